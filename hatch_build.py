@@ -0,0 +1,42 @@
+"""Hatch build hook: ship gzip-precompressed copies of the dashboard assets.
+
+For every compressible file in ``src/lattice/dashboard/static/`` the wheel
+also gets ``<name>.gz`` (level 9, no timestamp), which the dashboard serves
+as-is to clients that accept gzip instead of compressing at runtime.  The
+``.gz`` files are build outputs only and are never committed.
+"""
+
+from __future__ import annotations
+
+import gzip
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+STATIC_DIR = Path("src/lattice/dashboard/static")
+# Keep in sync with lattice.dashboard.assets (the build env cannot import lattice)
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".js", ".css", ".json", ".svg"})
+GZIP_MIN_BYTES = 1400
+
+
+class PrecompressStaticHook(BuildHookInterface):
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        root = Path(self.root)
+        self._tmp = tempfile.TemporaryDirectory(prefix="lattice-static-gz-")
+        out_dir = Path(self._tmp.name)
+        for path in sorted((root / STATIC_DIR).iterdir()):
+            if path.suffix not in COMPRESSIBLE_SUFFIXES or not path.is_file():
+                continue
+            data = path.read_bytes()
+            if len(data) < GZIP_MIN_BYTES:
+                continue
+            target = out_dir / f"{path.name}.gz"
+            target.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+            build_data["force_include"][str(target)] = f"lattice/dashboard/static/{path.name}.gz"
+
+    def finalize(self, version: str, build_data: dict[str, Any], artifact_path: str) -> None:
+        self._tmp.cleanup()
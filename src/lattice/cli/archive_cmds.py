@@ -1,8 +1,7 @@
-"""Archive commands: archive and unarchive."""
+"""Archive commands: archive, archive-pack and unarchive."""
 
 from __future__ import annotations
 
-import shutil
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -21,11 +20,15 @@ from lattice.cli.helpers import (
     validate_actor_format_or_exit,
 )
 from lattice.cli.main import cli
-from lattice.core.events import create_event, serialize_event
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.archive_packs import pack_archive
+from lattice.storage.catalog import rebuild_catalog
 from lattice.storage.hooks import execute_hooks
+from lattice.storage.layout import task_snapshot_files, task_snapshot_path
 from lattice.storage.locks import multi_lock
+from lattice.storage.operations import archive_task_files, unarchive_task_files
+from lattice.storage.readers import read_archived_snapshot
 
 
 def _parse_task_ids(raw_ids: tuple[str, ...]) -> list[str]:
@@ -56,8 +59,7 @@ def _archive_one(
     snapshot = read_snapshot(lattice_dir, task_id)
 
     if snapshot is None:
-        archive_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-        if archive_path.exists():
+        if read_archived_snapshot(lattice_dir, task_id) is not None:
             return f"Task {task_id} is already archived."
         return f"Task {task_id} not found."
 
@@ -79,41 +81,7 @@ def _archive_one(
     lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
 
     with multi_lock(locks_dir, lock_keys):
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        atomic_write(
-            lattice_dir / "archive" / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        if snapshot_path.exists():
-            snapshot_path.unlink()
-
-        shutil.move(
-            str(event_path),
-            str(lattice_dir / "archive" / "events" / f"{task_id}.jsonl"),
-        )
-
-        notes_path = lattice_dir / "notes" / f"{task_id}.md"
-        if notes_path.exists():
-            shutil.move(
-                str(notes_path),
-                str(lattice_dir / "archive" / "notes" / f"{task_id}.md"),
-            )
-
-        plans_path = lattice_dir / "plans" / f"{task_id}.md"
-        if plans_path.exists():
-            archive_plans_dir = lattice_dir / "archive" / "plans"
-            archive_plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(plans_path),
-                str(archive_plans_dir / f"{task_id}.md"),
-            )
+        archive_task_files(lattice_dir, task_id, event, updated_snapshot)
 
     execute_hooks(config, lattice_dir, task_id, event)
     return event
@@ -145,6 +113,9 @@ def archive(
     Use --stale to auto-archive done tasks older than yesterday:
 
       lattice archive --stale --actor human:atin
+
+    Use `lattice archive-pack` to fold all archived tasks into packed
+    segment files (fewer files, faster archive scans).
     """
     is_json = output_json
 
@@ -284,20 +255,8 @@ def _archive_stale(
     # "Before yesterday" means done_at date < today - 1 day (i.e., 2+ days ago)
     cutoff = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
 
-    tasks_dir = lattice_dir / "tasks"
-    if not tasks_dir.is_dir():
-        if is_json:
-            click.echo(
-                json.dumps(
-                    {"ok": True, "data": {"archived": [], "failed": []}}, sort_keys=True, indent=2
-                )
-            )
-        elif not is_quiet:
-            click.echo("No stale done tasks found.")
-        return
-
     candidates: list[str] = []
-    for task_file in sorted(tasks_dir.glob("*.json")):
+    for task_file in task_snapshot_files(lattice_dir):
         try:
             snap = json.loads(task_file.read_text())
         except (json.JSONDecodeError, OSError):
@@ -392,18 +351,14 @@ def _unarchive_one(
     provenance_reason: str | None,
 ) -> dict | str:
     """Unarchive a single task. Returns the event dict on success or an error string on failure."""
-    import json
-
-    active_path = lattice_dir / "tasks" / f"{task_id}.json"
+    active_path = task_snapshot_path(lattice_dir, task_id)
     if active_path.exists():
         return f"Task {task_id} is already active."
 
-    archive_snapshot_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-    if not archive_snapshot_path.exists():
+    snapshot = read_archived_snapshot(lattice_dir, task_id)
+    if snapshot is None:
         return f"Task {task_id} not found in archive."
 
-    snapshot = json.loads(archive_snapshot_path.read_text())
-
     event = create_event(
         type="task_unarchived",
         task_id=task_id,
@@ -422,39 +377,7 @@ def _unarchive_one(
     lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
 
     with multi_lock(locks_dir, lock_keys):
-        archive_event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
-        jsonl_append(archive_event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        shutil.move(
-            str(archive_event_path),
-            str(lattice_dir / "events" / f"{task_id}.jsonl"),
-        )
-
-        atomic_write(
-            lattice_dir / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        archive_snapshot_path.unlink()
-
-        archive_notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
-        if archive_notes_path.exists():
-            shutil.move(
-                str(archive_notes_path),
-                str(lattice_dir / "notes" / f"{task_id}.md"),
-            )
-
-        archive_plans_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
-        if archive_plans_path.exists():
-            plans_dir = lattice_dir / "plans"
-            plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(archive_plans_path),
-                str(plans_dir / f"{task_id}.md"),
-            )
+        unarchive_task_files(lattice_dir, task_id, event, updated_snapshot)
 
     execute_hooks(config, lattice_dir, task_id, event)
     return event
@@ -572,3 +495,39 @@ def unarchive(
         click.echo(f"  Failed {fid}: {msg}", err=True)
     if failed:
         sys.exit(1)
+
+
+@cli.command("archive-pack")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+@click.option("--quiet", is_flag=True, help="Print only the new segment name.")
+def archive_pack(output_json: bool, quiet: bool) -> None:
+    """Fold every loose archived task into a new packed segment.
+
+    Packing stores the snapshots, event logs, notes and plans of all loose
+    archived tasks in one segment file (fewer files, faster archive scans).
+    Packed tasks still work with show, unarchive, doctor and rebuild.
+    """
+    is_json = output_json
+    lattice_dir = require_root(is_json)
+    result = pack_archive(lattice_dir)
+    if result["segment"] is None:
+        output_result(
+            data=result,
+            human_message="No loose archived tasks to pack.",
+            quiet_value="",
+            is_json=is_json,
+            is_quiet=quiet,
+        )
+        return
+    # Snapshots are unchanged, but the catalog's freshness signature is not
+    rebuild_catalog(lattice_dir)
+    output_result(
+        data=result,
+        human_message=(
+            f"Packed {result['tasks']} archived task(s) into {result['segment']} "
+            f"({result['files_removed']} files removed)"
+        ),
+        quiet_value=result["segment"],
+        is_json=is_json,
+        is_quiet=quiet,
+    )
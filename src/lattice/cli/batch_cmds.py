@@ -0,0 +1,57 @@
+"""Batch command: apply a stream of task operations in one pass."""
+
+from __future__ import annotations
+
+import json
+from typing import TextIO
+
+import click
+
+from lattice.cli import helpers
+from lattice.cli.helpers import load_project_config, output_error, require_actor, require_root
+from lattice.cli.main import cli
+from lattice.storage.batch import BatchError, parse_operations, run_batch
+
+
+@cli.command("batch")
+@click.argument("source", type=click.File("r"), default="-")
+@click.option(
+    "--actor",
+    default=None,
+    expose_value=False,
+    callback=helpers._store_actor,
+    help="Actor (e.g., human:atin, agent:claude). Deprecated: prefer --name.",
+)
+@click.option(
+    "--name",
+    "session_name",
+    default=None,
+    expose_value=False,
+    callback=helpers._store_session_name,
+    is_eager=True,
+    help="Session name (e.g., Argus-3). Resolves to full identity.",
+)
+def batch_cmd(source: TextIO) -> None:
+    """Apply newline-delimited JSON operations from SOURCE (default: stdin).
+
+    Each line is one operation: create, update, status, assign, comment,
+    link or unlink, e.g. {"op": "create", "title": "Fix login", "ref": "fix"}
+    followed by {"op": "status", "task": "@fix", "status": "planned"}.
+    Locks for every affected task are taken once, and the batch is
+    all-or-nothing.  Prints one JSON result per operation and exits with
+    status 1 if the batch was not applied.
+    """
+    lattice_dir = require_root(False)
+    actor = require_actor(False)
+    config = load_project_config(lattice_dir)
+
+    try:
+        operations = parse_operations(source)
+    except BatchError as exc:
+        output_error(exc.message, exc.code, False)
+
+    committed, results = run_batch(lattice_dir, operations, actor, config)
+    for result in results:
+        click.echo(json.dumps(result, sort_keys=True))
+    if not committed:
+        raise SystemExit(1)
@@ -0,0 +1,93 @@
+"""Daemon commands: daemon start, stop, status."""
+
+from __future__ import annotations
+
+import signal
+
+import click
+
+from lattice.cli.helpers import json_envelope, output_error, require_root
+from lattice.cli.main import cli
+from lattice.daemon import NO_DAEMON_ENV, DaemonError, request, serve
+
+
+def _handle_sigterm(signum, frame):
+    """Turn SIGTERM into KeyboardInterrupt so the socket file is cleaned up."""
+    raise KeyboardInterrupt
+
+
+@cli.group()
+def daemon() -> None:
+    """Keep a warm process that serves lattice commands over a Unix socket."""
+
+
+@daemon.command("start")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def daemon_start(output_json: bool) -> None:
+    """Run the daemon in the foreground until stopped.
+
+    While it runs, `lattice` commands in this project are forwarded to it over
+    `.lattice/daemon.sock` and skip interpreter startup, imports and cold
+    caches.  Commands fall back to running directly once it stops.  Run it
+    under a process supervisor or with `&` to keep it in the background.
+    """
+    lattice_dir = require_root(output_json)
+
+    def on_ready(path) -> None:
+        if output_json:
+            click.echo(json_envelope(True, data={"socket": str(path)}))
+        else:
+            click.echo(f"Lattice daemon listening on {path}")
+            click.echo(f"Press Ctrl+C to stop. Set {NO_DAEMON_ENV}=1 to bypass it.")
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    try:
+        serve(lattice_dir, on_ready=on_ready)
+    except DaemonError as exc:
+        output_error(str(exc), "DAEMON_ERROR", output_json)
+    except KeyboardInterrupt:
+        pass
+
+
+@daemon.command("stop")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def daemon_stop(output_json: bool) -> None:
+    """Stop the daemon serving this project."""
+    lattice_dir = require_root(output_json)
+    try:
+        request(lattice_dir, {"op": "stop"})
+    except DaemonError:
+        output_error("No lattice daemon is running for this project.", "NOT_RUNNING", output_json)
+
+    if output_json:
+        click.echo(json_envelope(True, data={"stopped": True}))
+    else:
+        click.echo("Lattice daemon stopped.")
+
+
+@daemon.command("status")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def daemon_status(output_json: bool) -> None:
+    """Show whether a daemon is serving this project.
+
+    Exits with status 1 when no daemon is running.
+    """
+    lattice_dir = require_root(output_json)
+    try:
+        info = request(lattice_dir, {"op": "status"})
+    except DaemonError:
+        output_error("No lattice daemon is running for this project.", "NOT_RUNNING", output_json)
+
+    data = {
+        "pid": info.get("pid"),
+        "started_at": info.get("started_at"),
+        "served": info.get("served"),
+        "version": info.get("version"),
+    }
+    if output_json:
+        click.echo(json_envelope(True, data=data))
+    else:
+        click.echo(
+            f"Lattice daemon running (pid {data['pid']}, up since {data['started_at']}, "
+            f"{data['served']} command{'s' if data['served'] != 1 else ''} served)"
+        )
@@ -80,6 +80,11 @@ def dashboard_cmd(host: str, port: int | None, output_json: bool) -> None:
         signal.signal(signal.SIGHUP, _handle_sighup)
 
     from lattice.dashboard.server import create_server
+    from lattice.storage.hook_queue import start_worker_if_queued
+
+    # Queued hooks from dashboard writes run on a thread here (it is a daemon
+    # thread, so it ends with the process).
+    start_worker_if_queued(lattice_dir)
 
     first_start = True
 
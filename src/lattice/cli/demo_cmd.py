@@ -13,6 +13,7 @@ from lattice.core.events import create_event
 from lattice.core.ids import generate_instance_id, generate_task_id
 from lattice.core.tasks import apply_event_to_snapshot
 from lattice.storage.fs import LATTICE_DIR, atomic_write, ensure_lattice_dirs
+from lattice.storage.layout import task_snapshot_path
 from lattice.storage.operations import scaffold_plan, write_task_event
 from lattice.storage.short_ids import _default_index, allocate_short_id, save_id_index
 
@@ -1397,7 +1398,7 @@ def _add_relationship(
     target_id = task_ids[target_idx]
 
     # Read current snapshot
-    snap_path = lattice_dir / "tasks" / f"{source_id}.json"
+    snap_path = task_snapshot_path(lattice_dir, source_id)
     snapshot = json_mod.loads(snap_path.read_text())
 
     # Check for duplicate
@@ -0,0 +1,73 @@
+"""Dependency graph commands: graph check."""
+
+from __future__ import annotations
+
+import sys
+
+import click
+
+from lattice.cli.helpers import json_envelope, require_root
+from lattice.cli.main import cli
+from lattice.storage.blocking_index import blocking_report
+from lattice.storage.catalog import load_snapshots
+
+
+@cli.group()
+def graph() -> None:
+    """Inspect the blocks/depends_on dependency graph."""
+
+
+@graph.command("check")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def graph_check(output_json: bool) -> None:
+    """Report blocked tasks and dependency cycles.
+
+    A task is blocked while any task that blocks it (or that it depends on)
+    is still open.  Tasks in a cycle wait on each other and can never be
+    picked by `lattice next`.  Exits with status 1 when cycles are found.
+    """
+    is_json = output_json
+    lattice_dir = require_root(is_json)
+    report = blocking_report(lattice_dir)
+
+    if is_json:
+        click.echo(
+            json_envelope(
+                True,
+                data={
+                    "edges": report["edges"],
+                    "blocked": [
+                        {"task_id": task_id, "blockers": blockers}
+                        for task_id, blockers in report["blocked"].items()
+                    ],
+                    "cycles": report["cycles"],
+                },
+            )
+        )
+    else:
+        active, archived = load_snapshots(lattice_dir)
+        labels = {
+            snap["id"]: snap.get("short_id") or snap["id"]
+            for snap in active + archived
+            if "id" in snap
+        }
+
+        def label(task_id: str) -> str:
+            return labels.get(task_id, task_id)
+
+        blocked = report["blocked"]
+        click.echo(
+            f"{report['edges']} blocking edge{'s' if report['edges'] != 1 else ''}, "
+            f"{len(blocked)} blocked task{'s' if len(blocked) != 1 else ''}"
+        )
+        for task_id, blockers in blocked.items():
+            click.echo(f"  {label(task_id)} waits on {', '.join(label(b) for b in blockers)}")
+
+        if report["cycles"]:
+            for cycle in report["cycles"]:
+                click.echo(f"\u26a0 Cycle among {', '.join(label(t) for t in cycle)}")
+        else:
+            click.echo("\u2713 No dependency cycles")
+
+    if report["cycles"]:
+        sys.exit(1)
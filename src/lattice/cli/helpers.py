@@ -10,6 +10,8 @@ import click
 
 from lattice.core.ids import is_short_id, validate_actor, validate_id
 from lattice.storage.fs import LATTICE_DIR, LatticeRootError, find_root
+from lattice.storage.layout import task_snapshot_path
+from lattice.storage.mutations import MutationError, plan_gate_error
 from lattice.storage.operations import write_task_event  # noqa: F401 — re-exported
 from lattice.storage.short_ids import resolve_short_id as _resolve_short
 
@@ -94,6 +96,17 @@ def output_error(message: str, code: str, is_json: bool, exit_code: int = 1) ->
     raise SystemExit(exit_code)
 
 
+def output_mutation_error(exc: MutationError, is_json: bool) -> NoReturn:
+    """Print a rejected task write, with its extra JSON fields, and exit."""
+    if is_json:
+        error_obj = json_error_obj(exc.code, exc.message)
+        error_obj.update(exc.details)
+        click.echo(json_envelope(False, error=error_obj))
+    else:
+        click.echo(f"Error: {exc.message}", err=True)
+    raise SystemExit(1)
+
+
 def output_result(
     *,
     data: object,
@@ -293,7 +306,7 @@ def common_options(f):  # noqa: ANN001, ANN201
 
 def read_snapshot(lattice_dir: Path, task_id: str) -> dict | None:
     """Read a task snapshot, returning None if not found."""
-    path = lattice_dir / "tasks" / f"{task_id}.json"
+    path = task_snapshot_path(lattice_dir, task_id)
     if not path.exists():
         return None
     return json.loads(path.read_text())
@@ -401,56 +414,6 @@ def list_all_resources(lattice_dir: Path) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 
-def is_scaffold_plan(content: str, *, description: str | None = None) -> bool:
-    """Return True when plan content still matches the default scaffold placeholders.
-
-    The scaffold is minimal: just ``# <title>`` and optionally the task
-    description as a paragraph.  A plan that has been "filled in" will
-    contain sub-headings, lists, code fences, or other structural
-    elements — OR plain-text content that differs from the auto-generated
-    description paragraph.
-
-    When *description* is provided, a plan consisting only of heading +
-    that exact description text is still considered scaffold.  Without
-    *description*, any non-empty text beyond the heading is accepted as
-    a real plan (one-line plans are valid).
-    """
-    stripped = content.strip()
-    if not stripped:
-        return True
-    lines = stripped.splitlines()
-    # Must start with a heading to look like a scaffold at all.
-    if not lines[0].startswith("# "):
-        return False
-
-    # Collect non-empty, non-heading body lines.
-    body_lines = [lt for line in lines[1:] if (lt := line.strip())]
-
-    if not body_lines:
-        # Only a heading, no body → still scaffold.
-        return True
-
-    # If there's structural markdown content, it's definitely filled in.
-    for lt in body_lines:
-        if lt.startswith(("## ", "### ", "- ", "* ", "```")):
-            return False
-        if len(lt) > 2 and lt[0].isdigit() and ". " in lt[:5]:
-            return False
-
-    # Plain text exists. If we have the original description, check whether
-    # the body is just the auto-generated description (still scaffold).
-    if description:
-        body_text = "\n".join(body_lines)
-        desc_text = "\n".join(
-            lt for line in description.strip().splitlines() if (lt := line.strip())
-        )
-        if body_text == desc_text:
-            return True  # Body is just the description → scaffold.
-
-    # Plain text that isn't the auto-generated description → real plan.
-    return False
-
-
 def check_plan_gate(
     lattice_dir: Path,
     task_id: str,
@@ -477,36 +440,6 @@ def check_plan_gate(
             )
         return
 
-    plan_path = lattice_dir / "plans" / f"{task_id}.md"
-    if not plan_path.exists():
-        output_error(
-            f"Plan file missing for {task_id}. "
-            "Write a plan before moving to in_progress. "
-            "Override with --force --reason.",
-            "PLAN_REQUIRED",
-            is_json,
-        )
-
-    try:
-        content = plan_path.read_text()
-    except OSError:
-        return  # Can't read → don't block (filesystem issue, not a planning issue)
-
-    # Load the task description so we can distinguish "plan is just the
-    # auto-generated description" from "plan has real content".
-    description: str | None = None
-    snap_path = lattice_dir / "tasks" / f"{task_id}.json"
-    try:
-        snap = json.loads(snap_path.read_text())
-        description = snap.get("description")
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
-        pass
-
-    if is_scaffold_plan(content, description=description):
-        output_error(
-            f"Plan for {task_id} is still scaffold. "
-            "Write the plan (even one line) before moving to in_progress. "
-            "Override with --force --reason.",
-            "PLAN_REQUIRED",
-            is_json,
-        )
+    message = plan_gate_error(lattice_dir, task_id)
+    if message is not None:
+        output_error(message, "PLAN_REQUIRED", is_json)
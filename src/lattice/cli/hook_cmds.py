@@ -0,0 +1,101 @@
+"""Hook queue commands: hooks status, drain, retry."""
+
+from __future__ import annotations
+
+import click
+
+from lattice.cli.helpers import json_envelope, load_project_config, output_error, require_root
+from lattice.cli.main import cli
+from lattice.storage.hook_queue import (
+    dead_letters,
+    drain,
+    pending_jobs,
+    retry_dead_letters,
+    worker_running,
+)
+
+
+@cli.group()
+def hooks() -> None:
+    """Inspect and drive the queued-hook outbox (``hooks.queued`` in config)."""
+
+
+@hooks.command("status")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def hooks_status(output_json: bool) -> None:
+    """Show queued hook jobs and dead letters (commands that kept failing)."""
+    lattice_dir = require_root(output_json)
+    jobs = pending_jobs(lattice_dir)
+    dead = dead_letters(lattice_dir)
+    running = worker_running(lattice_dir)
+
+    if output_json:
+        data = {
+            "worker_running": running,
+            "pending": [
+                {
+                    "id": job["id"],
+                    "key": job["key"],
+                    "queued_at": job["queued_at"],
+                    "commands": [c["cmd"] for c in job["commands"][job.get("next", 0) :]],
+                }
+                for job in jobs
+            ],
+            "dead": [
+                {k: letter[k] for k in ("id", "key", "cmd", "attempts", "error", "failed_at")}
+                for letter in dead
+            ],
+        }
+        click.echo(json_envelope(True, data=data))
+        return
+
+    click.echo(f"Worker: {'running' if running else 'idle'}")
+    click.echo(f"Pending jobs: {len(jobs)}")
+    click.echo(f"Dead letters: {len(dead)}")
+    for letter in dead:
+        click.echo(f"  {letter['id']}  {letter['key']}  {letter['cmd']}")
+        click.echo(f"    {letter['error']}")
+
+
+@hooks.command("drain")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def hooks_drain(output_json: bool) -> None:
+    """Run every queued hook job now, in the foreground."""
+    lattice_dir = require_root(output_json)
+    stats = drain(lattice_dir, load_project_config(lattice_dir))
+    if stats is None:
+        output_error("Another hook worker is already draining the outbox.", "BUSY", output_json)
+
+    if output_json:
+        click.echo(json_envelope(True, data=stats))
+    else:
+        click.echo(
+            f"Ran {stats['commands']} hook command{'s' if stats['commands'] != 1 else ''} "
+            f"from {stats['jobs']} job{'s' if stats['jobs'] != 1 else ''} "
+            f"({stats['retries']} retried, {stats['dead']} dead-lettered)."
+        )
+
+
+@hooks.command("retry")
+@click.argument("letter_ids", nargs=-1)
+@click.option("--all", "retry_all", is_flag=True, help="Re-queue every dead letter.")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def hooks_retry(letter_ids: tuple[str, ...], retry_all: bool, output_json: bool) -> None:
+    """Move dead letters back onto the queue (by ID, or all with --all)."""
+    lattice_dir = require_root(output_json)
+    if not letter_ids and not retry_all:
+        output_error(
+            "Give one or more dead-letter IDs, or --all.", "VALIDATION_ERROR", output_json
+        )
+
+    known = {letter["id"] for letter in dead_letters(lattice_dir)}
+    missing = sorted(set(letter_ids) - known)
+    if missing:
+        output_error(f"Dead letter not found: {', '.join(missing)}.", "NOT_FOUND", output_json)
+
+    requeued = retry_dead_letters(lattice_dir, None if retry_all else list(letter_ids))
+
+    if output_json:
+        click.echo(json_envelope(True, data={"requeued": requeued}))
+    else:
+        click.echo(f"Re-queued {len(requeued)} hook command{'s' if len(requeued) != 1 else ''}.")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import click
@@ -16,9 +17,52 @@ from lattice.cli.helpers import (
 from lattice.cli.main import cli
 from lattice.core.events import LIFECYCLE_EVENT_TYPES, serialize_event
 from lattice.core.ids import validate_id, validate_short_id, parse_short_id
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
-from lattice.storage.fs import atomic_write
+from lattice.core.tasks import replay_events, serialize_snapshot
+from lattice.storage.archive_packs import (
+    find_packed,
+    packed_event_logs,
+    packed_snapshots,
+    read_packed_part,
+    read_packed_snapshot,
+    verify_packs,
+)
+from lattice.storage.catalog import catalog_record, rebuild_catalog, verify_catalog
+from lattice.storage.event_index import (
+    EVENT_INDEX_FILENAME,
+    index_row,
+    rebuild_event_index,
+    verify_event_index,
+)
+from lattice.storage.fs import atomic_write, cache_path
+from lattice.storage.hook_queue import dead_letters
+from lattice.storage.layout import (
+    LIFECYCLE_LOG,
+    ensure_parent,
+    lifecycle_log_path,
+    project_layout,
+    resource_event_files,
+    resource_event_path,
+    task_event_files,
+    task_event_path,
+    task_snapshot_files,
+    task_snapshot_path,
+)
 from lattice.storage.locks import multi_lock
+from lattice.storage.blocking_index import (
+    blocking_index_record,
+    rebuild_blocking_index,
+    verify_blocking_index,
+)
+from lattice.storage.ready_queue import (
+    ready_queue_record,
+    rebuild_ready_queue,
+    verify_ready_queue,
+)
+from lattice.storage.relationship_index import (
+    rebuild_relationship_index,
+    relationship_index_record,
+    verify_relationship_index,
+)
 from lattice.storage.short_ids import load_id_index, save_id_index
 
 
@@ -94,11 +138,7 @@ def _fix_truncated_jsonl(path: Path) -> bool:
 
 def _collect_task_files(lattice_dir: Path) -> list[Path]:
     """Collect all task snapshot files from tasks/ and archive/tasks/."""
-    result = []
-    for d in [lattice_dir / "tasks", lattice_dir / "archive" / "tasks"]:
-        if d.is_dir():
-            result.extend(sorted(d.glob("*.json")))
-    return result
+    return task_snapshot_files(lattice_dir) + task_snapshot_files(lattice_dir, archived=True)
 
 
 def _collect_event_files(lattice_dir: Path) -> list[Path]:
@@ -106,26 +146,12 @@ def _collect_event_files(lattice_dir: Path) -> list[Path]:
 
     Excludes ``_lifecycle.jsonl`` and ``res_*`` resource event files.
     """
-    result = []
-    for d in [lattice_dir / "events", lattice_dir / "archive" / "events"]:
-        if d.is_dir():
-            for f in sorted(d.glob("*.jsonl")):
-                if f.name == "_lifecycle.jsonl":
-                    continue
-                if f.stem.startswith("res_"):
-                    continue
-                result.append(f)
-    return result
+    return task_event_files(lattice_dir) + task_event_files(lattice_dir, archived=True)
 
 
 def _collect_resource_event_files(lattice_dir: Path) -> list[Path]:
     """Collect all per-resource event files (``res_*.jsonl``)."""
-    result = []
-    events_dir = lattice_dir / "events"
-    if events_dir.is_dir():
-        for f in sorted(events_dir.glob("res_*.jsonl")):
-            result.append(f)
-    return result
+    return resource_event_files(lattice_dir)
 
 
 def _collect_resource_snapshot_files(lattice_dir: Path) -> list[Path]:
@@ -188,15 +214,13 @@ def doctor(fix: bool, output_json: bool) -> None:
     if config_path.exists():
         json_files.append(config_path)
 
+    task_file_set = set(task_files)
     json_ok = True
     for jf in json_files:
         try:
             data = json.loads(jf.read_text())
             # Store snapshot data for later checks
-            if jf.parent.name in ("tasks",) and jf.suffix == ".json":
-                snapshots[jf.stem] = data
-                known_task_ids.add(jf.stem)
-            elif jf.parent.parent.name == "archive" and jf.parent.name == "tasks":
+            if jf in task_file_set:
                 snapshots[jf.stem] = data
                 known_task_ids.add(jf.stem)
             elif jf.parent.name == "meta":
@@ -216,9 +240,9 @@ def doctor(fix: bool, output_json: bool) -> None:
     # Check 2: JSONL parseability
     # -----------------------------------------------------------------
     all_jsonl_files = list(event_files)
-    lifecycle_log_path = lattice_dir / "events" / "_lifecycle.jsonl"
-    if lifecycle_log_path.exists():
-        all_jsonl_files.append(lifecycle_log_path)
+    lifecycle_path = lifecycle_log_path(lattice_dir)
+    if lifecycle_path.exists():
+        all_jsonl_files.append(lifecycle_path)
 
     jsonl_ok = True
     per_task_events: dict[str, list[dict]] = {}
@@ -237,13 +261,28 @@ def doctor(fix: bool, output_json: bool) -> None:
                             finding["level"] = "warning"
             findings.extend(parse_findings)
 
-        if jf.name == "_lifecycle.jsonl":
+        if jf.name == LIFECYCLE_LOG:
             global_events = events
         else:
             task_id = jf.stem
             per_task_events[task_id] = events
             total_event_count += len(events)
 
+    # Packed archived tasks (``lattice archive-pack``) join the same checks
+    for snap in packed_snapshots(lattice_dir, skip={f.stem for f in task_files}):
+        snapshots[snap["id"]] = snap
+        known_task_ids.add(snap["id"])
+        task_count += 1
+    for task_id, data in packed_event_logs(lattice_dir, skip=set(per_task_events)):
+        events = []
+        for line in data.splitlines():
+            try:
+                events.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+        per_task_events[task_id] = events
+        total_event_count += len(events)
+
     event_count = total_event_count
 
     # -----------------------------------------------------------------
@@ -251,9 +290,9 @@ def doctor(fix: bool, output_json: bool) -> None:
     # -----------------------------------------------------------------
     drift_ok = True
     # Only check active tasks (in tasks/, not archive/tasks/)
-    active_tasks_dir = lattice_dir / "tasks"
+    layout = project_layout(lattice_dir)
     for task_id, snap in snapshots.items():
-        snap_path = active_tasks_dir / f"{task_id}.json"
+        snap_path = task_snapshot_path(lattice_dir, task_id, layout=layout)
         if not snap_path.exists():
             continue  # archived task, skip drift check
         last_event_id = snap.get("last_event_id")
@@ -645,6 +684,156 @@ def doctor(fix: bool, output_json: bool) -> None:
                     }
                 )
 
+    # -----------------------------------------------------------------
+    # Check 12: Task catalog consistency
+    # -----------------------------------------------------------------
+    active_snaps: dict[str, dict] = {}
+    archived_snaps: dict[str, dict] = {}
+    for task_id, snap in snapshots.items():
+        if task_snapshot_path(lattice_dir, task_id, layout=layout).exists():
+            active_snaps[task_id] = snap
+        else:
+            archived_snaps[task_id] = snap
+
+    catalog_problems = verify_catalog(lattice_dir, active_snaps, archived_snaps)
+    catalog_ok = not catalog_problems
+    for problem in catalog_problems:
+        findings.append(
+            {
+                "level": "warning",
+                "check": "catalog_integrity",
+                "message": problem,
+                "task_id": None,
+            }
+        )
+
+    if fix and not catalog_ok:
+        rebuild_catalog(lattice_dir)
+        for f in findings:
+            if f["check"] == "catalog_integrity":
+                f["message"] += " (fixed by regenerating catalog)"
+
+    # -----------------------------------------------------------------
+    # Check 13: Event index consistency
+    # -----------------------------------------------------------------
+    event_index_problems = verify_event_index(
+        lattice_dir, {**per_task_events, **per_resource_events}
+    )
+    event_index_ok = not event_index_problems
+    for problem in event_index_problems:
+        findings.append(
+            {
+                "level": "warning",
+                "check": "event_index_integrity",
+                "message": problem,
+                "task_id": None,
+            }
+        )
+
+    if fix and not event_index_ok:
+        rebuild_event_index(lattice_dir)
+        for f in findings:
+            if f["check"] == "event_index_integrity":
+                f["message"] += " (fixed by regenerating event index)"
+
+    # -----------------------------------------------------------------
+    # Check 14: Relationship index consistency
+    # -----------------------------------------------------------------
+    relationship_index_problems = verify_relationship_index(
+        lattice_dir, active_snaps, archived_snaps
+    )
+    relationship_index_ok = not relationship_index_problems
+    for problem in relationship_index_problems:
+        findings.append(
+            {
+                "level": "warning",
+                "check": "relationship_index_integrity",
+                "message": problem,
+                "task_id": None,
+            }
+        )
+
+    if fix and not relationship_index_ok:
+        rebuild_relationship_index(lattice_dir)
+        for f in findings:
+            if f["check"] == "relationship_index_integrity":
+                f["message"] += " (fixed by regenerating relationship index)"
+
+    # -----------------------------------------------------------------
+    # Check 15: Blocking index consistency
+    # -----------------------------------------------------------------
+    blocking_index_problems = verify_blocking_index(lattice_dir, active_snaps, archived_snaps)
+    blocking_index_ok = not blocking_index_problems
+    for problem in blocking_index_problems:
+        findings.append(
+            {
+                "level": "warning",
+                "check": "blocking_index_integrity",
+                "message": problem,
+                "task_id": None,
+            }
+        )
+
+    if fix and not blocking_index_ok:
+        rebuild_blocking_index(lattice_dir)
+        for f in findings:
+            if f["check"] == "blocking_index_integrity":
+                f["message"] += " (fixed by regenerating blocking index)"
+
+    # -----------------------------------------------------------------
+    # Check 16: Ready queue consistency
+    # -----------------------------------------------------------------
+    ready_queue_problems = verify_ready_queue(lattice_dir, active_snaps)
+    ready_queue_ok = not ready_queue_problems
+    for problem in ready_queue_problems:
+        findings.append(
+            {
+                "level": "warning",
+                "check": "ready_queue_integrity",
+                "message": problem,
+                "task_id": None,
+            }
+        )
+
+    if fix and not ready_queue_ok:
+        rebuild_ready_queue(lattice_dir)
+        for f in findings:
+            if f["check"] == "ready_queue_integrity":
+                f["message"] += " (fixed by regenerating ready queue)"
+
+    # -----------------------------------------------------------------
+    # Check 17: Packed archive segments
+    # -----------------------------------------------------------------
+    pack_problems = verify_packs(lattice_dir)
+    packs_ok = not pack_problems
+    for problem in pack_problems:
+        findings.append(
+            {
+                "level": "error",
+                "check": "pack_integrity",
+                "message": problem,
+                "task_id": None,
+            }
+        )
+
+    # -----------------------------------------------------------------
+    # Check 18: Dead-lettered hook commands (queued hooks)
+    # -----------------------------------------------------------------
+    dead = dead_letters(lattice_dir)
+    for letter in dead:
+        findings.append(
+            {
+                "level": "warning",
+                "check": "hook_dead_letter",
+                "message": (
+                    f"Hook command failed after {letter['attempts']} attempts: "
+                    f"{letter['cmd']} ({letter['error']}); "
+                    f"run 'lattice hooks retry {letter['id']}' to re-queue"
+                ),
+                "task_id": letter["key"] if letter["key"].startswith("task_") else None,
+            }
+        )
+
     # -----------------------------------------------------------------
     # Output
     # -----------------------------------------------------------------
@@ -755,6 +944,50 @@ def doctor(fix: bool, output_json: bool) -> None:
                 if f["check"] == "alias_integrity":
                     click.echo(f"\u26a0 {f['message']}")
 
+        if catalog_ok:
+            click.echo("\u2713 Task catalog consistent")
+        else:
+            for f in findings:
+                if f["check"] == "catalog_integrity":
+                    click.echo(f"\u26a0 {f['message']}")
+
+        if event_index_ok:
+            click.echo("\u2713 Event index consistent")
+        else:
+            for f in findings:
+                if f["check"] == "event_index_integrity":
+                    click.echo(f"\u26a0 {f['message']}")
+
+        if relationship_index_ok:
+            click.echo("\u2713 Relationship index consistent")
+        else:
+            for f in findings:
+                if f["check"] == "relationship_index_integrity":
+                    click.echo(f"\u26a0 {f['message']}")
+
+        if blocking_index_ok:
+            click.echo("\u2713 Blocking index consistent")
+        else:
+            for f in findings:
+                if f["check"] == "blocking_index_integrity":
+                    click.echo(f"\u26a0 {f['message']}")
+
+        if ready_queue_ok:
+            click.echo("\u2713 Ready queue consistent")
+        else:
+            for f in findings:
+                if f["check"] == "ready_queue_integrity":
+                    click.echo(f"\u26a0 {f['message']}")
+
+        if not packs_ok:
+            for f in findings:
+                if f["check"] == "pack_integrity":
+                    click.echo(f"\u26a0 {f['message']}")
+
+        for f in findings:
+            if f["check"] == "hook_dead_letter":
+                click.echo(f"\u26a0 {f['message']}")
+
         if resource_count > 0:
             if resource_ok:
                 click.echo(f"\u2713 All {resource_count} resource(s) consistent")
@@ -791,15 +1024,21 @@ def _rebuild_task(lattice_dir: Path, task_id: str) -> dict:
     Raises FileNotFoundError if the event log does not exist.
     """
     # Check both active and archive locations
-    event_path = lattice_dir / "events" / f"{task_id}.jsonl"
+    event_path = task_event_path(lattice_dir, task_id)
     if not event_path.exists():
-        event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
-    if not event_path.exists():
-        raise FileNotFoundError(f"No event log found for {task_id}")
+        event_path = task_event_path(lattice_dir, task_id, archived=True)
+    if event_path.exists():
+        text = event_path.read_text()
+    else:
+        # Packed archived task
+        packed = read_packed_part(lattice_dir, task_id, "events")
+        if packed is None:
+            raise FileNotFoundError(f"No event log found for {task_id}")
+        text = packed.decode("utf-8")
 
     # Parse events
     events: list[dict] = []
-    for line in event_path.read_text().splitlines():
+    for line in text.splitlines():
         stripped = line.strip()
         if stripped:
             events.append(json.loads(stripped))
@@ -807,77 +1046,183 @@ def _rebuild_task(lattice_dir: Path, task_id: str) -> dict:
     if not events:
         raise ValueError(f"Event log for {task_id} is empty")
 
-    # Replay events
-    snapshot: dict | None = None
-    for event in events:
-        snapshot = apply_event_to_snapshot(snapshot, event)
+    # Replay events (in place: one snapshot, no per-event copy)
+    snapshot = replay_events(events)
 
     assert snapshot is not None
     return snapshot
 
 
-def _rebuild_lifecycle_log(lattice_dir: Path) -> list[str]:
-    """Rebuild _lifecycle.jsonl from all per-task event logs.
+def _replay_task_log(job: tuple[Path, str, Path, Path, bool]) -> dict:
+    """Replay one task log and write its snapshot, for ``rebuild --all``.
+
+    Reads the log exactly once and returns everything the rest of the rebuild
+    needs from it, so no later step has to rescan the event logs:
+
+    - ``snapshot`` — the rebuilt snapshot (``None`` on error)
+    - ``error`` — why the task could not be rebuilt, or ``None``
+    - ``lifecycle`` — the log's lifecycle events, for ``_lifecycle.jsonl``
+    - ``log_size`` / ``index_rows`` — event index rows (only when requested)
 
-    Returns list of rebuilt task IDs (for reporting).
+    Module-level so it can run in a worker process.
     """
-    all_lifecycle_events: list[dict] = []
-
-    # Scan all per-task event logs (active + archive)
-    for directory in [
-        lattice_dir / "events",
-        lattice_dir / "archive" / "events",
-    ]:
-        if not directory.is_dir():
-            continue
-        for jsonl_file in sorted(directory.glob("*.jsonl")):
-            if jsonl_file.name == "_lifecycle.jsonl":
-                continue
-            for line in jsonl_file.read_text().splitlines():
-                stripped = line.strip()
-                if not stripped:
-                    continue
-                try:
-                    event = json.loads(stripped)
-                except json.JSONDecodeError:
-                    continue  # skip malformed lines during rebuild
-                if event.get("type") in LIFECYCLE_EVENT_TYPES:
-                    all_lifecycle_events.append(event)
+    lattice_dir, task_id, log_path, snapshot_path, want_index_rows = job
+    result = _new_replay_result(task_id, log_path)
+    try:
+        data = log_path.read_bytes()
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+
+    snapshot = _replay_log_data(result, data, want_index_rows)
+    if snapshot is None:
+        return result
+
+    with multi_lock(lattice_dir / "locks", [f"tasks_{task_id}"]):
+        atomic_write(snapshot_path, serialize_snapshot(snapshot))
+    result["snapshot"] = snapshot
+    return result
+
 
+def _new_replay_result(task_id: str, log_path: Path | None) -> dict:
+    return {
+        "task_id": task_id,
+        "log_path": log_path,
+        "snapshot": None,
+        "error": None,
+        "lifecycle": [],
+        "log_size": 0,
+        "index_rows": [],
+    }
+
+
+def _replay_log_data(result: dict, data: bytes, want_index_rows: bool) -> dict | None:
+    """Parse and replay one log's bytes into *result*; return the snapshot or None."""
+    task_id = result["task_id"]
+    events: list[dict] = []
+    offsets: list[int] = []
+    error: str | None = None
+    offset = 0
+    for raw in data.split(b"\n"):
+        stripped = raw.strip()
+        if stripped:
+            try:
+                event = json.loads(stripped)
+            except ValueError as e:
+                # Malformed lines fail the replay but are skipped everywhere else
+                error = error or str(e)
+            else:
+                if isinstance(event, dict):
+                    events.append(event)
+                    offsets.append(offset)
+        offset += len(raw) + 1
+
+    result["lifecycle"] = [e for e in events if e.get("type") in LIFECYCLE_EVENT_TYPES]
+    if want_index_rows:
+        result["log_size"] = len(data)
+        result["index_rows"] = [index_row(e, task_id, o) for e, o in zip(events, offsets)]
+
+    if error is None and not events:
+        error = f"Event log for {task_id} is empty"
+    if error is None:
+        try:
+            snapshot = replay_events(events)
+        except ValueError as e:
+            error = str(e)
+    if error is not None:
+        result["error"] = error
+        return None
+
+    assert snapshot is not None
+    return snapshot
+
+
+def _replay_packed_logs(lattice_dir: Path, skip: set[str]) -> list[dict]:
+    """Replay every packed archived log not in *skip*, for ``rebuild --all``.
+
+    Packed segments are never rewritten: a snapshot that replays differently
+    from its packed copy is written as a loose archived snapshot, which wins
+    over the packed one (see :mod:`lattice.storage.archive_packs`).
+    """
+    results: list[dict] = []
+    for task_id, data in packed_event_logs(lattice_dir, skip=skip):
+        result = _new_replay_result(task_id, None)
+        snapshot = _replay_log_data(result, data, False)
+        if snapshot is not None:
+            if snapshot != read_packed_snapshot(lattice_dir, task_id):
+                snapshot_path = task_snapshot_path(lattice_dir, task_id, archived=True)
+                with multi_lock(lattice_dir / "locks", [f"tasks_{task_id}"]):
+                    atomic_write(ensure_parent(snapshot_path), serialize_snapshot(snapshot))
+            result["snapshot"] = snapshot
+        results.append(result)
+    return results
+
+
+def _run_replay_jobs(jobs: list[tuple[Path, str, Path, Path, bool]], workers: int) -> list[dict]:
+    """Run :func:`_replay_task_log` over *jobs*, in order, across *workers* processes."""
+    if workers <= 1 or len(jobs) < 2:
+        return [_replay_task_log(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(workers, len(jobs))
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_replay_task_log, jobs, chunksize=chunksize))
+
+
+def _write_lifecycle_log(lattice_dir: Path, lifecycle_events: list[dict]) -> None:
+    """Rewrite _lifecycle.jsonl from lifecycle events collected across all task logs."""
     # Sort by (ts, id) for deterministic ordering
-    all_lifecycle_events.sort(key=lambda e: (e.get("ts", ""), e.get("id", "")))
+    ordered = sorted(lifecycle_events, key=lambda e: (e.get("ts", ""), e.get("id", "")))
 
     # Write atomically
-    lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-    content = "".join(serialize_event(e) for e in all_lifecycle_events)
+    lifecycle_path = lifecycle_log_path(lattice_dir)
+    content = "".join(serialize_event(e) for e in ordered)
 
     locks_dir = lattice_dir / "locks"
     with multi_lock(locks_dir, ["events__lifecycle"]):
         atomic_write(lifecycle_path, content)
 
-    return [e.get("task_id", "") for e in all_lifecycle_events]
+
+def _load_other_snapshots(lattice_dir: Path, archived: bool, skip: set[str]) -> list[dict]:
+    """Read the active or archived snapshots whose task ID is not in *skip*."""
+    result: list[dict] = []
+    for snap_file in task_snapshot_files(lattice_dir, archived=archived):
+        if snap_file.stem in skip:
+            continue
+        try:
+            snap = json.loads(snap_file.read_text())
+        except (json.JSONDecodeError, OSError):
+            continue
+        snap.setdefault("id", snap_file.stem)
+        result.append(snap)
+    if archived:
+        result.extend(packed_snapshots(lattice_dir, skip=skip | {s["id"] for s in result}))
+    return result
 
 
 def _rebuild_id_index(lattice_dir: Path) -> None:
     """Rebuild ``ids.json`` from all task snapshots (active + archived)."""
+    _write_id_index(
+        lattice_dir,
+        _load_other_snapshots(lattice_dir, False, set())
+        + _load_other_snapshots(lattice_dir, True, set()),
+    )
+
+
+def _write_id_index(lattice_dir: Path, snapshots: list[dict]) -> None:
+    """Write ``ids.json`` from *snapshots* (active first, then archived)."""
     id_map: dict[str, str] = {}
     max_seq: dict[str, int] = {}  # per-prefix max seq
 
-    for directory in [lattice_dir / "tasks", lattice_dir / "archive" / "tasks"]:
-        if not directory.is_dir():
-            continue
-        for snap_file in sorted(directory.glob("*.json")):
-            try:
-                snap = json.loads(snap_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            short_id = snap.get("short_id")
-            if short_id and validate_short_id(short_id):
-                task_ulid = snap.get("id", snap_file.stem)
-                id_map[short_id] = task_ulid
-                prefix, num = parse_short_id(short_id)
-                if prefix not in max_seq or num > max_seq[prefix]:
-                    max_seq[prefix] = num
+    for snap in snapshots:
+        short_id = snap.get("short_id")
+        if short_id and validate_short_id(short_id):
+            id_map[short_id] = snap["id"]
+            prefix, num = parse_short_id(short_id)
+            if prefix not in max_seq or num > max_seq[prefix]:
+                max_seq[prefix] = num
 
     # Compute per-prefix next_seqs (v2 schema)
     next_seqs: dict[str, int] = {}
@@ -898,9 +1243,9 @@ def _rebuild_resource(lattice_dir: Path, resource_id: str) -> dict:
     Returns the rebuilt snapshot dict.
     Raises FileNotFoundError if the event log does not exist.
     """
-    from lattice.core.resources import apply_resource_event_to_snapshot
+    from lattice.core.resources import replay_resource_events
 
-    event_path = lattice_dir / "events" / f"{resource_id}.jsonl"
+    event_path = resource_event_path(lattice_dir, resource_id)
     if not event_path.exists():
         raise FileNotFoundError(f"No event log found for resource {resource_id}")
 
@@ -913,9 +1258,7 @@ def _rebuild_resource(lattice_dir: Path, resource_id: str) -> dict:
     if not events:
         raise ValueError(f"Event log for resource {resource_id} is empty")
 
-    snapshot: dict | None = None
-    for event in events:
-        snapshot = apply_resource_event_to_snapshot(snapshot, event)
+    snapshot = replay_resource_events(events)
 
     assert snapshot is not None
     return snapshot
@@ -924,9 +1267,21 @@ def _rebuild_resource(lattice_dir: Path, resource_id: str) -> dict:
 @cli.command()
 @click.argument("task_id", required=False, default=None)
 @click.option("--all", "rebuild_all", is_flag=True, help="Rebuild all tasks.")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="With --all, replay tasks across N worker processes (0 = one per CPU).",
+)
 @click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
-def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
-    """Rebuild task snapshots from event logs."""
+def rebuild(task_id: str | None, rebuild_all: bool, jobs: int, output_json: bool) -> None:
+    """Rebuild task snapshots from event logs.
+
+    With --all, every log is read once: the same pass that replays each task
+    also collects the lifecycle log, the short-ID index and the event index.
+    """
     is_json = output_json
     lattice_dir = require_root(is_json)
 
@@ -945,51 +1300,84 @@ def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
         )
 
     if rebuild_all:
-        # Rebuild all tasks (active + archived)
+        # Rebuild all tasks (active + archived) in a single pass over the logs:
+        # each replay also yields the lifecycle events and event index rows,
+        # so nothing below has to read the event logs a second time.
         rebuilt_ids: list[str] = []
-
-        # Collect event files from both active and archive directories
-        event_dirs = [
-            (lattice_dir / "events", lattice_dir / "tasks"),
-            (lattice_dir / "archive" / "events", lattice_dir / "archive" / "tasks"),
-        ]
-
-        for event_dir, target_tasks_dir in event_dirs:
-            if not event_dir.is_dir():
-                continue
-            for jsonl_file in sorted(event_dir.glob("*.jsonl")):
-                if jsonl_file.name == "_lifecycle.jsonl":
-                    continue
-                # Skip resource event files (handled separately)
-                if jsonl_file.stem.startswith("res_"):
-                    continue
+        want_index_rows = (cache_path(lattice_dir, EVENT_INDEX_FILENAME)).exists()
+
+        # Collect task event files from both active and archive directories
+        # (resource logs are handled separately below)
+        layout = project_layout(lattice_dir)
+        replay_jobs: list[tuple[Path, str, Path, Path, bool]] = []
+        job_archived: list[bool] = []
+        for archived in (False, True):
+            for jsonl_file in task_event_files(lattice_dir, archived=archived, layout=layout):
                 tid = jsonl_file.stem
-                try:
-                    snapshot = _rebuild_task(lattice_dir, tid)
-                except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
-                    if is_json:
-                        output_error(str(e), "REBUILD_ERROR", is_json)
-                    else:
-                        click.echo(f"Error rebuilding {tid}: {e}", err=True)
-                    continue
-
-                # Write snapshot to the correct location (active or archive)
-                snapshot_path = target_tasks_dir / f"{tid}.json"
-                locks_dir = lattice_dir / "locks"
-                with multi_lock(locks_dir, [f"tasks_{tid}"]):
-                    atomic_write(snapshot_path, serialize_snapshot(snapshot))
-                rebuilt_ids.append(tid)
+                # Snapshot goes to the correct location (active or archive)
+                snapshot_path = ensure_parent(
+                    task_snapshot_path(lattice_dir, tid, archived=archived, layout=layout)
+                )
+                replay_jobs.append((lattice_dir, tid, jsonl_file, snapshot_path, want_index_rows))
+                job_archived.append(archived)
+
+        workers = jobs or os.cpu_count() or 1
+        results = _run_replay_jobs(replay_jobs, workers)
+        # Packed archived logs are replayed in-process: they are a few
+        # sequential segment reads rather than one file per task
+        packed_results = _replay_packed_logs(
+            lattice_dir, {job[1] for job, archived in zip(replay_jobs, job_archived) if archived}
+        )
+        results += packed_results
+        job_archived += [True] * len(packed_results)
+
+        lifecycle_events: list[dict] = []
+        scanned_logs: dict[Path, tuple[int, list[dict]]] = {}
+        rebuilt_snapshots: dict[bool, list[dict]] = {False: [], True: []}
+        for archived, result in zip(job_archived, results):
+            lifecycle_events.extend(result["lifecycle"])
+            if want_index_rows and result["log_path"] is not None:
+                scanned_logs[result["log_path"]] = (result["log_size"], result["index_rows"])
+            if result["error"] is not None:
+                tid = result["task_id"]
+                if is_json:
+                    output_error(result["error"], "REBUILD_ERROR", is_json)
+                else:
+                    click.echo(f"Error rebuilding {tid}: {result['error']}", err=True)
+                continue
+            rebuilt_snapshots[archived].append(result["snapshot"])
+            rebuilt_ids.append(result["task_id"])
+
+        # Rebuild lifecycle log from the events collected above
+        _write_lifecycle_log(lattice_dir, lifecycle_events)
+
+        # Rebuild ids.json from the rebuilt snapshots, plus any snapshot
+        # without a (replayable) log, exactly as a directory scan would see them
+        all_snapshots: list[dict] = []
+        for archived, rebuilt in rebuilt_snapshots.items():
+            all_snapshots.extend(
+                sorted(
+                    rebuilt
+                    + _load_other_snapshots(lattice_dir, archived, {s["id"] for s in rebuilt}),
+                    key=lambda snap: snap["id"],
+                )
+            )
+        _write_id_index(lattice_dir, all_snapshots)
 
-        # Rebuild lifecycle log
-        _rebuild_lifecycle_log(lattice_dir)
+        # Regenerate the task catalog, graph indexes and ready queue from the
+        # rebuilt snapshots
+        rebuild_catalog(lattice_dir)
+        rebuild_relationship_index(lattice_dir)
+        rebuild_blocking_index(lattice_dir)
+        rebuild_ready_queue(lattice_dir)
 
-        # Rebuild ids.json from snapshots
-        _rebuild_id_index(lattice_dir)
+        # Regenerate the global event index if the project has one
+        if want_index_rows:
+            rebuild_event_index(lattice_dir, scanned=scanned_logs)
 
         # Rebuild resource snapshots
         rebuilt_resources: list[str] = []
-        resource_event_files = _collect_resource_event_files(lattice_dir)
-        for ref in resource_event_files:
+        for ref in _collect_resource_event_files(lattice_dir):
             res_id = ref.stem
             try:
                 from lattice.core.resources import serialize_resource_snapshot
@@ -1043,14 +1431,21 @@ def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
             output_error(str(e), "REBUILD_ERROR", is_json)
 
         # Determine target path (active or archive)
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        archive_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-        if archive_path.exists() and not snapshot_path.exists():
+        snapshot_path = task_snapshot_path(lattice_dir, task_id)
+        archive_path = task_snapshot_path(lattice_dir, task_id, archived=True)
+        is_archived = archive_path.exists() or find_packed(lattice_dir, task_id) is not None
+        if is_archived and not snapshot_path.exists():
             snapshot_path = archive_path
 
         locks_dir = lattice_dir / "locks"
         with multi_lock(locks_dir, [f"tasks_{task_id}"]):
-            atomic_write(snapshot_path, serialize_snapshot(snapshot))
+            atomic_write(ensure_parent(snapshot_path), serialize_snapshot(snapshot))
+            catalog_record(lattice_dir, [snapshot], archived=snapshot_path == archive_path)
+            relationship_index_record(
+                lattice_dir, [snapshot], archived=snapshot_path == archive_path
+            )
+            blocking_index_record(lattice_dir, [snapshot], archived=snapshot_path == archive_path)
+            ready_queue_record(lattice_dir, [snapshot], archived=snapshot_path == archive_path)
 
         if is_json:
             click.echo(
@@ -8,6 +8,7 @@ from lattice.cli.helpers import (
     common_options,
     load_project_config,
     output_error,
+    output_mutation_error,
     output_result,
     read_snapshot_or_exit,
     require_actor,
@@ -17,12 +18,18 @@ from lattice.cli.helpers import (
     write_task_event,
 )
 from lattice.cli.main import cli
-from lattice.core.events import create_event, serialize_event
-from lattice.core.relationships import RELATIONSHIP_TYPES, validate_relationship_type
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
 from lattice.storage.hooks import execute_hooks
+from lattice.storage.layout import task_snapshot_path
 from lattice.storage.locks import multi_lock
+from lattice.storage.mutations import (
+    MutationError,
+    check_not_self_link,
+    check_relationship_type,
+    link_data,
+    unlink_data,
+)
 
 
 def _validate_branch_name(branch: str, is_json: bool) -> None:
@@ -87,27 +94,16 @@ def link(
     task_id = resolve_task_id(lattice_dir, task_id, is_json)
     target_task_id = resolve_task_id(lattice_dir, target_task_id, is_json)
 
-    # Validate relationship type
-    if not validate_relationship_type(rel_type):
-        sorted_types = ", ".join(sorted(RELATIONSHIP_TYPES))
-        output_error(
-            f"Invalid relationship type: '{rel_type}'. Valid types: {sorted_types}.",
-            "VALIDATION_ERROR",
-            is_json,
-        )
-
-    # Reject self-links
-    if task_id == target_task_id:
-        output_error(
-            "Cannot create a relationship from a task to itself.",
-            "VALIDATION_ERROR",
-            is_json,
-        )
+    try:
+        check_relationship_type(rel_type)
+        check_not_self_link(task_id, target_task_id)
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
 
     # Validate both tasks exist
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
     # Check target exists (we don't need the snapshot, just existence)
-    target_path = lattice_dir / "tasks" / f"{target_task_id}.json"
+    target_path = task_snapshot_path(lattice_dir, target_task_id)
     if not target_path.exists():
         output_error(
             f"Target task {target_task_id} not found.",
@@ -115,22 +111,10 @@ def link(
             is_json,
         )
 
-    # Reject duplicates: same type + same target already in relationships_out
-    for rel in snapshot.get("relationships_out", []):
-        if rel["type"] == rel_type and rel["target_task_id"] == target_task_id:
-            output_error(
-                f"Duplicate: {rel_type} relationship to {target_task_id} already exists.",
-                "CONFLICT",
-                is_json,
-            )
-
-    # Build event
-    event_data: dict = {
-        "type": rel_type,
-        "target_task_id": target_task_id,
-    }
-    if note is not None:
-        event_data["note"] = note
+    try:
+        event_data = link_data(snapshot, rel_type, target_task_id, note)
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
 
     event = create_event(
         type="relationship_added",
@@ -192,37 +176,18 @@ def unlink(
     task_id = resolve_task_id(lattice_dir, task_id, is_json)
     target_task_id = resolve_task_id(lattice_dir, target_task_id, is_json)
 
-    # Validate relationship type
-    if not validate_relationship_type(rel_type):
-        sorted_types = ", ".join(sorted(RELATIONSHIP_TYPES))
-        output_error(
-            f"Invalid relationship type: '{rel_type}'. Valid types: {sorted_types}.",
-            "VALIDATION_ERROR",
-            is_json,
-        )
+    try:
+        check_relationship_type(rel_type)
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
 
     # Validate source task exists and load snapshot
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
 
-    # Validate the relationship exists in snapshot's relationships_out
-    found = False
-    for rel in snapshot.get("relationships_out", []):
-        if rel["type"] == rel_type and rel["target_task_id"] == target_task_id:
-            found = True
-            break
-
-    if not found:
-        output_error(
-            f"No {rel_type} relationship to {target_task_id}.",
-            "NOT_FOUND",
-            is_json,
-        )
-
-    # Build event
-    event_data: dict = {
-        "type": rel_type,
-        "target_task_id": target_task_id,
-    }
+    try:
+        event_data = unlink_data(snapshot, rel_type, target_task_id)
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
 
     event = create_event(
         type="relationship_removed",
@@ -326,12 +291,7 @@ def branch_link(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
@@ -429,12 +389,7 @@ def branch_unlink(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
@@ -15,6 +15,7 @@ from lattice.core.config import (
 )
 from lattice.core.ids import generate_instance_id, generate_task_id, validate_actor
 from lattice.storage.fs import LATTICE_DIR, atomic_write, ensure_lattice_dirs
+from lattice.storage.layout import task_snapshot_path
 from lattice.storage.short_ids import _default_index, allocate_short_id, save_id_index
 
 
@@ -230,7 +231,7 @@ def _seed_example_tasks(lattice_dir: Path, config: dict) -> None:
         source_id = task_ids[i]
         target_id = task_ids[i + 1]
 
-        snap_path = lattice_dir / "tasks" / f"{source_id}.json"
+        snap_path = task_snapshot_path(lattice_dir, source_id)
         snapshot = json_mod.loads(snap_path.read_text())
 
         rel_ev = create_event(
@@ -243,7 +244,105 @@ def _seed_example_tasks(lattice_dir: Path, config: dict) -> None:
         write_task_event(lattice_dir, source_id, [rel_ev], snapshot, config)
 
 
-@click.group(invoke_without_command=True)
+# ---------------------------------------------------------------------------
+# Lazy command loading
+# ---------------------------------------------------------------------------
+
+# Command name -> module that registers it.  Modules are imported on first
+# use, so a single `lattice <cmd>` only pays for the module it runs.
+_LAZY_COMMANDS: dict[str, str] = {
+    "archive": "lattice.cli.archive_cmds",
+    "archive-pack": "lattice.cli.archive_cmds",
+    "assign": "lattice.cli.task_cmds",
+    "attach": "lattice.cli.artifact_cmds",
+    "backfill-ids": "lattice.cli.migration_cmds",
+    "batch": "lattice.cli.batch_cmds",
+    "branch-link": "lattice.cli.link_cmds",
+    "branch-unlink": "lattice.cli.link_cmds",
+    "comment": "lattice.cli.task_cmds",
+    "comment-delete": "lattice.cli.task_cmds",
+    "comment-edit": "lattice.cli.task_cmds",
+    "comments": "lattice.cli.query_cmds",
+    "complete": "lattice.cli.task_cmds",
+    "create": "lattice.cli.task_cmds",
+    "daemon": "lattice.cli.daemon_cmds",
+    "dashboard": "lattice.cli.dashboard_cmd",
+    "demo": "lattice.cli.demo_cmd",
+    "doctor": "lattice.cli.integrity_cmds",
+    "event": "lattice.cli.query_cmds",
+    "graph": "lattice.cli.graph_cmds",
+    "hooks": "lattice.cli.hook_cmds",
+    "link": "lattice.cli.link_cmds",
+    "list": "lattice.cli.query_cmds",
+    "migrate-layout": "lattice.cli.migration_cmds",
+    "next": "lattice.cli.query_cmds",
+    "plan": "lattice.cli.query_cmds",
+    "react": "lattice.cli.task_cmds",
+    "rebuild": "lattice.cli.integrity_cmds",
+    "resource": "lattice.cli.resource_cmds",
+    "restart": "lattice.cli.dashboard_cmd",
+    "session": "lattice.cli.session_cmds",
+    "show": "lattice.cli.query_cmds",
+    "stats": "lattice.cli.stats_cmds",
+    "status": "lattice.cli.task_cmds",
+    "unarchive": "lattice.cli.archive_cmds",
+    "unlink": "lattice.cli.link_cmds",
+    "unreact": "lattice.cli.task_cmds",
+    "update": "lattice.cli.task_cmds",
+    "weather": "lattice.cli.weather_cmds",
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports command modules only when they are needed.
+
+    A lazily mapped command is resolved by importing its module, which
+    registers it on this group as a side effect.  CLI plugins are loaded the
+    first time a name is not found among the built-ins, or when the full
+    command list is requested (``--help``, shell completion).
+    """
+
+    def __init__(self, *args, lazy_commands: dict[str, str] | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+        self._plugins_loaded = False
+        # Names registered by CLI plugins rather than by lattice itself
+        self.plugin_commands: frozenset[str] = frozenset()
+
+    def _load_plugins(self) -> None:
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        from lattice.plugins import load_cli_plugins
+
+        before = set(self.commands)
+        load_cli_plugins(self)
+        self.plugin_commands = frozenset(set(self.commands) - before - set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context | None, cmd_name: str) -> click.Command | None:
+        command = self.commands.get(cmd_name)
+        if command is not None:
+            return command
+        module = self.lazy_commands.get(cmd_name)
+        if module is not None:
+            # __import__ (unlike importlib.import_module) goes through the
+            # import statement's machinery, so it shows in -X importtime.
+            __import__(module)
+        else:
+            self._load_plugins()
+        return self.commands.get(cmd_name)
+
+    def list_commands(self, ctx: click.Context | None) -> list[str]:
+        self._load_plugins()
+        return sorted(set(self.commands) | set(self.lazy_commands))
+
+    def load_all(self) -> None:
+        """Import every lazily mapped command module and load plugins."""
+        for name in self.list_commands(None):
+            self.get_command(None, name)
+
+
+@click.group(cls=LazyGroup, invoke_without_command=True, lazy_commands=_LAZY_COMMANDS)
 @click.version_option(package_name="lattice-tracker")
 @click.pass_context
 def cli(ctx: click.Context) -> None:
@@ -1359,13 +1458,16 @@ def plugins_cmd(as_json: bool) -> None:
 
     from lattice.plugins import (
         CLI_PLUGIN_GROUP,
+        HOOK_PLUGIN_GROUP,
         TEMPLATE_BLOCK_GROUP,
         discover_cli_plugins,
+        discover_hook_plugins,
         discover_template_blocks,
     )
 
     cli_plugins = discover_cli_plugins()
     template_blocks = discover_template_blocks()
+    hook_plugins = discover_hook_plugins()
 
     if as_json:
         data = {
@@ -1374,14 +1476,16 @@ def plugins_cmd(as_json: bool) -> None:
                 {"marker": b["marker"], "position": b.get("position", "after_base")}
                 for b in template_blocks
             ],
+            "hooks": [{"name": ep.name, "value": ep.value} for ep in hook_plugins],
         }
         click.echo(json_mod.dumps({"ok": True, "data": data}, sort_keys=True, indent=2))
         return
 
-    if not cli_plugins and not template_blocks:
+    if not cli_plugins and not template_blocks and not hook_plugins:
         click.echo("No plugins installed.")
         click.echo(f"  CLI plugins group: {CLI_PLUGIN_GROUP}")
         click.echo(f"  Template blocks group: {TEMPLATE_BLOCK_GROUP}")
+        click.echo(f"  Hook handlers group: {HOOK_PLUGIN_GROUP}")
         return
 
     if cli_plugins:
@@ -1389,35 +1493,20 @@ def plugins_cmd(as_json: bool) -> None:
         for ep in cli_plugins:
             click.echo(f"  {ep.name} -> {ep.value}")
 
+    if hook_plugins:
+        click.echo('Hook handlers (use as "py:<name>" in hooks config):')
+        for ep in hook_plugins:
+            click.echo(f"  {ep.name} -> {ep.value}")
+
     if template_blocks:
         click.echo("Template blocks:")
         for block in template_blocks:
             click.echo(f"  {block['marker']} (position: {block.get('position', 'after_base')})")
 
 
-# ---------------------------------------------------------------------------
-# Register command modules (must be after cli group is defined)
-# ---------------------------------------------------------------------------
-from lattice.cli import migration_cmds as _migration_cmds  # noqa: E402, F401
-from lattice.cli import task_cmds as _task_cmds  # noqa: E402, F401
-from lattice.cli import link_cmds as _link_cmds  # noqa: E402, F401
-from lattice.cli import artifact_cmds as _artifact_cmds  # noqa: E402, F401
-from lattice.cli import query_cmds as _query_cmds  # noqa: E402, F401
-from lattice.cli import integrity_cmds as _integrity_cmds  # noqa: E402, F401
-from lattice.cli import archive_cmds as _archive_cmds  # noqa: E402, F401
-from lattice.cli import dashboard_cmd as _dashboard_cmd  # noqa: E402, F401
-from lattice.cli import stats_cmds as _stats_cmds  # noqa: E402, F401
-from lattice.cli import weather_cmds as _weather_cmds  # noqa: E402, F401
-from lattice.cli import resource_cmds as _resource_cmds  # noqa: E402, F401
-from lattice.cli import demo_cmd as _demo_cmd  # noqa: E402, F401
-from lattice.cli import session_cmds as _session_cmds  # noqa: E402, F401
-
-# ---------------------------------------------------------------------------
-# Load CLI plugins (must be after all built-in commands are registered)
-# ---------------------------------------------------------------------------
-from lattice.plugins import load_cli_plugins as _load_cli_plugins  # noqa: E402
-
-_load_cli_plugins(cli)
-
 if __name__ == "__main__":
-    cli()
+    # Run the importable module's group: command modules register on
+    # ``lattice.cli.main.cli``, not on this ``__main__`` copy.
+    from lattice.cli.main import cli as _cli
+
+    _cli()
@@ -1,23 +1,43 @@
-"""Migration commands: backfill-ids."""
+"""Migration commands: backfill-ids, migrate-layout."""
 
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import click
 
 from lattice.cli.helpers import (
+    json_envelope,
     load_project_config,
     output_error,
     require_root,
 )
 from lattice.cli.main import cli
-from lattice.core.config import serialize_config, validate_project_code
+from lattice.core.config import (
+    DEFAULT_LAYOUT,
+    LAYOUTS,
+    get_layout,
+    serialize_config,
+    validate_project_code,
+)
 from lattice.core.events import create_event
 from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.storage.catalog import catalog_record, rebuild_catalog
+from lattice.storage.fs import atomic_write
+from lattice.storage.layout import (
+    SHARD_WIDTH,
+    ensure_parent,
+    events_dir,
+    task_event_files,
+    task_event_path,
+    task_snapshot_files,
+    task_snapshot_path,
+    tasks_dir,
+)
 from lattice.storage.locks import multi_lock
+from lattice.storage.operations import append_events
 from lattice.storage.short_ids import load_id_index, register_short_id, save_id_index
 
 
@@ -28,13 +48,8 @@ def _collect_tasks_missing_short_id(lattice_dir: Path) -> list[dict]:
     """
     tasks: list[tuple[str, dict, bool]] = []
 
-    for directory, is_archived in [
-        (lattice_dir / "tasks", False),
-        (lattice_dir / "archive" / "tasks", True),
-    ]:
-        if not directory.is_dir():
-            continue
-        for snap_file in directory.glob("*.json"):
+    for is_archived in (False, True):
+        for snap_file in task_snapshot_files(lattice_dir, archived=is_archived):
             try:
                 snap = json.loads(snap_file.read_text())
             except (json.JSONDecodeError, OSError):
@@ -127,8 +142,6 @@ def backfill_ids(
         index["next_seqs"] = next_seqs
 
         # Emit task_short_id_assigned event
-        from lattice.core.events import serialize_event
-
         event = create_event(
             type="task_short_id_assigned",
             task_id=task_ulid,
@@ -141,17 +154,18 @@ def backfill_ids(
 
         # Determine paths
         if is_archived:
-            event_path = lattice_dir / "archive" / "events" / f"{task_ulid}.jsonl"
-            snap_path = lattice_dir / "archive" / "tasks" / f"{task_ulid}.json"
+            event_path = task_event_path(lattice_dir, task_ulid, archived=True)
+            snap_path = task_snapshot_path(lattice_dir, task_ulid, archived=True)
         else:
-            event_path = lattice_dir / "events" / f"{task_ulid}.jsonl"
-            snap_path = lattice_dir / "tasks" / f"{task_ulid}.json"
+            event_path = task_event_path(lattice_dir, task_ulid)
+            snap_path = task_snapshot_path(lattice_dir, task_ulid)
 
         # Write event and snapshot under lock
         locks_dir = lattice_dir / "locks"
         with multi_lock(locks_dir, sorted([f"events_{task_ulid}", f"tasks_{task_ulid}"])):
-            jsonl_append(event_path, serialize_event(event))
+            append_events(lattice_dir, task_ulid, event_path, [event])
             atomic_write(snap_path, serialize_snapshot(updated_snap))
+            catalog_record(lattice_dir, [updated_snap], archived=is_archived)
 
         # Register in index
         register_short_id(index, short_id, task_ulid)
@@ -182,3 +196,93 @@ def backfill_ids(
         )
     else:
         click.echo(f"Assigned {first_id} through {last_id} to {count} existing tasks.")
+
+
+def _layout_moves(lattice_dir: Path, target: str) -> list[tuple[Path, Path]]:
+    """Return (source, destination) pairs for every task file not yet in *target*.
+
+    Files are looked up under the *other* layout, so a migration interrupted
+    part-way can simply be run again.
+    """
+    source = "flat" if target == "sharded" else "sharded"
+    moves: list[tuple[Path, Path]] = []
+    for archived in (False, True):
+        for f in task_snapshot_files(lattice_dir, archived=archived, layout=source):
+            dest = task_snapshot_path(lattice_dir, f.stem, archived=archived, layout=target)
+            moves.append((f, dest))
+        for f in task_event_files(lattice_dir, archived=archived, layout=source):
+            dest = task_event_path(lattice_dir, f.stem, archived=archived, layout=target)
+            moves.append((f, dest))
+    return moves
+
+
+def _prune_shard_dirs(lattice_dir: Path) -> None:
+    """Remove shard directories left empty by a migration to the flat layout."""
+    for archived in (False, True):
+        for base in (
+            tasks_dir(lattice_dir, archived=archived),
+            events_dir(lattice_dir, archived=archived),
+        ):
+            if not base.is_dir():
+                continue
+            for entry in base.iterdir():
+                if entry.is_dir() and len(entry.name) == SHARD_WIDTH:
+                    try:
+                        entry.rmdir()
+                    except OSError:
+                        continue  # not empty
+
+
+@cli.command("migrate-layout")
+@click.option(
+    "--to",
+    "target",
+    type=click.Choice(LAYOUTS),
+    required=True,
+    help="Layout to convert the project to.",
+)
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def migrate_layout(target: str, output_json: bool) -> None:
+    """Move task snapshots and event logs into the flat or sharded layout.
+
+    Converts in place and records the new layout in config.json.  Run it
+    while nothing else is writing to the project.
+    """
+    is_json = output_json
+    lattice_dir = require_root(is_json)
+    config = load_project_config(lattice_dir)
+    previous = get_layout(config)
+
+    moves = _layout_moves(lattice_dir, target)
+    conflicts = [dest for _, dest in moves if dest.exists()]
+    if conflicts:
+        output_error(
+            f"{len(conflicts)} file(s) already exist in the {target} layout "
+            f"(first: {conflicts[0].relative_to(lattice_dir)}). Resolve them and retry.",
+            "CONFLICT",
+            is_json,
+        )
+
+    for src, dest in moves:
+        os.replace(src, ensure_parent(dest))
+    if target == "flat":
+        _prune_shard_dirs(lattice_dir)
+
+    if config.get("layout", DEFAULT_LAYOUT) != target:
+        config["layout"] = target
+        atomic_write(lattice_dir / "config.json", serialize_config(config))
+
+    # The catalog's freshness signature depends on the layout
+    rebuild_catalog(lattice_dir)
+
+    if is_json:
+        click.echo(
+            json_envelope(
+                True,
+                data={"layout": target, "previous_layout": previous, "moved": len(moves)},
+            )
+        )
+    elif not moves and previous == target:
+        click.echo(f"Already using the {target} layout.")
+    else:
+        click.echo(f"Moved {len(moves)} files to the {target} layout.")
@@ -15,6 +15,7 @@ from lattice.cli.helpers import (
     load_project_config,
     output_error,
     output_result,
+    plan_gate_error,
     read_snapshot,
     read_snapshot_or_exit,
     require_actor,
@@ -33,15 +34,25 @@ from lattice.core.events import (
     validate_custom_event_type,
 )
 from lattice.core.ids import extract_short_ids, validate_id
-from lattice.core.next import compute_claim_transitions, select_next
-from lattice.core.stats import load_all_snapshots
 from lattice.core.tasks import (
     apply_event_to_snapshot,
     compact_snapshot,
     is_backward_status_transition,
+    is_scaffold_plan,
 )
-from lattice.storage.locks import multi_lock
-from lattice.storage.readers import read_task_events
+from lattice.storage.blocking_index import blocked_task_ids
+from lattice.storage.catalog import load_snapshots
+from lattice.storage.layout import task_event_path
+from lattice.storage.operations import claim_tasks
+from lattice.storage.readers import (
+    iter_task_events_reverse,
+    read_archived_doc,
+    read_archived_snapshot,
+    read_task_events,
+    read_task_events_tail,
+)
+from lattice.storage.ready_queue import queue_select_batch, queue_select_next
+from lattice.storage.relationship_index import incoming_relationships
 
 
 # ---------------------------------------------------------------------------
@@ -69,12 +80,10 @@ def comments_cmd(
     snapshot = read_snapshot(lattice_dir, task_id)
     if snapshot is None:
         # Check archive
-        archive_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-        if archive_path.exists():
-            try:
-                snapshot = json.loads(archive_path.read_text())
-            except (json.JSONDecodeError, OSError):
-                pass
+        try:
+            snapshot = read_archived_snapshot(lattice_dir, task_id)
+        except (json.JSONDecodeError, OSError):
+            pass
 
     # Try active first, then archive
     events = read_task_events(lattice_dir, task_id, is_archived=False)
@@ -230,7 +239,7 @@ def event_cmd(
             )
 
         # Idempotency check: scan event log for matching ID
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
+        event_path = task_event_path(lattice_dir, task_id)
         if event_path.exists():
             for line in event_path.read_text().splitlines():
                 line = line.strip()
@@ -335,29 +344,11 @@ def list_cmd(
         valid = ", ".join(config.get("workflow", {}).get("statuses", []))
         status_warning = f"'{status}' is not a configured status. Valid statuses: {valid}."
 
-    # Scan all .json files in tasks/ directory
-    tasks_dir = lattice_dir / "tasks"
-    snapshots: list[dict] = []
-
-    if tasks_dir.is_dir():
-        for task_file in sorted(tasks_dir.glob("*.json")):
-            try:
-                snap = json.loads(task_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            snapshots.append(snap)
-
-    # Include archived tasks if requested
-    if include_archived:
-        archive_dir = lattice_dir / "archive" / "tasks"
-        if archive_dir.is_dir():
-            for task_file in sorted(archive_dir.glob("*.json")):
-                try:
-                    snap = json.loads(task_file.read_text())
-                except (json.JSONDecodeError, OSError):
-                    continue
-                snap["_archived"] = True
-                snapshots.append(snap)
+    # Active snapshots (plus archived if requested) from the task catalog
+    active, archived = load_snapshots(lattice_dir, include_archived=include_archived)
+    snapshots: list[dict] = list(active)
+    for snap in archived:
+        snapshots.append({**snap, "_archived": True})
 
     # Apply filters (AND combination)
     filtered: list[dict] = []
@@ -455,19 +446,38 @@ def list_cmd(
     help="Comma-separated statuses to consider (default: backlog,planned).",
 )
 @click.option("--claim", is_flag=True, help="Atomically assign + move to in_progress.")
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    default=None,
+    help="With --claim: claim up to N tasks in one pass.",
+)
+@click.option(
+    "--worker",
+    "workers",
+    multiple=True,
+    help="With --claim: assign claimed tasks to this actor (repeatable, one task each).",
+)
 @click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
 @click.option("--quiet", is_flag=True, help="Print only the task ID.")
 def next_cmd(
     status_csv: str | None,
     claim: bool,
+    count: int | None,
+    workers: tuple[str, ...],
     output_json: bool,
     quiet: bool,
 ) -> None:
     """Pick the highest-priority task to work on next.
 
-    Returns the top task from the ready pool (backlog/planned by default).
+    Returns the top task from the ready pool (backlog/planned by default),
+    skipping tasks that still wait on an open blocks/depends_on prerequisite.
     If --actor/--name is specified, resumes in-progress work first.
     Use --claim to atomically assign and start the task.
+
+    Batch mode (--claim with --count and/or --worker) claims several tasks
+    under one lock pass: one per --worker, or --count tasks for the actor.
+    Tasks another agent claimed in the meantime are skipped, not fatal.
     """
     is_json = output_json
 
@@ -488,11 +498,36 @@ def next_cmd(
     if status_csv is not None:
         ready_statuses = frozenset(s.strip() for s in status_csv.split(",") if s.strip())
 
-    # Load all active snapshots
-    active, _archived = load_all_snapshots(lattice_dir)
+    if count is not None or workers:
+        if not claim:
+            output_error("--count and --worker require --claim.", "VALIDATION_ERROR", is_json)
+        for worker in workers:
+            validate_actor_format_or_exit(worker, is_json)
+        if not workers:
+            claimants: list[str | dict] = [resolved_actor] * count
+        elif count is None or len(workers) == count:
+            claimants = list(workers)
+        elif len(workers) == 1:
+            claimants = list(workers) * count
+        else:
+            output_error(
+                f"--count {count} does not match the {len(workers)} --worker values.",
+                "VALIDATION_ERROR",
+                is_json,
+            )
+        _batch_claim(
+            lattice_dir, config, resolved_actor, claimants, ready_statuses, is_json, quiet
+        )
+        return
 
-    # Select next task
-    selected = select_next(active, actor=resolved_actor, ready_statuses=ready_statuses)
+    # Select next task from the ready queue, skipping tasks whose
+    # prerequisites are still open
+    selected = queue_select_next(
+        lattice_dir,
+        actor=resolved_actor,
+        ready_statuses=ready_statuses,
+        blocked=blocked_task_ids(lattice_dir),
+    )
 
     if selected is None:
         if is_json:
@@ -511,97 +546,13 @@ def next_cmd(
         # Planning gate: block if plan is still scaffold
         check_plan_gate(lattice_dir, task_id, "in_progress", is_json)
 
-        locks_dir = lattice_dir / "locks"
-        lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}"])
-
-        with multi_lock(locks_dir, lock_keys):
-            # Re-read snapshot under lock to prevent TOCTOU race
-            snapshot = read_snapshot(lattice_dir, task_id)
-            if snapshot is None:
-                output_error(f"Task {task_id} not found.", "NOT_FOUND", is_json)
-
-            # Concurrent claim guard: reject if another agent claimed
-            # this task between our select_next() and lock acquisition.
-            from lattice.core.next import _actors_match
-
-            current_assigned = snapshot.get("assigned_to")
-            current_status = snapshot.get("status", "")
-            if current_assigned is not None and not _actors_match(
-                current_assigned, resolved_actor
-            ):
-                owner = get_actor_display(current_assigned)
-                output_error(
-                    f"Task already claimed by {owner}.",
-                    "ALREADY_CLAIMED",
-                    is_json,
-                )
-            if current_status in ("in_progress", "review", "done", "cancelled"):
-                if not _actors_match(current_assigned, resolved_actor):
-                    output_error(
-                        f"Task already in {current_status}.",
-                        "ALREADY_CLAIMED",
-                        is_json,
-                    )
-
-            events = []
-
-            # Assignment event (if not already assigned to this actor)
-            if not _actors_match(current_assigned, resolved_actor):
-                assign_event = create_event(
-                    type="assignment_changed",
-                    task_id=task_id,
-                    actor=resolved_actor,
-                    data={"from": current_assigned, "to": resolved_actor},
-                )
-                events.append(assign_event)
-                snapshot = apply_event_to_snapshot(snapshot, assign_event)
-
-            # Status transitions — compute valid path to in_progress
-            current_status = snapshot.get("status")
-            if current_status != "in_progress":
-                transitions = config.get("workflow", {}).get("transitions", {})
-                path = compute_claim_transitions(current_status, "in_progress", transitions)
-                if path is None:
-                    output_error(
-                        f"No valid transition path from {current_status} to in_progress.",
-                        "INVALID_TRANSITION",
-                        is_json,
-                    )
-                # Emit a status_changed event for each step in the path
-                prev_status = current_status
-                for next_status in path:
-                    status_event = create_event(
-                        type="status_changed",
-                        task_id=task_id,
-                        actor=resolved_actor,
-                        data={"from": prev_status, "to": next_status},
-                    )
-                    events.append(status_event)
-                    snapshot = apply_event_to_snapshot(snapshot, status_event)
-                    prev_status = next_status
-
-            if events:
-                # Write directly under the already-held lock (bypass write_task_event
-                # which would try to acquire its own locks)
-                from lattice.core.events import serialize_event
-                from lattice.core.tasks import serialize_snapshot
-                from lattice.storage.fs import atomic_write, jsonl_append
-
-                event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-                for event in events:
-                    jsonl_append(event_path, serialize_event(event))
-
-                snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-                atomic_write(snapshot_path, serialize_snapshot(snapshot))
-
-            selected = snapshot
-
-        # Fire hooks after lock release
-        if events and config:
-            from lattice.storage.hooks import execute_hooks
-
-            for event in events:
-                execute_hooks(config, lattice_dir, task_id, event)
+        # The same locked re-check and transition path as batch claims
+        claimed, skipped = claim_tasks(
+            lattice_dir, [(task_id, resolved_actor)], resolved_actor, config
+        )
+        if skipped:
+            output_error(skipped[0]["message"], skipped[0]["code"], is_json)
+        selected = claimed[0]
 
     display_id = selected.get("short_id") or task_id
     result_data = selected
@@ -620,6 +571,56 @@ def next_cmd(
     )
 
 
+def _batch_claim(
+    lattice_dir: Path,
+    config: dict,
+    actor: str | dict,
+    claimants: list[str | dict],
+    ready_statuses: frozenset[str] | None,
+    is_json: bool,
+    quiet: bool,
+) -> None:
+    """Claim one ready task per claimant for ``next --claim --count/--worker``."""
+    pairs = queue_select_batch(
+        lattice_dir,
+        claimants,
+        ready_statuses=ready_statuses,
+        blocked=blocked_task_ids(lattice_dir),
+    )
+    # Planning gate for every selected task before any lock is taken; a task
+    # that fails it is reported with the contended ones, the rest are claimed
+    claims: list[tuple[str, str | dict]] = []
+    gated: list[dict] = []
+    for claimant, snap in pairs:
+        message = plan_gate_error(lattice_dir, snap["id"])
+        if message is None:
+            claims.append((snap["id"], claimant))
+        else:
+            gated.append({"task_id": snap["id"], "code": "PLAN_REQUIRED", "message": message})
+
+    claimed, skipped = claim_tasks(lattice_dir, claims, actor, config)
+    skipped = gated + skipped
+
+    if is_json:
+        click.echo(json_envelope(True, data={"claimed": claimed, "skipped": skipped}))
+        return
+    for snap in claimed:
+        display_id = snap.get("short_id") or snap["id"]
+        if quiet:
+            click.echo(display_id)
+        else:
+            assignee = get_actor_display(snap.get("assigned_to"))
+            click.echo(
+                f"{display_id}  {snap.get('status', '?')}  {snap.get('priority', '?')}  "
+                f'"{snap.get("title", "?")}"  {assignee}'
+            )
+    if not quiet:
+        for entry in skipped:
+            click.echo(f"Skipped {entry['task_id']}: {entry['message']}", err=True)
+        if not claimed:
+            click.echo("No tasks available.")
+
+
 def _read_plan_content_for_next(lattice_dir: Path, task_id: str) -> str | None:
     """Return plan markdown for *task_id* if present and non-scaffold; else None."""
     plan_path = lattice_dir / "plans" / f"{task_id}.md"
@@ -639,8 +640,6 @@ def _read_plan_content_for_next(lattice_dir: Path, task_id: str) -> str | None:
 
 def _is_scaffold_plan_content(content: str) -> bool:
     """Return True when plan content still matches the default scaffold placeholders."""
-    from lattice.cli.helpers import is_scaffold_plan
-
     return is_scaffold_plan(content)
 
 
@@ -648,6 +647,9 @@ def _is_scaffold_plan_content(content: str) -> bool:
 # lattice show
 # ---------------------------------------------------------------------------
 
+# Events listed by human-readable ``show`` (``--full`` lists all of them).
+_SHOW_RECENT_EVENTS = 20
+
 
 @cli.command("show")
 @click.argument("task_id")
@@ -673,13 +675,11 @@ def show_cmd(
 
     if snapshot is None:
         # Check archive
-        archive_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-        if archive_path.exists():
-            try:
-                snapshot = json.loads(archive_path.read_text())
-                is_archived = True
-            except (json.JSONDecodeError, OSError):
-                pass
+        try:
+            snapshot = read_archived_snapshot(lattice_dir, task_id)
+            is_archived = snapshot is not None
+        except (json.JSONDecodeError, OSError):
+            pass
 
     if snapshot is None:
         output_error(f"Task {task_id} not found.", "NOT_FOUND", is_json)
@@ -701,10 +701,23 @@ def show_cmd(
             _print_compact_show(snapshot, is_archived, valid_transitions)
         return
 
-    # Read event log
-    events = _read_events(lattice_dir, task_id, is_archived)
+    # Read event log.  JSON and --full output carry the whole history; the
+    # human summary lists only the latest events, read from the end of the log.
+    # Legacy snapshots without reopened_count need the full log to derive it.
+    events_truncated = False
+    if is_json or full or "reopened_count" not in snapshot:
+        events = _read_events(lattice_dir, task_id, is_archived)
+    else:
+        events = read_task_events_tail(
+            lattice_dir, task_id, _SHOW_RECENT_EVENTS + 1, is_archived=is_archived
+        )
+        if len(events) > _SHOW_RECENT_EVENTS:
+            events_truncated = True
+            events = events[-_SHOW_RECENT_EVENTS:]
     status_rank = _status_rank_from_config(config)
     backward_count, latest_reopen = _scan_backward_status_transitions(events, status_rank)
+    if events_truncated and latest_reopen is None and snapshot.get("reopened_count"):
+        latest_reopen = _find_latest_reopen(lattice_dir, task_id, is_archived, status_rank)
     reopened_count = snapshot.get("reopened_count", 0)
     if not isinstance(reopened_count, int):
         reopened_count = 0
@@ -721,19 +734,17 @@ def show_cmd(
 
     # Check for notes and plan files
     if is_archived:
-        notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
-        plan_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
+        has_notes = read_archived_doc(lattice_dir, task_id, "notes") is not None
+        has_plan = read_archived_doc(lattice_dir, task_id, "plan") is not None
     else:
-        notes_path = lattice_dir / "notes" / f"{task_id}.md"
-        plan_path = lattice_dir / "plans" / f"{task_id}.md"
-    has_notes = notes_path.exists()
-    has_plan = plan_path.exists()
+        has_notes = (lattice_dir / "notes" / f"{task_id}.md").exists()
+        has_plan = (lattice_dir / "plans" / f"{task_id}.md").exists()
 
     # Read outgoing relationship target titles (best effort)
     relationships_out = _enrich_relationships(lattice_dir, snapshot)
 
-    # Derive incoming relationships by scanning all task snapshots
-    relationships_in = _find_incoming_relationships(lattice_dir, task_id)
+    # Incoming relationships come from the reverse relationship index
+    relationships_in = incoming_relationships(lattice_dir, task_id)
 
     # Read artifact metadata (best effort)
     artifact_info = _read_artifact_info(lattice_dir, snapshot)
@@ -785,6 +796,7 @@ def show_cmd(
             auto_commits,
             config=config,
             reopened_warning=reopened_warning,
+            events_truncated=events_truncated,
         )
 
 
@@ -872,50 +884,22 @@ def _auto_detect_branch_links(
 
 
 def _auto_detect_commits(short_id: str | None, lattice_dir: Path) -> list[dict[str, str]]:
-    """Find commits whose message contains *short_id*.
+    """Find commits whose message references *short_id*.
 
-    Uses ``git log --grep=<short_id>`` and returns commit summaries in reverse
-    chronological order. Returns an empty list when git is unavailable, the
-    directory is not in a git repo, or any git error occurs.
+    Served from the commit index (``.lattice/cache/commit_index.json``), which walks
+    only commits added since its last refresh.  Returns commit summaries in
+    reverse chronological order, or an empty list when git is unavailable,
+    the directory is not in a git repo, or any git error occurs.
     """
-    import shutil
-    import subprocess
-
-    if not short_id or not shutil.which("git"):
-        return []
-
-    repo_root = lattice_dir.parent
-    fmt = "%h%x1f%ad%x1f%s"
-
-    try:
-        result = subprocess.run(
-            [
-                "git",
-                "log",
-                f"--grep={short_id}",
-                "--fixed-strings",
-                "--regexp-ignore-case",
-                "--date=short",
-                f"--pretty=format:{fmt}",
-            ],
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-    except (subprocess.TimeoutExpired, OSError):
+    if not short_id:
         return []
 
-    if result.returncode != 0:
-        return []
+    from lattice.dashboard.commit_index import task_commits
 
-    commits: list[dict[str, str]] = []
-    for line in result.stdout.splitlines():
-        sha, date, subject = (line.split("\x1f", 2) + ["", "", ""])[:3]
-        if not sha:
-            continue
-        commits.append({"sha": sha, "date": date, "subject": subject})
-    return commits
+    return [
+        {"sha": c["short_hash"], "date": c["date"][:10], "subject": c["subject"]}
+        for c in task_commits(lattice_dir, lattice_dir.parent, [short_id])
+    ]
 
 
 def _read_events(lattice_dir: Path, task_id: str, is_archived: bool) -> list[dict]:
@@ -923,6 +907,17 @@ def _read_events(lattice_dir: Path, task_id: str, is_archived: bool) -> list[dic
     return read_task_events(lattice_dir, task_id, is_archived=is_archived)
 
 
+def _find_latest_reopen(
+    lattice_dir: Path, task_id: str, is_archived: bool, status_rank: dict[str, int]
+) -> dict | None:
+    """Find the most recent backward status transition, scanning newest-first."""
+    for event in iter_task_events_reverse(lattice_dir, task_id, is_archived=is_archived):
+        _count, latest = _scan_backward_status_transitions([event], status_rank)
+        if latest is not None:
+            return latest
+    return None
+
+
 def _status_rank_from_config(config: dict) -> dict[str, int]:
     """Return ``{status: rank}`` using configured workflow order."""
     statuses = config.get("workflow", {}).get("statuses", [])
@@ -972,50 +967,16 @@ def _enrich_relationships(lattice_dir: Path, snapshot: dict) -> list[dict]:
         target_snap = read_snapshot(lattice_dir, target_id)
         if target_snap is None:
             # Check archive
-            archive_path = lattice_dir / "archive" / "tasks" / f"{target_id}.json"
-            if archive_path.exists():
-                try:
-                    target_snap = json.loads(archive_path.read_text())
-                except (json.JSONDecodeError, OSError):
-                    pass
+            try:
+                target_snap = read_archived_snapshot(lattice_dir, target_id)
+            except (json.JSONDecodeError, OSError):
+                pass
         if target_snap is not None:
             enriched["target_title"] = target_snap.get("title")
         relationships.append(enriched)
     return relationships
 
 
-def _find_incoming_relationships(lattice_dir: Path, task_id: str) -> list[dict]:
-    """Find all tasks that have outgoing relationships pointing at *task_id*.
-
-    Scans active and archived snapshots. Returns a list of dicts with
-    ``source_task_id``, ``source_title``, ``type``, and ``note``.
-    """
-    incoming: list[dict] = []
-
-    for directory in [lattice_dir / "tasks", lattice_dir / "archive" / "tasks"]:
-        if not directory.is_dir():
-            continue
-        for snap_file in directory.glob("*.json"):
-            if snap_file.stem == task_id:
-                continue  # skip self
-            try:
-                snap = json.loads(snap_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            for rel in snap.get("relationships_out", []):
-                if rel.get("target_task_id") == task_id:
-                    incoming.append(
-                        {
-                            "source_task_id": snap.get("id", snap_file.stem),
-                            "source_title": snap.get("title"),
-                            "type": rel.get("type"),
-                            "note": rel.get("note"),
-                        }
-                    )
-
-    return incoming
-
-
 def _read_artifact_info(lattice_dir: Path, snapshot: dict) -> list[dict]:
     """Read artifact metadata for each artifact evidence ref (best effort).
 
@@ -1096,6 +1057,7 @@ def _print_human_show(
     auto_detected_commits: list[dict[str, str]] | None = None,
     config: dict | None = None,
     reopened_warning: str | None = None,
+    events_truncated: bool = False,
 ) -> None:
     """Print full human-readable show output."""
     from lattice.core.config import get_display_name
@@ -1232,7 +1194,10 @@ def _print_human_show(
 
     if events:
         click.echo("")
-        click.echo("Events (latest first):")
+        if events_truncated:
+            click.echo(f"Events (latest {len(events)}, newest first; use --full for all):")
+        else:
+            click.echo("Events (latest first):")
         # Show events in reverse chronological order
         for ev in reversed(events):
             ts = ev.get("ts", "?")
@@ -1329,23 +1294,28 @@ def plan(task_id: str, output_json: bool) -> None:
     lattice_dir = require_root(is_json)
     task_id = resolve_task_id(lattice_dir, task_id, is_json)
 
-    # Check active then archive
-    plan_path = lattice_dir / "plans" / f"{task_id}.md"
+    # Check active then archive (loose or packed)
+    plan_path: Path | None = lattice_dir / "plans" / f"{task_id}.md"
     is_archived = False
     if not plan_path.is_file():
         plan_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
         is_archived = True
-    if not plan_path.is_file():
-        output_error(f"No plan file found for task {task_id}.", "NOT_FOUND", is_json)
+    if plan_path.is_file():
+        content = plan_path.read_text(encoding="utf-8")
+    else:
+        content = read_archived_doc(lattice_dir, task_id, "plan")
+        plan_path = None  # packed: no file of its own
+        if content is None:
+            output_error(f"No plan file found for task {task_id}.", "NOT_FOUND", is_json)
 
     if is_json:
         data = {
             "task_id": task_id,
-            "plan_path": str(plan_path),
+            "plan_path": str(plan_path) if plan_path is not None else None,
             "archived": is_archived,
-            "content": plan_path.read_text(encoding="utf-8"),
+            "content": content,
         }
         click.echo(json_envelope(True, data=data))
     else:
         # Print content to stdout
-        click.echo(plan_path.read_text(encoding="utf-8"))
+        click.echo(content)
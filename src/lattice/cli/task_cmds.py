@@ -7,10 +7,10 @@ import json
 import click
 
 from lattice.cli.helpers import (
-    check_plan_gate,
     common_options,
     load_project_config,
     output_error,
+    output_mutation_error,
     output_result,
     read_snapshot_or_exit,
     require_root,
@@ -19,6 +19,7 @@ from lattice.cli.helpers import (
     validate_actor_format_or_exit,
     write_task_event,
 )
+from lattice.storage.layout import task_snapshot_path
 from lattice.storage.operations import scaffold_plan
 from lattice.cli.main import cli
 from lattice.core.comments import (
@@ -27,45 +28,27 @@ from lattice.core.comments import (
     validate_comment_for_delete,
     validate_comment_for_edit,
     validate_comment_for_react,
-    validate_comment_for_reply,
     validate_emoji,
 )
-from lattice.core.config import (
-    VALID_COMPLEXITIES,
-    VALID_PRIORITIES,
-    VALID_URGENCIES,
-    get_configured_roles,
-    get_review_cycle_limit,
-    get_valid_transitions,
-    validate_completion_policy,
-    validate_status,
-    validate_task_type,
-    validate_transition,
+from lattice.core.config import get_configured_roles
+from lattice.core.events import create_event, utc_now
+from lattice.core.ids import generate_task_id, validate_id
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.mutations import (
+    MutationError,
+    check_existing_task,
+    check_status_change,
+    comment_data,
+    field_change,
+    new_task_data,
+    parse_assignee,
+    reset_plan_after_status_change,
+    task_created_data,
 )
-from lattice.core.events import count_review_rework_cycles, create_event, utc_now
-from lattice.core.ids import generate_task_id, validate_actor, validate_id
-from lattice.core.tasks import apply_event_to_snapshot, is_backward_status_transition
 from lattice.storage.readers import read_task_events
 from lattice.storage.short_ids import allocate_short_id
 
 
-# ---------------------------------------------------------------------------
-# Idempotency comparison fields for create
-# ---------------------------------------------------------------------------
-
-_CREATE_COMPARE_FIELDS = (
-    "title",
-    "type",
-    "priority",
-    "urgency",
-    "complexity",
-    "status",
-    "description",
-    "tags",
-    "assigned_to",
-)
-
-
 # ---------------------------------------------------------------------------
 # lattice create
 # ---------------------------------------------------------------------------
@@ -112,88 +95,43 @@ def create(
     if on_behalf_of is not None:
         validate_actor_format_or_exit(on_behalf_of, is_json)
 
-    # Apply defaults
-    if status is None:
-        status = config.get("default_status", "backlog")
-    if priority is None:
-        priority = config.get("default_priority", "medium")
-    if task_type is None:
-        task_type = "task"
-
-    # Validate inputs
-    if not validate_status(config, status):
-        valid = ", ".join(config.get("workflow", {}).get("statuses", []))
-        output_error(
-            f"Invalid status: '{status}'. Valid statuses: {valid}.", "VALIDATION_ERROR", is_json
-        )
-    if not validate_task_type(config, task_type):
-        valid = ", ".join(config.get("task_types", []))
-        output_error(
-            f"Invalid task type: '{task_type}'. Valid types: {valid}.", "VALIDATION_ERROR", is_json
-        )
-    if priority not in VALID_PRIORITIES:
-        valid = ", ".join(VALID_PRIORITIES)
-        output_error(
-            f"Invalid priority: '{priority}'. Valid priorities: {valid}.",
-            "VALIDATION_ERROR",
-            is_json,
-        )
-    if urgency is not None and urgency not in VALID_URGENCIES:
-        valid = ", ".join(VALID_URGENCIES)
-        output_error(
-            f"Invalid urgency: '{urgency}'. Valid urgencies: {valid}.", "VALIDATION_ERROR", is_json
-        )
-    if complexity is not None and complexity not in VALID_COMPLEXITIES:
-        valid = ", ".join(VALID_COMPLEXITIES)
-        output_error(
-            f"Invalid complexity: '{complexity}'. Valid complexities: {valid}.",
-            "VALIDATION_ERROR",
-            is_json,
+    try:
+        data = new_task_data(
+            config,
+            title,
+            task_type=task_type,
+            priority=priority,
+            urgency=urgency,
+            complexity=complexity,
+            status=status,
+            description=description,
+            tags=tags,
+            assigned_to=assigned_to,
         )
-    if assigned_to is not None and not validate_actor(assigned_to):
-        output_error(f"Invalid assigned-to format: '{assigned_to}'.", "INVALID_ACTOR", is_json)
-
-    # Parse tags
-    tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
+    status, priority, task_type = data["status"], data["priority"], data["type"]
 
     # Generate or validate task ID
     if task_id is not None:
         if not validate_id(task_id, "task"):
             output_error(f"Invalid task ID format: '{task_id}'.", "INVALID_ID", is_json)
         # Idempotency check
-        existing_path = lattice_dir / "tasks" / f"{task_id}.json"
+        existing_path = task_snapshot_path(lattice_dir, task_id)
         if existing_path.exists():
             existing = json.loads(existing_path.read_text())
-            new_data = {
-                "title": title,
-                "type": task_type,
-                "priority": priority,
-                "urgency": urgency,
-                "complexity": complexity,
-                "status": status,
-                "description": description,
-                "tags": tag_list,
-                "assigned_to": assigned_to,
-            }
-            existing_data = {field: existing.get(field) for field in _CREATE_COMPARE_FIELDS}
-            # Normalize: snapshot stores tags as list, default is None
-            if existing_data.get("tags") is None:
-                existing_data["tags"] = []
-            if new_data == existing_data:
-                output_result(
-                    data=existing,
-                    human_message=f"Task {task_id} already exists (idempotent).",
-                    quiet_value=task_id,
-                    is_json=is_json,
-                    is_quiet=quiet,
-                )
-                return
-            else:
-                output_error(
-                    f"Conflict: task {task_id} exists with different data.",
-                    "CONFLICT",
-                    is_json,
-                )
+            try:
+                check_existing_task(task_id, existing, data)
+            except MutationError as exc:
+                output_mutation_error(exc, is_json)
+            output_result(
+                data=existing,
+                human_message=f"Task {task_id} already exists (idempotent).",
+                quiet_value=task_id,
+                is_json=is_json,
+                is_quiet=quiet,
+            )
+            return
     else:
         task_id = generate_task_id()
 
@@ -206,22 +144,7 @@ def create(
         short_id, _idx = allocate_short_id(lattice_dir, prefix, task_ulid=task_id)
 
     # Build event data
-    event_data: dict = {
-        "title": title,
-        "status": status,
-        "type": task_type,
-        "priority": priority,
-    }
-    if urgency is not None:
-        event_data["urgency"] = urgency
-    if complexity is not None:
-        event_data["complexity"] = complexity
-    if description is not None:
-        event_data["description"] = description
-    if tag_list:
-        event_data["tags"] = tag_list
-    if assigned_to is not None:
-        event_data["assigned_to"] = assigned_to
+    event_data = task_created_data(data)
     if short_id is not None:
         event_data["short_id"] = short_id
 
@@ -262,20 +185,6 @@ def create(
     )
 
 
-# ---------------------------------------------------------------------------
-# Updatable field names for `lattice update`
-# ---------------------------------------------------------------------------
-
-_UPDATABLE_FIELDS = frozenset(
-    {"title", "description", "priority", "urgency", "complexity", "type", "tags"}
-)
-
-_REDIRECT_FIELDS = {
-    "status": "Use 'lattice status' to change status.",
-    "assigned_to": "Use 'lattice assign' to change assignment.",
-}
-
-
 # ---------------------------------------------------------------------------
 # lattice update
 # ---------------------------------------------------------------------------
@@ -329,83 +238,10 @@ def update(
     events: list[dict] = []
 
     for field, value in parsed:
-        # Reject status and assigned_to with helpful messages
-        if field in _REDIRECT_FIELDS:
-            output_error(_REDIRECT_FIELDS[field], "VALIDATION_ERROR", is_json)
-
-        # Handle custom_fields.* dot notation
-        if field.startswith("custom_fields."):
-            key = field[len("custom_fields.") :]
-            if not key:
-                output_error(
-                    "Invalid custom field: 'custom_fields.' requires a key name.",
-                    "VALIDATION_ERROR",
-                    is_json,
-                )
-            old_value = (snapshot.get("custom_fields") or {}).get(key)
-            new_value = value
-            if old_value == new_value:
-                continue
-            events.append(
-                create_event(
-                    type="field_updated",
-                    task_id=task_id,
-                    actor=actor,
-                    data={"field": field, "from": old_value, "to": new_value},
-                    ts=shared_ts,
-                    model=model,
-                    session=session,
-                    triggered_by=triggered_by,
-                    on_behalf_of=on_behalf_of,
-                    reason=provenance_reason,
-                )
-            )
-            continue
-
-        if field not in _UPDATABLE_FIELDS:
-            valid = ", ".join(sorted(_UPDATABLE_FIELDS))
-            output_error(
-                f"Unknown or non-updatable field: '{field}'. "
-                f"Updatable fields: {valid}. Use custom_fields.<key> for custom data.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-
-        # Validate enum fields
-        if field == "priority" and value not in VALID_PRIORITIES:
-            valid = ", ".join(VALID_PRIORITIES)
-            output_error(
-                f"Invalid priority: '{value}'. Valid priorities: {valid}.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-        if field == "urgency" and value not in VALID_URGENCIES:
-            valid = ", ".join(VALID_URGENCIES)
-            output_error(
-                f"Invalid urgency: '{value}'. Valid urgencies: {valid}.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-        if field == "complexity" and value not in VALID_COMPLEXITIES:
-            valid = ", ".join(VALID_COMPLEXITIES)
-            output_error(
-                f"Invalid complexity: '{value}'. Valid complexities: {valid}.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-        if field == "type" and not validate_task_type(config, value):
-            valid = ", ".join(config.get("task_types", []))
-            output_error(
-                f"Invalid task type: '{value}'. Valid types: {valid}.", "VALIDATION_ERROR", is_json
-            )
-
-        # Get old value and compute new value
-        if field == "tags":
-            new_value = [t.strip() for t in value.split(",") if t.strip()]
-            old_value = snapshot.get("tags") or []
-        else:
-            new_value = value
-            old_value = snapshot.get(field)
+        try:
+            old_value, new_value = field_change(config, snapshot, field, value)
+        except MutationError as exc:
+            output_mutation_error(exc, is_json)
 
         if old_value == new_value:
             continue
@@ -462,34 +298,6 @@ def update(
 # ---------------------------------------------------------------------------
 
 
-def _status_rank_from_config(config: dict) -> dict[str, int] | None:
-    statuses = config.get("workflow", {}).get("statuses", [])
-    if not isinstance(statuses, list):
-        return None
-    rank = {status: idx for idx, status in enumerate(statuses) if isinstance(status, str)}
-    return rank or None
-
-
-def _append_plan_reset_section(
-    lattice_dir,
-    task_id: str,
-    actor: str,
-    event_ts: str | None,
-) -> None:
-    plan_path = lattice_dir / "plans" / f"{task_id}.md"
-    if not plan_path.exists():
-        return
-
-    date = "unknown-date"
-    if isinstance(event_ts, str) and event_ts:
-        date = event_ts.split("T", 1)[0]
-
-    content = plan_path.read_text(encoding="utf-8")
-    separator = "" if content.endswith("\n") else "\n"
-    reset_heading = f"## Reset {date} by {actor}"
-    plan_path.write_text(f"{content}{separator}\n{reset_heading}\n", encoding="utf-8")
-
-
 @cli.command("status")
 @click.argument("task_id")
 @click.argument("new_status")
@@ -527,14 +335,17 @@ def status_cmd(
 
     new_status = resolve_status_input(config, new_status)
 
-    # Validate new_status is a known status
-    if not validate_status(config, new_status):
-        valid = ", ".join(config.get("workflow", {}).get("statuses", []))
-        output_error(
-            f"Invalid status: '{new_status}'. Valid statuses: {valid}.",
-            "VALIDATION_ERROR",
-            is_json,
+    try:
+        check_status_change(
+            lattice_dir,
+            config,
+            snapshot,
+            new_status,
+            force=force,
+            reason=provenance_reason,
         )
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
 
     # Already at the target status
     if current_status == new_status:
@@ -553,84 +364,6 @@ def status_cmd(
             click.echo(f"Already at status {new_status}")
         return
 
-    status_rank = _status_rank_from_config(config)
-    is_backward_transition = is_backward_status_transition(
-        current_status,
-        new_status,
-        status_rank,
-    )
-
-    # Check transition validity
-    if not validate_transition(config, current_status, new_status):
-        if not force:
-            valid_targets = get_valid_transitions(config, current_status)
-            valid_list = ", ".join(valid_targets) if valid_targets else "(none)"
-            msg = (
-                f"Invalid transition from {current_status} to {new_status}. "
-                f"Valid transitions from {current_status}: {valid_list}. "
-                "Use --force --reason to override."
-            )
-            if is_json:
-                from lattice.cli.helpers import json_envelope, json_error_obj
-
-                error_obj = json_error_obj("INVALID_TRANSITION", msg)
-                error_obj["current_status"] = current_status
-                error_obj["requested_status"] = new_status
-                error_obj["valid_transitions"] = valid_targets
-                click.echo(json_envelope(False, error=error_obj))
-                raise SystemExit(1)
-            else:
-                click.echo(f"Error: {msg}", err=True)
-                raise SystemExit(1)
-        if not provenance_reason:
-            output_error(
-                "--reason is required with --force.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-
-    # Review cycle limit: block rework transitions if cycle limit reached
-    if current_status == "review" and new_status in ("in_progress", "in_planning") and not force:
-        events = read_task_events(lattice_dir, task_id)
-        cycle_count = count_review_rework_cycles(events)
-        cycle_limit = get_review_cycle_limit(config)
-        if cycle_count >= cycle_limit:
-            msg = (
-                f"Review cycle limit reached ({cycle_count}/{cycle_limit}). "
-                f"This task has been sent back from review {cycle_count} time(s). "
-                "Move to needs_human with a comment explaining the situation "
-                "instead of cycling further. "
-                "Override with --force --reason."
-            )
-            output_error(msg, "REVIEW_CYCLE_LIMIT", is_json)
-
-    # Check completion policies (evidence gating)
-    policy_ok, policy_failures = validate_completion_policy(config, snapshot, new_status)
-    if not policy_ok:
-        if not force:
-            failure_msg = "; ".join(policy_failures)
-            output_error(
-                f"Completion policy not satisfied: {failure_msg}. Override with --force --reason.",
-                "COMPLETION_BLOCKED",
-                is_json,
-            )
-        if not provenance_reason:
-            output_error(
-                "--reason is required with --force.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-
-    # Planning gate: block in_progress if plan is still scaffold
-    check_plan_gate(
-        lattice_dir,
-        task_id,
-        new_status,
-        is_json,
-        force=force,
-        reason=provenance_reason,
-    )
-
     event_data: dict = {
         "from": current_status,
         "to": new_status,
@@ -652,8 +385,7 @@ def status_cmd(
     )
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
     write_task_event(lattice_dir, task_id, [event], updated_snapshot, config)
-    if is_backward_transition:
-        _append_plan_reset_section(lattice_dir, task_id, actor, event.get("ts"))
+    reset_plan_after_status_change(lattice_dir, config, event, actor)
 
     display_id = updated_snapshot.get("short_id") or task_id
     output_result(
@@ -670,9 +402,6 @@ def status_cmd(
 # ---------------------------------------------------------------------------
 
 
-_UNASSIGN_SENTINELS = frozenset({"none", "unassigned", "-"})
-
-
 @cli.command()
 @click.argument("task_id")
 @click.argument("actor_id")
@@ -699,19 +428,11 @@ def assign(
 
     task_id = resolve_task_id(lattice_dir, task_id, is_json)
 
-    # Check for unassignment sentinel values
-    is_unassign = actor_id.lower() in _UNASSIGN_SENTINELS
-    target_actor: str | None = None if is_unassign else actor_id
-
-    # Validate assignee actor format (skip for unassignment)
-    if not is_unassign and not validate_actor(actor_id):
-        output_error(
-            f"Invalid actor format: '{actor_id}'. "
-            "Expected prefix:identifier (e.g., human:atin, agent:claude). "
-            "Use 'none', 'unassigned', or '-' to unassign.",
-            "INVALID_ACTOR",
-            is_json,
-        )
+    try:
+        target_actor = parse_assignee(actor_id)
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
+    is_unassign = target_actor is None
 
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
     current_assigned = snapshot.get("assigned_to")
@@ -828,35 +549,16 @@ def comment(
 
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
 
-    # Validate reply-to if provided
-    if reply_to is not None:
-        events = read_task_events(lattice_dir, task_id)
-        try:
-            validate_comment_for_reply(events, reply_to)
-        except ValueError as exc:
-            output_error(str(exc), "VALIDATION_ERROR", is_json)
-
-    # Validate and normalize body
     try:
-        text = validate_comment_body(text)
-    except ValueError as exc:
-        output_error(str(exc), "VALIDATION_ERROR", is_json)
-
-    # Validate role against configured completion policy roles
-    if role is not None:
-        configured_roles = get_configured_roles(config)
-        if configured_roles and role not in configured_roles:
-            output_error(
-                f"Unknown role: '{role}'. Valid roles: {', '.join(sorted(configured_roles))}.",
-                "INVALID_ROLE",
-                is_json,
-            )
-
-    event_data: dict = {"body": text}
-    if reply_to is not None:
-        event_data["parent_id"] = reply_to
-    if role is not None:
-        event_data["role"] = role
+        event_data = comment_data(
+            config,
+            text,
+            role=role,
+            reply_to=reply_to,
+            read_events=lambda: read_task_events(lattice_dir, task_id),
+        )
+    except MutationError as exc:
+        output_mutation_error(exc, is_json)
 
     event = create_event(
         type="comment_added",
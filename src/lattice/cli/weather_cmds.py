@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -12,11 +11,13 @@ from lattice.cli.helpers import json_envelope, load_project_config, require_root
 from lattice.cli.main import cli
 from lattice.core.stats import (
     build_stats,
+    count_recent_events,
     days_ago,
     format_days,
     load_all_snapshots,
-    parse_ts,
 )
+from lattice.storage.blocking_index import blocked_task_ids
+from lattice.storage.stats_rollup import update_stats_rollup
 
 # Future config shape for scheduling:
 # "schedule": {
@@ -74,36 +75,6 @@ def _determine_weather(
 # ---------------------------------------------------------------------------
 
 
-def _load_recent_events(lattice_dir: Path, hours: float = 24.0) -> list[dict]:
-    """Load all events from the last *hours* hours."""
-    now = datetime.now(timezone.utc)
-    cutoff_seconds = hours * 3600
-    recent: list[dict] = []
-
-    events_dir = lattice_dir / "events"
-    if not events_dir.is_dir():
-        return recent
-
-    for f in events_dir.glob("*.jsonl"):
-        if f.name.startswith("_"):
-            continue
-        for line in f.read_text().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                ev = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            ts = parse_ts(ev.get("ts", ""))
-            if ts is not None:
-                delta = (now - ts).total_seconds()
-                if delta <= cutoff_seconds:
-                    recent.append(ev)
-
-    return recent
-
-
 def _find_recently_completed(
     lattice_dir: Path,
     active: list[dict],
@@ -147,14 +118,15 @@ def _find_recently_completed(
     return [t for t in done_tasks if t["days_ago"] <= fallback_days]
 
 
-def _find_up_next(active: list[dict]) -> list[dict]:
+def _find_up_next(active: list[dict], blocked: frozenset[str] = frozenset()) -> list[dict]:
     """Find backlog/planned tasks ready to pick up, ordered by priority.
 
-    Delegates to core.next.select_all_ready for filtering and sorting.
+    Delegates to core.next.select_all_ready for filtering and sorting;
+    tasks in *blocked* (open prerequisites) are left out.
     """
     from lattice.core.next import select_all_ready
 
-    candidates = select_all_ready(active)
+    candidates = select_all_ready(active, blocked=blocked)
 
     # Format for weather output (cap at 10)
     result: list[dict] = []
@@ -239,8 +211,8 @@ def _build_weather(lattice_dir: Path, config: dict) -> dict:
     stats = build_stats(lattice_dir, config)
     active, archived = load_all_snapshots(lattice_dir)
 
-    # Recent events
-    recent_events = _load_recent_events(lattice_dir, hours=24.0)
+    # Recent events (the rollup was just brought up to date by build_stats)
+    events_24h = count_recent_events(update_stats_rollup(lattice_dir), now, hours=24.0)
 
     # In-progress count
     in_progress_statuses = {"in_planning", "in_progress", "review"}
@@ -253,7 +225,7 @@ def _build_weather(lattice_dir: Path, config: dict) -> dict:
     attention = _find_attention_needed(active, stats["stale"], stats["wip"])
 
     # Up next
-    up_next = _find_up_next(active)
+    up_next = _find_up_next(active, blocked_task_ids(lattice_dir))
 
     # WIP breaches
     wip_breaches = sum(1 for w in stats["wip"] if w["over"])
@@ -280,7 +252,7 @@ def _build_weather(lattice_dir: Path, config: dict) -> dict:
             "active_tasks": stats["summary"]["active_tasks"],
             "in_progress": in_progress_count,
             "done_recently": len(recently_completed),
-            "events_24h": len(recent_events),
+            "events_24h": events_24h,
         },
         "attention": attention,
         "recently_completed": recently_completed,
@@ -51,6 +51,9 @@ class HooksConfig(TypedDict, total=False):
     post_event: str
     on: HooksOnConfig
     transitions: dict[str, str | list[str]]
+    queued: bool
+    workers: int
+    max_attempts: int
 
 
 class ResourceDef(TypedDict, total=False):
@@ -142,6 +145,8 @@ class LatticeConfig(TypedDict, total=False):
     project_name: str
     model: str
     dashboard_port: int
+    durability: str
+    layout: str
 
 
 def default_config(preset: str = "classic") -> LatticeConfig:
@@ -357,6 +362,49 @@ def get_review_cycle_limit(config: dict) -> int:
     return config.get("workflow", {}).get("review_cycle_limit", 3)
 
 
+# Event-append durability policies (``config.json`` → ``"durability"``):
+#
+# - ``strict``  — one write + fsync + directory fsync per event (default)
+# - ``batched`` — one write + fsync + directory fsync per file per call
+# - ``relaxed`` — like ``batched`` but skips directory fsyncs
+#
+# ``batched`` and ``relaxed`` are opt-in trades of crash safety for write
+# latency.
+#
+# ``strict`` and ``batched`` give the same guarantee once a command returns;
+# they differ only in how much of a multi-event write survives a crash
+# *during* the call.
+DURABILITY_MODES: tuple[str, ...] = ("strict", "batched", "relaxed")
+DEFAULT_DURABILITY = "strict"
+
+
+def get_durability(config: dict) -> str:
+    """Return the configured durability policy.
+
+    Missing means :data:`DEFAULT_DURABILITY`; an unrecognised value falls
+    back to ``strict`` rather than silently weakening durability.
+    """
+    mode = config.get("durability", DEFAULT_DURABILITY)
+    return mode if mode in DURABILITY_MODES else "strict"
+
+
+# On-disk layout of task snapshots and event logs (``config.json`` → ``"layout"``):
+#
+# - ``flat``    — ``tasks/<id>.json``, ``events/<id>.jsonl`` (default)
+# - ``sharded`` — ``tasks/<xx>/<id>.json``, ``events/<xx>/<id>.jsonl`` where
+#   ``xx`` is the last two characters of the task ID
+#
+# Switch with ``lattice migrate-layout``, which moves the files as well.
+LAYOUTS: tuple[str, ...] = ("flat", "sharded")
+DEFAULT_LAYOUT = "flat"
+
+
+def get_layout(config: dict) -> str:
+    """Return the configured on-disk layout (unrecognised values mean ``flat``)."""
+    layout = config.get("layout", DEFAULT_LAYOUT)
+    return layout if layout in LAYOUTS else DEFAULT_LAYOUT
+
+
 def validate_completion_policy(
     config: dict,
     snapshot: dict,
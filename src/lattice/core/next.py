@@ -18,7 +18,7 @@ RESUME_STATUSES = frozenset({"in_progress", "in_planning"})
 DEFAULT_READY_STATUSES = frozenset({"backlog", "planned"})
 
 
-def _actors_match(assigned: str | dict | None, actor: str | dict | None) -> bool:
+def actors_match(assigned: str | dict | None, actor: str | dict | None) -> bool:
     """Check if an assigned_to value matches a requesting actor.
 
     Handles both legacy string actors and structured dict actors.
@@ -36,6 +36,7 @@ def select_next(
     *,
     actor: str | dict | None = None,
     ready_statuses: frozenset[str] | None = None,
+    blocked: frozenset[str] = frozenset(),
 ) -> dict | None:
     """Select the highest-priority task an agent should work on.
 
@@ -44,7 +45,8 @@ def select_next(
        tasks assigned to that actor. Return the highest-priority one.
     2. **Pick from ready pool:** Tasks in *ready_statuses* (default: backlog, planned)
        that are unassigned OR assigned to the requesting actor. Excludes needs_human,
-       blocked, done, cancelled.
+       blocked, done, cancelled, and any task in *blocked* (tasks still waiting
+       on an unresolved ``blocks``/``depends_on`` prerequisite).
     3. **Sort by:** priority (critical > high > medium > low) → urgency
        (immediate > high > normal > low) → ULID / id (oldest first).
     4. **Return** top result or None.
@@ -60,7 +62,7 @@ def select_next(
         for snap in snapshots:
             status = snap.get("status", "")
             assigned = snap.get("assigned_to")
-            if status in RESUME_STATUSES and _actors_match(assigned, actor):
+            if status in RESUME_STATUSES and actors_match(assigned, actor):
                 resume_candidates.append(snap)
         if resume_candidates:
             resume_candidates.sort(key=sort_key)
@@ -76,8 +78,10 @@ def select_next(
         # terminal/waiting states, still exclude them.
         if status in EXCLUDED_STATUSES:
             continue
+        if snap.get("id") in blocked:
+            continue  # prerequisites still open
         assigned = snap.get("assigned_to")
-        if assigned is not None and actor is not None and not _actors_match(assigned, actor):
+        if assigned is not None and actor is not None and not actors_match(assigned, actor):
             continue  # assigned to someone else
         if assigned is not None and actor is None:
             continue  # assigned but no actor specified
@@ -94,11 +98,13 @@ def select_all_ready(
     snapshots: list[dict],
     *,
     ready_statuses: frozenset[str] | None = None,
+    blocked: frozenset[str] = frozenset(),
 ) -> list[dict]:
     """Return all ready tasks sorted by priority, for display purposes.
 
     Unlike select_next, this returns the full sorted list (not just top-1)
     and does not filter by actor assignment. Used by weather/display code.
+    Tasks in *blocked* are left out, as in select_next.
     """
     if ready_statuses is None:
         ready_statuses = DEFAULT_READY_STATUSES
@@ -110,12 +116,58 @@ def select_all_ready(
             continue
         if status in EXCLUDED_STATUSES:
             continue
+        if snap.get("id") in blocked:
+            continue
         candidates.append(snap)
 
     candidates.sort(key=sort_key)
     return candidates
 
 
+def select_batch(
+    snapshots: list[dict],
+    actors: list[str | dict],
+    *,
+    ready_statuses: frozenset[str] | None = None,
+    blocked: frozenset[str] = frozenset(),
+) -> list[tuple[str | dict, dict]]:
+    """Pair each of *actors* with a distinct task from the ready pool.
+
+    Actors are served in order, each getting the highest-priority remaining
+    task that is unassigned or already assigned to them (same eligibility
+    rules as step 2 of select_next; there is no resume step).  Returns
+    ``(actor, snapshot)`` pairs — fewer than ``len(actors)`` when the pool
+    runs out.
+
+    This is pure logic — no filesystem I/O.
+    """
+    if ready_statuses is None:
+        ready_statuses = DEFAULT_READY_STATUSES
+
+    pool = [
+        snap
+        for snap in snapshots
+        if snap.get("status", "") in ready_statuses
+        and snap.get("status", "") not in EXCLUDED_STATUSES
+        and snap.get("id") not in blocked
+    ]
+    pool.sort(key=sort_key)
+
+    pairs: list[tuple[str | dict, dict]] = []
+    taken: set[str] = set()
+    for actor in actors:
+        for snap in pool:
+            if snap["id"] in taken:
+                continue
+            assigned = snap.get("assigned_to")
+            if assigned is not None and not actors_match(assigned, actor):
+                continue
+            taken.add(snap["id"])
+            pairs.append((actor, snap))
+            break
+    return pairs
+
+
 def sort_key(snap: dict) -> tuple[int, int, str]:
     """Return a sort key: (priority_rank, urgency_rank, id).
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import copy
 import json
+from collections.abc import Iterable
 from datetime import datetime, timezone
 
 
@@ -21,6 +22,26 @@ def apply_resource_event_to_snapshot(snapshot: dict | None, event: dict) -> dict
 
     Returns a new (or mutated) snapshot dict.
     """
+    if snapshot is not None and event["type"] != "resource_created":
+        snapshot = copy.deepcopy(snapshot)
+    return _apply_resource_in_place(snapshot, event)
+
+
+def replay_resource_events(events: Iterable[dict], snapshot: dict | None = None) -> dict | None:
+    """Fold *events* into a single resource snapshot, mutating it in place.
+
+    The resource counterpart of :func:`lattice.core.tasks.replay_events`:
+    byte-identical to chaining :func:`apply_resource_event_to_snapshot`,
+    without deep-copying the snapshot for every event.  Resource events are
+    small, so each one is copied instead to keep the result detached.
+    """
+    snap = copy.deepcopy(snapshot) if snapshot is not None else None
+    for event in events:
+        snap = _apply_resource_in_place(snap, copy.deepcopy(event))
+    return snap
+
+
+def _apply_resource_in_place(snapshot: dict | None, event: dict) -> dict:
     etype = event["type"]
 
     if etype == "resource_created":
@@ -32,7 +53,7 @@ def apply_resource_event_to_snapshot(snapshot: dict | None, event: dict) -> dict
                 "snapshot (expected 'resource_created' first)"
             )
             raise ValueError(msg)
-        snap = copy.deepcopy(snapshot)
+        snap = snapshot
         _apply_resource_mutation(snap, etype, event)
 
     snap["last_event_id"] = event["id"]
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import json
-from collections import Counter, defaultdict
+import heapq
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -11,58 +11,12 @@ from pathlib import Path
 def load_all_snapshots(lattice_dir: Path) -> tuple[list[dict], list[dict]]:
     """Load all active and archived task snapshots.
 
-    Returns (active, archived) lists.
+    Returns (active, archived) lists.  Served from the derived task catalog
+    when it is fresh, falling back to a directory scan otherwise.
     """
-    active: list[dict] = []
-    archived: list[dict] = []
+    from lattice.storage.catalog import load_snapshots
 
-    tasks_dir = lattice_dir / "tasks"
-    if tasks_dir.is_dir():
-        for f in tasks_dir.glob("*.json"):
-            try:
-                active.append(json.loads(f.read_text()))
-            except (json.JSONDecodeError, OSError):
-                continue
-
-    archive_dir = lattice_dir / "archive" / "tasks"
-    if archive_dir.is_dir():
-        for f in archive_dir.glob("*.json"):
-            try:
-                archived.append(json.loads(f.read_text()))
-            except (json.JSONDecodeError, OSError):
-                continue
-
-    return active, archived
-
-
-def count_events(lattice_dir: Path, archived: bool = False) -> tuple[int, Counter]:
-    """Count total events and events per task.
-
-    Returns (total_events, per_task_counter).
-    """
-    if archived:
-        events_dir = lattice_dir / "archive" / "events"
-    else:
-        events_dir = lattice_dir / "events"
-
-    total = 0
-    per_task: Counter = Counter()
-
-    if not events_dir.is_dir():
-        return total, per_task
-
-    for f in events_dir.glob("*.jsonl"):
-        if f.name.startswith("_"):
-            continue  # skip _lifecycle.jsonl
-        task_id = f.stem
-        count = 0
-        for line in f.read_text().splitlines():
-            if line.strip():
-                count += 1
-        total += count
-        per_task[task_id] = count
-
-    return total, per_task
+    return load_snapshots(lattice_dir)
 
 
 def parse_ts(ts_str: str) -> datetime | None:
@@ -94,195 +48,192 @@ def format_days(days: float) -> str:
     return f"{days / 30:.1f}mo"
 
 
-def load_all_events(lattice_dir: Path) -> list[dict]:
-    """Load and parse all events from active task event logs.
+# ---------------------------------------------------------------------------
+# Per-log rollups (folded by lattice.storage.stats_rollup)
+# ---------------------------------------------------------------------------
 
-    Returns a flat list of event dicts, sorted by timestamp.
-    """
-    events_dir = lattice_dir / "events"
-    events: list[dict] = []
-    if not events_dir.is_dir():
-        return events
-    for f in events_dir.glob("*.jsonl"):
-        if f.name.startswith("_"):
-            continue
-        for line in f.read_text().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                events.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    events.sort(key=lambda e: e.get("ts", ""))
-    return events
-
-
-def _compute_velocity(events: list[dict], now: datetime, weeks: int = 8) -> list[dict]:
-    """Compute tasks completed per week for the last N weeks.
+# Event types whose body (not just the index columns) the rollup needs.
+STATUS_EVENT_TYPES = frozenset({"task_created", "status_changed"})
 
-    Returns list of {week_label, count} dicts, oldest first.
-    """
-    # Find status_changed events where to == "done"
-    done_events: list[datetime] = []
-    for ev in events:
-        if ev.get("type") == "status_changed" and ev.get("data", {}).get("to") == "done":
-            dt = parse_ts(ev.get("ts", ""))
-            if dt:
-                done_events.append(dt)
-
-    # Bucket by ISO week
-    cutoff = now - timedelta(weeks=weeks)
-    buckets: Counter = Counter()
-    for dt in done_events:
-        if dt >= cutoff:
-            # Use ISO year-week as key
-            iso_year, iso_week, _ = dt.isocalendar()
-            buckets[f"{iso_year}-W{iso_week:02d}"] = (
-                buckets.get(f"{iso_year}-W{iso_week:02d}", 0) + 1
-            )
 
-    # Build ordered list for the last N weeks
-    result: list[dict] = []
-    for i in range(weeks - 1, -1, -1):
-        week_start = now - timedelta(weeks=i)
-        iso_year, iso_week, _ = week_start.isocalendar()
-        label = f"{iso_year}-W{iso_week:02d}"
-        result.append({"week": label, "count": buckets.get(label, 0)})
+def _week_label(dt: datetime) -> str:
+    iso_year, iso_week, _ = dt.isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
 
-    return result
 
+def new_log_rollup(*, resource: bool = False) -> dict:
+    """Return an empty rollup for one event log (JSON-serializable).
 
-def _compute_time_in_status(events: list[dict], now: datetime) -> list[dict]:
-    """Compute average time spent in each status across all tasks.
-
-    Returns list of {status, avg_hours, sample_count} dicts, sorted by avg_hours desc.
+    ``done_weeks`` maps ISO week labels to done transitions, ``dwell`` maps a
+    status to ``[hours, samples]`` of completed stays, ``current`` is the
+    open ``[status, ts]`` stay, ``blocked`` is ``[hours, episodes]`` of
+    resolved blocked episodes and ``blocked_since`` the start of an open one.
     """
-    # Group events by task_id
-    task_events: dict[str, list[dict]] = defaultdict(list)
-    for ev in events:
-        tid = ev.get("task_id")
-        if tid:
-            task_events[tid].append(ev)
-
-    # For each task, walk status transitions and accumulate durations
-    status_durations: defaultdict[str, list[float]] = defaultdict(list)  # status -> list of hours
-
-    for tid, tevs in task_events.items():
-        tevs.sort(key=lambda e: e.get("ts", ""))
-
-        # Find initial status from task_created event
-        current_status = None
-        current_ts = None
-
-        for ev in tevs:
-            etype = ev.get("type")
-            ts = parse_ts(ev.get("ts", ""))
-            if ts is None:
-                continue
-
-            if etype == "task_created":
-                current_status = ev.get("data", {}).get("status", "backlog")
-                current_ts = ts
-            elif etype == "status_changed":
-                if current_status and current_ts:
-                    hours = (ts - current_ts).total_seconds() / 3600
-                    status_durations[current_status].append(hours)
-                current_status = ev.get("data", {}).get("to")
-                current_ts = ts
-
-        # Account for time in current status up to now
-        if current_status and current_ts:
-            hours = (now - current_ts).total_seconds() / 3600
-            status_durations[current_status].append(hours)
-
-    # Compute averages
-    result: list[dict] = []
-    for status, durations in status_durations.items():
-        avg = sum(durations) / len(durations)
-        result.append(
-            {
-                "status": status,
-                "avg_hours": round(avg, 1),
-                "sample_count": len(durations),
-            }
-        )
-
-    result.sort(key=lambda r: r["avg_hours"], reverse=True)
-    return result
+    return {
+        "archived": False,
+        "resource": resource,
+        "events": 0,
+        "actors": {},
+        "done_weeks": {},
+        "dwell": {},
+        "current": None,
+        "blocked": [0.0, 0],
+        "blocked_since": None,
+    }
 
 
-def _compute_blocked_counts(events: list[dict], active: list[dict]) -> dict:
-    """Compute blocked-related metrics.
+def fold_event(agg: dict, event_type: str, ts_str: str, actor: str, data: dict | None) -> None:
+    """Feed one event of a log, in log order, into every aggregate of *agg*.
 
-    Returns {currently_blocked, total_blocked_episodes, avg_blocked_hours}.
+    *actor* is the display form.  *data* is the event's ``data`` for
+    :data:`STATUS_EVENT_TYPES` (``None`` if it could not be read, which
+    leaves the status aggregates untouched).
     """
-    currently_blocked = sum(1 for s in active if s.get("status") == "blocked")
-
-    # Count how many times any task entered "blocked"
-    unblocked_times: list[float] = []  # hours spent blocked
-
-    task_blocked_at: dict[str, datetime] = {}  # task_id -> when it entered blocked
-
-    for ev in events:
-        if ev.get("type") != "status_changed":
-            continue
-        data = ev.get("data", {})
-        ts = parse_ts(ev.get("ts", ""))
-        tid = ev.get("task_id", "")
-        if not ts:
+    agg["events"] += 1
+    if actor:
+        agg["actors"][actor] = agg["actors"].get(actor, 0) + 1
+    if data is None or agg["resource"] or event_type not in STATUS_EVENT_TYPES:
+        return
+    ts = parse_ts(ts_str)
+    if ts is None:
+        return
+
+    if event_type == "task_created":
+        agg["current"] = [data.get("status", "backlog"), ts_str]
+        return
+
+    # status_changed: close the current stay
+    current = agg["current"]
+    if current is not None and current[0]:
+        since = parse_ts(current[1])
+        if since is not None:
+            dwell = agg["dwell"].setdefault(current[0], [0.0, 0])
+            dwell[0] += (ts - since).total_seconds() / 3600
+            dwell[1] += 1
+    to_status = data.get("to")
+    agg["current"] = [to_status, ts_str] if to_status else None
+
+    if to_status == "done":
+        label = _week_label(ts)
+        agg["done_weeks"][label] = agg["done_weeks"].get(label, 0) + 1
+
+    if to_status == "blocked":
+        agg["blocked_since"] = ts_str
+    elif data.get("from") == "blocked" and agg["blocked_since"]:
+        since = parse_ts(agg["blocked_since"])
+        if since is not None:
+            agg["blocked"][0] += (ts - since).total_seconds() / 3600
+            agg["blocked"][1] += 1
+        agg["blocked_since"] = None
+
+
+def count_recent_events(rollup: dict, now: datetime, hours: float = 24.0) -> int:
+    """Count events on active logs from the last *hours* hours."""
+    logs = rollup["logs"]
+    cutoff = hours * 3600
+    count = 0
+    for ts_str, log, _event_id in rollup["recent"]:
+        agg = logs.get(log)
+        if agg is None or agg["archived"]:
             continue
+        ts = parse_ts(ts_str)
+        if ts is not None and (now - ts).total_seconds() <= cutoff:
+            count += 1
+    return count
 
-        if data.get("to") == "blocked":
-            task_blocked_at[tid] = ts
-        elif data.get("from") == "blocked" and tid in task_blocked_at:
-            hours = (ts - task_blocked_at[tid]).total_seconds() / 3600
-            unblocked_times.append(hours)
-            del task_blocked_at[tid]
 
-    total_episodes = len(unblocked_times) + len(task_blocked_at)  # resolved + still blocked
-    avg_hours = round(sum(unblocked_times) / len(unblocked_times), 1) if unblocked_times else 0
+def _compute_velocity(done_weeks: Counter, now: datetime, weeks: int = 8) -> list[dict]:
+    """Compute tasks completed per week for the last N weeks.
 
-    return {
-        "currently_blocked": currently_blocked,
-        "total_blocked_episodes": total_episodes,
-        "avg_blocked_hours": avg_hours,
-    }
+    Returns list of {week_label, count} dicts, oldest first.
+    """
+    return [
+        {"week": label, "count": done_weeks.get(label, 0)}
+        for label in (_week_label(now - timedelta(weeks=i)) for i in range(weeks - 1, -1, -1))
+    ]
 
 
-def _compute_agent_activity(events: list[dict]) -> list[dict]:
-    """Compute event counts per actor.
+def _compute_time_in_status(
+    dwell: dict[str, list[float]], open_stays: list[list], now: datetime
+) -> list[dict]:
+    """Compute average time spent in each status across all tasks.
 
-    Returns list of {actor, event_count} dicts, sorted by count desc. Top 10.
+    *dwell* holds completed stays; each open ``[status, ts]`` stay counts up
+    to *now*.  Returns list of {status, avg_hours, sample_count} dicts,
+    sorted by avg_hours desc.
     """
-    from lattice.core.events import get_actor_display
-
-    actor_counts: Counter = Counter()
-    for ev in events:
-        actor = ev.get("actor")
-        if actor:
-            actor_counts[get_actor_display(actor)] += 1
-
-    return [
-        {"actor": actor, "event_count": count} for actor, count in actor_counts.most_common(10)
+    totals: dict[str, list[float]] = {status: list(v) for status, v in dwell.items()}
+    for status, ts_str in open_stays:
+        since = parse_ts(ts_str)
+        if not status or since is None:
+            continue
+        total = totals.setdefault(status, [0.0, 0])
+        total[0] += (now - since).total_seconds() / 3600
+        total[1] += 1
+
+    result = [
+        {"status": status, "avg_hours": round(hours / n, 1), "sample_count": n}
+        for status, (hours, n) in totals.items()
+        if n
     ]
+    result.sort(key=lambda r: r["avg_hours"], reverse=True)
+    return result
 
 
 def build_stats(lattice_dir: Path, config: dict) -> dict:
-    """Build the full stats data structure."""
+    """Build the full stats data structure.
+
+    Snapshot-derived figures come from one pass over the active snapshots;
+    event-derived ones are summed from the incrementally maintained stats
+    rollup, so no event log is read here.
+    """
+    from lattice.core.events import get_actor_display
+    from lattice.storage.stats_rollup import update_stats_rollup
+
     now = datetime.now(timezone.utc)
     active, archived = load_all_snapshots(lattice_dir)
+    rollup = update_stats_rollup(lattice_dir)
+
+    # --- Event aggregates (velocity and friends cover active logs only) ---
+    active_events = 0
+    archived_events = 0
+    active_per_task: Counter = Counter()
+    done_weeks: Counter = Counter()
+    dwell: dict[str, list[float]] = {}
+    open_stays: list[list] = []
+    blocked_hours = 0.0
+    blocked_resolved = 0
+    blocked_open = 0
+    actor_counts: Counter = Counter()
 
-    # Event counts
-    active_events, active_per_task = count_events(lattice_dir, archived=False)
-    archived_events, _ = count_events(lattice_dir, archived=True)
-
-    # --- Distributions (active tasks only) ---
+    for log_id, agg in rollup["logs"].items():
+        if agg["archived"]:
+            archived_events += agg["events"]
+            continue
+        active_events += agg["events"]
+        if agg["events"]:
+            active_per_task[log_id] = agg["events"]
+        actor_counts.update(agg["actors"])
+        done_weeks.update(agg["done_weeks"])
+        for status, (hours, n) in agg["dwell"].items():
+            total = dwell.setdefault(status, [0.0, 0])
+            total[0] += hours
+            total[1] += n
+        if agg["current"] is not None:
+            open_stays.append(agg["current"])
+        blocked_hours += agg["blocked"][0]
+        blocked_resolved += agg["blocked"][1]
+        if agg["blocked_since"]:
+            blocked_open += 1
+
+    # --- Distributions and staleness (active tasks only, one pass) ---
     status_counts: Counter = Counter()
     priority_counts: Counter = Counter()
     type_counts: Counter = Counter()
     assignee_counts: Counter = Counter()
     tag_counts: Counter = Counter()
+    stale: list[dict] = []  # tasks not updated in 7+ days
+    by_id: dict[str, dict] = {}
 
     for snap in active:
         status_counts[snap.get("status", "unknown")] += 1
@@ -290,21 +241,13 @@ def build_stats(lattice_dir: Path, config: dict) -> dict:
         type_counts[snap.get("type", "unset")] += 1
         raw_assignee = snap.get("assigned_to")
         if raw_assignee:
-            from lattice.core.events import get_actor_display
-
             assignee_counts[get_actor_display(raw_assignee)] += 1
         else:
             assignee_counts["unassigned"] += 1
         for tag in snap.get("tags") or []:
             tag_counts[tag] += 1
 
-    # --- Staleness (active tasks only) ---
-    stale: list[dict] = []  # tasks not updated in 7+ days
-    recently_active: list[dict] = []
-
-    for snap in active:
-        updated_at = snap.get("updated_at", "")
-        d = days_ago(updated_at, now)
+        d = days_ago(snap.get("updated_at", ""), now)
         if d is not None and d >= 7:
             stale.append(
                 {
@@ -315,17 +258,15 @@ def build_stats(lattice_dir: Path, config: dict) -> dict:
                     "days_stale": round(d, 1),
                 }
             )
+        if "id" in snap:
+            by_id.setdefault(snap["id"], snap)
 
     # Sort stale by stalest first
     stale.sort(key=lambda s: s["days_stale"], reverse=True)
 
     # Recently active: 5 most recently updated
-    active_sorted = sorted(
-        active,
-        key=lambda s: s.get("updated_at", ""),
-        reverse=True,
-    )
-    for snap in active_sorted[:5]:
+    recently_active: list[dict] = []
+    for snap in heapq.nlargest(5, active, key=lambda s: s.get("updated_at", "")):
         d = days_ago(snap.get("updated_at", ""), now)
         recently_active.append(
             {
@@ -340,21 +281,12 @@ def build_stats(lattice_dir: Path, config: dict) -> dict:
     # --- Busiest tasks (by event count) ---
     busiest: list[dict] = []
     for task_id, count in active_per_task.most_common(5):
-        # Look up title from active snapshots
-        title = "?"
-        short_id = None
-        full_id = task_id
-        for snap in active:
-            if snap.get("id") == task_id:
-                title = snap.get("title", "?")
-                short_id = snap.get("short_id")
-                full_id = snap.get("id", task_id)
-                break
+        snap = by_id.get(task_id, {})
         busiest.append(
             {
-                "id": short_id or task_id,
-                "full_id": full_id,
-                "title": title,
+                "id": snap.get("short_id") or task_id,
+                "full_id": snap.get("id", task_id),
+                "title": snap.get("title", "?"),
                 "event_count": count,
             }
         )
@@ -385,13 +317,6 @@ def build_stats(lattice_dir: Path, config: dict) -> dict:
         if s not in defined_statuses and c > 0:
             ordered_status.append((s, c))
 
-    # --- Quality Metrics (event-derived) ---
-    all_events = load_all_events(lattice_dir)
-    velocity = _compute_velocity(all_events, now)
-    time_in_status = _compute_time_in_status(all_events, now)
-    blocked = _compute_blocked_counts(all_events, active)
-    agent_activity = _compute_agent_activity(all_events)
-
     return {
         "summary": {
             "active_tasks": len(active),
@@ -409,8 +334,16 @@ def build_stats(lattice_dir: Path, config: dict) -> dict:
         "recently_active": recently_active,
         "stale": stale,
         "busiest": busiest,
-        "velocity": velocity,
-        "time_in_status": time_in_status,
-        "blocked": blocked,
-        "agent_activity": agent_activity,
+        "velocity": _compute_velocity(done_weeks, now),
+        "time_in_status": _compute_time_in_status(dwell, open_stays, now),
+        "blocked": {
+            "currently_blocked": status_counts.get("blocked", 0),
+            "total_blocked_episodes": blocked_resolved + blocked_open,
+            "avg_blocked_hours": (
+                round(blocked_hours / blocked_resolved, 1) if blocked_resolved else 0
+            ),
+        },
+        "agent_activity": [
+            {"actor": actor, "event_count": count} for actor, count in actor_counts.most_common(10)
+        ],
     }
@@ -5,6 +5,7 @@ from __future__ import annotations
 import copy
 import json
 import sys
+from collections.abc import Iterable
 
 # Fields that cannot be overwritten by field_updated events.  These are
 # managed exclusively by internal bookkeeping or dedicated event types.
@@ -77,6 +78,32 @@ def apply_event_to_snapshot(snapshot: dict | None, event: dict) -> dict:
 
     Returns a new (or mutated) snapshot dict.
     """
+    if snapshot is not None and event["type"] != "task_created":
+        # Deep copy so callers keep the original intact (including nested
+        # dicts like custom_fields and lists like relationships_out).
+        snapshot = copy.deepcopy(snapshot)
+    return _apply_in_place(snapshot, event)
+
+
+def replay_events(events: Iterable[dict], snapshot: dict | None = None) -> dict | None:
+    """Fold *events* into a single snapshot, mutating it in place.
+
+    Produces exactly the snapshot that chaining :func:`apply_event_to_snapshot`
+    over the same events would, without a deep copy per event -- replay cost
+    is linear in the number of events rather than events x snapshot size.
+    Used by rebuild.
+
+    A starting *snapshot* is copied once up front.  Events are never mutated
+    and the result shares no mutable state with them.  Returns ``None`` when
+    *events* is empty and no snapshot was given.
+    """
+    snap = copy.deepcopy(snapshot) if snapshot is not None else None
+    for event in events:
+        snap = _apply_in_place(snap, _detach_event(event))
+    return snap
+
+
+def _apply_in_place(snapshot: dict | None, event: dict) -> dict:
     etype = event["type"]
 
     if etype == "task_created":
@@ -88,9 +115,7 @@ def apply_event_to_snapshot(snapshot: dict | None, event: dict) -> dict:
                 "snapshot (expected 'task_created' first)"
             )
             raise ValueError(msg)
-        # Deep copy so callers keep the original intact (including nested
-        # dicts like custom_fields and lists like relationships_out).
-        snap = copy.deepcopy(snapshot)
+        snap = snapshot
         _apply_mutation(snap, etype, event)
 
     # Every event updates bookkeeping fields.
@@ -99,6 +124,23 @@ def apply_event_to_snapshot(snapshot: dict | None, event: dict) -> dict:
     return snap
 
 
+def _detach_event(event: dict) -> dict:
+    """Return *event* with container values in ``data`` copied.
+
+    Handlers may store ``data`` values (tags, custom_fields, ...) in the
+    snapshot; copying them keeps in-place replay from aliasing -- and later
+    mutating -- the caller's event dicts.  Scalars are shared as-is.
+    """
+    data = event.get("data")
+    if not data or not any(isinstance(v, (dict, list)) for v in data.values()):
+        return event
+    detached = dict(event)
+    detached["data"] = {
+        k: copy.deepcopy(v) if isinstance(v, (dict, list)) else v for k, v in data.items()
+    }
+    return detached
+
+
 # ---------------------------------------------------------------------------
 # Serialization helpers
 # ---------------------------------------------------------------------------
@@ -458,3 +500,58 @@ def _apply_mutation(snap: dict, etype: str, event: dict) -> None:
             f"Warning: unknown event type '{etype}' ignored during snapshot materialization",
             file=sys.stderr,
         )
+
+
+# ---------------------------------------------------------------------------
+# Plan scaffolds
+# ---------------------------------------------------------------------------
+
+
+def is_scaffold_plan(content: str, *, description: str | None = None) -> bool:
+    """Return True when plan content still matches the default scaffold placeholders.
+
+    The scaffold is minimal: just ``# <title>`` and optionally the task
+    description as a paragraph.  A plan that has been "filled in" will
+    contain sub-headings, lists, code fences, or other structural
+    elements — OR plain-text content that differs from the auto-generated
+    description paragraph.
+
+    When *description* is provided, a plan consisting only of heading +
+    that exact description text is still considered scaffold.  Without
+    *description*, any non-empty text beyond the heading is accepted as
+    a real plan (one-line plans are valid).
+    """
+    stripped = content.strip()
+    if not stripped:
+        return True
+    lines = stripped.splitlines()
+    # Must start with a heading to look like a scaffold at all.
+    if not lines[0].startswith("# "):
+        return False
+
+    # Collect non-empty, non-heading body lines.
+    body_lines = [lt for line in lines[1:] if (lt := line.strip())]
+
+    if not body_lines:
+        # Only a heading, no body → still scaffold.
+        return True
+
+    # If there's structural markdown content, it's definitely filled in.
+    for lt in body_lines:
+        if lt.startswith(("## ", "### ", "- ", "* ", "```")):
+            return False
+        if len(lt) > 2 and lt[0].isdigit() and ". " in lt[:5]:
+            return False
+
+    # Plain text exists. If we have the original description, check whether
+    # the body is just the auto-generated description (still scaffold).
+    if description:
+        body_text = "\n".join(body_lines)
+        desc_text = "\n".join(
+            lt for line in description.strip().splitlines() if (lt := line.strip())
+        )
+        if body_text == desc_text:
+            return True  # Body is just the description → scaffold.
+
+    # Plain text that isn't the auto-generated description → real plan.
+    return False
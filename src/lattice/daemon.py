@@ -0,0 +1,419 @@
+"""Opt-in CLI daemon: serve ``lattice`` commands from a warm process.
+
+Every ``lattice`` invocation pays for interpreter startup, importing Click and
+every command module, plugin discovery and re-reading the catalog, id index
+and config.  ``lattice daemon start`` keeps one process alive with all of that
+loaded and listens on a Unix domain socket at ``.lattice/daemon.sock``.
+
+The ``lattice`` entry point (:func:`main`) checks for that socket before
+importing the CLI.  When a daemon answers, the command line, working
+directory and environment are sent over and the command runs inside the
+daemon; its stdout, stderr and exit code are relayed back.  When no daemon is
+running, or it cannot take the request, the command runs in-process exactly
+as before.  Standard input is not forwarded: commands that read it or prompt
+(:data:`LOCAL_COMMANDS`) always run in the invoking process, and so do
+commands added by CLI plugins, which the daemon cannot vouch for — it
+declines them and the client runs them itself.
+
+The daemon holds no state of its own.  Commands run unchanged, so every write
+still goes through ``write_task_event`` and the files on disk stay
+authoritative.  What stays warm are the process-level caches the storage
+layer already keeps (catalog, short-id index, project config, the derived
+indexes), each of which re-validates against the file it caches on every use.
+
+Requests are served one at a time: a command may change the process's
+working directory and environment while it runs, so they must not overlap.
+The queued-hook worker thread is the one thing that runs alongside them; it
+captures the daemon's own environment and directory at startup and passes
+them to each hook rather than reading the process's.
+
+Wire protocol: the client writes one JSON object terminated by a newline and
+reads one JSON object back.
+
+- ``{"op": "run", "version", "argv", "cwd", "env", "color"}`` ->
+  ``{"ok": true, "exit_code", "stdout", "stderr"}``
+- ``{"op": "status"}`` -> ``{"ok": true, "pid", "started_at", "served", ...}``
+- ``{"op": "stop"}`` -> ``{"ok": true}``, then the daemon exits.
+
+A reply of ``{"ok": false, "error": ...}`` to ``run`` means the command was
+*not* executed and the client should run it itself.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import UTC, datetime
+from pathlib import Path
+
+from lattice.storage.fs import LATTICE_DIR, LatticeRootError, find_root
+
+DAEMON_SOCKET_FILENAME = "daemon.sock"
+
+# Set to any non-empty value to bypass a running daemon.
+NO_DAEMON_ENV = "LATTICE_NO_DAEMON"
+
+# Built-in commands that prompt, read stdin, open a browser or run their own
+# server.  These always run in the invoking process; plugin commands are
+# declined by the daemon for the same reason.
+LOCAL_COMMANDS = frozenset(
+    {
+        "batch",
+        "daemon",
+        "dashboard",
+        "demo",
+        "init",
+        "restart",
+        "setup-claude",
+        "setup-claude-skill",
+        "setup-codex",
+        "setup-openclaw",
+    }
+)
+
+# How long a client waits for the daemon to accept a connection before
+# falling back to running the command itself.
+_CONNECT_TIMEOUT = 1.0
+
+# How long the daemon waits for a connected client to send its request.
+_REQUEST_TIMEOUT = 5.0
+
+# Upper bound on a request line; argv + environment is a few KB at most.
+_MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot be reached or started."""
+
+
+def socket_path(lattice_dir: Path) -> Path:
+    """Return the daemon socket path for a ``.lattice/`` directory."""
+    return lattice_dir / DAEMON_SOCKET_FILENAME
+
+
+def _version() -> str:
+    from lattice import __version__
+
+    return __version__
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def _recv_line(sock: socket.socket, limit: int | None = None) -> bytes:
+    chunks: list[bytes] = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        newline = chunk.find(b"\n")
+        if newline != -1:
+            chunks.append(chunk[:newline])
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if limit is not None and size > limit:
+            raise DaemonError("Request too large")
+    return b"".join(chunks)
+
+
+def _connect(path: Path) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(_CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def request(lattice_dir: Path, payload: dict) -> dict:
+    """Send one request to the daemon for *lattice_dir* and return its reply.
+
+    Raises :class:`DaemonError` if no daemon is listening or the reply is
+    missing or malformed.
+    """
+    try:
+        sock = _connect(socket_path(lattice_dir))
+    except OSError as exc:
+        raise DaemonError(f"No daemon is listening: {exc}") from exc
+    with sock:
+        try:
+            sock.settimeout(None)
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            raw = _recv_line(sock)
+        except OSError as exc:
+            raise DaemonError(f"Daemon connection failed: {exc}") from exc
+    try:
+        reply = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise DaemonError("Daemon sent a malformed reply") from exc
+    if not isinstance(reply, dict):
+        raise DaemonError("Daemon sent a malformed reply")
+    return reply
+
+
+def _command_name(argv: list[str]) -> str | None:
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg
+    return None
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run *argv* in a running daemon and return its exit code.
+
+    Returns ``None`` when the command should run in this process instead: the
+    daemon is bypassed or not running, the command is in
+    :data:`LOCAL_COMMANDS`, or the daemon declined the request.  Once the
+    request has been handed over the command may already have run, so a lost
+    reply is reported as an error rather than retried locally.
+    """
+    if os.environ.get(NO_DAEMON_ENV):
+        return None
+    if _command_name(argv) in LOCAL_COMMANDS:
+        return None
+    try:
+        root = find_root()
+    except LatticeRootError:
+        return None
+    if root is None:
+        return None
+    path = socket_path(root / LATTICE_DIR)
+    if not path.exists():
+        return None
+
+    try:
+        sock = _connect(path)
+    except OSError:
+        return None  # stale socket file; nobody is listening
+
+    payload = {
+        "op": "run",
+        "version": _version(),
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "color": sys.stdout.isatty(),
+    }
+    with sock:
+        try:
+            sock.settimeout(None)
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            raw = _recv_line(sock)
+            reply = json.loads(raw)
+        except (OSError, json.JSONDecodeError):
+            reply = None
+
+    if not isinstance(reply, dict) or "exit_code" not in reply:
+        if isinstance(reply, dict) and reply.get("ok") is False:
+            return None  # declined before running anything
+        sys.stderr.write(
+            "Error: lost the connection to the lattice daemon; the command may or may "
+            f"not have run. Set {NO_DAEMON_ENV}=1 to bypass the daemon.\n"
+        )
+        return 1
+
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.stderr.flush()
+    return int(reply["exit_code"])
+
+
+def main() -> None:
+    """Console entry point: forward to a running daemon, else run directly."""
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from lattice.cli.main import cli
+
+    cli()
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+def is_forwardable(argv: list[str]) -> bool:
+    """Return whether the daemon may run *argv* for a client.
+
+    Only built-in commands outside :data:`LOCAL_COMMANDS` qualify; a plugin
+    command might read stdin or prompt, and the daemon has no terminal.
+    """
+    from lattice.cli.main import cli
+
+    name = _command_name(argv)
+    if name is None or name in LOCAL_COMMANDS:
+        return False
+    return cli.get_command(None, name) is not None and name not in cli.plugin_commands
+
+
+def _exit_code(exc: SystemExit) -> tuple[int, str]:
+    code = exc.code
+    if code is None:
+        return 0, ""
+    if isinstance(code, int):
+        return code, ""
+    return 1, f"{code}\n"
+
+
+def run_command(argv: list[str], cwd: str, env: dict[str, str], *, color: bool) -> dict:
+    """Run one CLI command in this process and capture its output.
+
+    The process's working directory, environment and standard streams are
+    swapped for the duration of the command and restored afterwards.  Stdin
+    is empty: commands that read it are never sent here (see
+    :func:`is_forwardable`).
+    """
+    from lattice.cli.main import cli
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_stdin = sys.stdin
+    exit_code = 0
+    try:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+        sys.stdin = io.StringIO("")
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                cli.main(args=argv, prog_name="lattice", color=color)
+            except SystemExit as exc:
+                exit_code, message = _exit_code(exc)
+                stderr.write(message)
+            except Exception:  # noqa: BLE001 — report a crash as the CLI would, keep serving
+                traceback.print_exc(file=stderr)
+                exit_code = 1
+    finally:
+        sys.stdin = saved_stdin
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+    return {
+        "ok": True,
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+class _Server:
+    def __init__(self, lattice_dir: Path) -> None:
+        self.lattice_dir = lattice_dir
+        self.started_at = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+        self.served = 0
+        self.stopping = False
+
+    def handle(self, payload: dict) -> dict:
+        op = payload.get("op")
+        if op == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "started_at": self.started_at,
+                "served": self.served,
+                "version": _version(),
+                "lattice_dir": str(self.lattice_dir),
+            }
+        if op == "stop":
+            self.stopping = True
+            return {"ok": True}
+        if op == "run":
+            if payload.get("version") != _version():
+                return {"ok": False, "error": "version mismatch"}
+            argv, cwd, env = payload.get("argv"), payload.get("cwd"), payload.get("env")
+            if not (isinstance(argv, list) and isinstance(cwd, str) and isinstance(env, dict)):
+                return {"ok": False, "error": "malformed request"}
+            if not os.path.isdir(cwd):
+                return {"ok": False, "error": "working directory does not exist"}
+            if not is_forwardable(argv):
+                return {"ok": False, "error": "command must run locally"}
+            self.served += 1
+            return run_command(argv, cwd, env, color=bool(payload.get("color")))
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    def handle_connection(self, conn: socket.socket) -> None:
+        with conn:
+            try:
+                conn.settimeout(_REQUEST_TIMEOUT)
+                raw = _recv_line(conn, _MAX_REQUEST_BYTES)
+                payload = json.loads(raw)
+                if not isinstance(payload, dict):
+                    raise TypeError("request is not an object")
+            except (OSError, ValueError, TypeError, DaemonError):
+                return
+            reply = self.handle(payload)
+            try:
+                conn.settimeout(None)
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+            except OSError:
+                pass
+
+
+def _bind(path: Path) -> socket.socket:
+    if path.exists():
+        try:
+            _connect(path).close()
+        except OSError:
+            path.unlink()  # left behind by a daemon that did not shut down cleanly
+        else:
+            raise DaemonError(f"A lattice daemon is already listening on {path}")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(str(path))
+    except OSError as exc:
+        sock.close()
+        raise DaemonError(f"Cannot listen on {path}: {exc}") from exc
+    os.chmod(path, 0o600)
+    sock.listen(16)
+    return sock
+
+
+def serve(lattice_dir: Path, *, on_ready=None) -> None:
+    """Serve requests for *lattice_dir* until a ``stop`` request arrives.
+
+    Imports the CLI up front so the first forwarded command is already warm,
+    starts a hook worker when ``hooks.queued`` is set, then calls *on_ready*
+    (if given) once the socket is listening.  The socket
+    file is removed on the way out, including on ``KeyboardInterrupt``.
+
+    Raises :class:`DaemonError` if another daemon is already listening or the
+    socket cannot be created.
+    """
+    from lattice.cli.main import cli
+    from lattice.storage.hook_queue import start_worker_if_queued
+
+    cli.load_all()
+    path = socket_path(lattice_dir)
+    sock = _bind(path)
+    server = _Server(lattice_dir)
+    hook_worker = start_worker_if_queued(lattice_dir)
+    try:
+        if on_ready is not None:
+            on_ready(path)
+        while not server.stopping:
+            conn, _addr = sock.accept()
+            server.handle_connection(conn)
+    finally:
+        if hook_worker is not None:
+            hook_worker.stop()
+        sock.close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
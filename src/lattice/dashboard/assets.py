@@ -0,0 +1,119 @@
+"""Static asset cache and gzip negotiation for the dashboard server.
+
+Static files are read once and kept in memory with a content-hash ETag; a
+``stat`` per request picks up edits during development.  If a ``<name>.gz``
+sits next to the file and matches it (wheels ship one per asset, written by
+the ``hatch_build.py`` build hook) it is served as-is to clients that accept
+gzip; otherwise the file is compressed once, in memory.
+
+API responses are compressed on the fly only above :data:`GZIP_MIN_BYTES`,
+where the saving outweighs the CPU cost.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+import zlib
+from pathlib import Path
+
+# Bodies smaller than about one TCP segment are not worth compressing.
+GZIP_MIN_BYTES = 1400
+# Fast level for per-request API bodies; static assets are compressed once, harder.
+API_GZIP_LEVEL = 5
+STATIC_GZIP_LEVEL = 9
+
+# File types worth compressing (images are already compressed)
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".js", ".css", ".json", ".svg"})
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return True if an ``Accept-Encoding`` header allows gzip."""
+    if not accept_encoding:
+        return False
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def gzip_bytes(data: bytes, level: int = API_GZIP_LEVEL) -> bytes:
+    """Compress *data* deterministically (no timestamp in the header)."""
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class StaticAsset:
+    """One static file held in memory."""
+
+    __slots__ = ("data", "etag", "gzipped", "stamp")
+
+    def __init__(
+        self, data: bytes, gzipped: bytes | None, etag: str, stamp: tuple[int, int]
+    ) -> None:
+        self.data = data
+        self.gzipped = gzipped
+        self.etag = etag
+        self.stamp = stamp
+
+
+_assets: dict[Path, StaticAsset] = {}
+_assets_lock = threading.Lock()
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _precompressed(path: Path, data: bytes) -> bytes | None:
+    """Return ``<path>.gz`` if it exists and decompresses to *data*.
+
+    Checked by content rather than mtime: installers do not preserve the
+    order in which the two files were written.
+    """
+    try:
+        gzipped = path.with_name(path.name + ".gz").read_bytes()
+        if gzip.decompress(gzipped) == data:
+            return gzipped
+    except (OSError, EOFError, gzip.BadGzipFile, zlib.error):
+        pass
+    return None
+
+
+def load_static(path: Path) -> StaticAsset | None:
+    """Return the cached asset for *path*, re-reading it only after it changes."""
+    stamp = _stamp(path)
+    if stamp is None:
+        return None
+    with _assets_lock:
+        asset = _assets.get(path)
+    if asset is not None and asset.stamp == stamp:
+        return asset
+
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    gzipped: bytes | None = None
+    if path.suffix in COMPRESSIBLE_SUFFIXES and len(data) >= GZIP_MIN_BYTES:
+        gzipped = _precompressed(path, data)
+        if gzipped is None:
+            gzipped = gzip_bytes(data, STATIC_GZIP_LEVEL)
+    etag = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+    asset = StaticAsset(data, gzipped, etag, stamp)
+    with _assets_lock:
+        _assets[path] = asset
+    return asset
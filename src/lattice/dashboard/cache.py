@@ -0,0 +1,146 @@
+"""Process-wide read cache shared by the dashboard's request threads.
+
+The dashboard serves each request on its own thread.  Every handler for a
+given ``.lattice/`` directory shares one :class:`DashboardCache`, which holds:
+
+- the loaded task snapshots, keyed on a cheap *revision* (the catalog
+  signature plus the catalog file's inode/size/mtime), so external writers —
+  the CLI, agents, the MCP server — invalidate it simply by writing;
+- the incremental :class:`~lattice.storage.event_index.EventIndex` used by the
+  activity feed, and the :class:`~lattice.dashboard.feed.ChangeFeed` built on
+  it that pushes changes to ``/api/events/stream`` clients;
+- a readers/writer lock.  GET handlers hold the read side while they build a
+  response, POST handlers hold the write side for their whole
+  read-modify-write, so a reader never observes a half-applied dashboard
+  write and two dashboard writes to the same task cannot interleave.
+
+Writes made through the dashboard bump a local generation on release, which
+invalidates the snapshot cache even when the filesystem's mtime granularity
+would hide the change.  Cached snapshot dicts are shared between threads and
+must not be mutated.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from lattice.dashboard.feed import ChangeFeed
+from lattice.storage.catalog import CATALOG_FILENAME, catalog_signature, load_snapshots
+from lattice.storage.event_index import EventIndex
+from lattice.storage.fs import cache_path
+
+
+class RWLock:
+    """Many concurrent readers or one writer; waiting writers block new readers."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class DashboardCache:
+    """Snapshot and event-index cache for one ``.lattice/`` directory."""
+
+    def __init__(self, lattice_dir: Path) -> None:
+        self.lattice_dir = lattice_dir
+        self.lock = RWLock()
+        self.events = EventIndex(lattice_dir)
+        self.feed = ChangeFeed(self)
+        self._generation = 0
+        self._fill_lock = threading.Lock()
+        # include_archived -> (revision, (active, archived))
+        self._snapshots: dict[bool, tuple[tuple, tuple[list[dict], list[dict]]]] = {}
+
+    def revision(self) -> tuple:
+        """Return a token that changes whenever any task snapshot may have changed.
+
+        Costs a handful of ``stat`` calls and no parsing.
+        """
+        try:
+            st = os.stat(cache_path(self.lattice_dir, CATALOG_FILENAME))
+            catalog_key = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            catalog_key = None
+        return (self._generation, catalog_key, *catalog_signature(self.lattice_dir))
+
+    def snapshots(self, *, include_archived: bool = True) -> tuple[list[dict], list[dict]]:
+        """Return ``(active, archived)`` snapshots, reloading only after a change."""
+        rev = self.revision()
+        cached = self._snapshots.get(include_archived)
+        if cached is not None and cached[0] == rev:
+            return cached[1]
+        with self._fill_lock:
+            cached = self._snapshots.get(include_archived)
+            if cached is not None and cached[0] == rev:
+                return cached[1]
+            # The revision is captured before loading, so a write racing with
+            # the load leaves the entry stale rather than silently wrong.
+            data = load_snapshots(self.lattice_dir, include_archived=include_archived)
+            self._snapshots[include_archived] = (rev, data)
+            return data
+
+    def invalidate(self) -> None:
+        """Drop cached snapshots after a write made by this process."""
+        self._generation += 1
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Hold the write side of the lock, invalidating the cache on release."""
+        with self.lock.write():
+            try:
+                yield
+            finally:
+                self.invalidate()
+        self.feed.poke()
+
+
+_caches: dict[Path, DashboardCache] = {}
+_caches_lock = threading.Lock()
+
+
+def shared_cache(lattice_dir: Path) -> DashboardCache:
+    """Return the process-wide cache for *lattice_dir*, creating it on first use.
+
+    Shared across server restarts (SIGHUP) so a reload keeps its warm cache.
+    """
+    key = lattice_dir.resolve()
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = DashboardCache(lattice_dir)
+        return cache
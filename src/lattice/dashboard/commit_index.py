@@ -0,0 +1,229 @@
+"""Derived git commit → task reference index.
+
+``lattice show`` and the dashboard used to shell out to a full ``git log``
+(and regex-scan every message) on each request.  The index
+(``.lattice/cache/commit_index.json``) keeps the result instead:
+
+- ``tips`` — the last indexed tip of every local branch.  A refresh lists
+  the current tips (one ``git for-each-ref``) and walks only the commits
+  reachable from moved or new tips and not from any indexed tip, in a single
+  ``git log`` — so a new commit costs a walk of one commit.
+- ``refs`` — task reference (uppercased short ID such as ``LAT-42``, or a
+  ``task_…`` ULID) → commit hashes, newest first; ``commits`` holds the
+  metadata of every commit that references a task.
+- ``recent`` — the latest commits of each branch, keyed by the tip they were
+  read at, for ``/api/git/branches/<name>/commits``.
+
+The reference map is cumulative: commits stay listed after their branch is
+deleted or rewritten.  Like the other derived files the index is
+**non-authoritative** — deleting it is always safe and the next refresh
+re-walks the history once.  Refreshed indexes are cached per process and the
+returned state must not be mutated.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+from lattice.core.ids import extract_short_ids
+from lattice.dashboard.git_reader import (
+    get_branch_tips,
+    get_recent_commits,
+    git_available,
+    read_log,
+)
+from lattice.storage.fs import atomic_write, cache_path, ensure_cache_dir
+
+COMMIT_INDEX_FILENAME = "commit_index.json"
+COMMIT_INDEX_SCHEMA_VERSION = 1
+
+# Commits kept per branch for the branch commits endpoint
+RECENT_COMMITS_LIMIT = 20
+
+_TASK_ID_RE = re.compile(r"\b(task_[0-9A-Z]{26})\b")
+
+
+def _empty_state() -> dict[str, Any]:
+    return {
+        "schema_version": COMMIT_INDEX_SCHEMA_VERSION,
+        "tips": {},
+        "commits": {},
+        "refs": {},
+        "recent": {},
+    }
+
+
+def _read_state(path: Path) -> dict[str, Any]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return _empty_state()
+    if not isinstance(state, dict) or state.get("schema_version") != COMMIT_INDEX_SCHEMA_VERSION:
+        return _empty_state()
+    return state
+
+
+def index_keys(commit: dict[str, Any]) -> list[str]:
+    """Return the task references a commit message mentions, as index keys.
+
+    Short IDs are matched case-insensitively (``lat-42`` indexes as
+    ``LAT-42``), the same way branch names are.
+    """
+    message = f"{commit['subject']} {commit.get('body') or ''}"
+    keys = extract_short_ids(message)
+    keys.extend(ref for ref in _TASK_ID_RE.findall(message) if ref not in keys)
+    return keys
+
+
+def _walk(
+    repo_root: Path, heads: set[str], known: set[str], fallback: set[str]
+) -> list[dict[str, Any]] | None:
+    """Return commits reachable from *heads* but not from *known*, newest first.
+
+    *known* may name commits that no longer exist (a rewritten branch after
+    ``gc``); git then refuses the walk and it is retried excluding only
+    *fallback*, which re-reads a little history but is always valid.
+    """
+    for exclude in (known, fallback):
+        revisions = sorted(heads)
+        exclude = exclude - heads
+        if exclude:
+            revisions += ["--not", *sorted(exclude)]
+        commits = read_log(repo_root, revisions)
+        if commits is not None:
+            return commits
+    return None
+
+
+def _refresh(
+    repo_root: Path, state: dict[str, Any], tips: dict[str, str] | None
+) -> dict[str, Any] | None:
+    """Return *state* advanced to the current branch tips (copy-on-write).
+
+    Returns *state* itself when nothing moved, or None if git failed.
+    """
+    if tips is None:
+        tips = get_branch_tips(repo_root)
+        if tips is None:
+            return None
+    old_tips: dict[str, str] = state["tips"]
+    if tips == old_tips:
+        return state
+
+    moved = {sha for name, sha in tips.items() if old_tips.get(name) != sha}
+    unchanged = {sha for name, sha in tips.items() if old_tips.get(name) == sha}
+    commits: dict[str, dict[str, Any]] = dict(state["commits"])
+    refs: dict[str, list[str]] = dict(state["refs"])
+    if moved:
+        walked = _walk(repo_root, moved, set(old_tips.values()), unchanged)
+        if walked is None:
+            return None
+        added: dict[str, list[str]] = {}
+        for commit in walked:
+            if commit["hash"] in commits:
+                continue
+            keys = index_keys(commit)
+            if not keys:
+                continue
+            commits[commit["hash"]] = commit
+            for key in keys:
+                added.setdefault(key, []).append(commit["hash"])
+        for key, hashes in added.items():
+            refs[key] = hashes + refs.get(key, [])
+
+    recent = {
+        name: entry for name, entry in state["recent"].items() if tips.get(name) == entry["tip"]
+    }
+    return {**state, "tips": tips, "commits": commits, "refs": refs, "recent": recent}
+
+
+_cache: dict[Path, dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def _save(lattice_dir: Path, state: dict[str, Any]) -> None:
+    try:
+        atomic_write(
+            ensure_cache_dir(lattice_dir) / COMMIT_INDEX_FILENAME,
+            json.dumps(state, separators=(",", ":")),
+        )
+    except OSError:
+        pass  # still correct in memory; the next process re-walks
+
+
+def refresh_commit_index(
+    lattice_dir: Path, repo_root: Path, *, tips: dict[str, str] | None = None
+) -> dict[str, Any] | None:
+    """Bring the index up to date with the branch tips of *repo_root* and return it.
+
+    *tips* (``{branch: full hash}``) saves listing them again when the caller
+    just did.  Returns None when git is unavailable or fails.
+    """
+    if not git_available():
+        return None
+    with _cache_lock:
+        state = _cache.get(lattice_dir)
+        if state is None:
+            state = _read_state(cache_path(lattice_dir, COMMIT_INDEX_FILENAME))
+        refreshed = _refresh(repo_root, state, tips)
+        if refreshed is None:
+            return None
+        if refreshed is not state:
+            _save(lattice_dir, refreshed)
+        _cache[lattice_dir] = refreshed
+        return refreshed
+
+
+def task_commits(lattice_dir: Path, repo_root: Path, refs: list[str]) -> list[dict[str, Any]]:
+    """Return indexed commits referencing any of *refs*, newest first."""
+    state = refresh_commit_index(lattice_dir, repo_root)
+    if state is None:
+        return []
+    hashes: dict[str, None] = {}
+    for ref in refs:
+        for sha in state["refs"].get(ref if ref.startswith("task_") else ref.upper(), []):
+            hashes[sha] = None
+    commits = [state["commits"][sha] for sha in hashes if sha in state["commits"]]
+    commits.sort(key=lambda c: c["date"], reverse=True)
+    return commits
+
+
+def task_commit_activity(state: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Summarize the index per task reference: commit count and latest commit date."""
+    commits = state["commits"]
+    activity: dict[str, dict[str, Any]] = {}
+    for ref, hashes in state["refs"].items():
+        dates = [commits[sha]["date"] for sha in hashes if sha in commits]
+        if dates:
+            activity[ref] = {"count": len(dates), "last_commit_date": max(dates)}
+    return activity
+
+
+def branch_commits(
+    lattice_dir: Path, repo_root: Path, branch: str, *, limit: int = RECENT_COMMITS_LIMIT
+) -> list[dict[str, Any]]:
+    """Return recent commits on *branch*, read from git only after its tip moves.
+
+    Revisions that are not local branch names (tags, ``origin/main``) and
+    non-default limits go straight to :func:`get_recent_commits`.
+    """
+    state = refresh_commit_index(lattice_dir, repo_root)
+    if state is None or branch not in state["tips"] or limit != RECENT_COMMITS_LIMIT:
+        return get_recent_commits(repo_root, branch, limit=limit)
+    tip = state["tips"][branch]
+    entry = state["recent"].get(branch)
+    if entry is not None and entry["tip"] == tip:
+        return entry["commits"]
+
+    commits = get_recent_commits(repo_root, tip, limit=limit)
+    with _cache_lock:
+        current = _cache.get(lattice_dir)
+        if current is not None and current["tips"].get(branch) == tip:
+            recent = {**current["recent"], branch: {"tip": tip, "commits": commits}}
+            _cache[lattice_dir] = updated = {**current, "recent": recent}
+            _save(lattice_dir, updated)
+    return commits
@@ -0,0 +1,213 @@
+"""Change feed behind ``GET /api/events/stream`` (Server-Sent Events).
+
+One :class:`ChangeFeed` per :class:`~lattice.dashboard.cache.DashboardCache`
+watches the global event index for appended rows — written by dashboard
+POSTs, the CLI, agents or the MCP server alike — and pushes a task-level
+delta to every connected browser:
+
+- ``task``: ``{"id", "task", "archived", "event"}`` where ``task`` is the
+  compact row ``/api/tasks`` (or ``/api/archived``) would serve now;
+- ``config``: ``config.json`` changed, re-fetch it;
+- ``resync``: deltas were lost (the index was rebuilt — e.g. because a
+  ``git pull`` brought in logs it had no rows for — or a slow client's queue
+  overflowed), re-fetch everything.
+
+The watcher is a single thread that only runs while someone is subscribed.
+When nothing changes a tick costs a handful of ``stat`` calls (``config.json``,
+the index file and the event log directories), however many dashboards are
+open.  Dashboard writes :meth:`~ChangeFeed.poke` it so their deltas go out
+immediately instead of on the next tick.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from typing import TYPE_CHECKING
+
+from lattice.core.tasks import compact_snapshot
+from lattice.storage.event_index import ROW_ID, ROW_TASK_ID, IndexRow
+
+if TYPE_CHECKING:
+    from lattice.dashboard.cache import DashboardCache
+
+POLL_INTERVAL_SECONDS = 0.5
+KEEPALIVE_SECONDS = 15.0
+SUBSCRIBER_QUEUE_SIZE = 256
+# Event index rows land just before the snapshot they produce is written;
+# wait this many ticks for the snapshot to catch up before sending anyway.
+SNAPSHOT_WAIT_TICKS = 4
+
+
+def task_row(snapshot: dict, *, archived: bool = False) -> dict:
+    """Return the compact row ``/api/tasks`` (or ``/api/archived``) serves for *snapshot*."""
+    row = compact_snapshot(snapshot)
+    row["updated_at"] = snapshot.get("updated_at")
+    row["created_at"] = snapshot.get("created_at")
+    row["done_at"] = snapshot.get("done_at")
+    if archived:
+        row["archived"] = True
+    else:
+        # Active session indicator: task is in_progress with an assignee
+        row["has_active_session"] = bool(
+            snapshot.get("status") == "in_progress" and snapshot.get("assigned_to")
+        )
+    return row
+
+
+def format_message(kind: str, data: dict, *, message_id: str | None = None) -> bytes:
+    """Encode one Server-Sent Events message."""
+    lines = [f"event: {kind}"]
+    if message_id:
+        lines.append(f"id: {message_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class Subscription:
+    """One connected client's queue of ``(kind, data)`` messages."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[str, dict]] = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._overflowed = False
+
+    def put(self, kind: str, data: dict) -> None:
+        try:
+            self._queue.put_nowait((kind, data))
+        except queue.Full:
+            self._overflowed = True
+
+    def get(self, timeout: float) -> tuple[str, dict] | None:
+        """Return the next message, or ``None`` if none arrived within *timeout*."""
+        if self._overflowed:
+            self._overflowed = False
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            return ("resync", {})
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class ChangeFeed:
+    """Fan out task changes found in the event index to subscribed clients."""
+
+    def __init__(self, cache: DashboardCache, *, interval: float = POLL_INTERVAL_SECONDS) -> None:
+        self._cache = cache
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
+        self._thread: threading.Thread | None = None
+        self._wake = threading.Event()
+        self._pending_lock = threading.Lock()
+        self._pending: list[IndexRow] = []
+        self._resync = False
+        # task_id -> [rows not yet sent, ticks spent waiting for the snapshot]
+        self._waiting: dict[str, list] = {}
+        self._config_stamp: tuple[int, int] | None = None
+        cache.events.add_listener(self._on_rows)
+
+    def subscribe(self) -> Subscription:
+        """Register a client; only changes made after this call are pushed to it."""
+        self._cache.events.refresh()
+        sub = Subscription()
+        with self._lock:
+            self._subscribers.add(sub)
+            if self._thread is None:
+                self._config_stamp = self._stat_config()
+                self._thread = threading.Thread(
+                    target=self._run, name="lattice-change-feed", daemon=True
+                )
+                self._thread.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def poke(self) -> None:
+        """Check for changes now rather than on the next tick."""
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+
+    def _on_rows(self, rows: list[IndexRow] | None) -> None:
+        if not self._subscribers:
+            return
+        with self._pending_lock:
+            if rows is None:
+                self._resync = True
+            else:
+                self._pending.extend(rows)
+
+    def _stat_config(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self._cache.lattice_dir / "config.json")
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _broadcast(self, kind: str, data: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.put(kind, data)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self._tick()
+
+    def _tick(self) -> None:
+        stamp = self._stat_config()
+        if stamp != self._config_stamp:
+            self._config_stamp = stamp
+            self._broadcast("config", {})
+
+        self._cache.events.refresh()
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+            resync, self._resync = self._resync, False
+        if resync:
+            self._waiting.clear()
+            self._broadcast("resync", {})
+            return
+        for row in rows:
+            if row[ROW_TASK_ID] is not None:
+                self._waiting.setdefault(row[ROW_TASK_ID], [[], 0])[0].append(row)
+        if self._waiting:
+            self._flush()
+
+    def _flush(self) -> None:
+        active, archived = self._cache.snapshots()
+        by_id = {snap.get("id"): (snap, True) for snap in archived}
+        by_id.update((snap.get("id"), (snap, False)) for snap in active)
+
+        for task_id, entry in list(self._waiting.items()):
+            rows, ticks = entry
+            rows.sort()
+            found = by_id.get(task_id)
+            current = found is not None and found[0].get("last_event_id") == rows[-1][ROW_ID]
+            if not current and ticks < SNAPSHOT_WAIT_TICKS:
+                entry[1] += 1
+                continue
+            del self._waiting[task_id]
+
+            snapshot, is_archived = found if found is not None else (None, False)
+            task = task_row(snapshot, archived=is_archived) if snapshot is not None else None
+            for row in rows:
+                event = self._cache.events.read_event(row)
+                if event is None:
+                    continue
+                self._broadcast(
+                    "task",
+                    {"id": task_id, "task": task, "archived": is_archived, "event": event},
+                )
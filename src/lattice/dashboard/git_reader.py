@@ -9,9 +9,11 @@ gracefully and returns structured ``available=False`` payloads.
 from __future__ import annotations
 
 import hashlib
+import os
 import re
 import shutil
 import subprocess
+import threading
 import time
 from pathlib import Path
 from typing import Any
@@ -21,7 +23,9 @@ from typing import Any
 # ---------------------------------------------------------------------------
 
 GIT_COMMAND_TIMEOUT = 10  # seconds per subprocess call
-CACHE_TTL_SECONDS = 30  # how long the summary cache is valid
+CACHE_TTL_SECONDS = 30  # how long a "not a git repo" answer is trusted
+REFRESH_POLL_SECONDS = 1.0  # how often the refresher checks the refs signature
+REFRESHER_IDLE_SECONDS = 120  # refresher exits after this long without a request
 
 # Patterns for extracting Lattice task references from commit messages.
 # Matches short IDs like LAT-42, PROJ-7, or any UPPER-ID pattern:
@@ -93,41 +97,51 @@ def get_current_branch(repo_root: Path) -> str | None:
     return None
 
 
-def get_branches(repo_root: Path) -> list[dict[str, Any]]:
-    """Return a list of local branch metadata dicts.
+def _read_branches(repo_root: Path) -> tuple[list[dict[str, Any]], dict[str, str] | None]:
+    """Return ``(branch metadata, {branch: full tip hash})`` from one ``for-each-ref``.
 
-    Each dict has keys: ``name``, ``is_current``, ``commit_hash``,
-    ``commit_subject``, ``commit_date``, ``author_name``, ``author_email``.
+    The tips are None if git failed.
     """
-    # Format: refname:short, HEAD indicator, objectname:short, subject, authordate:iso-strict, authorname, authoremail
-    fmt = "%(refname:short)%09%(HEAD)%09%(objectname:short)%09%(subject)%09%(authordate:iso-strict)%09%(authorname)%09%(authoremail)"
+    # Format: refname:short, HEAD indicator, objectname, objectname:short, subject, authordate:iso-strict, authorname, authoremail
+    fmt = "%(refname:short)%09%(HEAD)%09%(objectname)%09%(objectname:short)%09%(subject)%09%(authordate:iso-strict)%09%(authorname)%09%(authoremail)"
     try:
         result = _run_git(
             ["for-each-ref", "--sort=-authordate", f"--format={fmt}", "refs/heads/"],
             cwd=repo_root,
         )
         if result.returncode != 0:
-            return []
+            return [], None
     except (subprocess.TimeoutExpired, OSError):
-        return []
+        return [], None
 
     branches: list[dict[str, Any]] = []
+    tips: dict[str, str] = {}
     for line in result.stdout.strip().splitlines():
         parts = line.split("\t")
-        if len(parts) < 7:
+        if len(parts) < 8:
             continue
         branches.append(
             {
                 "name": parts[0],
                 "is_current": parts[1].strip() == "*",
-                "commit_hash": parts[2],
-                "commit_subject": parts[3],
-                "commit_date": parts[4],
-                "author_name": parts[5],
-                "author_email": parts[6],
+                "commit_hash": parts[3],
+                "commit_subject": parts[4],
+                "commit_date": parts[5],
+                "author_name": parts[6],
+                "author_email": parts[7],
             }
         )
-    return branches
+        tips[parts[0]] = parts[2]
+    return branches, tips
+
+
+def get_branches(repo_root: Path) -> list[dict[str, Any]]:
+    """Return a list of local branch metadata dicts.
+
+    Each dict has keys: ``name``, ``is_current``, ``commit_hash``,
+    ``commit_subject``, ``commit_date``, ``author_name``, ``author_email``.
+    """
+    return _read_branches(repo_root)[0]
 
 
 def _validate_branch_name(name: str) -> bool:
@@ -138,37 +152,34 @@ def _validate_branch_name(name: str) -> bool:
     return bool(name) and not name.startswith("-")
 
 
-def get_recent_commits(
-    repo_root: Path,
-    branch: str,
-    *,
-    limit: int = 20,
-) -> list[dict[str, Any]]:
-    """Return recent commits on *branch* as a list of dicts.
-
-    Each dict has: ``hash``, ``short_hash``, ``subject``, ``body``,
-    ``author_name``, ``author_email``, ``date``, ``task_refs``.
-
-    Returns an empty list if *branch* looks like a git flag (starts with
-    ``-``) to prevent argument injection.
-    """
-    if not _validate_branch_name(branch):
-        return []
-
-    # Use %x00 as field separator, %x01 as record separator
-    fmt = "%H%x00%h%x00%s%x00%b%x00%an%x00%ae%x00%aI%x01"
+def get_branch_tips(repo_root: Path) -> dict[str, str] | None:
+    """Return ``{branch: full commit hash}`` for every local branch, or None on error."""
     try:
         result = _run_git(
-            ["log", f"--max-count={limit}", f"--format={fmt}", branch, "--"],
+            ["for-each-ref", "--format=%(refname:short)%00%(objectname)", "refs/heads/"],
             cwd=repo_root,
         )
         if result.returncode != 0:
-            return []
+            return None
     except (subprocess.TimeoutExpired, OSError):
-        return []
+        return None
+
+    tips: dict[str, str] = {}
+    for line in result.stdout.splitlines():
+        name, _, sha = line.partition("\x00")
+        if name and sha:
+            tips[name] = sha
+    return tips
+
+
+# Use %x00 as field separator, %x01 as record separator
+_LOG_FORMAT = "%H%x00%h%x00%s%x00%b%x00%an%x00%ae%x00%aI%x01"
 
+
+def _parse_log(stdout: str) -> list[dict[str, Any]]:
+    """Parse ``git log --format=_LOG_FORMAT`` output into commit dicts."""
     commits: list[dict[str, Any]] = []
-    for record in result.stdout.split("\x01"):
+    for record in stdout.split("\x01"):
         record = record.strip()
         if not record:
             continue
@@ -205,6 +216,39 @@ def get_recent_commits(
     return commits
 
 
+def read_log(repo_root: Path, revisions: list[str]) -> list[dict[str, Any]] | None:
+    """Run ``git log`` over *revisions* (any ``git log`` revision arguments).
+
+    Returns commit dicts newest first, or None if git failed.
+    """
+    try:
+        result = _run_git(["log", f"--format={_LOG_FORMAT}", *revisions, "--"], cwd=repo_root)
+        if result.returncode != 0:
+            return None
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    return _parse_log(result.stdout)
+
+
+def get_recent_commits(
+    repo_root: Path,
+    branch: str,
+    *,
+    limit: int = 20,
+) -> list[dict[str, Any]]:
+    """Return recent commits on *branch* as a list of dicts.
+
+    Each dict has: ``hash``, ``short_hash``, ``subject``, ``body``,
+    ``author_name``, ``author_email``, ``date``, ``task_refs``.
+
+    Returns an empty list if *branch* looks like a git flag (starts with
+    ``-``) to prevent argument injection.
+    """
+    if not _validate_branch_name(branch):
+        return []
+    return read_log(repo_root, [f"--max-count={limit}", branch]) or []
+
+
 def get_commit_count(repo_root: Path) -> int | None:
     """Return total commit count, or None on error."""
     try:
@@ -261,31 +305,133 @@ def extract_task_refs(text: str) -> list[str]:
 # Summary & caching
 # ---------------------------------------------------------------------------
 
-# Module-level cache.  Keyed by repo root path string.
-_summary_cache: dict[str, tuple[float, str, dict[str, Any]]] = {}
-# Each entry: (timestamp, etag, summary_dict)
 
+class _SummaryEntry:
+    """Cached ``/api/git`` summary for one ``.lattice/`` directory.
+
+    Served as-is to requests (stale-while-revalidate) while a background
+    thread watches the refs signature and rebuilds it after a change.
+    """
+
+    def __init__(self, lattice_dir: Path) -> None:
+        self.lattice_dir = lattice_dir
+        # (repo root, git dir, common dir); None until discovered or outside a repo
+        self.repo: tuple[Path, Path, Path] | None = None
+        self.summary: dict[str, Any] | None = None
+        self.etag = ""
+        self.signature: tuple | None = None
+        self.checked_at = 0.0
+        self.last_access = time.monotonic()
+        # (HEAD hash, commit count) and (config stamp, origin URL) of the last build
+        self.head_count: tuple[str, int] | None = None
+        self.remote: tuple[tuple | None, str | None] | None = None
+        self.refresh_lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+
+_entries: dict[Path, _SummaryEntry] = {}
+_entries_lock = threading.Lock()
+
+
+def _discover_repo(start: Path) -> tuple[Path, Path, Path] | None:
+    """Return ``(repo root, git dir, common dir)`` for *start* with one ``rev-parse``."""
+    try:
+        result = _run_git(
+            ["rev-parse", "--show-toplevel", "--absolute-git-dir", "--git-common-dir"],
+            cwd=start,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    lines = result.stdout.splitlines()
+    if result.returncode != 0 or len(lines) < 3 or not lines[0]:
+        return None
+    # --git-common-dir may be relative to the working directory
+    return Path(lines[0]), Path(lines[1]), start / lines[2]
+
+
+def _stamp(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
 
-def _prune_expired_cache() -> None:
-    """Remove all expired entries from the summary cache.
 
-    Called on each cache read/write to prevent unbounded growth.
+def refs_signature(git_dir: Path, common_dir: Path) -> tuple:
+    """Return a cheap signature of HEAD, the branch refs and the repo config.
+
+    Built from ``stat`` alone: git rewrites a ref (or ``packed-refs``, or
+    ``HEAD``) through a lock file and a rename, which changes its inode and
+    mtime, and touches the containing directory.
     """
-    now = time.monotonic()
-    expired = [k for k, (ts, _, _) in _summary_cache.items() if now - ts > CACHE_TTL_SECONDS]
-    for k in expired:
-        del _summary_cache[k]
+    parts: list[Any] = [
+        _stamp(git_dir / "HEAD"),
+        _stamp(common_dir / "packed-refs"),
+        _stamp(common_dir / "config"),
+    ]
+    for dirpath, _dirnames, filenames in os.walk(common_dir / "refs" / "heads"):
+        parts.append((dirpath, _stamp(Path(dirpath))))
+        parts.extend((name, _stamp(Path(dirpath) / name)) for name in sorted(filenames))
+    return tuple(parts)
+
+
+def _read_head(git_dir: Path, tips: dict[str, str] | None) -> str | None:
+    """Return the commit HEAD points at, resolved through *tips* when symbolic."""
+    try:
+        content = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not content.startswith("ref: "):
+        return content or None  # detached
+    ref = content[len("ref: ") :]
+    if tips is None or not ref.startswith("refs/heads/"):
+        return None
+    return tips.get(ref[len("refs/heads/") :])  # None on an unborn branch
+
+
+def _count_commits(
+    repo_root: Path, head: str | None, previous: tuple[str, int] | None
+) -> int | None:
+    """Return the commit count of *head*, walking only what changed since *previous*.
+
+    ``rev-list --left-right --count old...new`` counts the commits only the old
+    and only the new HEAD can reach, so the new total is derived from the old
+    one without walking the whole history again.
+    """
+    if head is None:
+        return None
+    if previous is not None:
+        old_head, old_count = previous
+        if old_head == head:
+            return old_count
+        try:
+            result = _run_git(
+                ["rev-list", "--left-right", "--count", f"{old_head}...{head}"], cwd=repo_root
+            )
+            if result.returncode == 0:
+                removed, added = (int(n) for n in result.stdout.split())
+                return old_count - removed + added
+        except (subprocess.TimeoutExpired, OSError, ValueError):
+            pass
+    try:
+        result = _run_git(["rev-list", "--count", head], cwd=repo_root)
+        if result.returncode == 0:
+            return int(result.stdout.strip())
+    except (subprocess.TimeoutExpired, OSError, ValueError):
+        pass
+    return None
 
 
 def _compute_etag(summary: dict[str, Any]) -> str:
     """Compute an ETag from all fields that affect the ``/api/git`` response.
 
-    Includes ``current_branch``, ``remote_url``, ``commit_count``, and
-    per-branch name + tip hash so that *any* change in the response payload
-    invalidates the ETag.
+    Includes ``current_branch``, ``head_commit``, ``remote_url``,
+    ``commit_count``, and per-branch name + tip hash so that *any* change in
+    the response payload invalidates the ETag.
     """
     parts: list[str] = [
         f"current_branch={summary.get('current_branch', '')}",
+        f"head_commit={summary.get('head_commit', '')}",
         f"remote_url={summary.get('remote_url', '')}",
         f"commit_count={summary.get('commit_count', '')}",
     ]
@@ -295,66 +441,124 @@ def _compute_etag(summary: dict[str, Any]) -> str:
     return hashlib.md5(raw.encode()).hexdigest()[:12]
 
 
-def get_git_summary(lattice_dir: Path) -> tuple[dict[str, Any], str]:
-    """Build the full git summary payload for ``GET /api/git``.
+def _refresh(entry: _SummaryEntry) -> None:
+    """Rebuild *entry*'s summary.  Runs git; never called on a request thread
+    once the entry has a summary."""
+    if entry.repo is None:
+        entry.repo = _discover_repo(entry.lattice_dir.parent)
+    entry.checked_at = time.monotonic()
+    if entry.repo is None:
+        entry.summary, entry.etag = {"available": False, "reason": "not_a_git_repo"}, ""
+        return
 
-    Returns ``(summary_dict, etag_string)``.
+    from lattice.dashboard.commit_index import refresh_commit_index, task_commit_activity
 
-    Uses a module-level cache with a 30-second TTL.  The summary is
-    re-computed only when the cache expires.
-    """
-    if not git_available():
-        summary: dict[str, Any] = {
-            "available": False,
-            "reason": "git_not_installed",
-        }
-        return summary, ""
+    repo_root, git_dir, common_dir = entry.repo
+    # Taken before running git, so a change racing with the build triggers another
+    entry.signature = refs_signature(git_dir, common_dir)
 
-    # lattice_dir is .lattice/ — repo root is its parent
-    repo_root = find_git_root(lattice_dir.parent)
-    if repo_root is None:
-        summary = {
-            "available": False,
-            "reason": "not_a_git_repo",
-        }
-        return summary, ""
-
-    cache_key = str(repo_root)
-    now = time.monotonic()
-
-    # Prune expired entries to prevent unbounded growth
-    _prune_expired_cache()
-
-    # Check cache
-    if cache_key in _summary_cache:
-        cached_time, cached_etag, cached_summary = _summary_cache[cache_key]
-        if now - cached_time < CACHE_TTL_SECONDS:
-            return cached_summary, cached_etag
+    branches, tips = _read_branches(repo_root)
+    head = _read_head(git_dir, tips)
+    commit_count = _count_commits(repo_root, head, entry.head_count)
+    entry.head_count = (head, commit_count) if head and commit_count is not None else None
 
-    # Build fresh summary
-    branches = get_branches(repo_root)
-    current_branch = get_current_branch(repo_root)
-    commit_count = get_commit_count(repo_root)
-    remote_url = get_remote_url(repo_root)
+    config_stamp = _stamp(common_dir / "config")
+    if entry.remote is None or entry.remote[0] != config_stamp:
+        entry.remote = (config_stamp, get_remote_url(repo_root))
+    commit_index = refresh_commit_index(entry.lattice_dir, repo_root, tips=tips)
 
-    summary = {
+    summary: dict[str, Any] = {
         "available": True,
         "repo_root": str(repo_root),
-        "current_branch": current_branch,
+        "current_branch": next((b["name"] for b in branches if b["is_current"]), None),
+        "head_commit": head,
         "branch_count": len(branches),
         "commit_count": commit_count,
-        "remote_url": remote_url,
+        "remote_url": entry.remote[1],
         "branches": branches,
+        "task_commits": task_commit_activity(commit_index) if commit_index else {},
     }
+    entry.summary, entry.etag = summary, _compute_etag(summary)
+
+
+def _needs_refresh(entry: _SummaryEntry) -> bool:
+    if entry.repo is None:
+        return time.monotonic() - entry.checked_at > CACHE_TTL_SECONDS
+    return refs_signature(entry.repo[1], entry.repo[2]) != entry.signature
+
 
-    etag = _compute_etag(summary)
+def _refresher(entry: _SummaryEntry) -> None:
+    """Background loop: rebuild the summary whenever the refs signature changes.
 
-    # Store in cache
-    _summary_cache[cache_key] = (now, etag, summary)
+    Exits once no request has asked for the summary in a while (or the entry
+    was dropped by :func:`invalidate_cache`); the next request restarts it.
+    """
+    while True:
+        if entry.summary is not None:
+            time.sleep(REFRESH_POLL_SECONDS)
+        with _entries_lock:
+            idle = time.monotonic() - entry.last_access > REFRESHER_IDLE_SECONDS
+            if idle or _entries.get(entry.lattice_dir) is not entry:
+                entry.thread = None
+                return
+        try:
+            with entry.refresh_lock:
+                if entry.summary is None or _needs_refresh(entry):
+                    _refresh(entry)
+        except Exception:  # noqa: BLE001 — keep serving the last summary
+            time.sleep(REFRESH_POLL_SECONDS)
+
+
+def _entry(lattice_dir: Path) -> _SummaryEntry:
+    """Return the cache entry for *lattice_dir*, (re)starting its refresher."""
+    with _entries_lock:
+        entry = _entries.get(lattice_dir)
+        if entry is None:
+            entry = _entries[lattice_dir] = _SummaryEntry(lattice_dir)
+        entry.last_access = time.monotonic()
+        if entry.thread is None:
+            entry.thread = threading.Thread(
+                target=_refresher, args=(entry,), name="lattice-git-summary", daemon=True
+            )
+            entry.thread.start()
+        return entry
+
+
+def prime_git_summary(lattice_dir: Path) -> None:
+    """Start building the git summary in the background (dashboard startup)."""
+    if git_available():
+        _entry(lattice_dir)
+
+
+def get_git_summary(lattice_dir: Path) -> tuple[dict[str, Any], str]:
+    """Return the git summary payload for ``GET /api/git`` and its ETag.
+
+    Returns ``(summary_dict, etag_string)``.
+
+    The summary is served from a per-directory cache that a background
+    thread rebuilds whenever ``HEAD``, a branch ref, ``packed-refs`` or the
+    repo config changes, so only the very first call (when the dashboard did
+    not prime it) waits for git.
+    """
+    if not git_available():
+        summary: dict[str, Any] = {
+            "available": False,
+            "reason": "git_not_installed",
+        }
+        return summary, ""
 
-    return summary, etag
+    entry = _entry(lattice_dir)
+    if entry.summary is None:
+        # Cold cache: wait for (or run) the first build
+        with entry.refresh_lock:
+            if entry.summary is None:
+                _refresh(entry)
+    summary = entry.summary
+    assert summary is not None
+    return summary, entry.etag
 
 
 def invalidate_cache() -> None:
-    """Clear the summary cache.  Useful for testing."""
-    _summary_cache.clear()
+    """Drop every cached summary (their refreshers exit).  Useful for testing."""
+    with _entries_lock:
+        _entries.clear()
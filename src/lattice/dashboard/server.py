@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import platform
-import shutil
 import subprocess
 import sys
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qs, urlparse
@@ -29,18 +31,42 @@ from lattice.core.config import (
     validate_task_type,
     validate_transition,
 )
-from lattice.core.events import create_event, serialize_event, utc_now
+from lattice.core.events import create_event, utc_now
 from lattice.core.ids import generate_task_id, validate_actor, validate_id
-from lattice.core.tasks import (
-    apply_event_to_snapshot,
-    compact_snapshot,
-    serialize_snapshot,
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.dashboard.assets import GZIP_MIN_BYTES, accepts_gzip, gzip_bytes, load_static
+from lattice.dashboard.cache import shared_cache
+from lattice.dashboard.feed import KEEPALIVE_SECONDS, format_message, task_row
+from lattice.storage.archive_packs import (
+    find_packed,
+    packed_event_logs,
+    packs_dir,
+    unpack_task,
 )
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.storage.catalog import load_snapshots
+from lattice.storage.event_index import (
+    EVENT_INDEX_FILENAME,
+    ROW_ACTOR,
+    ROW_ID,
+    ROW_TASK_ID,
+    ROW_TYPE,
+    EventIndex,
+    decode_cursor,
+    encode_cursor,
+    page_rows,
+)
+from lattice.storage.fs import atomic_write, cache_path
+from lattice.storage.layout import resource_event_files, task_event_files, task_snapshot_path
 from lattice.storage.locks import multi_lock
 from lattice.storage.hooks import execute_hooks
-from lattice.storage.operations import scaffold_plan, write_task_event
-from lattice.storage.readers import read_task_events
+from lattice.storage.operations import archive_task_files, scaffold_plan, write_task_event
+from lattice.storage.relationship_index import incoming_relationships
+from lattice.storage.readers import (
+    read_archived_doc,
+    read_archived_snapshot,
+    read_jsonl_tail,
+    read_task_events,
+)
 from lattice.storage.short_ids import allocate_short_id
 
 STATIC_DIR = Path(__file__).parent / "static"
@@ -48,6 +74,9 @@ STATIC_DIR = Path(__file__).parent / "static"
 # Maximum allowed request body size (1 MiB) to prevent DoS via oversized payloads.
 MAX_REQUEST_BODY_BYTES = 1_048_576
 
+# /api/stats reports durations up to "now", so its ETag also rolls over this often.
+STATS_ETAG_SECONDS = 60
+
 # ---------------------------------------------------------------------------
 # JSON envelope helpers
 # ---------------------------------------------------------------------------
@@ -68,6 +97,41 @@ def _err(code: str, message: str) -> str:
     )
 
 
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _task_docs_key(ld: Path, task_id: str) -> list:
+    """Stat keys of *task_id*'s notes and plan, active and archived.
+
+    The files themselves are stat'ed, not their directories: an in-place
+    edit does not touch the directory.  Packed copies never change, so the
+    packs directory (rewritten on every pack/unpack) covers them.
+    """
+    if not validate_id(task_id, "task"):
+        return []
+    return [
+        _stat_key(ld / base / kind / f"{task_id}.md")
+        for base in ("", "archive")
+        for kind in ("notes", "plans")
+    ] + [_stat_key(packs_dir(ld))]
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an ``If-None-Match`` header value matches *etag*."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 # ---------------------------------------------------------------------------
 # Request handler
 # ---------------------------------------------------------------------------
@@ -76,15 +140,28 @@ def _err(code: str, message: str) -> str:
 def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
     """Create a handler class bound to a specific .lattice/ directory."""
 
+    # Shared by every request thread (and across SIGHUP restarts)
+    cache = shared_cache(lattice_dir)
+    event_index = cache.events
+
     class LatticeHandler(BaseHTTPRequestHandler):
         _lattice_dir: Path = lattice_dir
         _readonly: bool = readonly
+        _cache = cache
+
+        def setup(self) -> None:
+            super().setup()
+            # Hooks queued by a POST handler, run once the write lock is released
+            self._deferred_hooks: list = []
+            # ETag of the current GET, attached to its 200 response by _send_json
+            self._etag: str | None = None
 
         # Suppress default access logging to stdout; send to stderr instead
         def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
             sys.stderr.write(f"{self.address_string()} - {format % args}\n")
 
         def do_GET(self) -> None:  # noqa: N802
+            self._etag = None
             parsed = urlparse(self.path)
             path = parsed.path.rstrip("/") or "/"
 
@@ -92,8 +169,20 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 self._serve_static("index.html", "text/html")
             elif path == "/stats-demo":
                 self._serve_notes_file("stats-demo/demo.html", "text/html")
-            elif path.startswith("/api/"):
+            elif path == "/api/events/stream":
+                # Long-lived; must not hold the cache lock
+                self._handle_event_stream()
+            elif path.startswith("/api/git"):
+                # Git endpoints never touch .lattice/ state; don't hold up writers
                 self._route_api(path)
+            elif path.startswith("/api/"):
+                with cache.lock.read():
+                    # Answer revalidations before any snapshot or event is parsed
+                    self._etag = self._api_etag(path)
+                    if _etag_matches(self.headers.get("If-None-Match"), self._etag):
+                        self._send_not_modified(self._etag)
+                    else:
+                        self._route_api(path)
             elif path.startswith("/static/"):
                 # Serve static assets (JS, CSS) with path traversal protection
                 rel_path = path[len("/static/") :]
@@ -124,7 +213,10 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             path = parsed.path.rstrip("/") or "/"
 
             if path.startswith("/api/"):
-                self._route_api_post(path)
+                with cache.writing():
+                    self._route_api_post(path)
+                for hook in self._deferred_hooks:
+                    hook()
             else:
                 self._send_json(404, _err("NOT_FOUND", f"Not found: {path}"))
 
@@ -133,17 +225,20 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
         # ---------------------------------------------------------------
 
         def _serve_static(self, filename: str, content_type: str) -> None:
-            filepath = STATIC_DIR / filename
-            if not filepath.is_file():
+            asset = load_static(STATIC_DIR / filename)
+            if asset is None:
                 self._send_json(404, _err("NOT_FOUND", f"Static file not found: {filename}"))
                 return
-            data = filepath.read_bytes()
-            self.send_response(200)
-            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.send_header("Cache-Control", "no-cache")
-            self.end_headers()
-            self.wfile.write(data)
+            if _etag_matches(self.headers.get("If-None-Match"), asset.etag):
+                self._send_not_modified(asset.etag)
+                return
+            self._send_body(
+                200,
+                asset.data,
+                f"{content_type}; charset=utf-8",
+                {"ETag": asset.etag, "Cache-Control": "no-cache"},
+                gzipped=asset.gzipped,
+            )
 
         def _serve_notes_file(self, relpath: str, content_type: str) -> None:
             """Serve a file from the repo's notes/ directory."""
@@ -250,14 +345,75 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
         # JSON response helper
         # ---------------------------------------------------------------
 
-        def _send_json(self, status: int, body: str) -> None:
-            data = body.encode("utf-8")
+        def _send_json(self, status: int, body: str, *, cache_control: str = "no-cache") -> None:
+            """Send a JSON response; a 200 carries the request's ETag, if it has one."""
+            headers: dict[str, str] = {}
+            if status == 200 and self._etag:
+                headers["ETag"] = self._etag
+                headers["Cache-Control"] = cache_control
+            self._send_body(
+                status, body.encode("utf-8"), "application/json; charset=utf-8", headers
+            )
+
+        def _send_body(
+            self,
+            status: int,
+            data: bytes,
+            content_type: str,
+            headers: dict[str, str],
+            *,
+            gzipped: bytes | None = None,
+        ) -> None:
+            """Send *data*, gzip-encoded if the client accepts it and it is worth it.
+
+            *gzipped* is a ready-made compressed form (static assets); without
+            one, bodies of at least ``GZIP_MIN_BYTES`` are compressed here.
+            """
+            compressible = gzipped is not None or len(data) >= GZIP_MIN_BYTES
+            encoded = False
+            if compressible and accepts_gzip(self.headers.get("Accept-Encoding")):
+                data = gzipped if gzipped is not None else gzip_bytes(data)
+                encoded = True
             self.send_response(status)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Type", content_type)
             self.send_header("Content-Length", str(len(data)))
+            if compressible:
+                self.send_header("Vary", "Accept-Encoding")
+            if encoded:
+                self.send_header("Content-Encoding", "gzip")
+            for name, value in headers.items():
+                self.send_header(name, value)
             self.end_headers()
             self.wfile.write(data)
 
+        def _send_not_modified(self, etag: str) -> None:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+
+        def _api_etag(self, path: str) -> str:
+            """Return the ETag for a GET of a ``.lattice/``-backed endpoint.
+
+            Built from ``stat`` calls only: the cache revision (every snapshot
+            write), the event index and ``config.json``, plus the task's notes
+            and plan files for per-task endpoints.  The query string is part of
+            the key, so each activity page or filter validates separately.
+            """
+            ld = self._lattice_dir
+            parts: list = [
+                self.path,
+                cache.revision(),
+                _stat_key(cache_path(ld, EVENT_INDEX_FILENAME)),
+                _stat_key(ld / "config.json"),
+            ]
+            if path.startswith("/api/tasks/"):
+                task_id = path[len("/api/tasks/") :].split("/", 1)[0]
+                parts += _task_docs_key(ld, task_id)
+            elif path == "/api/stats":
+                parts.append(int(time.time() // STATS_ETAG_SECONDS))
+            digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+            return f'"{digest}"'
+
         # ---------------------------------------------------------------
         # Endpoint handlers
         # ---------------------------------------------------------------
@@ -272,23 +428,8 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             self._send_json(200, _ok(config))
 
         def _handle_tasks(self, ld: Path) -> None:
-            tasks_dir = ld / "tasks"
-            snapshots: list[dict] = []
-            if tasks_dir.is_dir():
-                for task_file in sorted(tasks_dir.glob("*.json")):
-                    try:
-                        snap = json.loads(task_file.read_text())
-                    except (json.JSONDecodeError, OSError):
-                        continue
-                    compact = compact_snapshot(snap)
-                    compact["updated_at"] = snap.get("updated_at")
-                    compact["created_at"] = snap.get("created_at")
-                    compact["done_at"] = snap.get("done_at")
-                    # Active session indicator: task is in_progress with an assignee
-                    compact["has_active_session"] = bool(
-                        snap.get("status") == "in_progress" and snap.get("assigned_to")
-                    )
-                    snapshots.append(compact)
+            active, _archived = cache.snapshots(include_archived=False)
+            snapshots = [task_row(snap) for snap in active]
             # Sort by ID
             snapshots.sort(key=lambda s: s.get("id", ""))
             self._send_json(200, _ok(snapshots))
@@ -312,17 +453,10 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 return
 
             # Enrich with notes_exists, plan_exists, and artifacts
-            if is_archived:
-                notes_path = ld / "archive" / "notes" / f"{task_id}.md"
-                plan_path = ld / "archive" / "plans" / f"{task_id}.md"
-            else:
-                notes_path = ld / "notes" / f"{task_id}.md"
-                plan_path = ld / "plans" / f"{task_id}.md"
-
             result = dict(snapshot)
-            result["notes_exists"] = notes_path.exists()
-            result["plan_exists"] = plan_path.exists()
+            result["notes_exists"], result["plan_exists"] = _docs_exist(ld, task_id, is_archived)
             result["artifacts"] = _read_artifact_info(ld, snapshot)
+            result["relationships_in"] = incoming_relationships(ld, task_id)
             result["has_active_session"] = bool(
                 snapshot.get("status") == "in_progress" and snapshot.get("assigned_to")
             )
@@ -376,27 +510,18 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 self._send_json(404, _err("NOT_FOUND", f"Task {task_id} not found"))
                 return
 
-            # Read events (latest 20)
-            events = read_task_events(ld, task_id, is_archived=is_archived)
-            events.reverse()
-            recent_events = events[:20]
-
-            # Materialize comments
+            # Read the log once: comments need the full history and the
+            # latest 20 events (newest first) come off its end.
             all_events = read_task_events(ld, task_id, is_archived=is_archived)
             comments = materialize_comments(all_events)
+            recent_events = all_events[-20:]
+            recent_events.reverse()
 
             # Enrich snapshot
             result = dict(snapshot)
-            if is_archived:
-                notes_path = ld / "archive" / "notes" / f"{task_id}.md"
-                plan_path = ld / "archive" / "plans" / f"{task_id}.md"
-            else:
-                notes_path = ld / "notes" / f"{task_id}.md"
-                plan_path = ld / "plans" / f"{task_id}.md"
-
-            result["notes_exists"] = notes_path.exists()
-            result["plan_exists"] = plan_path.exists()
+            result["notes_exists"], result["plan_exists"] = _docs_exist(ld, task_id, is_archived)
             result["artifacts"] = _read_artifact_info(ld, snapshot)
+            result["relationships_in"] = incoming_relationships(ld, task_id)
             result["has_active_session"] = bool(
                 snapshot.get("status") == "in_progress" and snapshot.get("assigned_to")
             )
@@ -407,6 +532,30 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
 
             self._send_json(200, _ok(result))
 
+        def _handle_event_stream(self) -> None:
+            """Handle GET /api/events/stream — push task changes as Server-Sent Events."""
+            feed = cache.feed
+            sub = feed.subscribe()
+            self.close_connection = True
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(b"retry: 3000\n\n")
+                while True:
+                    message = sub.get(KEEPALIVE_SECONDS)
+                    if message is None:
+                        self.wfile.write(b": keepalive\n\n")
+                        continue
+                    kind, data = message
+                    event_id = data["event"].get("id") if kind == "task" else None
+                    self.wfile.write(format_message(kind, data, message_id=event_id))
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away
+            finally:
+                feed.unsubscribe(sub)
+
         def _handle_activity(self, ld: Path) -> None:
             # Re-parse path to get query string (since _route_api strips it)
             parsed = urlparse(self.path)
@@ -425,6 +574,14 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 offset = max(0, int(_qs("offset") or "0"))
             except (ValueError, TypeError):
                 offset = 0
+            cursor: tuple[str, str] | None = None
+            cursor_param = _qs("cursor")
+            if cursor_param:
+                try:
+                    cursor = decode_cursor(cursor_param)
+                except ValueError:
+                    self._send_json(400, _err("VALIDATION_ERROR", "Invalid activity cursor"))
+                    return
 
             type_filter = _qs("type")
             task_param = _qs("task")
@@ -460,6 +617,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                                         "offset": offset,
                                         "limit": limit,
                                         "has_more": False,
+                                        "next_cursor": None,
                                         "facets": {"types": [], "actors": [], "tasks": []},
                                     }
                                 ),
@@ -475,7 +633,32 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                         )
                         return
 
-            # Collect events — full scan when filters active, tail otherwise
+            # Served from the global event index: filter on its columns, then
+            # seek to just the events on the requested page.
+            if event_index.refresh():
+                self._send_json(
+                    200,
+                    _ok(
+                        _activity_page_from_index(
+                            event_index,
+                            ld,
+                            include_archived=has_filters,
+                            type_filter=type_filter,
+                            task_filter=task_filter,
+                            actor_filter=actor_filter,
+                            after=after,
+                            before=before,
+                            search=search,
+                            limit=limit,
+                            offset=offset,
+                            cursor=cursor,
+                        )
+                    ),
+                )
+                return
+
+            # Fallback (index unavailable): collect events — full scan when
+            # filters active, tail otherwise
             all_events = _collect_events(ld, full_scan=has_filters, tail_n=10)
 
             # Build facets from the full (unfiltered) set for dropdown population
@@ -508,6 +691,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                         "offset": offset,
                         "limit": limit,
                         "has_more": has_more,
+                        "next_cursor": None,
                         "facets": facets,
                     }
                 ),
@@ -526,34 +710,14 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             self._send_json(200, _ok(stats))
 
         def _handle_archived(self, ld: Path) -> None:
-            archive_dir = ld / "archive" / "tasks"
-            snapshots: list[dict] = []
-            if archive_dir.is_dir():
-                for task_file in sorted(archive_dir.glob("*.json")):
-                    try:
-                        snap = json.loads(task_file.read_text())
-                    except (json.JSONDecodeError, OSError):
-                        continue
-                    compact = compact_snapshot(snap)
-                    compact["updated_at"] = snap.get("updated_at")
-                    compact["created_at"] = snap.get("created_at")
-                    compact["done_at"] = snap.get("done_at")
-                    compact["archived"] = True
-                    snapshots.append(compact)
+            _active, archived = cache.snapshots()
+            snapshots = [task_row(snap, archived=True) for snap in archived]
             snapshots.sort(key=lambda s: s.get("id", ""))
             self._send_json(200, _ok(snapshots))
 
         def _handle_graph(self, ld: Path) -> None:
             """Handle GET /api/graph — return nodes + directed edges for graph visualization."""
-            tasks_dir = ld / "tasks"
-            snapshots: list[dict] = []
-            if tasks_dir.is_dir():
-                for task_file in sorted(tasks_dir.glob("*.json")):
-                    try:
-                        snap = json.loads(task_file.read_text())
-                    except (json.JSONDecodeError, OSError):
-                        continue
-                    snapshots.append(snap)
+            snapshots, _archived = cache.snapshots(include_archived=False)
 
             # Build set of active task IDs for filtering link targets
             active_ids: set[str] = {s["id"] for s in snapshots if "id" in s}
@@ -600,26 +764,10 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                             }
                         )
 
-            # Revision string for cheap change detection
+            # Revision string for cheap change detection by the cube/web views
             revision = f"{len(nodes)}:{max_updated_at}"
 
-            # ETag / 304 support — return early if client has current data
-            etag = f'"{revision}"'  # ETags must be quoted per RFC 7232
-            if_none_match = self.headers.get("If-None-Match")
-            if if_none_match and if_none_match == etag:
-                self.send_response(304)
-                self.send_header("ETag", etag)
-                self.end_headers()
-                return
-
-            body = _ok({"nodes": nodes, "links": links, "revision": revision})
-            data = body.encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.send_header("ETag", etag)
-            self.end_headers()
-            self.wfile.write(data)
+            self._send_json(200, _ok({"nodes": nodes, "links": links, "revision": revision}))
 
         # ---------------------------------------------------------------
         # Git API handlers
@@ -636,33 +784,23 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 self._send_json(200, _ok(summary))
                 return
 
-            # ETag / 304 support
-            etag = f'"{etag_value}"'
-            if_none_match = self.headers.get("If-None-Match")
-            if if_none_match and if_none_match == etag:
-                self.send_response(304)
-                self.send_header("ETag", etag)
-                self.end_headers()
+            # ETag / 304 support (git state is not covered by the .lattice/ revision)
+            self._etag = f'"{etag_value}"'
+            if _etag_matches(self.headers.get("If-None-Match"), self._etag):
+                self._send_not_modified(self._etag)
                 return
 
-            body = _ok(summary)
-            data = body.encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.send_header("ETag", etag)
-            self.send_header("Cache-Control", "max-age=30")
-            self.end_headers()
-            self.wfile.write(data)
+            # Refreshed in the background as refs move; revalidate every time
+            self._send_json(200, _ok(summary), cache_control="no-cache")
 
         def _handle_git_branch_commits(self, ld: Path, branch_name: str) -> None:
             """Handle GET /api/git/branches/<name>/commits — recent commits for a branch."""
             from urllib.parse import unquote
 
+            from lattice.dashboard.commit_index import branch_commits
             from lattice.dashboard.git_reader import (
                 _validate_branch_name,
                 find_git_root,
-                get_recent_commits,
                 git_available,
             )
 
@@ -696,7 +834,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 )
                 return
 
-            commits = get_recent_commits(repo_root, branch_name)
+            commits = branch_commits(ld, repo_root, branch_name)
             self._send_json(
                 200,
                 _ok(
@@ -784,7 +922,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 )
                 return
 
-            # Read snapshot (outside lock — acceptable TOCTOU at v0 scale)
+            # Read snapshot (dashboard writes are serialized by the cache write lock)
             snapshot = _read_snapshot(ld, task_id)
             if snapshot is None:
                 self._send_json(404, _err("NOT_FOUND", f"Task {task_id} not found"))
@@ -1464,8 +1602,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 return
 
             # Check if already archived
-            archive_check = ld / "archive" / "tasks" / f"{task_id}.json"
-            if archive_check.is_file():
+            if _read_snapshot_archive(ld, task_id) is not None:
                 self._send_json(400, _err("CONFLICT", f"Task {task_id} is already archived"))
                 return
 
@@ -1488,56 +1625,15 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                     )
                     updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-                    # 1. Append event to per-task log
-                    event_path = ld / "events" / f"{task_id}.jsonl"
-                    jsonl_append(event_path, serialize_event(event))
-
-                    # 2. Append to lifecycle log
-                    lifecycle_path = ld / "events" / "_lifecycle.jsonl"
-                    jsonl_append(lifecycle_path, serialize_event(event))
-
-                    # 3. Write snapshot to archive
-                    atomic_write(
-                        ld / "archive" / "tasks" / f"{task_id}.json",
-                        serialize_snapshot(updated_snapshot),
-                    )
-
-                    # 4. Remove active snapshot
-                    snapshot_path = ld / "tasks" / f"{task_id}.json"
-                    if snapshot_path.exists():
-                        snapshot_path.unlink()
-
-                    # 5. Move event log to archive
-                    if event_path.exists():
-                        shutil.move(
-                            str(event_path),
-                            str(ld / "archive" / "events" / f"{task_id}.jsonl"),
-                        )
-
-                    # 6. Move notes if they exist
-                    notes_path = ld / "notes" / f"{task_id}.md"
-                    if notes_path.exists():
-                        shutil.move(
-                            str(notes_path),
-                            str(ld / "archive" / "notes" / f"{task_id}.md"),
-                        )
-
-                    # 7. Move plans if they exist
-                    plans_path = ld / "plans" / f"{task_id}.md"
-                    if plans_path.exists():
-                        (ld / "archive" / "plans").mkdir(parents=True, exist_ok=True)
-                        shutil.move(
-                            str(plans_path),
-                            str(ld / "archive" / "plans" / f"{task_id}.md"),
-                        )
+                    archive_task_files(ld, task_id, event, updated_snapshot)
 
             except Exception as exc:
                 self._send_json(500, _err("WRITE_ERROR", f"Failed to archive task: {exc}"))
                 return
 
-            # Fire hooks after locks released
+            # Fire hooks after locks released (including the dashboard write lock)
             if event is not None:
-                execute_hooks(config, ld, task_id, event)
+                self._deferred_hooks.append(lambda: execute_hooks(config, ld, task_id, event))
 
             self._send_json(200, _ok({"message": f"Task {task_id} archived"}))
 
@@ -1885,6 +1981,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             # Resolve notes path (check active, then archive)
             notes_path = ld / "notes" / f"{task_id}.md"
             if not notes_path.is_file():
+                _unpack_for_edit(ld, task_id)
                 notes_path = ld / "archive" / "notes" / f"{task_id}.md"
             if not notes_path.is_file():
                 self._send_json(404, _err("NOT_FOUND", f"No notes file for task {task_id}"))
@@ -1928,6 +2025,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             # Resolve plan path (check active, then archive, then scaffold)
             plan_path = ld / "plans" / f"{task_id}.md"
             if not plan_path.is_file():
+                _unpack_for_edit(ld, task_id)
                 plan_path = ld / "archive" / "plans" / f"{task_id}.md"
             if not plan_path.is_file():
                 # Scaffold a fresh plan file so the user lands in a useful template
@@ -1978,34 +2076,37 @@ def _collect_events(ld: Path, *, full_scan: bool = False, tail_n: int = 10) -> l
     """Read events from all JSONL files in the events directory.
 
     When *full_scan* is True, reads every line.  Otherwise reads the last
-    *tail_n* lines from each file (fast path for the unfiltered default).
+    *tail_n* records from each file by seeking backward from EOF (fast path
+    for the unfiltered default — cost is independent of history length).
     Also scans archived events when doing a full scan.
     """
     all_events: list[dict] = []
-    dirs = [ld / "events"]
+    files = task_event_files(ld) + resource_event_files(ld)
     if full_scan:
-        archive_events = ld / "archive" / "events"
-        if archive_events.is_dir():
-            dirs.append(archive_events)
+        archived_files = task_event_files(ld, archived=True)
+        files += archived_files
+        for _task_id, data in packed_event_logs(ld, skip={f.stem for f in archived_files}):
+            for line in data.splitlines():
+                try:
+                    all_events.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
 
-    for events_dir in dirs:
-        if not events_dir.is_dir():
+    for event_file in files:
+        if not full_scan:
+            all_events.extend(read_jsonl_tail(event_file, tail_n))
             continue
-        for event_file in events_dir.glob("*.jsonl"):
-            if event_file.name == "_lifecycle.jsonl":
-                continue
-            try:
-                lines = event_file.read_text().splitlines()
-            except OSError:
-                continue
-            subset = lines if full_scan else lines[-tail_n:]
-            for line in subset:
-                line = line.strip()
-                if line:
-                    try:
-                        all_events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+        try:
+            lines = event_file.read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            line = line.strip()
+            if line:
+                try:
+                    all_events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
     return all_events
 
 
@@ -2025,27 +2126,93 @@ def _build_facets(events: list[dict], ld: Path) -> dict:
         if ev.get("task_id"):
             task_ids.add(ev["task_id"])
 
-    # Build task info list with short_id and title from snapshots
+    return {
+        "types": sorted(types),
+        "actors": sorted(actors),
+        "tasks": _task_facet_info(task_ids, ld),
+    }
+
+
+def _task_facet_info(task_ids: set[str], ld: Path) -> list[dict]:
+    """Build the task facet list (id, short_id, title) from the task catalog."""
+    active, archived = load_snapshots(ld)
+    by_id = {snap.get("id"): snap for snap in archived}
+    by_id.update((snap.get("id"), snap) for snap in active)
+
     task_info: list[dict] = []
     for tid in sorted(task_ids):
         info: dict = {"id": tid}
-        # Try active snapshot
-        snap_path = ld / "tasks" / f"{tid}.json"
-        if not snap_path.is_file():
-            snap_path = ld / "archive" / "tasks" / f"{tid}.json"
-        if snap_path.is_file():
-            try:
-                snap = json.loads(snap_path.read_text())
-                info["short_id"] = snap.get("short_id")
-                info["title"] = snap.get("title")
-            except (json.JSONDecodeError, OSError):
-                pass
+        snap = by_id.get(tid)
+        if snap is not None:
+            info["short_id"] = snap.get("short_id")
+            info["title"] = snap.get("title")
         task_info.append(info)
+    return task_info
+
+
+def _activity_page_from_index(
+    index: EventIndex,
+    ld: Path,
+    *,
+    include_archived: bool,
+    type_filter: str | None,
+    task_filter: str | None,
+    actor_filter: str | None,
+    after: str | None,
+    before: str | None,
+    search: str | None,
+    limit: int,
+    offset: int,
+    cursor: tuple[str, str] | None,
+) -> dict:
+    """Build an /api/activity response body from the global event index.
+
+    Type/task/actor/date filters run on index columns; only the events on the
+    returned page are decoded (plus the candidates, when *search* is given,
+    since it matches against event data).
+    """
+    base = index.select(include_archived=include_archived)
+    facets = {
+        "types": sorted({row[ROW_TYPE] for row in base if row[ROW_TYPE]}),
+        "actors": sorted({row[ROW_ACTOR] for row in base if row[ROW_ACTOR]}),
+        "tasks": _task_facet_info({row[ROW_TASK_ID] for row in base if row[ROW_TASK_ID]}, ld),
+    }
+
+    rows = index.select(
+        types={t.strip() for t in type_filter.split(",")} if type_filter else None,
+        task_id=task_filter,
+        actor=actor_filter,
+        after=after,
+        before=before,
+        include_archived=include_archived,
+    )
+
+    decoded: dict[str, dict] = {}
+    if search:
+        search_lower = search.lower()
+        matching: list = []
+        for row in rows:
+            ev = index.read_event(row)
+            if ev is not None and _event_matches_search(ev, search_lower):
+                decoded[row[ROW_ID]] = ev
+                matching.append(row)
+        rows = matching
+
+    page, has_more = page_rows(rows, limit=limit, offset=offset, cursor=cursor)
+    events: list[dict] = []
+    for row in page:
+        ev = decoded.get(row[ROW_ID]) or index.read_event(row)
+        if ev is not None:
+            events.append(ev)
 
     return {
-        "types": sorted(types),
-        "actors": sorted(actors),
-        "tasks": task_info,
+        "events": events,
+        "total": len(rows),
+        "offset": offset,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(page[-1]) if has_more and page else None,
+        "facets": facets,
     }
 
 
@@ -2084,26 +2251,27 @@ def _apply_activity_filters(
 
     if search:
         search_lower = search.lower()
+        result = [e for e in result if _event_matches_search(e, search_lower)]
 
-        def _matches(ev: dict) -> bool:
-            from lattice.core.events import get_actor_display
+    return result
 
-            # Search in event data values (comment bodies, field values, etc.)
-            data = ev.get("data") or {}
-            for v in data.values():
-                if isinstance(v, str) and search_lower in v.lower():
-                    return True
-            # Also search in actor and type
-            actor_str = get_actor_display(ev["actor"]) if ev.get("actor") else ""
-            if search_lower in actor_str.lower():
-                return True
-            if search_lower in (ev.get("type") or "").lower():
-                return True
-            return False
 
-        result = [e for e in result if _matches(e)]
+def _event_matches_search(ev: dict, search_lower: str) -> bool:
+    """Case-insensitive free-text match against event data values, actor and type."""
+    from lattice.core.events import get_actor_display
 
-    return result
+    # Search in event data values (comment bodies, field values, etc.)
+    data = ev.get("data") or {}
+    for v in data.values():
+        if isinstance(v, str) and search_lower in v.lower():
+            return True
+    # Also search in actor and type
+    actor_str = get_actor_display(ev["actor"]) if ev.get("actor") else ""
+    if search_lower in actor_str.lower():
+        return True
+    if search_lower in (ev.get("type") or "").lower():
+        return True
+    return False
 
 
 # ---------------------------------------------------------------------------
@@ -2112,7 +2280,7 @@ def _apply_activity_filters(
 
 
 def _read_snapshot(ld: Path, task_id: str) -> dict | None:
-    path = ld / "tasks" / f"{task_id}.json"
+    path = task_snapshot_path(ld, task_id)
     if not path.is_file():
         return None
     try:
@@ -2122,15 +2290,30 @@ def _read_snapshot(ld: Path, task_id: str) -> dict | None:
 
 
 def _read_snapshot_archive(ld: Path, task_id: str) -> dict | None:
-    path = ld / "archive" / "tasks" / f"{task_id}.json"
-    if not path.is_file():
-        return None
     try:
-        return json.loads(path.read_text())
+        return read_archived_snapshot(ld, task_id)
     except (json.JSONDecodeError, OSError):
         return None
 
 
+def _docs_exist(ld: Path, task_id: str, is_archived: bool) -> tuple[bool, bool]:
+    """Return (notes_exists, plan_exists) for an active or archived task."""
+    if is_archived:
+        return (
+            read_archived_doc(ld, task_id, "notes") is not None,
+            read_archived_doc(ld, task_id, "plan") is not None,
+        )
+    return (ld / "notes" / f"{task_id}.md").exists(), (ld / "plans" / f"{task_id}.md").exists()
+
+
+def _unpack_for_edit(ld: Path, task_id: str) -> None:
+    """Restore a packed archived task's loose files so they can be opened."""
+    if find_packed(ld, task_id) is None:
+        return
+    with multi_lock(ld / "locks", sorted([f"events_{task_id}", f"tasks_{task_id}"])):
+        unpack_task(ld, task_id)
+
+
 def _read_artifact_info(ld: Path, snapshot: dict) -> list[dict]:
     artifacts: list[dict] = []
     # Read from evidence_refs (new) with fallback to artifact_refs (legacy)
@@ -2175,8 +2358,8 @@ def _get_artifact_evidence_refs(snapshot: dict) -> list[tuple[str, str | None]]:
 
 def create_server(
     lattice_dir: Path, host: str, port: int, *, readonly: bool = False
-) -> HTTPServer:
-    """Create an HTTP server bound to *host*:*port* serving the Lattice dashboard.
+) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server bound to *host*:*port* serving the Lattice dashboard.
 
     Parameters
     ----------
@@ -2188,7 +2371,15 @@ def create_server(
         TCP port to listen on.
     readonly:
         If ``True``, all POST requests return 403 FORBIDDEN.
+
+    Each request runs on its own daemon thread, so a slow request (a large
+    activity page) never stalls other browser tabs.  Handlers share one
+    :class:`~lattice.dashboard.cache.DashboardCache`.  The git summary starts
+    building in the background here, so ``/api/git`` never waits on git.
     """
+    from lattice.dashboard.git_reader import prime_git_summary
+
     handler_cls = _make_handler_class(lattice_dir, readonly=readonly)
-    server = HTTPServer((host, port), handler_cls)
+    server = ThreadingHTTPServer((host, port), handler_cls)
+    prime_git_summary(lattice_dir)
     return server
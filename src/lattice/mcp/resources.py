@@ -7,7 +7,10 @@ from pathlib import Path
 
 from lattice.core.ids import is_short_id, validate_id
 from lattice.mcp.server import mcp
+from lattice.storage.catalog import load_snapshots
 from lattice.storage.fs import find_root
+from lattice.storage.layout import task_snapshot_path
+from lattice.storage.readers import read_archived_doc, read_archived_snapshot, read_task_events
 from lattice.storage.short_ids import resolve_short_id
 
 
@@ -39,33 +42,13 @@ def _resolve_task_id(lattice_dir: Path, raw_id: str) -> str:
 
 def _load_all_snapshots(lattice_dir: Path) -> list[dict]:
     """Load all active task snapshots."""
-    tasks_dir = lattice_dir / "tasks"
-    snapshots: list[dict] = []
-    if tasks_dir.is_dir():
-        for task_file in sorted(tasks_dir.glob("*.json")):
-            try:
-                snapshots.append(json.loads(task_file.read_text()))
-            except (json.JSONDecodeError, OSError):
-                continue
-    return snapshots
+    active, _archived = load_snapshots(lattice_dir, include_archived=False)
+    return active
 
 
 def _read_events(lattice_dir: Path, task_id: str, is_archived: bool = False) -> list[dict]:
     """Read all events for a task."""
-    if is_archived:
-        event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
-    else:
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-    events: list[dict] = []
-    if event_path.exists():
-        for line in event_path.read_text().splitlines():
-            line = line.strip()
-            if line:
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    return events
+    return read_task_events(lattice_dir, task_id, is_archived=is_archived)
 
 
 # ---------------------------------------------------------------------------
@@ -88,17 +71,15 @@ def resource_task_detail(task_id: str) -> str:
     task_id = _resolve_task_id(lattice_dir, task_id)
 
     # Try active first
-    snap_path = lattice_dir / "tasks" / f"{task_id}.json"
+    snap_path = task_snapshot_path(lattice_dir, task_id)
     is_archived = False
     if snap_path.exists():
         snapshot = json.loads(snap_path.read_text())
     else:
-        archive_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-        if archive_path.exists():
-            snapshot = json.loads(archive_path.read_text())
-            is_archived = True
-        else:
+        snapshot = read_archived_snapshot(lattice_dir, task_id)
+        if snapshot is None:
             raise ValueError(f"Task {task_id} not found.")
+        is_archived = True
 
     result = dict(snapshot)
     if is_archived:
@@ -142,10 +123,10 @@ def resource_notes(task_id: str) -> str:
     if notes_path.exists():
         return notes_path.read_text()
 
-    # Check archive
-    archive_notes = lattice_dir / "archive" / "notes" / f"{task_id}.md"
-    if archive_notes.exists():
-        return archive_notes.read_text()
+    # Check archive (loose or packed)
+    archive_notes = read_archived_doc(lattice_dir, task_id, "notes")
+    if archive_notes is not None:
+        return archive_notes
 
     raise ValueError(f"No notes file found for task {task_id}.")
 
@@ -160,9 +141,9 @@ def resource_plans(task_id: str) -> str:
     if plan_path.exists():
         return plan_path.read_text()
 
-    # Check archive
-    archive_plans = lattice_dir / "archive" / "plans" / f"{task_id}.md"
-    if archive_plans.exists():
-        return archive_plans.read_text()
+    # Check archive (loose or packed)
+    archive_plans = read_archived_doc(lattice_dir, task_id, "plan")
+    if archive_plans is not None:
+        return archive_plans
 
     raise ValueError(f"No plan file found for task {task_id}.")
@@ -34,7 +34,6 @@ from lattice.core.events import (
     BUILTIN_EVENT_TYPES,
     create_event,
     get_actor_display,
-    serialize_event,
     validate_custom_event_type,
 )
 from lattice.core.ids import (
@@ -45,13 +44,31 @@ from lattice.core.ids import (
     validate_id,
 )
 from lattice.core.relationships import RELATIONSHIP_TYPES, validate_relationship_type
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.core.tasks import apply_event_to_snapshot
 from lattice.mcp.server import mcp
-from lattice.storage.fs import atomic_write, find_root, jsonl_append
+from lattice.storage.archive_packs import packed_task_ids
+from lattice.storage.batch import run_batch
+from lattice.storage.blocking_index import blocked_task_ids
+from lattice.storage.catalog import load_snapshots
+from lattice.storage.fs import atomic_write, find_root
 from lattice.storage.hooks import execute_hooks
+from lattice.storage.layout import (
+    task_event_files,
+    task_event_path,
+    task_snapshot_files,
+    task_snapshot_path,
+)
 from lattice.storage.locks import multi_lock
-from lattice.storage.operations import scaffold_plan, write_task_event
-from lattice.storage.readers import read_task_events
+from lattice.storage.operations import (
+    archive_task_files,
+    claim_tasks,
+    scaffold_plan,
+    unarchive_task_files,
+    write_task_event,
+)
+from lattice.storage.readers import read_archived_doc, read_archived_snapshot, read_task_events
+from lattice.storage.ready_queue import queue_select_batch, queue_select_next
+from lattice.storage.relationship_index import incoming_relationships
 from lattice.storage.short_ids import allocate_short_id, resolve_short_id
 
 logger = logging.getLogger(__name__)
@@ -99,7 +116,7 @@ def _resolve_task_id(lattice_dir: Path, raw_id: str) -> str:
 
 def _read_snapshot(lattice_dir: Path, task_id: str) -> dict | None:
     """Read a task snapshot, returning None if not found."""
-    path = lattice_dir / "tasks" / f"{task_id}.json"
+    path = task_snapshot_path(lattice_dir, task_id)
     if not path.exists():
         return None
     return json.loads(path.read_text())
@@ -183,7 +200,7 @@ def lattice_create(
         if not validate_id(task_id, "task"):
             raise ValueError(f"Invalid task ID format: '{task_id}'.")
         # Idempotency check with payload comparison (matches CLI behavior)
-        existing_path = lattice_dir / "tasks" / f"{task_id}.json"
+        existing_path = task_snapshot_path(lattice_dir, task_id)
         if existing_path.exists():
             existing = json.loads(existing_path.read_text())
             _compare_fields = (
@@ -531,7 +548,7 @@ def lattice_link(
     snapshot = _read_snapshot_or_error(lattice_dir, source_id)
 
     # Check target exists
-    if not (lattice_dir / "tasks" / f"{target_id}.json").exists():
+    if not (task_snapshot_path(lattice_dir, target_id)).exists():
         raise ValueError(f"Target task {target_id} not found.")
 
     # Reject duplicates
@@ -692,8 +709,7 @@ def lattice_archive(
 
     snapshot = _read_snapshot(lattice_dir, task_id)
     if snapshot is None:
-        archive_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-        if archive_path.exists():
+        if read_archived_snapshot(lattice_dir, task_id) is not None:
             raise ValueError(f"Task {task_id} is already archived.")
         raise ValueError(f"Task {task_id} not found.")
 
@@ -704,41 +720,7 @@ def lattice_archive(
     lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
 
     with multi_lock(locks_dir, lock_keys):
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        atomic_write(
-            lattice_dir / "archive" / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        if snapshot_path.exists():
-            snapshot_path.unlink()
-
-        shutil.move(
-            str(event_path),
-            str(lattice_dir / "archive" / "events" / f"{task_id}.jsonl"),
-        )
-
-        notes_path = lattice_dir / "notes" / f"{task_id}.md"
-        if notes_path.exists():
-            shutil.move(
-                str(notes_path),
-                str(lattice_dir / "archive" / "notes" / f"{task_id}.md"),
-            )
-
-        plan_path = lattice_dir / "plans" / f"{task_id}.md"
-        if plan_path.exists():
-            archive_plans_dir = lattice_dir / "archive" / "plans"
-            archive_plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(plan_path),
-                str(archive_plans_dir / f"{task_id}.md"),
-            )
+        archive_task_files(lattice_dir, task_id, event, updated_snapshot)
 
     # Fire hooks after locks released
     execute_hooks(config, lattice_dir, task_id, event)
@@ -760,15 +742,14 @@ def lattice_unarchive(
     _validate_actor(actor)
     task_id = _resolve_task_id(lattice_dir, task_id)
 
-    active_path = lattice_dir / "tasks" / f"{task_id}.json"
+    active_path = task_snapshot_path(lattice_dir, task_id)
     if active_path.exists():
         raise ValueError(f"Task {task_id} is already active.")
 
-    archive_snapshot_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-    if not archive_snapshot_path.exists():
+    snapshot = read_archived_snapshot(lattice_dir, task_id)
+    if snapshot is None:
         raise ValueError(f"Task {task_id} not found in archive.")
 
-    snapshot = json.loads(archive_snapshot_path.read_text())
     event = create_event(type="task_unarchived", task_id=task_id, actor=actor, data={})
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
@@ -776,39 +757,7 @@ def lattice_unarchive(
     lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
 
     with multi_lock(locks_dir, lock_keys):
-        archive_event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
-        jsonl_append(archive_event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        shutil.move(
-            str(archive_event_path),
-            str(lattice_dir / "events" / f"{task_id}.jsonl"),
-        )
-
-        atomic_write(
-            lattice_dir / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        archive_snapshot_path.unlink()
-
-        archive_notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
-        if archive_notes_path.exists():
-            shutil.move(
-                str(archive_notes_path),
-                str(lattice_dir / "notes" / f"{task_id}.md"),
-            )
-
-        archive_plan_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
-        if archive_plan_path.exists():
-            plans_dir = lattice_dir / "plans"
-            plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(archive_plan_path),
-                str(plans_dir / f"{task_id}.md"),
-            )
+        unarchive_task_files(lattice_dir, task_id, event, updated_snapshot)
 
     # Fire hooks after locks released
     execute_hooks(config, lattice_dir, task_id, event)
@@ -875,12 +824,7 @@ def lattice_branch_link(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
@@ -937,12 +881,7 @@ def lattice_branch_unlink(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
@@ -1161,6 +1100,41 @@ def lattice_unreact(
     return updated_snapshot
 
 
+@mcp.tool()
+def lattice_batch(
+    operations: Annotated[
+        list[dict],
+        Field(
+            description=(
+                "Operations to apply in order, e.g. "
+                '{"op": "create", "title": "...", "ref": "a"}, '
+                '{"op": "status", "task": "@a", "status": "planned"}. '
+                "Ops: create, update, status, assign, comment, link, unlink."
+            )
+        ),
+    ],
+    actor: Annotated[str, Field(description="Actor performing the operations")],
+    lattice_root: Annotated[
+        str | None, Field(description="Path to project directory containing .lattice/")
+    ] = None,
+) -> dict:
+    """Apply several task operations at once, all-or-nothing.
+
+    Locks every affected task once and writes each task a single time.
+    ``@name`` refers to a task created earlier in the batch with ``ref``.
+    Returns ``committed`` and one result per operation; if any operation
+    fails, nothing is written.
+    """
+    lattice_dir = _find_root(lattice_root)
+    config = _load_config(lattice_dir)
+    _validate_actor(actor)
+    if not all(isinstance(op, dict) for op in operations):
+        raise ValueError("Each operation must be an object.")
+
+    committed, results = run_batch(lattice_dir, operations, actor, config)
+    return {"committed": committed, "results": results}
+
+
 # ---------------------------------------------------------------------------
 # Read tools
 # ---------------------------------------------------------------------------
@@ -1197,16 +1171,7 @@ def lattice_list(
 ) -> list[dict]:
     """List active Lattice tasks with optional filters. Returns list of task snapshots."""
     lattice_dir = _find_root(lattice_root)
-    tasks_dir = lattice_dir / "tasks"
-    snapshots: list[dict] = []
-
-    if tasks_dir.is_dir():
-        for task_file in sorted(tasks_dir.glob("*.json")):
-            try:
-                snap = json.loads(task_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            snapshots.append(snap)
+    snapshots, _archived = load_snapshots(lattice_dir, include_archived=False)
 
     filtered: list[dict] = []
     for snap in snapshots:
@@ -1228,6 +1193,82 @@ def lattice_list(
     return filtered
 
 
+@mcp.tool()
+def lattice_next(
+    actor: Annotated[
+        str | None,
+        Field(description="Who is asking; resumes their in-progress work first"),
+    ] = None,
+    statuses: Annotated[
+        str | None,
+        Field(description="Comma-separated statuses to consider (default: backlog,planned)"),
+    ] = None,
+    lattice_root: Annotated[
+        str | None, Field(description="Path to project directory containing .lattice/")
+    ] = None,
+) -> dict | None:
+    """Pick the highest-priority ready task. Returns its snapshot, or null if none.
+
+    Tasks still waiting on an open blocks/depends_on prerequisite are skipped.
+    Read-only: use lattice_assign and lattice_status to claim the task.
+    """
+    lattice_dir = _find_root(lattice_root)
+    ready_statuses = None
+    if statuses is not None:
+        ready_statuses = frozenset(s.strip() for s in statuses.split(",") if s.strip())
+    return queue_select_next(
+        lattice_dir,
+        actor=actor,
+        ready_statuses=ready_statuses,
+        blocked=blocked_task_ids(lattice_dir),
+    )
+
+
+@mcp.tool()
+def lattice_claim_next(
+    actor: Annotated[str, Field(description="Actor performing the claim")],
+    count: Annotated[int, Field(description="Number of tasks to claim", ge=1)] = 1,
+    workers: Annotated[
+        list[str] | None,
+        Field(description="Claim one task for each of these actors (default: actor)"),
+    ] = None,
+    statuses: Annotated[
+        str | None,
+        Field(description="Comma-separated statuses to consider (default: backlog,planned)"),
+    ] = None,
+    lattice_root: Annotated[
+        str | None, Field(description="Path to project directory containing .lattice/")
+    ] = None,
+) -> dict:
+    """Claim the top ready tasks: assign each and move it to in_progress.
+
+    With *workers*, claims one task per worker (*count* is ignored); otherwise
+    *count* tasks for *actor*.  All tasks are locked in one pass.  Returns
+    ``claimed`` snapshots and ``skipped`` entries for tasks someone else
+    claimed first.
+    """
+    lattice_dir = _find_root(lattice_root)
+    config = _load_config(lattice_dir)
+    _validate_actor(actor)
+    claimants = list(workers) if workers else [actor] * count
+    for claimant in claimants:
+        _validate_actor(claimant)
+    ready_statuses = None
+    if statuses is not None:
+        ready_statuses = frozenset(s.strip() for s in statuses.split(",") if s.strip())
+
+    pairs = queue_select_batch(
+        lattice_dir,
+        claimants,
+        ready_statuses=ready_statuses,
+        blocked=blocked_task_ids(lattice_dir),
+    )
+    claimed, skipped = claim_tasks(
+        lattice_dir, [(snap["id"], claimant) for claimant, snap in pairs], actor, config
+    )
+    return {"claimed": claimed, "skipped": skipped}
+
+
 @mcp.tool()
 def lattice_show(
     task_id: Annotated[str, Field(description="Task ID (ULID or short ID)")],
@@ -1244,10 +1285,8 @@ def lattice_show(
     is_archived = False
 
     if snapshot is None:
-        archive_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
-        if archive_path.exists():
-            snapshot = json.loads(archive_path.read_text())
-            is_archived = True
+        snapshot = read_archived_snapshot(lattice_dir, task_id)
+        is_archived = snapshot is not None
 
     if snapshot is None:
         raise ValueError(f"Task {task_id} not found.")
@@ -1259,20 +1298,18 @@ def lattice_show(
     if include_events:
         result["events"] = _read_events(lattice_dir, task_id, is_archived)
 
-    # Check for notes
-    if is_archived:
-        notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
-    else:
-        notes_path = lattice_dir / "notes" / f"{task_id}.md"
-    if notes_path.exists():
-        result["notes_path"] = f"notes/{task_id}.md"
+    result["relationships_in"] = incoming_relationships(lattice_dir, task_id)
 
-    # Check for plan
+    # Check for notes and plan (archived ones may be packed)
     if is_archived:
-        plan_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
+        has_notes = read_archived_doc(lattice_dir, task_id, "notes") is not None
+        has_plan = read_archived_doc(lattice_dir, task_id, "plan") is not None
     else:
-        plan_path = lattice_dir / "plans" / f"{task_id}.md"
-    if plan_path.exists():
+        has_notes = (lattice_dir / "notes" / f"{task_id}.md").exists()
+        has_plan = (lattice_dir / "plans" / f"{task_id}.md").exists()
+    if has_notes:
+        result["notes_path"] = f"notes/{task_id}.md"
+    if has_plan:
         result["plan_path"] = f"plans/{task_id}.md"
 
     return result
@@ -1330,40 +1367,36 @@ def lattice_doctor(
             issues.append({"level": "warning", "message": msg})
 
     # Check snapshots have matching event logs
-    tasks_dir = lattice_dir / "tasks"
-    if tasks_dir.is_dir():
-        for snap_file in tasks_dir.glob("*.json"):
-            tid = snap_file.stem
-            event_file = lattice_dir / "events" / f"{tid}.jsonl"
-            if not event_file.exists():
-                issues.append(
-                    {
-                        "level": "warning",
-                        "message": f"Task {tid} has snapshot but no event log",
-                    }
-                )
+    snapshot_files = task_snapshot_files(lattice_dir)
+    for snap_file in snapshot_files:
+        tid = snap_file.stem
+        event_file = task_event_path(lattice_dir, tid)
+        if not event_file.exists():
+            issues.append(
+                {
+                    "level": "warning",
+                    "message": f"Task {tid} has snapshot but no event log",
+                }
+            )
 
     # Check event logs have matching snapshots
-    events_dir = lattice_dir / "events"
-    if events_dir.is_dir():
-        for event_file in events_dir.glob("*.jsonl"):
-            if event_file.name.startswith("_"):
-                continue
-            tid = event_file.stem
-            snap_file = lattice_dir / "tasks" / f"{tid}.json"
-            if not snap_file.exists():
-                issues.append(
-                    {
-                        "level": "warning",
-                        "message": f"Event log {tid} has no matching snapshot (orphaned)",
-                    }
-                )
+    for event_file in task_event_files(lattice_dir):
+        tid = event_file.stem
+        snap_file = task_snapshot_path(lattice_dir, tid)
+        if not snap_file.exists():
+            issues.append(
+                {
+                    "level": "warning",
+                    "message": f"Event log {tid} has no matching snapshot (orphaned)",
+                }
+            )
 
     return {
         "ok": len([i for i in issues if i["level"] == "error"]) == 0,
         "issues": issues,
-        "task_count": len(list(tasks_dir.glob("*.json"))) if tasks_dir.is_dir() else 0,
-        "archived_count": len(list((lattice_dir / "archive" / "tasks").glob("*.json")))
-        if (lattice_dir / "archive" / "tasks").is_dir()
-        else 0,
+        "task_count": len(snapshot_files),
+        "archived_count": len(
+            {f.stem for f in task_snapshot_files(lattice_dir, archived=True)}
+            | packed_task_ids(lattice_dir)
+        ),
     }
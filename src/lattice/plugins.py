@@ -1,8 +1,9 @@
 """Plugin discovery and loading via importlib.metadata entry points.
 
-Two entry point groups, zero new dependencies:
+Three entry point groups, zero new dependencies:
 - ``lattice.cli_plugins`` — register additional Click commands
 - ``lattice.template_blocks`` — provide additional CLAUDE.md template sections
+- ``lattice.hooks`` — in-process event hook handlers, referenced from config
 
 Plugin load failures are logged to stderr and never crash the host CLI.
 Set LATTICE_DEBUG=1 for full tracebacks on failures.
@@ -120,3 +121,43 @@ def discover_template_blocks() -> list[dict]:
             blocks.append(block)
 
     return blocks
+
+
+# ---------------------------------------------------------------------------
+# Hook handler plugins
+# ---------------------------------------------------------------------------
+
+HOOK_PLUGIN_GROUP = "lattice.hooks"
+
+# Configured hooks name these as ``"py:<entry point name>"`` (see
+# ``lattice.storage.hooks``).
+
+# Entry points are discovered once per process; handlers load on first use.
+_hook_entry_points: dict | None = None
+_loaded_hooks: dict = {}
+
+
+def discover_hook_plugins():
+    """Return entry points from the ``lattice.hooks`` group."""
+    return list(entry_points(group=HOOK_PLUGIN_GROUP))
+
+
+def load_hook_handler(name: str):
+    """Return the ``lattice.hooks`` handler registered as *name*.
+
+    Handlers are called as ``handler(event, env)``: the event dict (what a
+    shell hook reads on stdin) and the ``LATTICE_*`` variables a shell hook
+    would get.  Raises ``LookupError`` if no entry point has that name;
+    errors importing the handler propagate.
+    """
+    global _hook_entry_points
+    handler = _loaded_hooks.get(name)
+    if handler is not None:
+        return handler
+    if _hook_entry_points is None:
+        _hook_entry_points = {ep.name: ep for ep in discover_hook_plugins()}
+    ep = _hook_entry_points.get(name)
+    if ep is None:
+        raise LookupError(f"no '{HOOK_PLUGIN_GROUP}' entry point named '{name}'")
+    handler = _loaded_hooks[name] = ep.load()
+    return handler
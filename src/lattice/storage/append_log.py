@@ -0,0 +1,257 @@
+"""Shared file format and process cache for the derived append-only caches.
+
+The task catalog, relationship index, blocking index and ready queue are all
+kept the same way: a JSONL file under ``.lattice/cache/`` holding one record
+per item, grown by appended commits and folded back together once the tail
+gets large.  This module owns that format; each cache supplies a
+:class:`LogState` subclass that knows how to apply its own item records.
+
+File format:
+
+- ``{"kind": "header", "schema_version", "generation", "sig", "body_bytes"}``
+  — first line.  *sig* is the snapshot-directory signature captured before
+  the snapshots the file was built from were read.
+- item records (their ``kind`` is up to the cache) — written by a rebuild or
+  compaction.
+- ``{"kind": "commit", "records": [...], "sig": [...]}`` — appended by a
+  writer after a snapshot write.  Applies *records* in order, bumps the
+  generation by one and replaces the recorded signature.
+
+A file is fresh while its recorded signature matches the current one; a
+snapshot write that bypassed it changes the directory mtimes and so makes
+it stale.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from lattice.storage.fs import atomic_write, cache_path, ensure_cache_dir
+from lattice.storage.locks import LockTimeout, lattice_lock
+
+# Compact once the append tail has grown past this multiple of the base size.
+_COMPACT_RATIO = 2
+
+
+def dumps(obj: dict) -> str:
+    """Serialize one record as a compact, key-sorted JSONL line."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")) + "\n"
+
+
+class LogState:
+    """Replayed contents of an append log.
+
+    Subclasses add their own slots and implement :meth:`apply` and
+    :meth:`records`.
+    """
+
+    __slots__ = ("generation", "inode", "pos", "sig")
+
+    def __init__(self) -> None:
+        self.inode: int | None = None
+        self.pos = 0
+        self.generation = 0
+        self.sig: list | None = None
+
+    def apply(self, record: dict) -> None:
+        """Apply one item record."""
+        raise NotImplementedError
+
+    def records(self) -> list[dict]:
+        """Return the item records a compacted file holds, in file order."""
+        raise NotImplementedError
+
+
+_S = TypeVar("_S", bound=LogState)
+
+
+class AppendLog(Generic[_S]):  # noqa: UP046 - stay importable on 3.11
+    """One derived cache file: its format, process cache, writes and compaction."""
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        lock_name: str,
+        schema_version: int,
+        state_class: type[_S],
+        signature: Callable[[Path], list[int]],
+        compact_min_bytes: int = 64 * 1024,
+    ) -> None:
+        self.filename = filename
+        self.lock_name = lock_name
+        self.schema_version = schema_version
+        self.state_class = state_class
+        self.signature = signature
+        # Never bother compacting a file smaller than this.
+        self.compact_min_bytes = compact_min_bytes
+        self._cache: dict[Path, _S] = {}
+        self._cache_lock = threading.Lock()
+
+    def path(self, lattice_dir: Path) -> Path:
+        return cache_path(lattice_dir, self.filename)
+
+    @contextmanager
+    def lock(self, lattice_dir: Path, *, timeout: float = 10) -> Iterator[None]:
+        with lattice_lock(lattice_dir / "locks", self.lock_name, timeout=timeout):
+            yield
+
+    # -- reading ------------------------------------------------------------
+
+    def _ingest(self, state: _S, data: bytes) -> bool:
+        """Apply complete lines from *data*; False if the header is unsupported."""
+        for raw in data.splitlines():
+            try:
+                record = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # torn write; the signature check or doctor catches it
+            if not isinstance(record, dict):
+                continue
+            kind = record.get("kind")
+            if kind == "header":
+                if record.get("schema_version") != self.schema_version:
+                    return False
+                state.generation = record.get("generation", 0)
+                state.sig = record.get("sig")
+                continue
+            if kind == "commit":
+                for item in record.get("records", []):
+                    if isinstance(item, dict):
+                        state.apply(item)
+                state.generation += 1
+                state.sig = record.get("sig")
+            else:
+                state.apply(record)
+        return True
+
+    def parse(self, data: bytes) -> _S | None:
+        """Replay a whole file's bytes into a new state, or None if unsupported."""
+        state = self.state_class()
+        if not self._ingest(state, data):
+            return None
+        return state
+
+    def current_state(self, lattice_dir: Path) -> _S | None:
+        """Return the cached state brought up to date with disk, or None.
+
+        Only the bytes appended since the last call are read.  The returned
+        object is shared and must not be mutated.
+        """
+        path = self.path(lattice_dir)
+        with self._cache_lock:
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._cache.pop(lattice_dir, None)
+                return None
+            state = self._cache.get(lattice_dir)
+            if state is None or state.inode != st.st_ino or st.st_size < state.pos:
+                state = self.state_class()
+                state.inode = st.st_ino
+                self._cache[lattice_dir] = state
+            if st.st_size == state.pos:
+                return state
+            try:
+                with open(path, "rb") as fh:
+                    fh.seek(state.pos)
+                    data = fh.read(st.st_size - state.pos)
+            except OSError:
+                return None
+            # Only consume complete lines; a torn tail is picked up next time
+            end = data.rfind(b"\n") + 1
+            state.pos += end
+            if not self._ingest(state, data[:end]):
+                self._cache.pop(lattice_dir, None)
+                return None
+            return state
+
+    def fresh_state(self, lattice_dir: Path, rebuild: Callable[[Path], object]) -> _S | None:
+        """Return the cached state if its signature matches the snapshot directories.
+
+        A missing or stale file is regenerated with *rebuild* first.  Returns
+        None when it still cannot be trusted (e.g. a read-only project, or a
+        write racing with the rebuild); callers then scan the snapshots.
+        """
+        state = self.current_state(lattice_dir)
+        if state is not None and state.sig == self.signature(lattice_dir):
+            return state
+        try:
+            rebuild(lattice_dir)
+        except (LockTimeout, OSError):
+            pass
+        state = self.current_state(lattice_dir)
+        if state is not None and state.sig == self.signature(lattice_dir):
+            return state
+        return None
+
+    # -- writing ------------------------------------------------------------
+
+    def write_full(
+        self,
+        lattice_dir: Path,
+        records: list[dict],
+        *,
+        sig: list[int] | None,
+        generation: int = 0,
+    ) -> None:
+        """Atomically replace the file with a header plus *records*. Caller holds the lock."""
+        body = "".join(dumps(r) for r in records)
+        header = dumps(
+            {
+                "kind": "header",
+                "schema_version": self.schema_version,
+                "generation": generation,
+                "sig": sig,
+                "body_bytes": len(body.encode("utf-8")),
+            }
+        )
+        atomic_write(ensure_cache_dir(lattice_dir) / self.filename, header + body)
+
+    def append(self, lattice_dir: Path, records: list[dict]) -> None:
+        """Append a commit of *records* stamped with the current signature.
+
+        Call after the snapshot files are on disk.  *records* may be empty: a
+        write that does not affect this file still has to restamp it, or the
+        next reader would see a signature mismatch and regenerate it.  A
+        no-op when the file does not exist.  The append is not fsynced: the
+        file is derived, and a lost tail simply reads as stale.
+        """
+        path = self.path(lattice_dir)
+        if not path.exists():
+            return
+        with self.lock(lattice_dir):
+            if not path.exists():
+                return  # removed while we waited; appending would start a headerless file
+            commit = {"kind": "commit", "records": records, "sig": self.signature(lattice_dir)}
+            with open(path, "a", encoding="utf-8") as fh:
+                fh.write(dumps(commit))
+                size = fh.tell()
+            self._maybe_compact(lattice_dir, path, size)
+
+    def _maybe_compact(self, lattice_dir: Path, path: Path, size: int) -> None:
+        """Fold the commit tail back into item records once it has grown large.
+
+        Caller holds the lock.
+        """
+        if size < self.compact_min_bytes:
+            return
+        try:
+            with open(path, encoding="utf-8") as fh:
+                header = json.loads(fh.readline())
+        except (OSError, json.JSONDecodeError):
+            return
+        if size <= header.get("body_bytes", 0) * _COMPACT_RATIO:
+            return
+        try:
+            state = self.parse(path.read_bytes())
+        except OSError:
+            return
+        if state is None:
+            return
+        self.write_full(lattice_dir, state.records(), sig=state.sig, generation=state.generation)
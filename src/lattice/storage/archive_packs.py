@@ -0,0 +1,441 @@
+"""Packed archive segments: many archived tasks in a handful of files.
+
+Archiving moves a task's snapshot, event log, notes and plan into ``archive/``
+as separate files, so long-lived projects accumulate a very large number of
+tiny files that every archive scan re-opens.  ``lattice archive-pack`` folds
+all loose archived tasks into one new *segment*::
+
+    archive/packs/seg-000001.dat        # the bytes
+    archive/packs/seg-000001.idx.json   # which task lives where
+
+A segment's data file is written once and never modified.  It holds, in
+order, every snapshot (one compact JSON line each), every event log
+(verbatim, so byte offsets inside a log — and therefore event index rows —
+stay valid), then notes and plans.  The index maps each task ID to the
+``[offset, length]`` of each part and records where the snapshot and event
+regions start and end, so scanning all packed snapshots (or logs) is one
+sequential read per segment.
+
+Rules that keep readers simple:
+
+- a task is live in at most one segment index.  Unpacking it (``unarchive``,
+  or any write to an archived task) restores the loose files and rewrites the
+  index without it; its bytes stay behind as dead space.
+- a loose file in ``archive/`` always wins over its packed copy.
+- the index is the commit point: it is written after the data file and before
+  the loose files are removed, so an interrupted pack leaves every task
+  readable and a re-run simply packs what is still loose.
+
+The ``archive_packs`` lock serialises index rewrites.  It is always taken
+*after* task locks (``unpack_task`` runs with them held), so packing never
+holds it while waiting for a task lock.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from lattice.core.tasks import serialize_snapshot
+from lattice.storage.fs import atomic_write
+from lattice.storage.layout import (
+    ensure_parent,
+    task_event_path,
+    task_snapshot_files,
+    task_snapshot_path,
+)
+from lattice.storage.locks import lattice_lock, multi_lock
+
+PACKS_DIRNAME = "packs"
+PACK_PARTS = ("snapshot", "events", "notes", "plan")
+
+_DATA_SUFFIX = ".dat"
+_INDEX_SUFFIX = ".idx.json"
+_SEGMENT_PREFIX = "seg-"
+_SCHEMA_VERSION = 1
+
+
+def packs_dir(lattice_dir: Path) -> Path:
+    """Return ``archive/packs/``."""
+    return lattice_dir / "archive" / PACKS_DIRNAME
+
+
+def _loose_paths(lattice_dir: Path, task_id: str) -> dict[str, Path]:
+    """Where each part of an archived task lives when it is not packed."""
+    return {
+        "snapshot": task_snapshot_path(lattice_dir, task_id, archived=True),
+        "events": task_event_path(lattice_dir, task_id, archived=True),
+        "notes": lattice_dir / "archive" / "notes" / f"{task_id}.md",
+        "plan": lattice_dir / "archive" / "plans" / f"{task_id}.md",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Segment indexes
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Segment:
+    """One segment: its data file and the live entries of its index."""
+
+    name: str
+    data_path: Path
+    index_path: Path
+    snapshots: tuple[int, int]
+    events: tuple[int, int]
+    tasks: dict[str, dict[str, list[int]]]
+
+    def read(self, task_id: str, part: str) -> bytes | None:
+        """Return the bytes of *part* for *task_id*, or None if absent."""
+        extent = self.tasks.get(task_id, {}).get(part)
+        if extent is None:
+            return None
+        with open(self.data_path, "rb") as fh:
+            fh.seek(extent[0])
+            return fh.read(extent[1])
+
+    def read_region(self, region: tuple[int, int]) -> bytes:
+        with open(self.data_path, "rb") as fh:
+            fh.seek(region[0])
+            return fh.read(region[1] - region[0])
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "schema_version": _SCHEMA_VERSION,
+                "data": self.data_path.name,
+                "snapshots": list(self.snapshots),
+                "events": list(self.events),
+                "tasks": self.tasks,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+
+def _load_segment(index_path: Path) -> Segment | None:
+    try:
+        raw = json.loads(index_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(raw, dict) or not isinstance(raw.get("tasks"), dict):
+        return None
+    name = index_path.name[: -len(_INDEX_SUFFIX)]
+    return Segment(
+        name=name,
+        data_path=index_path.with_name(raw.get("data", name + _DATA_SUFFIX)),
+        index_path=index_path,
+        snapshots=tuple(raw.get("snapshots", (0, 0))),
+        events=tuple(raw.get("events", (0, 0))),
+        tasks=raw["tasks"],
+    )
+
+
+# packs dir -> (signature of its index files, segments by name)
+_cache: dict[Path, tuple[tuple, list[Segment]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _index_files(directory: Path) -> list[os.DirEntry]:
+    try:
+        with os.scandir(directory) as it:
+            return sorted((e for e in it if e.name.endswith(_INDEX_SUFFIX)), key=lambda e: e.name)
+    except OSError:
+        return []
+
+
+def segments(lattice_dir: Path) -> list[Segment]:
+    """Return every segment in name (= creation) order.
+
+    Cached per process and re-read only when an index file changes.  The
+    returned objects are shared and must not be mutated.
+    """
+    directory = packs_dir(lattice_dir)
+    entries = _index_files(directory)
+    sig_parts = []
+    for entry in entries:
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        sig_parts.append((entry.name, st.st_ino, st.st_size, st.st_mtime_ns))
+    sig = tuple(sig_parts)
+    with _cache_lock:
+        cached = _cache.get(directory)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+    loaded = [s for s in (_load_segment(Path(e.path)) for e in entries) if s is not None]
+    with _cache_lock:
+        _cache[directory] = (sig, loaded)
+    return loaded
+
+
+def find_packed(lattice_dir: Path, task_id: str) -> Segment | None:
+    """Return the segment *task_id* is packed in, or None."""
+    for segment in segments(lattice_dir):
+        if task_id in segment.tasks:
+            return segment
+    return None
+
+
+def packed_task_ids(lattice_dir: Path) -> set[str]:
+    """Return the IDs of all packed tasks."""
+    result: set[str] = set()
+    for segment in segments(lattice_dir):
+        result.update(segment.tasks)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+
+def read_packed_part(lattice_dir: Path, task_id: str, part: str) -> bytes | None:
+    """Return one part of a packed task (see :data:`PACK_PARTS`), or None."""
+    segment = find_packed(lattice_dir, task_id)
+    if segment is None:
+        return None
+    try:
+        return segment.read(task_id, part)
+    except OSError:
+        return None
+
+
+def read_packed_snapshot(lattice_dir: Path, task_id: str) -> dict | None:
+    """Return the packed snapshot of *task_id*, or None."""
+    blob = read_packed_part(lattice_dir, task_id, "snapshot")
+    if blob is None:
+        return None
+    try:
+        return json.loads(blob)
+    except ValueError:
+        return None
+
+
+def packed_snapshots(lattice_dir: Path, *, skip: set[str] | frozenset = frozenset()) -> list[dict]:
+    """Return every live packed snapshot whose ID is not in *skip*.
+
+    Reads each segment's snapshot region in one go.
+    """
+    result: list[dict] = []
+    for segment in segments(lattice_dir):
+        live = segment.tasks.keys() - skip
+        if not live:
+            continue
+        try:
+            region = segment.read_region(segment.snapshots)
+        except OSError:
+            continue
+        for line in region.splitlines():
+            try:
+                snap = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(snap, dict) and snap.get("id") in live:
+                result.append(snap)
+    return result
+
+
+def packed_event_logs(
+    lattice_dir: Path, *, skip: set[str] | frozenset = frozenset()
+) -> Iterator[tuple[str, bytes]]:
+    """Yield ``(task_id, log_bytes)`` for every live packed log not in *skip*.
+
+    Reads each segment's event region in one go.
+    """
+    for segment in segments(lattice_dir):
+        live = [tid for tid in segment.tasks if tid not in skip]
+        if not live:
+            continue
+        try:
+            region = segment.read_region(segment.events)
+        except OSError:
+            continue
+        base = segment.events[0]
+        for tid in sorted(live):
+            extent = segment.tasks[tid].get("events")
+            if extent is not None:
+                start = extent[0] - base
+                yield tid, region[start : start + extent[1]]
+
+
+# ---------------------------------------------------------------------------
+# Packing
+# ---------------------------------------------------------------------------
+
+
+def _next_segment_name(directory: Path) -> str:
+    highest = 0
+    for entry in _index_files(directory):
+        try:
+            highest = max(highest, int(entry.name[len(_SEGMENT_PREFIX) : -len(_INDEX_SUFFIX)]))
+        except ValueError:
+            continue
+    return f"{_SEGMENT_PREFIX}{highest + 1:06d}"
+
+
+def _drop_from_segment(segment: Segment, task_ids: set[str]) -> None:
+    """Rewrite *segment*'s index without *task_ids* (caller holds ``archive_packs``)."""
+    remaining = {tid: parts for tid, parts in segment.tasks.items() if tid not in task_ids}
+    if remaining:
+        dropped = Segment(
+            segment.name,
+            segment.data_path,
+            segment.index_path,
+            segment.snapshots,
+            segment.events,
+            remaining,
+        )
+        atomic_write(segment.index_path, dropped.to_json())
+    else:
+        segment.index_path.unlink(missing_ok=True)
+        segment.data_path.unlink(missing_ok=True)
+
+
+def pack_archive(lattice_dir: Path) -> dict:
+    """Fold every loose archived task into a new segment.
+
+    Returns ``{"segment", "tasks", "files_removed", "bytes"}``; ``segment``
+    is None when there was nothing to pack.
+    """
+    result: dict = {"segment": None, "tasks": 0, "files_removed": 0, "bytes": 0}
+
+    # 1. Read the loose files, noting what they looked like
+    collected: list[tuple[str, dict[str, bytes], dict[str, tuple[Path, int, int]]]] = []
+    for snap_file in task_snapshot_files(lattice_dir, archived=True):
+        task_id = snap_file.stem
+        parts: dict[str, bytes] = {}
+        seen: dict[str, tuple[Path, int, int]] = {}
+        for part, path in _loose_paths(lattice_dir, task_id).items():
+            try:
+                st = path.stat()
+                data = path.read_bytes()
+            except OSError:
+                data = read_packed_part(lattice_dir, task_id, part)
+                if data is not None:
+                    parts[part] = data
+                continue
+            parts[part] = data
+            seen[part] = (path, st.st_size, st.st_mtime_ns)
+        try:
+            snapshot = json.loads(parts["snapshot"])
+        except (KeyError, ValueError):
+            continue  # unreadable snapshot stays loose for doctor to report
+        parts["snapshot"] = (
+            json.dumps(snapshot, sort_keys=True, separators=(",", ":")) + "\n"
+        ).encode("utf-8")
+        log = parts.get("events")
+        if log and not log.endswith(b"\n"):
+            parts["events"] = log + b"\n"
+        collected.append((task_id, parts, seen))
+
+    if not collected:
+        return result
+
+    # 2. Lay the parts out region by region
+    data = bytearray()
+    tasks: dict[str, dict[str, list[int]]] = {task_id: {} for task_id, _, _ in collected}
+    regions: dict[str, tuple[int, int]] = {}
+    for part in PACK_PARTS:
+        start = len(data)
+        for task_id, parts, _ in collected:
+            blob = parts.get(part)
+            if blob is not None:
+                tasks[task_id][part] = [len(data), len(blob)]
+                data += blob
+        regions[part] = (start, len(data))
+
+    # 3. Write data, then the index (the commit point)
+    directory = packs_dir(lattice_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    packed_ids = set(tasks)
+    with lattice_lock(lattice_dir / "locks", "archive_packs"):
+        older = [s for s in segments(lattice_dir) if s.tasks.keys() & packed_ids]
+        name = _next_segment_name(directory)
+        segment = Segment(
+            name,
+            directory / f"{name}{_DATA_SUFFIX}",
+            directory / f"{name}{_INDEX_SUFFIX}",
+            regions["snapshot"],
+            regions["events"],
+            tasks,
+        )
+        atomic_write(segment.data_path, bytes(data))
+        atomic_write(segment.index_path, segment.to_json())
+        # A re-packed task supersedes its copy in an older segment
+        for old in older:
+            _drop_from_segment(old, packed_ids)
+
+    # 4. Remove the loose files that were packed, unless they changed since
+    removed = 0
+    locks_dir = lattice_dir / "locks"
+    for task_id, _, seen in collected:
+        with multi_lock(locks_dir, sorted([f"events_{task_id}", f"tasks_{task_id}"])):
+            unchanged = True
+            for path, size, mtime in seen.values():
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                    unchanged = False
+            if not unchanged:
+                continue  # the loose copy wins until the next pack
+            # Snapshot last: until it goes, listings still find the loose task
+            for part in ("events", "notes", "plan", "snapshot"):
+                if part in seen:
+                    seen[part][0].unlink(missing_ok=True)
+                    removed += 1
+
+    result.update(segment=name, tasks=len(collected), files_removed=removed, bytes=len(data))
+    return result
+
+
+def unpack_task(lattice_dir: Path, task_id: str) -> bool:
+    """Restore a packed task's loose files and drop it from its segment.
+
+    Loose files that already exist are kept (they win over the packed copy).
+    The caller must hold ``events_<id>`` and ``tasks_<id>``.  Returns True if
+    the task was packed.
+    """
+    with lattice_lock(lattice_dir / "locks", "archive_packs"):
+        segment = find_packed(lattice_dir, task_id)
+        if segment is None:
+            return False
+        for part, path in _loose_paths(lattice_dir, task_id).items():
+            if path.exists():
+                continue
+            blob = segment.read(task_id, part)
+            if blob is None:
+                continue
+            if part == "snapshot":
+                blob = serialize_snapshot(json.loads(blob)).encode("utf-8")
+            atomic_write(ensure_parent(path), blob)
+        _drop_from_segment(segment, {task_id})
+    return True
+
+
+def verify_packs(lattice_dir: Path) -> list[str]:
+    """Return problems with the packed segments (empty when consistent)."""
+    problems: list[str] = []
+    for segment in segments(lattice_dir):
+        try:
+            size = segment.data_path.stat().st_size
+        except OSError:
+            problems.append(f"Pack {segment.name} is missing its data file")
+            continue
+        for task_id, parts in sorted(segment.tasks.items()):
+            if "snapshot" not in parts:
+                problems.append(f"Pack {segment.name}: {task_id} has no snapshot")
+            for part, (offset, length) in parts.items():
+                if offset < 0 or offset + length > size:
+                    problems.append(
+                        f"Pack {segment.name}: {part} of {task_id} lies outside the data file"
+                    )
+    return problems
@@ -0,0 +1,444 @@
+"""Batched task mutations: many operations under one set of locks.
+
+``lattice batch`` and the ``lattice_batch`` MCP tool hand a list of operation
+dicts to :func:`run_batch`, which
+
+1. resolves every task the batch touches (ULIDs, short IDs, and ``@name``
+   references to tasks created earlier in the same batch) and assigns IDs to
+   new tasks;
+2. takes the ``events_``/``tasks_`` locks for all of them once, in sorted
+   order, and re-reads their snapshots;
+3. validates and applies each operation in order against the in-memory
+   snapshots, through the same :mod:`lattice.storage.mutations` checks the
+   individual commands use;
+4. if every operation succeeded, allocates short IDs for new tasks and writes
+   each touched task with a single ``write_task_event`` call -- one event
+   append and one snapshot write per task, however many operations touched
+   it;
+5. fires hooks once the locks are released.
+
+A batch is all-or-nothing: if any operation fails nothing is written, and
+every other operation is reported as ``ABORTED``.
+
+Operations (``task``, ``source`` and ``target`` accept a ULID, a short ID or
+``@name``):
+
+- ``{"op": "create", "title", "type"?, "priority"?, "urgency"?,
+  "complexity"?, "status"?, "description"?, "tags"?, "assigned_to"?,
+  "id"?, "ref"?}`` -- ``ref`` names the new task for later ``@name`` use
+- ``{"op": "update", "task", "fields": {field: value}}``
+- ``{"op": "status", "task", "status", "force"?, "reason"?}``
+- ``{"op": "assign", "task", "to"}`` -- ``null``/``"none"`` unassigns
+- ``{"op": "comment", "task", "text", "role"?, "reply_to"?}``
+- ``{"op": "link", "source", "type", "target", "note"?}``
+- ``{"op": "unlink", "source", "type", "target"}``
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+
+from lattice.core.config import resolve_status_input
+from lattice.core.events import create_event, utc_now
+from lattice.core.ids import generate_task_id, is_short_id, validate_id
+from lattice.core.tasks import apply_event_to_snapshot, replay_events
+from lattice.storage.hooks import execute_hooks
+from lattice.storage.layout import task_snapshot_path
+from lattice.storage.locks import multi_lock
+from lattice.storage.mutations import (
+    MutationError,
+    check_existing_task,
+    check_not_self_link,
+    check_relationship_type,
+    check_status_change,
+    comment_data,
+    field_change,
+    link_data,
+    new_task_data,
+    parse_assignee,
+    reset_plan_after_status_change,
+    task_created_data,
+    unlink_data,
+)
+from lattice.storage.operations import scaffold_plan, write_task_event
+from lattice.storage.readers import read_task_events
+from lattice.storage.short_ids import allocate_short_id, resolve_short_id
+
+BATCH_OPERATIONS = ("create", "update", "status", "assign", "comment", "link", "unlink")
+
+
+class BatchError(Exception):
+    """An operation (or the batch input) was rejected."""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def parse_operations(lines: Iterable[str]) -> list[dict]:
+    """Parse newline-delimited JSON operations, skipping blank lines.
+
+    Raises :class:`BatchError` naming the first line that is not a JSON
+    object.
+    """
+    operations: list[dict] = []
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            op = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise BatchError(
+                "VALIDATION_ERROR", f"Line {lineno}: invalid JSON ({exc.msg})."
+            ) from None
+        if not isinstance(op, dict):
+            raise BatchError("VALIDATION_ERROR", f"Line {lineno}: expected a JSON object.")
+        operations.append(op)
+    return operations
+
+
+def _require(op: dict, key: str) -> str:
+    value = op.get(key)
+    if not isinstance(value, str) or not value:
+        raise BatchError("VALIDATION_ERROR", f"'{op.get('op')}' requires a non-empty '{key}'.")
+    return value
+
+
+class _Batch:
+    """In-memory state of a batch while its locks are held."""
+
+    def __init__(self, lattice_dir: Path, config: dict, actor: str | dict) -> None:
+        self.lattice_dir = lattice_dir
+        self.config = config
+        self.actor = actor
+        self.refs: dict[str, str] = {}
+        self.snapshots: dict[str, dict | None] = {}
+        self.pending: dict[str, list[dict]] = {}
+        self.created: dict[str, dict] = {}
+        # Whether events__lifecycle is among the locks held (batches with a create)
+        self.holds_lifecycle = False
+
+    # -- reference resolution (before locking) ------------------------------
+
+    def resolve(self, raw: str) -> str:
+        if raw.startswith("@"):
+            task_id = self.refs.get(raw[1:])
+            if task_id is None:
+                raise BatchError("NOT_FOUND", f"Unknown reference '{raw}'.")
+            return task_id
+        if validate_id(raw, "task"):
+            return raw
+        if is_short_id(raw):
+            task_id = resolve_short_id(self.lattice_dir, raw.upper())
+            if task_id is None:
+                raise BatchError("NOT_FOUND", f"Short ID '{raw.upper()}' not found.")
+            return task_id
+        raise BatchError("INVALID_ID", f"Invalid task ID format: '{raw}'.")
+
+    def prepare(self, op: dict) -> list[str]:
+        """Resolve *op*'s task references in place; return the IDs it touches."""
+        kind = op.get("op")
+        if kind not in BATCH_OPERATIONS:
+            raise BatchError(
+                "VALIDATION_ERROR",
+                f"Unknown operation: {kind!r}. Valid: {', '.join(BATCH_OPERATIONS)}.",
+            )
+        if kind == "create":
+            task_id = op.get("id")
+            if task_id is None:
+                task_id = generate_task_id()
+            elif not isinstance(task_id, str) or not validate_id(task_id, "task"):
+                raise BatchError("INVALID_ID", f"Invalid task ID format: '{task_id}'.")
+            ref = op.get("ref")
+            if ref is not None:
+                if not isinstance(ref, str) or not ref or ref in self.refs:
+                    raise BatchError("VALIDATION_ERROR", f"Invalid or duplicate ref: {ref!r}.")
+                self.refs[ref] = task_id
+            op["_task_id"] = task_id
+            return [task_id]
+        if kind in ("link", "unlink"):
+            op["_source_id"] = self.resolve(_require(op, "source"))
+            op["_target_id"] = self.resolve(_require(op, "target"))
+            return [op["_source_id"], op["_target_id"]]
+        op["_task_id"] = self.resolve(_require(op, "task"))
+        return [op["_task_id"]]
+
+    # -- application (under the locks) --------------------------------------
+
+    def load(self, task_ids: Iterable[str]) -> None:
+        for task_id in task_ids:
+            try:
+                text = task_snapshot_path(self.lattice_dir, task_id).read_text()
+                self.snapshots[task_id] = json.loads(text)
+            except (OSError, json.JSONDecodeError):
+                self.snapshots[task_id] = None
+
+    def snapshot(self, task_id: str) -> dict:
+        snapshot = self.snapshots.get(task_id)
+        if snapshot is None:
+            raise BatchError("NOT_FOUND", f"Task {task_id} not found.")
+        return snapshot
+
+    def emit(self, task_id: str, event: dict) -> dict:
+        self.snapshots[task_id] = apply_event_to_snapshot(self.snapshots.get(task_id), event)
+        self.pending.setdefault(task_id, []).append(event)
+        return self.snapshots[task_id]
+
+    def event(self, event_type: str, task_id: str, data: dict, **kwargs) -> dict:
+        return create_event(
+            type=event_type, task_id=task_id, actor=self.actor, data=data, **kwargs
+        )
+
+    def task_events(self, task_id: str) -> list[dict]:
+        on_disk = [] if task_id in self.created else read_task_events(self.lattice_dir, task_id)
+        return on_disk + self.pending.get(task_id, [])
+
+    def apply(self, op: dict) -> dict:
+        handler = getattr(self, f"_op_{op['op']}")
+        try:
+            return handler(op)
+        except MutationError as exc:
+            raise BatchError(exc.code, exc.message) from None
+
+    def _op_create(self, op: dict) -> dict:
+        task_id = op["_task_id"]
+        data = new_task_data(
+            self.config,
+            _require(op, "title"),
+            task_type=op.get("type") or None,
+            priority=op.get("priority") or None,
+            urgency=op.get("urgency"),
+            complexity=op.get("complexity"),
+            status=op.get("status") or None,
+            description=op.get("description"),
+            tags=op.get("tags"),
+            assigned_to=op.get("assigned_to"),
+        )
+        existing = self.snapshots.get(task_id)
+        if existing is not None:
+            check_existing_task(task_id, existing, data)
+            return {"message": f"Task {task_id} already exists (idempotent)."}
+
+        self.created[task_id] = op
+        self.emit(task_id, self.event("task_created", task_id, task_created_data(data)))
+        return {}
+
+    def _op_update(self, op: dict) -> dict:
+        task_id = op["_task_id"]
+        snapshot = self.snapshot(task_id)
+        fields = op.get("fields")
+        if not isinstance(fields, dict) or not fields:
+            raise BatchError("VALIDATION_ERROR", "'update' requires a non-empty 'fields' object.")
+
+        shared_ts = utc_now()
+        events: list[dict] = []
+        for field, value in fields.items():
+            old_value, new_value = field_change(self.config, snapshot, field, value)
+            if old_value == new_value:
+                continue
+            events.append(
+                self.event(
+                    "field_updated",
+                    task_id,
+                    {"field": field, "from": old_value, "to": new_value},
+                    ts=shared_ts,
+                )
+            )
+
+        if not events:
+            return {"message": "No changes"}
+        for event in events:
+            self.emit(task_id, event)
+        return {}
+
+    def _op_status(self, op: dict) -> dict:
+        task_id = op["_task_id"]
+        snapshot = self.snapshot(task_id)
+        current = snapshot["status"]
+        new_status = resolve_status_input(self.config, _require(op, "status"))
+        force = bool(op.get("force"))
+        reason = op.get("reason")
+
+        check_status_change(
+            self.lattice_dir,
+            self.config,
+            snapshot,
+            new_status,
+            force=force,
+            reason=reason,
+            read_events=lambda: self.task_events(task_id),
+        )
+        if current == new_status:
+            return {"message": f"Already at status {new_status}"}
+
+        event_data: dict = {"from": current, "to": new_status}
+        if force:
+            event_data["force"] = True
+            event_data["reason"] = reason
+        self.emit(task_id, self.event("status_changed", task_id, event_data, reason=reason))
+        return {}
+
+    def _op_assign(self, op: dict) -> dict:
+        task_id = op["_task_id"]
+        snapshot = self.snapshot(task_id)
+        target = op.get("to")
+        if target is not None:
+            if not isinstance(target, str):
+                raise BatchError("INVALID_ACTOR", f"Invalid actor format: '{target}'.")
+            target = parse_assignee(target)
+
+        current = snapshot.get("assigned_to")
+        if current == target:
+            return {"message": f"Already assigned to {target}" if target else "Already unassigned"}
+        self.emit(
+            task_id, self.event("assignment_changed", task_id, {"from": current, "to": target})
+        )
+        return {}
+
+    def _op_comment(self, op: dict) -> dict:
+        task_id = op["_task_id"]
+        self.snapshot(task_id)
+        event_data = comment_data(
+            self.config,
+            op.get("text"),
+            role=op.get("role"),
+            reply_to=op.get("reply_to"),
+            read_events=lambda: self.task_events(task_id),
+        )
+        self.emit(task_id, self.event("comment_added", task_id, event_data))
+        return {}
+
+    def _op_link(self, op: dict) -> dict:
+        rel_type = _require(op, "type")
+        source_id, target_id = op["_source_id"], op["_target_id"]
+        check_relationship_type(rel_type)
+        check_not_self_link(source_id, target_id)
+        snapshot = self.snapshot(source_id)
+        self.snapshot(target_id)
+        event_data = link_data(snapshot, rel_type, target_id, op.get("note"))
+        self.emit(source_id, self.event("relationship_added", source_id, event_data))
+        return {}
+
+    def _op_unlink(self, op: dict) -> dict:
+        rel_type = _require(op, "type")
+        source_id, target_id = op["_source_id"], op["_target_id"]
+        check_relationship_type(rel_type)
+        event_data = unlink_data(self.snapshot(source_id), rel_type, target_id)
+        self.emit(source_id, self.event("relationship_removed", source_id, event_data))
+        return {}
+
+    # -- commit (under the locks) --------------------------------------------
+
+    def commit(self) -> None:
+        project_code = self.config.get("project_code")
+        subproject_code = self.config.get("subproject_code")
+        for task_id in self.created:
+            if project_code:
+                prefix = f"{project_code}-{subproject_code}" if subproject_code else project_code
+                short_id, _idx = allocate_short_id(self.lattice_dir, prefix, task_ulid=task_id)
+                self.pending[task_id][0]["data"]["short_id"] = short_id
+            self.snapshots[task_id] = replay_events(self.pending[task_id])
+
+        for task_id, events in self.pending.items():
+            write_task_event(
+                self.lattice_dir,
+                task_id,
+                events,
+                self.snapshots[task_id],
+                _caller_holds_lock=True,
+                _caller_holds_lifecycle_lock=self.holds_lifecycle,
+            )
+
+        for task_id, op in self.created.items():
+            snapshot = self.snapshots[task_id]
+            scaffold_plan(
+                self.lattice_dir,
+                task_id,
+                snapshot["title"],
+                snapshot.get("short_id"),
+                op.get("description"),
+            )
+
+        # Status moves back up the workflow reset the plan, as `lattice status` does
+        for events in self.pending.values():
+            for event in events:
+                if event["type"] == "status_changed":
+                    reset_plan_after_status_change(
+                        self.lattice_dir, self.config, event, self.actor
+                    )
+
+
+def _result(index: int, op: dict, **fields: object) -> dict:
+    return {"index": index, "op": op.get("op"), **fields}
+
+
+def _error(index: int, op: dict, exc: BatchError) -> dict:
+    return _result(index, op, ok=False, error={"code": exc.code, "message": exc.message})
+
+
+def _failed(operations: list[dict], failed: int, exc: BatchError) -> list[dict]:
+    aborted = BatchError("ABORTED", f"Not applied: operation {failed} failed.")
+    return [
+        _error(index, op, exc if index == failed else aborted)
+        for index, op in enumerate(operations)
+    ]
+
+
+def run_batch(
+    lattice_dir: Path,
+    operations: list[dict],
+    actor: str | dict,
+    config: dict,
+) -> tuple[bool, list[dict]]:
+    """Validate and apply *operations* as one all-or-nothing batch.
+
+    Returns ``(committed, results)`` with one result per operation, in order:
+    ``{"index", "op", "ok": True, "task_id", "short_id", ["message"]}`` or
+    ``{"index", "op", "ok": False, "error": {"code", "message"}}``.
+    When an operation fails, every other operation carries the ``ABORTED``
+    code and nothing has been written.
+    """
+    batch = _Batch(lattice_dir, config, actor)
+    operations = [dict(op) for op in operations]
+
+    touched: list[str] = []
+    for index, op in enumerate(operations):
+        try:
+            touched.extend(batch.prepare(op))
+        except BatchError as exc:
+            return False, _failed(operations, index, exc)
+
+    keys = {key for t in touched for key in (f"events_{t}", f"tasks_{t}")}
+    batch.holds_lifecycle = any(op.get("op") == "create" for op in operations)
+    if batch.holds_lifecycle:
+        # task_created is a lifecycle event: take events__lifecycle in sorted
+        # order with the task locks, as archive does, instead of nesting it
+        keys.add("events__lifecycle")
+    lock_keys = sorted(keys)
+    extras: list[dict] = []
+    with multi_lock(lattice_dir / "locks", lock_keys):
+        batch.load(dict.fromkeys(touched))
+        for index, op in enumerate(operations):
+            try:
+                extras.append(batch.apply(op))
+            except BatchError as exc:
+                return False, _failed(operations, index, exc)
+        batch.commit()
+
+    for task_id, events in batch.pending.items():
+        for event in events:
+            execute_hooks(config, lattice_dir, task_id, event)
+
+    results: list[dict] = []
+    for index, (op, extra) in enumerate(zip(operations, extras, strict=True)):
+        task_id = op.get("_task_id") or op["_source_id"]
+        snapshot = batch.snapshots.get(task_id) or {}
+        results.append(
+            _result(
+                index, op, ok=True, task_id=task_id, short_id=snapshot.get("short_id"), **extra
+            )
+        )
+    return True, results
@@ -0,0 +1,344 @@
+"""Derived blocking-graph index: which active tasks still wait on open prerequisites.
+
+A task is *blocked* while any of its blockers is unresolved.  ``A blocks B``
+and ``B depends_on A`` both make A a blocker of B; a blocker is resolved once
+it is ``done`` or ``cancelled``, or archived.  A blocker ID no known task has
+stays unresolved: it may be a task this process has not seen yet, and
+letting it through would hand out work whose prerequisite is still open.
+Answering "is this task ready?" from snapshots means walking every edge in
+the project, so the index (``.lattice/cache/blocking_index.jsonl``) keeps one small
+node record per task and the process cache maintains the blocked set
+incrementally as records are appended.
+
+Like the task catalog it is **non-authoritative** — snapshots stay the source
+of truth and :func:`rebuild_blocking_index` regenerates it at any time.
+
+It is an :class:`~lattice.storage.append_log.AppendLog` whose item records
+are ``{"kind": "node", "id", "status", "archived", "blocks": [...],
+"depends_on": [...]}`` — task ``id``'s status and the targets of its outgoing
+``blocks``/``depends_on`` edges; a later record for the same task replaces
+the earlier one.
+
+Writers append a node record after a write carrying a ``task_created``,
+``status_changed`` or relationship event and on archive and unarchive, and an
+empty commit after any other snapshot write, and only when the index already
+exists; the first lookup builds it.  A lookup that finds the recorded
+signature out of date (a snapshot write bypassed the index, e.g. a
+``git pull``) regenerates it first.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from lattice.storage.append_log import AppendLog, LogState
+from lattice.storage.catalog import catalog_signature, load_snapshots
+from lattice.storage.relationship_index import RELATIONSHIP_EVENT_TYPES
+
+BLOCKING_INDEX_FILENAME = "blocking_index.jsonl"
+BLOCKING_INDEX_SCHEMA_VERSION = 2
+
+# Event types that can change whether a task blocks or is blocked.
+BLOCKING_EVENT_TYPES = RELATIONSHIP_EVENT_TYPES | {"task_created", "status_changed"}
+
+# A blocker in one of these statuses no longer holds anything up.
+RESOLVED_STATUSES = frozenset({"done", "cancelled"})
+
+
+def _node_record(snapshot: dict, archived: bool) -> dict:
+    blocks: set[str] = set()
+    depends_on: set[str] = set()
+    for rel in snapshot.get("relationships_out", []):
+        target = rel.get("target_task_id")
+        if not isinstance(target, str) or target == snapshot["id"]:
+            continue  # self-links are reported by doctor, never block
+        if rel.get("type") == "blocks":
+            blocks.add(target)
+        elif rel.get("type") == "depends_on":
+            depends_on.add(target)
+    return {
+        "kind": "node",
+        "id": snapshot["id"],
+        "status": snapshot.get("status"),
+        "archived": archived,
+        "blocks": sorted(blocks),
+        "depends_on": sorted(depends_on),
+    }
+
+
+# ---------------------------------------------------------------------------
+# In-memory view
+# ---------------------------------------------------------------------------
+
+
+class _State(LogState):
+    """Replayed index: node records, blocker edges and the blocked set."""
+
+    __slots__ = ("blocked", "blockers", "dependents", "nodes")
+
+    def __init__(self) -> None:
+        super().__init__()
+        # task id -> node record
+        self.nodes: dict[str, dict] = {}
+        # blocked id -> blocker ids, and the inverse
+        self.blockers: dict[str, set[str]] = {}
+        self.dependents: dict[str, set[str]] = {}
+        # active task ids with at least one unresolved blocker
+        self.blocked: set[str] = set()
+
+    def _edges_of(self, node: dict | None) -> list[tuple[str, str]]:
+        """Return the (blocker, blocked) pairs contributed by *node*."""
+        if node is None:
+            return []
+        task_id = node["id"]
+        return [(task_id, t) for t in node.get("blocks", [])] + [
+            (t, task_id) for t in node.get("depends_on", [])
+        ]
+
+    def is_open(self, task_id: str) -> bool:
+        """True unless *task_id* is a known task that is resolved or archived."""
+        node = self.nodes.get(task_id)
+        if node is None:
+            return True
+        return not node.get("archived") and node.get("status") not in RESOLVED_STATUSES
+
+    def open_blockers(self, task_id: str) -> list[str]:
+        return sorted(b for b in self.blockers.get(task_id, ()) if self.is_open(b))
+
+    def _refresh(self, task_id: str) -> None:
+        node = self.nodes.get(task_id)
+        if (
+            node is not None
+            and not node.get("archived")
+            and any(self.is_open(b) for b in self.blockers.get(task_id, ()))
+        ):
+            self.blocked.add(task_id)
+        else:
+            self.blocked.discard(task_id)
+
+    def apply(self, record: dict) -> None:
+        task_id = record.get("id")
+        if record.get("kind") != "node" or not isinstance(task_id, str):
+            return
+        old_edges = self._edges_of(self.nodes.get(task_id))
+        for blocker, blocked in old_edges:
+            self.blockers.get(blocked, set()).discard(blocker)
+            self.dependents.get(blocker, set()).discard(blocked)
+        self.nodes[task_id] = record
+        new_edges = self._edges_of(record)
+        for blocker, blocked in new_edges:
+            self.blockers.setdefault(blocked, set()).add(blocker)
+            self.dependents.setdefault(blocker, set()).add(blocked)
+
+        # Only the task itself, its old/new edge endpoints and whatever it
+        # blocks can have changed state.
+        touched = {task_id} | self.dependents.get(task_id, set())
+        for _blocker, blocked in old_edges + new_edges:
+            touched.add(blocked)
+        for t in touched:
+            self._refresh(t)
+
+    def records(self) -> list[dict]:
+        return [self.nodes[t] for t in sorted(self.nodes)]
+
+
+_log = AppendLog(
+    BLOCKING_INDEX_FILENAME,
+    lock_name="blocking_index",
+    schema_version=BLOCKING_INDEX_SCHEMA_VERSION,
+    state_class=_State,
+    signature=catalog_signature,
+)
+
+
+def _scan_state(lattice_dir: Path) -> _State:
+    state = _State()
+    active, archived = load_snapshots(lattice_dir)
+    for is_archived, snaps in ((False, active), (True, archived)):
+        for snap in snaps:
+            if "id" in snap:
+                state.apply(_node_record(snap, is_archived))
+    return state
+
+
+def _state(lattice_dir: Path) -> _State:
+    """Return the index state, building it on first use and regenerating it when stale.
+
+    Falls back to a scan when the index cannot be written (e.g. a read-only
+    project).
+    """
+    state = _log.fresh_state(lattice_dir, rebuild_blocking_index)
+    if state is None:
+        state = _scan_state(lattice_dir)
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def blocked_task_ids(lattice_dir: Path) -> frozenset[str]:
+    """Return the IDs of active tasks that still have an unresolved blocker."""
+    return frozenset(_state(lattice_dir).blocked)
+
+
+def unresolved_blockers(lattice_dir: Path, task_id: str) -> list[str]:
+    """Return the IDs of the unresolved tasks *task_id* waits on, sorted."""
+    return _state(lattice_dir).open_blockers(task_id)
+
+
+def _cycles(state: _State) -> list[list[str]]:
+    """Strongly connected components (size > 1) of the open blocking graph.
+
+    Only edges between known, unresolved tasks count: a cycle through a
+    finished task no longer holds anything up.  Iterative Tarjan, so deep dependency
+    chains do not hit the recursion limit.
+    """
+    graph = {
+        t: sorted(d for d in state.dependents.get(t, ()) if d in state.nodes and state.is_open(d))
+        for t in state.nodes
+        if state.is_open(t)
+    }
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components: list[list[str]] = []
+    counter = 0
+
+    for root in sorted(graph):
+        if root in index:
+            continue
+        work: list[tuple[str, int]] = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack.add(node)
+            successors = graph[node]
+            if i < len(successors):
+                work.append((node, i + 1))
+                succ = successors[i]
+                if succ not in index:
+                    work.append((succ, 0))
+                elif succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+                continue
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component: list[str] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    components.append(sorted(component))
+
+    components.sort()
+    return components
+
+
+def blocking_report(lattice_dir: Path) -> dict:
+    """Summarize the blocking graph for ``lattice graph check``.
+
+    Returns ``edges`` (the number of blocker edges between known tasks),
+    ``blocked`` (``{task_id: [open blocker ids]}`` for every blocked active
+    task) and ``cycles`` (lists of task IDs that wait on each other and so
+    can never become ready).
+    """
+    state = _state(lattice_dir)
+    edges = sum(
+        1
+        for blocked, blockers in state.blockers.items()
+        if blocked in state.nodes
+        for b in blockers
+        if b in state.nodes
+    )
+    return {
+        "edges": edges,
+        "blocked": {t: state.open_blockers(t) for t in sorted(state.blocked)},
+        "cycles": _cycles(state),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def rebuild_blocking_index(lattice_dir: Path) -> int:
+    """Regenerate the index from all snapshots. Returns the number of blocked tasks."""
+    with _log.lock(lattice_dir):
+        sig = catalog_signature(lattice_dir)
+        active, archived = load_snapshots(lattice_dir)
+        state = _State()
+        records: list[dict] = []
+        for is_archived, snaps in ((False, active), (True, archived)):
+            for snap in snaps:
+                if "id" in snap:
+                    record = _node_record(snap, is_archived)
+                    records.append(record)
+                    state.apply(record)
+        records.sort(key=lambda r: r["id"])
+        _log.write_full(lattice_dir, records, sig=sig)
+    return len(state.blocked)
+
+
+def blocking_index_record(
+    lattice_dir: Path,
+    snapshots: list[dict],
+    *,
+    archived: bool = False,
+) -> None:
+    """Record the current status and blocking edges of freshly written snapshot(s).
+
+    Call after the snapshot files are on disk, while still holding the task
+    locks; pass no snapshots after a write that cannot change either.  A
+    no-op when the project has no index yet.
+    """
+    _log.append(lattice_dir, [_node_record(s, archived) for s in snapshots])
+
+
+# ---------------------------------------------------------------------------
+# Verification (doctor)
+# ---------------------------------------------------------------------------
+
+
+def verify_blocking_index(
+    lattice_dir: Path, active: dict[str, dict], archived: dict[str, dict]
+) -> list[str]:
+    """Compare the index against parsed snapshots. Returns problem descriptions.
+
+    An absent index is not a problem (it is built on first use).
+    """
+    path = _log.path(lattice_dir)
+    if not path.exists():
+        return []
+    try:
+        state = _log.parse(path.read_bytes())
+    except OSError:
+        return ["Blocking index is unreadable"]
+    if state is None:
+        return ["Blocking index has an unsupported schema version"]
+
+    expected: dict[str, dict] = {}
+    for is_archived, snaps in ((False, active), (True, archived)):
+        for task_id, snap in snaps.items():
+            expected[task_id] = _node_record(dict(snap, id=task_id), is_archived)
+
+    problems: list[str] = []
+    for task_id in sorted(set(expected) - set(state.nodes)):
+        problems.append(f"Blocking index is missing {task_id}")
+    for task_id in sorted(set(state.nodes) - set(expected)):
+        problems.append(f"Blocking index lists unknown task {task_id}")
+    for task_id in sorted(set(state.nodes) & set(expected)):
+        if state.nodes[task_id] != expected[task_id]:
+            problems.append(f"Blocking index entry for {task_id} differs from its snapshot")
+    return problems
@@ -0,0 +1,279 @@
+"""Derived task catalog: one file holding every task snapshot.
+
+The catalog (``.lattice/cache/catalog.jsonl``) lets list/board/stats readers load
+the whole task set with a single file read instead of opening every
+``tasks/*.json``.  It is **non-authoritative** — snapshots stay the source of
+truth and the catalog can always be regenerated from them.
+
+It is an :class:`~lattice.storage.append_log.AppendLog` whose item records are
+``{"kind": "row", "id": ..., "archived": bool, "snapshot": {...}}``, one per
+task; writers append a commit of the rows they changed after each snapshot
+write, and each commit bumps the generation by one.
+
+Freshness is validated by comparing the signature recorded with the last
+commit against the current mtimes of ``tasks/`` and ``archive/tasks/``.
+Every snapshot write goes through ``atomic_write`` (temp file + rename), which
+touches the directory mtime, so a write that bypassed the catalog makes it
+stale and readers fall back to the full scan.
+
+The parsed catalog is cached per process and only the bytes appended since
+the last read are replayed, so long-lived processes (the daemon, the
+dashboard) stay cheap.  Cached snapshot dicts are shared between callers and
+must not be mutated.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from lattice.storage.append_log import AppendLog, LogState
+from lattice.storage.archive_packs import packed_snapshots, packs_dir
+from lattice.storage.layout import directory_signature, task_snapshot_dirs, task_snapshot_files
+from lattice.storage.locks import LockTimeout
+
+CATALOG_FILENAME = "catalog.jsonl"
+CATALOG_SCHEMA_VERSION = 2
+
+
+class Catalog:
+    """In-memory view of a fresh catalog."""
+
+    __slots__ = ("active", "archived", "generation")
+
+    def __init__(self, generation: int, active: list[dict], archived: list[dict]) -> None:
+        self.generation = generation
+        self.active = active
+        self.archived = archived
+
+
+# ---------------------------------------------------------------------------
+# Signature
+# ---------------------------------------------------------------------------
+
+
+def catalog_signature(lattice_dir: Path) -> list[int]:
+    """Return the cheap freshness signature of the snapshot directories.
+
+    See :func:`~lattice.storage.layout.directory_signature`.  Once the archive
+    has been packed it also carries the mtime of ``archive/packs/``, which
+    every segment index rewrite bumps.
+    """
+    sig = directory_signature(lattice_dir, task_snapshot_dirs)
+    try:
+        sig.append(os.stat(packs_dir(lattice_dir)).st_mtime_ns)
+    except OSError:
+        pass
+    return sig
+
+
+def _row(snapshot: dict, archived: bool) -> dict:
+    return {"kind": "row", "id": snapshot["id"], "archived": archived, "snapshot": snapshot}
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+class _State(LogState):
+    """Replayed catalog: ``(archived, snapshot)`` per task ID."""
+
+    __slots__ = ("rows", "view")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: dict[str, tuple[bool, dict]] = {}
+        # Catalog built from rows at self.view.generation, reused until the next commit
+        self.view: Catalog | None = None
+
+    def apply(self, record: dict) -> None:
+        task_id = record.get("id")
+        if record.get("kind") != "row" or not isinstance(task_id, str):
+            return
+        self.rows[task_id] = (bool(record.get("archived")), record["snapshot"])
+        self.view = None
+
+    def records(self) -> list[dict]:
+        catalog = self.catalog()
+        return [_row(s, False) for s in catalog.active] + [_row(s, True) for s in catalog.archived]
+
+    def catalog(self) -> Catalog:
+        view = self.view
+        if view is None or view.generation != self.generation:
+            active: list[dict] = []
+            archived: list[dict] = []
+            for task_id in sorted(self.rows):
+                is_archived, snap = self.rows[task_id]
+                (archived if is_archived else active).append(snap)
+            view = self.view = Catalog(self.generation, active, archived)
+        return view
+
+
+_log = AppendLog(
+    CATALOG_FILENAME,
+    lock_name="catalog",
+    schema_version=CATALOG_SCHEMA_VERSION,
+    state_class=_State,
+    signature=catalog_signature,
+    compact_min_bytes=256 * 1024,
+)
+
+
+def read_catalog(lattice_dir: Path) -> Catalog | None:
+    """Return the catalog if it exists and is fresh, else ``None``."""
+    state = _log.current_state(lattice_dir)
+    if state is None or state.sig != catalog_signature(lattice_dir):
+        return None
+    catalog = state.catalog()
+    return Catalog(catalog.generation, list(catalog.active), list(catalog.archived))
+
+
+def catalog_generation(lattice_dir: Path) -> int | None:
+    """Return the current generation of a fresh catalog, or ``None``."""
+    catalog = read_catalog(lattice_dir)
+    return catalog.generation if catalog is not None else None
+
+
+def _scan_dir(lattice_dir: Path, *, archived: bool) -> list[dict]:
+    result: list[dict] = []
+    files = task_snapshot_files(lattice_dir, archived=archived)
+    for f in files:
+        try:
+            result.append(json.loads(f.read_text()))
+        except (json.JSONDecodeError, OSError):
+            continue
+    if archived:
+        packed = packed_snapshots(lattice_dir, skip={f.stem for f in files})
+        if packed:
+            result.extend(packed)
+            result.sort(key=lambda s: s.get("id", ""))
+    return result
+
+
+def load_snapshots(
+    lattice_dir: Path, *, include_archived: bool = True
+) -> tuple[list[dict], list[dict]]:
+    """Load (active, archived) snapshots, sorted by task ID.
+
+    Served from the catalog when it is fresh.  Otherwise falls back to a
+    full directory scan and, if nobody else is busy with the catalog,
+    regenerates it so the next call is fast.
+    """
+    catalog = read_catalog(lattice_dir)
+    if catalog is not None:
+        return catalog.active, (catalog.archived if include_archived else [])
+
+    if not include_archived:
+        return _scan_dir(lattice_dir, archived=False), []
+
+    sig = catalog_signature(lattice_dir)
+    active = _scan_dir(lattice_dir, archived=False)
+    archived = _scan_dir(lattice_dir, archived=True)
+    _try_regenerate(lattice_dir, active, archived, sig)
+    return active, archived
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def _try_regenerate(
+    lattice_dir: Path, active: list[dict], archived: list[dict], sig: list[int]
+) -> None:
+    """Opportunistically write a fresh catalog from a scan. Never blocks or raises.
+
+    *sig* must be captured **before** the scan so that a write racing with the
+    scan leaves the catalog stale rather than silently wrong.
+    """
+    locks_dir = lattice_dir / "locks"
+    if not locks_dir.is_dir():
+        return
+    try:
+        with _log.lock(lattice_dir, timeout=0):
+            state = _log.current_state(lattice_dir)
+            _log.write_full(
+                lattice_dir,
+                [_row(s, False) for s in active if "id" in s]
+                + [_row(s, True) for s in archived if "id" in s],
+                sig=sig,
+                generation=state.generation + 1 if state is not None else 0,
+            )
+    except (LockTimeout, OSError):
+        pass
+
+
+def rebuild_catalog(lattice_dir: Path) -> int:
+    """Regenerate the catalog from all snapshots. Returns the task count."""
+    with _log.lock(lattice_dir):
+        sig = catalog_signature(lattice_dir)
+        active = [s for s in _scan_dir(lattice_dir, archived=False) if "id" in s]
+        archived = [s for s in _scan_dir(lattice_dir, archived=True) if "id" in s]
+        state = _log.current_state(lattice_dir)
+        _log.write_full(
+            lattice_dir,
+            [_row(s, False) for s in active] + [_row(s, True) for s in archived],
+            sig=sig,
+            generation=state.generation + 1 if state is not None else 0,
+        )
+    return len(active) + len(archived)
+
+
+def catalog_record(
+    lattice_dir: Path,
+    snapshots: list[dict],
+    *,
+    archived: bool = False,
+) -> None:
+    """Record freshly written snapshot(s) in the catalog.
+
+    Call after the snapshot files are on disk, while still holding the task
+    locks.  A no-op when the project has no catalog yet.  The append is not
+    fsynced: the catalog is derived, and a lost tail simply reads as stale.
+    """
+    _log.append(lattice_dir, [_row(s, archived) for s in snapshots])
+
+
+# ---------------------------------------------------------------------------
+# Verification (doctor)
+# ---------------------------------------------------------------------------
+
+
+def verify_catalog(
+    lattice_dir: Path, active: dict[str, dict], archived: dict[str, dict]
+) -> list[str]:
+    """Compare the catalog against parsed snapshots. Returns problem descriptions.
+
+    An absent catalog is not a problem (it is optional).
+    """
+    path = _log.path(lattice_dir)
+    if not path.exists():
+        return []
+    try:
+        state = _log.parse(path.read_bytes())
+    except OSError:
+        state = None
+    if state is None:
+        return ["Task catalog is unreadable"]
+    rows = state.rows
+
+    problems: list[str] = []
+    if state.sig != catalog_signature(lattice_dir):
+        problems.append("Task catalog is stale (snapshot directories changed since last update)")
+
+    expected: dict[str, tuple[bool, dict]] = {}
+    for task_id, snap in active.items():
+        expected[task_id] = (False, snap)
+    for task_id, snap in archived.items():
+        expected[task_id] = (True, snap)
+
+    for task_id in sorted(set(expected) - set(rows)):
+        problems.append(f"Task catalog is missing {task_id}")
+    for task_id in sorted(set(rows) - set(expected)):
+        problems.append(f"Task catalog lists unknown task {task_id}")
+    for task_id in sorted(set(rows) & set(expected)):
+        if rows[task_id] != expected[task_id]:
+            problems.append(f"Task catalog entry for {task_id} differs from its snapshot")
+    return problems
@@ -0,0 +1,552 @@
+"""Derived global event index: one row per event, across every event log.
+
+The index (``.lattice/cache/event_index.jsonl``) lets the dashboard activity feed
+page through the whole event history in ``(ts, id)`` order without decoding
+every event file.  Each row carries the columns the feed filters on plus the
+byte offset of the event inside its per-task (or per-resource) log, so a page
+is served by seeking straight to the records it contains.
+
+Like the task catalog it is **non-authoritative** — the event logs stay the
+source of truth and :func:`rebuild_event_index` regenerates it at any time.
+
+Row kinds (JSONL, append-only):
+
+- ``{"ts", "id", "log", "task_id", "type", "actor", "offset"}`` — one event.
+  ``log`` is the event file stem; ``actor`` is the display form.
+- ``{"kind": "move", "log": ..., "archived": bool}`` — the log moved into or
+  out of ``archive/events/`` (offsets are unchanged by the move, and by
+  ``lattice archive-pack``, which stores logs verbatim).
+- ``{"kind": "sig", "sig": [...]}`` — the :func:`event_log_signature` after
+  the rows before it; the last one wins.
+
+Writers only append when the index already exists, so projects that never
+open the activity feed pay nothing.  Every append ends with a ``sig`` row, so
+a reader that finds a different signature on disk knows logs were created,
+replaced or moved behind the index's back (a ``git pull`` rewrites every log
+it touches) and rebuilds it.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import bisect
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from lattice.core.events import get_actor_display, serialize_event
+from lattice.storage.archive_packs import find_packed, packed_event_logs
+from lattice.storage.fs import atomic_write, cache_path, ensure_cache_dir
+from lattice.storage.layout import (
+    directory_signature,
+    resource_event_files,
+    task_event_dirs,
+    task_event_files,
+    task_event_path,
+)
+from lattice.storage.locks import LockTimeout, lattice_lock
+
+EVENT_INDEX_FILENAME = "event_index.jsonl"
+
+# Row tuple layout (sorted ascending; the first two fields are the sort key).
+ROW_TS, ROW_ID, ROW_LOG, ROW_TASK_ID, ROW_TYPE, ROW_ACTOR, ROW_OFFSET = range(7)
+
+IndexRow = tuple[str, str, str, str | None, str, str, int]
+
+
+def _dumps(obj: dict) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")) + "\n"
+
+
+def event_log_signature(lattice_dir: Path) -> list[int]:
+    """Return the cheap freshness signature of the event log directories.
+
+    Appending to an existing log leaves it unchanged; creating, replacing or
+    moving one changes it.  See :func:`~lattice.storage.layout.directory_signature`.
+    """
+    return directory_signature(lattice_dir, task_event_dirs)
+
+
+def _sig_row(lattice_dir: Path) -> str:
+    return _dumps({"kind": "sig", "sig": event_log_signature(lattice_dir)})
+
+
+def index_row(event: dict, log_id: str, offset: int) -> dict:
+    """Return the index row for *event*, found at byte *offset* of log *log_id*."""
+    actor = event.get("actor")
+    return {
+        "ts": event.get("ts") or "",
+        "id": event.get("id") or "",
+        "log": log_id,
+        "task_id": event.get("task_id"),
+        "type": event.get("type") or "",
+        "actor": get_actor_display(actor) if actor else "",
+        "offset": offset,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def _may_exist(lattice_dir: Path) -> bool:
+    """Return False only if there is no index and no rebuild has started.
+
+    A rebuild creates the ``event_index`` lock file before it scans any log,
+    so when neither file exists a log append that already happened will be
+    seen by any later rebuild, and writers can skip the lock entirely.
+    """
+    return (cache_path(lattice_dir, EVENT_INDEX_FILENAME)).exists() or (
+        lattice_dir / "locks" / "event_index.lock"
+    ).exists()
+
+
+def event_index_record(
+    lattice_dir: Path,
+    log_id: str,
+    end_offset: int,
+    events: list[dict],
+) -> None:
+    """Record events that were just appended to the log *log_id*.
+
+    *end_offset* is the size of the log after the append; the start offset of
+    each event is derived backward from it, which stays correct even if
+    ``jsonl_append`` inserted a separator newline.  Call while still holding
+    the log's lock.  A no-op when the project has no event index yet (a row
+    the rebuild also scanned is recorded twice; readers skip repeated ids).
+    """
+    path = cache_path(lattice_dir, EVENT_INDEX_FILENAME)
+    if not events or not _may_exist(lattice_dir):
+        return
+
+    offsets: list[int] = []
+    pos = end_offset
+    for event in reversed(events):
+        pos -= len(serialize_event(event).encode("utf-8"))
+        offsets.append(pos)
+    offsets.reverse()
+
+    payload = "".join(
+        _dumps(index_row(event, log_id, offset)) for event, offset in zip(events, offsets)
+    )
+    with lattice_lock(lattice_dir / "locks", "event_index"):
+        # Re-checked under the lock: a rebuild in progress may already have
+        # scanned this log, and the index it is about to write must get the row
+        if not path.exists():
+            return
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(payload + _sig_row(lattice_dir))
+
+
+def event_index_move(lattice_dir: Path, log_id: str, *, archived: bool) -> None:
+    """Record that the log *log_id* moved into (or out of) the archive."""
+    path = cache_path(lattice_dir, EVENT_INDEX_FILENAME)
+    if not _may_exist(lattice_dir):
+        return
+    with lattice_lock(lattice_dir / "locks", "event_index"):
+        if not path.exists():
+            return
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(
+                _dumps({"kind": "move", "log": log_id, "archived": archived})
+                + _sig_row(lattice_dir)
+            )
+
+
+def _scan_log(path: Path, log_id: str) -> list[dict]:
+    with open(path, "rb") as fh:
+        return _scan_lines(fh, log_id)
+
+
+def _scan_lines(lines: Iterable[bytes], log_id: str) -> list[dict]:
+    rows: list[dict] = []
+    offset = 0
+    for raw in lines:
+        stripped = raw.strip()
+        if stripped:
+            try:
+                event = json.loads(stripped)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                event = None
+            if isinstance(event, dict):
+                rows.append(index_row(event, log_id, offset))
+        offset += len(raw)
+    return rows
+
+
+def rebuild_event_index(
+    lattice_dir: Path,
+    *,
+    scanned: dict[Path, tuple[int, list[dict]]] | None = None,
+    timeout: float = 10,
+) -> int:
+    """Regenerate the event index from every event log. Returns the row count.
+
+    *scanned* maps log paths to ``(size, rows)`` already produced by a caller
+    that read those logs anyway (``rebuild --all``).  A log whose size still
+    matches is not read again; one that grew in the meantime is rescanned
+    under the index lock, so concurrent appends are never dropped.
+    """
+    scanned = scanned or {}
+    with lattice_lock(lattice_dir / "locks", "event_index", timeout=timeout):
+        # Captured before the scan, so a log created meanwhile leaves the index stale
+        sig = _sig_row(lattice_dir)
+        rows: list[dict] = []
+        moves: list[dict] = []
+        for archived in (False, True):
+            log_paths = task_event_files(lattice_dir, archived=archived)
+            if not archived:
+                log_paths += resource_event_files(lattice_dir)
+            for log_path in log_paths:
+                known = scanned.get(log_path)
+                try:
+                    if known is not None and log_path.stat().st_size == known[0]:
+                        rows.extend(known[1])
+                    else:
+                        rows.extend(_scan_log(log_path, log_path.stem))
+                except OSError:
+                    continue
+                if archived:
+                    moves.append({"kind": "move", "log": log_path.stem, "archived": True})
+        # Packed logs keep their in-log offsets; read_event finds them in the pack
+        loose = {p.stem for p in task_event_files(lattice_dir, archived=True)}
+        for log_id, data in packed_event_logs(lattice_dir, skip=loose):
+            rows.extend(_scan_lines(data.splitlines(keepends=True), log_id))
+            moves.append({"kind": "move", "log": log_id, "archived": True})
+        rows.sort(key=lambda r: (r["ts"], r["id"]))
+        atomic_write(
+            ensure_cache_dir(lattice_dir) / EVENT_INDEX_FILENAME,
+            "".join(_dumps(r) for r in rows) + "".join(_dumps(m) for m in moves) + sig,
+        )
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Cursors
+# ---------------------------------------------------------------------------
+
+
+def encode_cursor(row: IndexRow) -> str:
+    """Return an opaque cursor pointing just past *row* (in newest-first order)."""
+    raw = json.dumps([row[ROW_TS], row[ROW_ID]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from :func:`encode_cursor`.
+
+    Raises ``ValueError`` if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    if (
+        not isinstance(value, list)
+        or len(value) != 2
+        or not all(isinstance(v, str) for v in value)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return value[0], value[1]
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+class EventIndex:
+    """In-memory view of the event index, kept sorted by ``(ts, id)``.
+
+    :meth:`refresh` reads only the rows appended since the previous call, so
+    a long-lived reader (the dashboard) pays for new events only.  Safe to
+    share between threads.
+
+    Listeners registered with :meth:`add_listener` are called (under the
+    index lock, so they must be cheap) with the rows each refresh ingests,
+    or with ``None`` when the index file was replaced and everything was
+    re-read — including after a refresh found logs changed behind the
+    index's back and rebuilt it.
+    """
+
+    def __init__(self, lattice_dir: Path) -> None:
+        self.lattice_dir = lattice_dir
+        self._path = cache_path(lattice_dir, EVENT_INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._inode: int | None = None
+        self._pos = 0
+        self._ids: set[str] = set()
+        self._sig: list[int] | None = None
+        self.rows: list[IndexRow] = []
+        self.archived_logs: set[str] = set()
+        self.stale = False
+        self._listeners: list[Callable[[list[IndexRow] | None], None]] = []
+
+    def add_listener(self, listener: Callable[[list[IndexRow] | None], None]) -> None:
+        """Call *listener* with the rows ingested by every later refresh."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _reset(self) -> None:
+        self._pos = 0
+        self._ids = set()
+        self._sig = None
+        self.rows = []
+        self.archived_logs = set()
+        self.stale = False
+
+    def refresh(self) -> bool:
+        """Pick up rows appended since the last refresh.
+
+        Builds the index first if it does not exist yet (or was flagged
+        stale by :meth:`read_event`), and rebuilds it when the recorded
+        :func:`event_log_signature` no longer matches the logs.  Returns
+        ``False`` if it could not be read or built.
+        """
+        with self._lock:
+            if self.stale or not self._path.exists():
+                try:
+                    rebuild_event_index(self.lattice_dir)
+                except OSError:
+                    return False
+                self._inode = None
+            if not self._catch_up():
+                return False
+            if self._sig != event_log_signature(self.lattice_dir):
+                # Logs were created, replaced or moved without an index row
+                try:
+                    rebuild_event_index(self.lattice_dir, timeout=0)
+                except (LockTimeout, OSError):
+                    return True  # serve what we have; the next refresh retries
+                return self._catch_up()
+            return True
+
+    def _catch_up(self) -> bool:
+        """Ingest the index rows past the read position. Caller holds ``_lock``."""
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return False
+        replaced = False
+        if st.st_ino != self._inode or st.st_size < self._pos:
+            replaced = self._pos > 0
+            self._reset()
+            self._inode = st.st_ino
+        if st.st_size == self._pos:
+            if replaced:
+                self._notify(None)
+            return True
+
+        try:
+            with open(self._path, "rb") as fh:
+                fh.seek(self._pos)
+                data = fh.read(st.st_size - self._pos)
+        except OSError:
+            return False
+        # Only consume complete lines; a torn tail is picked up next time
+        end = data.rfind(b"\n") + 1
+        self._pos += end
+        new_rows = self._ingest(data[:end])
+        if replaced or new_rows:
+            self._notify(None if replaced else new_rows)
+        return True
+
+    def _notify(self, rows: list[IndexRow] | None) -> None:
+        for listener in self._listeners:
+            listener(rows)
+
+    def _ingest(self, data: bytes) -> list[IndexRow]:
+        new_rows: list[IndexRow] = []
+        for raw in data.splitlines():
+            try:
+                record = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if record.get("kind") == "sig":
+                self._sig = record.get("sig")
+                continue
+            if record.get("kind") == "move":
+                if record.get("archived"):
+                    self.archived_logs.add(record["log"])
+                else:
+                    self.archived_logs.discard(record["log"])
+                continue
+            event_id = record.get("id", "")
+            if event_id in self._ids:
+                continue  # recorded twice across a concurrent rebuild
+            self._ids.add(event_id)
+            new_rows.append(
+                (
+                    record.get("ts", ""),
+                    event_id,
+                    record["log"],
+                    record.get("task_id"),
+                    record.get("type", ""),
+                    record.get("actor", ""),
+                    record["offset"],
+                )
+            )
+        if not new_rows:
+            return new_rows
+        new_rows.sort()
+        if not self.rows or new_rows[0] >= self.rows[-1]:
+            self.rows.extend(new_rows)
+        else:
+            for row in new_rows:
+                bisect.insort(self.rows, row)
+        return new_rows
+
+    def select(
+        self,
+        *,
+        types: set[str] | None = None,
+        task_id: str | None = None,
+        actor: str | None = None,
+        after: str | None = None,
+        before: str | None = None,
+        include_archived: bool = True,
+    ) -> list[IndexRow]:
+        """Return matching rows in ascending ``(ts, id)`` order, filtered on index columns."""
+        archived_logs = self.archived_logs
+        result: list[IndexRow] = []
+        for row in self.rows:
+            if types is not None and row[ROW_TYPE] not in types:
+                continue
+            if task_id is not None and row[ROW_TASK_ID] != task_id:
+                continue
+            if actor is not None and row[ROW_ACTOR] != actor:
+                continue
+            if after is not None and row[ROW_TS] <= after:
+                continue
+            if before is not None and row[ROW_TS] >= before:
+                continue
+            if not include_archived and row[ROW_LOG] in archived_logs:
+                continue
+            result.append(row)
+        return result
+
+    def read_event(self, row: IndexRow) -> dict | None:
+        """Seek to and decode the event behind *row*.
+
+        Returns ``None`` (and flags the index stale so the next refresh
+        rebuilds it) if the log no longer holds that event at that offset.
+        """
+        log = row[ROW_LOG]
+        offset = row[ROW_OFFSET]
+        event = read_log_events(
+            self.lattice_dir, log, [offset], archived=log in self.archived_logs
+        ).get(offset)
+        if event is None or event.get("id") != row[ROW_ID]:
+            self.stale = True
+            return None
+        return event
+
+
+def _log_source(lattice_dir: Path, log_id: str, *, archived: bool) -> tuple[Path, int, int] | None:
+    """Locate the log *log_id*: ``(path, base, size)`` of its bytes, or ``None``.
+
+    The location given by *archived* is tried first, then the other one, then
+    the packed archive, so a log that moved after its index row was read is
+    still found.
+    """
+    for in_archive in (archived, not archived):
+        path = task_event_path(lattice_dir, log_id, archived=in_archive)
+        try:
+            return path, 0, path.stat().st_size
+        except OSError:
+            continue
+    segment = find_packed(lattice_dir, log_id)
+    extent = segment.tasks[log_id].get("events") if segment is not None else None
+    if extent is None:
+        return None
+    return segment.data_path, extent[0], extent[1]
+
+
+def read_log_events(
+    lattice_dir: Path,
+    log_id: str,
+    offsets: Iterable[int],
+    *,
+    archived: bool = False,
+) -> dict[int, dict]:
+    """Seek to and decode the events at *offsets* of the log *log_id*.
+
+    The log is opened once for all offsets.  Returns ``{offset: event}`` for
+    the offsets that hold a decodable event; callers check the event ids.
+    """
+    source = _log_source(lattice_dir, log_id, archived=archived)
+    if source is None:
+        return {}
+    path, base, size = source
+    events: dict[int, dict] = {}
+    try:
+        with open(path, "rb") as fh:
+            for offset in sorted(set(offsets)):
+                if offset >= size:
+                    continue
+                fh.seek(base + offset)
+                try:
+                    event = json.loads(fh.readline())
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if isinstance(event, dict):
+                    events[offset] = event
+    except OSError:
+        return events
+    return events
+
+
+def page_rows(
+    rows: list[IndexRow],
+    *,
+    limit: int,
+    offset: int = 0,
+    cursor: tuple[str, str] | None = None,
+) -> tuple[list[IndexRow], bool]:
+    """Slice one newest-first page out of ascending *rows*.
+
+    With *cursor* the page starts just past the cursor row (found by bisection);
+    otherwise *offset* rows from the newest end are skipped.  Returns
+    ``(page, has_more)``.
+    """
+    if cursor is not None:
+        end = bisect.bisect_left(rows, cursor)
+    else:
+        end = max(0, len(rows) - offset)
+    start = max(0, end - limit)
+    page = rows[start:end]
+    page.reverse()
+    return page, start > 0
+
+
+def verify_event_index(lattice_dir: Path, logs: dict[str, list[dict]]) -> list[str]:
+    """Compare the event index against parsed event logs (keyed by file stem).
+
+    Returns problem descriptions.  An absent index is not a problem.
+    """
+    path = cache_path(lattice_dir, EVENT_INDEX_FILENAME)
+    if not path.exists():
+        return []
+    index = EventIndex(lattice_dir)
+    # Read without the build-if-missing behaviour of refresh()
+    try:
+        index._ingest(path.read_bytes())
+    except OSError:
+        return ["Event index is unreadable"]
+
+    indexed = {(row[ROW_LOG], row[ROW_ID]) for row in index.rows}
+    expected = {(log, ev.get("id", "")) for log, events in logs.items() for ev in events}
+
+    problems: list[str] = []
+    missing = expected - indexed
+    unknown = indexed - expected
+    if missing:
+        problems.append(f"Event index is missing {len(missing)} event(s)")
+    if unknown:
+        problems.append(f"Event index lists {len(unknown)} unknown event(s)")
+    return problems
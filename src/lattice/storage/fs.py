@@ -9,6 +9,11 @@ from pathlib import Path
 LATTICE_DIR = ".lattice"
 LATTICE_ROOT_ENV = "LATTICE_ROOT"
 
+# Derived, rebuildable files (catalog, indexes, rollups) live in this
+# subdirectory of .lattice/, which ignores itself so they are never committed.
+CACHE_DIR = "cache"
+_CACHE_GITIGNORE = "# Derived files, rebuilt on demand. Never commit them.\n*\n"
+
 
 def _fsync_directory(path: Path) -> None:
     """Fsync a directory to ensure metadata (e.g. renames) is durable.
@@ -26,12 +31,15 @@ def _fsync_directory(path: Path) -> None:
         pass
 
 
-def atomic_write(path: Path, content: str | bytes) -> None:
+def atomic_write(path: Path, content: str | bytes, *, fsync_dir: bool = True) -> None:
     """Write content to path atomically via temp file + fsync + rename.
 
     The temp file is created in the same directory as the target to ensure
     os.rename() is an atomic operation (same filesystem).
 
+    With ``fsync_dir=False`` the parent directory is not fsynced, so the
+    rename itself may be lost on power failure (``relaxed`` durability).
+
     Raises:
         FileNotFoundError: If the parent directory does not exist.
     """
@@ -53,7 +61,8 @@ def atomic_write(path: Path, content: str | bytes) -> None:
         os.close(fd)
         closed = True
         os.replace(tmp_path, path)
-        _fsync_directory(parent)
+        if fsync_dir:
+            _fsync_directory(parent)
     except BaseException:
         if not closed:
             os.close(fd)
@@ -64,6 +73,26 @@ def atomic_write(path: Path, content: str | bytes) -> None:
         raise
 
 
+def cache_path(lattice_dir: Path, filename: str) -> Path:
+    """Return the path of the derived file *filename* in ``.lattice/cache/``."""
+    return lattice_dir / CACHE_DIR / filename
+
+
+def ensure_cache_dir(lattice_dir: Path) -> Path:
+    """Create ``.lattice/cache/`` if needed and return it.
+
+    The directory gets a ``.gitignore`` that ignores everything in it.
+    """
+    directory = lattice_dir / CACHE_DIR
+    if directory.is_dir():
+        return directory
+    directory.mkdir(parents=True, exist_ok=True)
+    gitignore = directory / ".gitignore"
+    if not gitignore.exists():
+        atomic_write(gitignore, _CACHE_GITIGNORE)
+    return directory
+
+
 def ensure_lattice_dirs(root: Path) -> None:
     """Create the full .lattice/ directory structure under root.
 
@@ -88,6 +117,7 @@ def ensure_lattice_dirs(root: Path) -> None:
     ]
     for subdir in subdirs:
         (lattice / subdir).mkdir(parents=True, exist_ok=True)
+    ensure_cache_dir(lattice)
 
     # Create empty _lifecycle.jsonl ready for appends
     lifecycle_log = lattice / "events" / "_lifecycle.jsonl"
@@ -157,17 +187,42 @@ def jsonl_append(path: Path, line: str) -> None:
         path: Path to the JSONL file (created if it does not exist).
         line: A single JSONL record ending with a newline character.
     """
+    jsonl_append_many(path, [line])
+
+
+def jsonl_append_many(path: Path, lines: list[str], *, fsync_dir: bool = True) -> None:
+    """Append several lines to a JSONL file with one write and one fsync.
+
+    Same contract as :func:`jsonl_append` (caller holds the lock, every line
+    ends with ``\\n``, a missing trailing newline is repaired first), but the
+    whole batch goes out in a single ``write()`` followed by a single
+    ``fsync()``.  With ``fsync_dir=False`` the parent directory is not
+    fsynced (``relaxed`` durability).
+    """
+    if not lines:
+        return
+
     # Defensive: ensure file ends with newline before appending
     needs_separator = False
-    if path.exists() and path.stat().st_size > 0:
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        size = 0
+    if size > 0:
         with open(path, "rb") as fh:
             fh.seek(-1, 2)
             needs_separator = fh.read(1) != b"\n"
 
-    with open(path, "a", encoding="utf-8") as fh:
-        if needs_separator:
-            fh.write("\n")
-        fh.write(line)
-        fh.flush()
-        os.fsync(fh.fileno())
-    _fsync_directory(path.parent)
+    payload = (("\n" if needs_separator else "") + "".join(lines)).encode("utf-8")
+    fd = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        # os.write() can short-write; loop until all bytes are flushed.
+        mv = memoryview(payload)
+        while mv:
+            written = os.write(fd, mv)
+            mv = mv[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    if fsync_dir:
+        _fsync_directory(path.parent)
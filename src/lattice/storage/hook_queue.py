@@ -0,0 +1,446 @@
+"""Durable outbox for queued hook execution.
+
+With ``"hooks": {"queued": true}`` in ``config.json``,
+:func:`~lattice.storage.hooks.execute_hooks` does not run hook commands
+itself.  It writes one job per event to ``.lattice/hooks/outbox/``: the
+matching commands in firing order, each with its ``LATTICE_*`` variables, and
+the event JSON for stdin.  The writer returns as soon as that file is
+durable.  A worker then drains the outbox, either
+
+- a detached ``python -m lattice.storage.hook_queue`` process, which the
+  writer starts when no worker holds the ``hooks_worker`` lock, or
+- a thread inside ``lattice daemon start`` or ``lattice dashboard``
+  (:func:`start_worker`).
+
+Jobs for the same task run one at a time, in the order they were queued.
+Jobs for different tasks run concurrently, up to ``hooks.workers`` (default
+4).  A command that exits non-zero, times out or cannot be started is retried
+up to ``hooks.max_attempts`` times in total (default 3), with exponential
+backoff.  A command that still fails is written to ``.lattice/hooks/dead/``,
+and the job moves on to its next command.  ``lattice hooks status`` lists
+pending jobs and dead letters, and ``lattice hooks retry`` re-queues them.
+
+Delivery is at-least-once.  The job file records progress after every
+command and is deleted only after its last command, so a worker that dies
+mid-job re-runs the unfinished commands on the next drain.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from lattice.storage.fs import atomic_write
+from lattice.storage.hooks import HOOK_TIMEOUT_SECONDS, PYTHON_HOOK_PREFIX, call_python_hook
+from lattice.storage.locks import LockTimeout, lattice_lock
+
+OUTBOX_DIR = "hooks/outbox"
+DEAD_DIR = "hooks/dead"
+WORKER_LOCK_KEY = "hooks_worker"
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Delay before the first retry of a failed command; doubles on each retry.
+RETRY_BACKOFF_SECONDS = 1.0
+
+# How often an in-process worker looks for jobs queued by other processes.
+_POLL_SECONDS = 5.0
+
+# Longest stderr excerpt kept in a dead letter.
+_ERROR_TAIL_CHARS = 2000
+
+# In-process workers by resolved ``.lattice/`` path.  Writers in this process
+# wake these instead of spawning a detached worker.
+_local_workers: dict[Path, HookWorker] = {}
+_local_workers_lock = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _new_job_id() -> str:
+    # Sorts by enqueue time, so a directory listing is the queue order.
+    return f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+
+
+def _settings(config: dict) -> tuple[int, int]:
+    hooks = config.get("hooks") or {}
+    workers = hooks.get("workers", DEFAULT_WORKERS)
+    max_attempts = hooks.get("max_attempts", DEFAULT_MAX_ATTEMPTS)
+    workers = workers if isinstance(workers, int) and workers >= 1 else DEFAULT_WORKERS
+    if not isinstance(max_attempts, int) or max_attempts < 1:
+        max_attempts = DEFAULT_MAX_ATTEMPTS
+    return workers, max_attempts
+
+
+def _read_json_files(directory: Path) -> list[dict]:
+    records: list[dict] = []
+    for path in sorted(directory.glob("*.json")) if directory.is_dir() else []:
+        try:
+            records.append(json.loads(path.read_text()))
+        except (OSError, json.JSONDecodeError):
+            continue
+    return records
+
+
+def _write_json(path: Path, record: dict, *, fsync_dir: bool = True) -> None:
+    atomic_write(path, json.dumps(record, sort_keys=True) + "\n", fsync_dir=fsync_dir)
+
+
+# ---------------------------------------------------------------------------
+# Producer side
+# ---------------------------------------------------------------------------
+
+
+def enqueue(
+    lattice_dir: Path,
+    key: str,
+    commands: list[tuple[str, dict[str, str]]],
+    stdin_data: str,
+) -> str:
+    """Durably queue *commands* for one event and make sure a worker runs them.
+
+    *key* is the task or resource ID the event belongs to; jobs sharing a key
+    run in queue order.  Each command carries only its ``LATTICE_*``
+    variables -- the worker runs it with its own environment plus those.
+    Returns the job ID.
+    """
+    outbox = lattice_dir / OUTBOX_DIR
+    outbox.mkdir(parents=True, exist_ok=True)
+    job_id = _new_job_id()
+    job = {
+        "id": job_id,
+        "key": key,
+        "commands": [{"cmd": cmd, "env": env} for cmd, env in commands],
+        "stdin": stdin_data,
+        "next": 0,
+        "queued_at": _now(),
+    }
+    _write_json(outbox / f"{job_id}.json", job)
+    notify_worker(lattice_dir)
+    return job_id
+
+
+def notify_worker(lattice_dir: Path) -> None:
+    """Wake this process's worker, or start a detached one if none is running."""
+    with _local_workers_lock:
+        worker = _local_workers.get(lattice_dir.resolve())
+    if worker is not None:
+        worker.wake()
+        return
+    if not worker_running(lattice_dir):
+        spawn_worker(lattice_dir)
+
+
+def worker_running(lattice_dir: Path) -> bool:
+    """Return whether some process is currently draining the outbox."""
+    try:
+        with lattice_lock(lattice_dir / "locks", WORKER_LOCK_KEY, timeout=0):
+            return False
+    except LockTimeout:
+        return True
+
+
+def spawn_worker(lattice_dir: Path) -> None:
+    """Start a detached worker process that drains the outbox and exits."""
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "lattice.storage.hook_queue", str(lattice_dir)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError as exc:
+        print(f"lattice: could not start hook worker: {exc}", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# Consumer side
+# ---------------------------------------------------------------------------
+
+
+def pending_jobs(lattice_dir: Path) -> list[dict]:
+    """Return queued jobs, oldest first."""
+    return _read_json_files(lattice_dir / OUTBOX_DIR)
+
+
+def dead_letters(lattice_dir: Path) -> list[dict]:
+    """Return commands that exhausted their retries, oldest first."""
+    return _read_json_files(lattice_dir / DEAD_DIR)
+
+
+def retry_dead_letters(lattice_dir: Path, ids: list[str] | None = None) -> list[str]:
+    """Re-queue dead letters (all of them, or those in *ids*).
+
+    Each becomes a new single-command job at the back of the queue.  Returns
+    the IDs of the dead letters that were re-queued.
+    """
+    dead_dir = lattice_dir / DEAD_DIR
+    outbox = lattice_dir / OUTBOX_DIR
+    outbox.mkdir(parents=True, exist_ok=True)
+    requeued: list[str] = []
+    for letter in dead_letters(lattice_dir):
+        if ids is not None and letter["id"] not in ids:
+            continue
+        job_id = _new_job_id()
+        job = {
+            "id": job_id,
+            "key": letter["key"],
+            "commands": [{"cmd": letter["cmd"], "env": letter["env"]}],
+            "stdin": letter["stdin"],
+            "next": 0,
+            "queued_at": _now(),
+        }
+        _write_json(outbox / f"{job_id}.json", job)
+        (dead_dir / f"{letter['id']}.json").unlink(missing_ok=True)
+        requeued.append(letter["id"])
+    if requeued:
+        notify_worker(lattice_dir)
+    return requeued
+
+
+def _run_command(
+    cmd: str,
+    env: dict[str, str],
+    stdin_data: str,
+    base_env: dict[str, str] | None = None,
+    cwd: str | None = None,
+) -> str | None:
+    """Run one hook command; return an error description, or ``None`` on success.
+
+    Shell commands get *base_env* (default: the current ``os.environ``)
+    overlaid with *env*, and run in *cwd* (default: the current directory).
+    """
+    if cmd.startswith(PYTHON_HOOK_PREFIX):
+        try:
+            call_python_hook(cmd, json.loads(stdin_data), env)
+        except Exception as exc:
+            return f"raised {type(exc).__name__}: {exc}"
+        return None
+    try:
+        result = subprocess.run(
+            cmd,
+            shell=True,
+            input=stdin_data,
+            env={**(os.environ if base_env is None else base_env), **env},
+            cwd=cwd,
+            timeout=HOOK_TIMEOUT_SECONDS,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except subprocess.TimeoutExpired:
+        return f"timed out after {HOOK_TIMEOUT_SECONDS}s"
+    except Exception as exc:
+        return f"could not run: {exc}"
+    if result.returncode != 0:
+        detail = result.stderr.strip()[-_ERROR_TAIL_CHARS:]
+        return f"exit status {result.returncode}" + (f": {detail}" if detail else "")
+    return None
+
+
+class _Drain:
+    """One pass over the outbox while holding the worker lock."""
+
+    def __init__(
+        self,
+        lattice_dir: Path,
+        config: dict,
+        base_env: dict[str, str] | None = None,
+        cwd: str | None = None,
+    ) -> None:
+        self.lattice_dir = lattice_dir
+        self.base_env = base_env
+        self.cwd = cwd
+        self.workers, self.max_attempts = _settings(config)
+        self.stats = {"jobs": 0, "commands": 0, "retries": 0, "dead": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, n in increments.items():
+                self.stats[name] += n
+
+    def run(self) -> None:
+        outbox = self.lattice_dir / OUTBOX_DIR
+        while True:
+            paths = sorted(outbox.glob("*.json")) if outbox.is_dir() else []
+            if not paths:
+                return
+            groups: dict[str, list[Path]] = {}
+            for path in paths:
+                try:
+                    key = json.loads(path.read_text()).get("key", "")
+                except (OSError, json.JSONDecodeError):
+                    continue
+                groups.setdefault(key, []).append(path)
+            if not groups:
+                return
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(groups))) as pool:
+                list(pool.map(self._run_group, groups.values()))
+
+    def _run_group(self, paths: list[Path]) -> None:
+        for path in paths:
+            self._run_job(path)
+
+    def _run_job(self, path: Path) -> None:
+        try:
+            job = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return
+        commands = job.get("commands", [])
+        for index in range(job.get("next", 0), len(commands)):
+            command = commands[index]
+            error = None
+            for attempt in range(1, self.max_attempts + 1):
+                error = _run_command(
+                    command["cmd"], command["env"], job["stdin"], self.base_env, self.cwd
+                )
+                if error is None:
+                    break
+                if attempt < self.max_attempts:
+                    self._count(retries=1)
+                    time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            self._count(commands=1)
+            if error is not None:
+                self._bury(job, index, command, error)
+            if index + 1 < len(commands):
+                job["next"] = index + 1
+                _write_json(path, job, fsync_dir=False)
+        path.unlink(missing_ok=True)
+        self._count(jobs=1)
+
+    def _bury(self, job: dict, index: int, command: dict, error: str) -> None:
+        dead_dir = self.lattice_dir / DEAD_DIR
+        dead_dir.mkdir(parents=True, exist_ok=True)
+        letter_id = f"{job['id']}-{index}"
+        letter = {
+            "id": letter_id,
+            "job_id": job["id"],
+            "key": job["key"],
+            "cmd": command["cmd"],
+            "env": command["env"],
+            "stdin": job["stdin"],
+            "attempts": self.max_attempts,
+            "error": error,
+            "failed_at": _now(),
+        }
+        _write_json(dead_dir / f"{letter_id}.json", letter)
+        self._count(dead=1)
+
+
+def drain(
+    lattice_dir: Path,
+    config: dict | None = None,
+    *,
+    base_env: dict[str, str] | None = None,
+    cwd: str | None = None,
+) -> dict[str, int] | None:
+    """Run every queued job, returning counts of what was done.
+
+    *base_env* and *cwd* fix the environment and working directory shell
+    hooks run with (see :class:`HookWorker`); by default they are the
+    process's own at the time each command runs.
+
+    Returns ``None`` without running anything if another worker holds the
+    ``hooks_worker`` lock.  After releasing the lock the outbox is checked
+    once more, so a job queued while this worker was finishing up (whose
+    writer saw the lock held and started no worker of its own) is not left
+    behind.
+    """
+    if config is None:
+        config = json.loads((lattice_dir / "config.json").read_text())
+    drained: _Drain | None = None
+    while True:
+        try:
+            with lattice_lock(lattice_dir / "locks", WORKER_LOCK_KEY, timeout=0):
+                current = _Drain(lattice_dir, config, base_env, cwd)
+                current.run()
+        except LockTimeout:
+            return drained.stats if drained is not None else None
+        if drained is None:
+            drained = current
+        else:
+            for name, n in current.stats.items():
+                drained.stats[name] += n
+        if not pending_jobs(lattice_dir):
+            return drained.stats
+
+
+class HookWorker(threading.Thread):
+    """Background thread that drains the outbox for a long-running process.
+
+    The environment and working directory are captured when the worker is
+    created and passed to every hook explicitly: the CLI daemon swaps
+    ``os.environ`` and the current directory per request, and hooks must not
+    pick up whichever client's happen to be in place when they run.
+    """
+
+    def __init__(self, lattice_dir: Path) -> None:
+        super().__init__(name="lattice-hook-worker", daemon=True)
+        self.lattice_dir = lattice_dir.resolve()
+        self.base_env = dict(os.environ)
+        self.cwd = os.getcwd()
+        self._wake = threading.Event()
+        self._stopping = False
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop after the current drain and unregister from this process."""
+        with _local_workers_lock:
+            if _local_workers.get(self.lattice_dir.resolve()) is self:
+                del _local_workers[self.lattice_dir.resolve()]
+        self._stopping = True
+        self._wake.set()
+
+    def run(self) -> None:
+        while not self._stopping:
+            try:
+                drain(self.lattice_dir, base_env=self.base_env, cwd=self.cwd)
+            except Exception as exc:
+                print(f"lattice: hook worker error: {exc}", file=sys.stderr)
+            self._wake.wait(_POLL_SECONDS)
+            self._wake.clear()
+
+
+def start_worker(lattice_dir: Path) -> HookWorker:
+    """Start an in-process worker for *lattice_dir* and route wake-ups to it."""
+    worker = HookWorker(lattice_dir)
+    with _local_workers_lock:
+        _local_workers[lattice_dir.resolve()] = worker
+    worker.start()
+    return worker
+
+
+def start_worker_if_queued(lattice_dir: Path) -> HookWorker | None:
+    """Start an in-process worker if the project has ``hooks.queued`` set."""
+    try:
+        config = json.loads((lattice_dir / "config.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not (config.get("hooks") or {}).get("queued"):
+        return None
+    return start_worker(lattice_dir)
+
+
+def main(argv: list[str]) -> None:
+    """Entry point of the detached worker: ``python -m lattice.storage.hook_queue <.lattice>``."""
+    drain(Path(argv[0]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,4 +1,4 @@
-"""Shell hook execution after events are written."""
+"""Hook execution after events are written: shell commands or in-process handlers."""
 
 from __future__ import annotations
 
@@ -10,6 +10,10 @@ from pathlib import Path
 
 HOOK_TIMEOUT_SECONDS = 10
 
+# A configured hook of the form ``"py:<name>"`` calls the ``lattice.hooks``
+# entry point ``<name>`` in-process instead of spawning a shell.
+PYTHON_HOOK_PREFIX = "py:"
+
 
 def execute_hooks(
     config: dict,
@@ -20,7 +24,12 @@ def execute_hooks(
     """Fire configured hooks for a single event.
 
     Hooks are fire-and-forget: failures are logged to stderr but never
-    raise exceptions or fail the calling CLI command.
+    raise exceptions or fail the calling CLI command.  A hook written as
+    ``py:<name>`` calls that ``lattice.hooks`` entry point in-process
+    (:func:`call_python_hook`) instead of running a shell command.  With
+    ``hooks.queued`` set, the commands are written to the durable outbox
+    (see :mod:`lattice.storage.hook_queue`) and run by a background worker
+    instead.
 
     Execution order when multiple are configured:
     1. ``hooks.post_event`` (catch-all)
@@ -35,18 +44,18 @@ def execute_hooks(
         return
 
     env = _build_env(lattice_dir, task_id, event)
-    stdin_data = json.dumps(event, sort_keys=True, separators=(",", ":"))
+    commands: list[tuple[str, dict[str, str]]] = []
 
     # 1. post_event (catch-all)
     post_event_cmd = hooks.get("post_event")
     if post_event_cmd:
-        _run_hook(post_event_cmd, env, stdin_data)
+        commands.append((post_event_cmd, env))
 
     # 2. on.<event_type>
     on_hooks = hooks.get("on") or {}
     type_cmd = on_hooks.get(event["type"])
     if type_cmd:
-        _run_hook(type_cmd, env, stdin_data)
+        commands.append((type_cmd, env))
 
     # 3. transitions (status_changed only)
     transitions = hooks.get("transitions")
@@ -62,7 +71,39 @@ def execute_hooks(
             transition_env["LATTICE_TO_STATUS"] = to_status
 
             for cmd in _match_transitions(transitions, from_status, to_status):
-                _run_hook(cmd, transition_env, stdin_data)
+                commands.append((cmd, transition_env))
+
+    _dispatch(hooks, lattice_dir, task_id, event, commands)
+
+
+def _dispatch(
+    hooks: dict,
+    lattice_dir: Path,
+    key: str,
+    event: dict,
+    commands: list[tuple[str, dict[str, str]]],
+) -> None:
+    """Run *commands* now, or queue them when ``hooks.queued`` is set."""
+    if not commands:
+        return
+    if hooks.get("queued"):
+        from lattice.storage.hook_queue import enqueue
+
+        stdin_data = json.dumps(event, sort_keys=True, separators=(",", ":"))
+        try:
+            enqueue(lattice_dir, key, commands, stdin_data)
+        except Exception as exc:
+            print(f"lattice: could not queue hooks: {exc}", file=sys.stderr)
+        return
+
+    stdin_data = None
+    for cmd, env in commands:
+        if cmd.startswith(PYTHON_HOOK_PREFIX):
+            _run_python_hook(cmd, event, env)
+            continue
+        if stdin_data is None:
+            stdin_data = json.dumps(event, sort_keys=True, separators=(",", ":"))
+        _run_hook(cmd, env, stdin_data)
 
 
 def _match_transitions(
@@ -148,25 +189,30 @@ def execute_resource_hooks(
         return
 
     env = _build_resource_env(lattice_dir, resource_id, resource_name, event)
-    stdin_data = json.dumps(event, sort_keys=True, separators=(",", ":"))
+    commands: list[tuple[str, dict[str, str]]] = []
 
     # post_event (catch-all)
     post_event_cmd = hooks.get("post_event")
     if post_event_cmd:
-        _run_hook(post_event_cmd, env, stdin_data)
+        commands.append((post_event_cmd, env))
 
     # on.<event_type>
     on_hooks = hooks.get("on") or {}
     type_cmd = on_hooks.get(event["type"])
     if type_cmd:
-        _run_hook(type_cmd, env, stdin_data)
+        commands.append((type_cmd, env))
+
+    _dispatch(hooks, lattice_dir, resource_id, event, commands)
 
 
 def _build_env(lattice_dir: Path, task_id: str, event: dict) -> dict[str, str]:
-    """Build the environment dict for hook subprocesses."""
+    """Build the ``LATTICE_*`` variables for task hook commands.
+
+    Commands run with the caller's environment plus these.
+    """
     from lattice.core.events import get_actor_display
 
-    env = os.environ.copy()
+    env: dict[str, str] = {}
     env["LATTICE_ROOT"] = str(lattice_dir)
     env["LATTICE_TASK_ID"] = task_id
     env["LATTICE_EVENT_TYPE"] = event["type"]
@@ -181,10 +227,10 @@ def _build_resource_env(
     resource_name: str,
     event: dict,
 ) -> dict[str, str]:
-    """Build the environment dict for resource hook subprocesses."""
+    """Build the ``LATTICE_*`` variables for resource hook commands."""
     from lattice.core.events import get_actor_display
 
-    env = os.environ.copy()
+    env: dict[str, str] = {}
     env["LATTICE_ROOT"] = str(lattice_dir)
     env["LATTICE_RESOURCE_ID"] = resource_id
     env["LATTICE_RESOURCE_NAME"] = resource_name
@@ -194,6 +240,27 @@ def _build_resource_env(
     return env
 
 
+def call_python_hook(cmd: str, event: dict, env: dict[str, str]) -> None:
+    """Call the ``lattice.hooks`` handler that ``py:<name>`` *cmd* refers to.
+
+    The handler receives the event dict itself (it must not modify it) and
+    the ``LATTICE_*`` variables a shell hook would get.  Exceptions, including
+    ``LookupError`` for an unknown name, propagate.
+    """
+    from lattice.plugins import load_hook_handler
+
+    handler = load_hook_handler(cmd[len(PYTHON_HOOK_PREFIX) :].strip())
+    handler(event, env)
+
+
+def _run_python_hook(cmd: str, event: dict, env: dict[str, str]) -> None:
+    """Call one in-process hook handler. Never raises."""
+    try:
+        call_python_hook(cmd, event, env)
+    except Exception as exc:
+        print(f"lattice: hook error: {cmd}: {exc}", file=sys.stderr)
+
+
 def _run_hook(cmd: str, env: dict[str, str], stdin_data: str) -> None:
     """Execute a single hook command. Never raises."""
     try:
@@ -201,7 +268,7 @@ def _run_hook(cmd: str, env: dict[str, str], stdin_data: str) -> None:
             cmd,
             shell=True,
             input=stdin_data,
-            env=env,
+            env={**os.environ, **env},
             timeout=HOOK_TIMEOUT_SECONDS,
             capture_output=True,
             text=True,
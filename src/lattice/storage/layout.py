@@ -0,0 +1,217 @@
+"""Path resolution for per-task files: the single place that knows the on-disk layout.
+
+Two layouts are supported (selected by ``"layout"`` in ``config.json``):
+
+- ``flat`` — every task snapshot and event log sits directly in its directory::
+
+      tasks/<task_id>.json            events/<task_id>.jsonl
+      archive/tasks/<task_id>.json    archive/events/<task_id>.jsonl
+
+- ``sharded`` — the same files fanned out into subdirectories named after the
+  last two characters of the task ID (the random end of the ULID, so shards
+  fill evenly; 1024 of them for Crockford base32)::
+
+      tasks/5F/<task_id>.json         events/5F/<task_id>.jsonl
+
+Only task snapshots and task event logs are sharded.  The lifecycle log,
+resource logs (``events/res_*.jsonl``), notes and plans keep their flat
+locations in both layouts.
+
+Every reader and writer resolves task paths through this module rather than
+joining ``"tasks"``/``"events"`` itself, so the layout can change without
+touching them.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+from lattice.core.config import DEFAULT_LAYOUT, get_layout
+from lattice.storage.project_config import read_project_config
+
+LIFECYCLE_LOG = "_lifecycle.jsonl"
+RESOURCE_PREFIX = "res_"
+
+SHARD_WIDTH = 2
+
+
+def project_layout(lattice_dir: Path) -> str:
+    """Return the layout configured for the project at *lattice_dir*."""
+    config = read_project_config(lattice_dir)
+    if config is None:
+        return DEFAULT_LAYOUT
+    return get_layout(config)
+
+
+def shard_of(task_id: str) -> str:
+    """Return the shard directory name for *task_id*."""
+    return task_id[-SHARD_WIDTH:]
+
+
+# ---------------------------------------------------------------------------
+# Directories
+# ---------------------------------------------------------------------------
+
+
+def tasks_dir(lattice_dir: Path, *, archived: bool = False) -> Path:
+    """Return the root directory for task snapshots (active or archived)."""
+    return lattice_dir / "archive" / "tasks" if archived else lattice_dir / "tasks"
+
+
+def events_dir(lattice_dir: Path, *, archived: bool = False) -> Path:
+    """Return the root directory for event logs (active or archived)."""
+    return lattice_dir / "archive" / "events" if archived else lattice_dir / "events"
+
+
+def lifecycle_log_path(lattice_dir: Path) -> Path:
+    """Return the path of ``_lifecycle.jsonl`` (never sharded)."""
+    return lattice_dir / "events" / LIFECYCLE_LOG
+
+
+# ---------------------------------------------------------------------------
+# Per-task paths
+# ---------------------------------------------------------------------------
+
+
+def task_snapshot_path(
+    lattice_dir: Path, task_id: str, *, archived: bool = False, layout: str | None = None
+) -> Path:
+    """Return where the snapshot of *task_id* lives under *layout* (default: configured)."""
+    base = tasks_dir(lattice_dir, archived=archived)
+    if (layout or project_layout(lattice_dir)) == "sharded":
+        return base / shard_of(task_id) / f"{task_id}.json"
+    return base / f"{task_id}.json"
+
+
+def task_event_path(
+    lattice_dir: Path, task_id: str, *, archived: bool = False, layout: str | None = None
+) -> Path:
+    """Return where the event log of *task_id* lives under *layout* (default: configured).
+
+    Resource IDs (``res_*``) resolve to their flat location in every layout.
+    """
+    base = events_dir(lattice_dir, archived=archived)
+    if task_id.startswith(RESOURCE_PREFIX):
+        return base / f"{task_id}.jsonl"
+    if (layout or project_layout(lattice_dir)) == "sharded":
+        return base / shard_of(task_id) / f"{task_id}.jsonl"
+    return base / f"{task_id}.jsonl"
+
+
+def resource_event_path(lattice_dir: Path, resource_id: str) -> Path:
+    """Return the event log path of a resource (resources are never sharded)."""
+    return lattice_dir / "events" / f"{resource_id}.jsonl"
+
+
+def ensure_parent(path: Path) -> Path:
+    """Create *path*'s parent directory (a shard) if needed. Returns *path*."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Listing
+# ---------------------------------------------------------------------------
+
+
+def _list_files(directory: Path, suffix: str, layout: str) -> list[Path]:
+    result: list[Path] = []
+    try:
+        top = os.scandir(directory)
+    except OSError:
+        return result
+    with top:
+        for entry in top:
+            if layout == "sharded":
+                if not entry.is_dir():
+                    continue
+                try:
+                    with os.scandir(entry.path) as shard:
+                        result.extend(
+                            Path(f.path)
+                            for f in shard
+                            if f.name.endswith(suffix) and not f.name.startswith(".")
+                        )
+                except OSError:
+                    continue
+            elif entry.name.endswith(suffix) and not entry.name.startswith("."):
+                result.append(Path(entry.path))
+    result.sort(key=lambda p: p.name)
+    return result
+
+
+def task_snapshot_files(
+    lattice_dir: Path, *, archived: bool = False, layout: str | None = None
+) -> list[Path]:
+    """List task snapshot files (active or archived), sorted by task ID."""
+    return _list_files(
+        tasks_dir(lattice_dir, archived=archived),
+        ".json",
+        layout or project_layout(lattice_dir),
+    )
+
+
+def task_event_files(
+    lattice_dir: Path, *, archived: bool = False, layout: str | None = None
+) -> list[Path]:
+    """List task event logs (active or archived), sorted by task ID.
+
+    Excludes the lifecycle log and resource logs.
+    """
+    files = _list_files(
+        events_dir(lattice_dir, archived=archived),
+        ".jsonl",
+        layout or project_layout(lattice_dir),
+    )
+    return [f for f in files if f.name != LIFECYCLE_LOG and not f.name.startswith(RESOURCE_PREFIX)]
+
+
+def resource_event_files(lattice_dir: Path) -> list[Path]:
+    """List resource event logs (``events/res_*.jsonl``), sorted by resource ID."""
+    return sorted((lattice_dir / "events").glob(f"{RESOURCE_PREFIX}*.jsonl"))
+
+
+def _with_shards(lattice_dir: Path, base: Path) -> list[Path]:
+    dirs = [base]
+    if project_layout(lattice_dir) == "sharded":
+        try:
+            with os.scandir(base) as it:
+                dirs.extend(sorted(Path(e.path) for e in it if e.is_dir()))
+        except OSError:
+            pass
+    return dirs
+
+
+def task_snapshot_dirs(lattice_dir: Path, *, archived: bool = False) -> list[Path]:
+    """Return every directory a snapshot write can touch (root plus shards)."""
+    return _with_shards(lattice_dir, tasks_dir(lattice_dir, archived=archived))
+
+
+def task_event_dirs(lattice_dir: Path, *, archived: bool = False) -> list[Path]:
+    """Return every directory a task event log can live in (root plus shards)."""
+    return _with_shards(lattice_dir, events_dir(lattice_dir, archived=archived))
+
+
+def _dir_mtime(path: Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def directory_signature(lattice_dir: Path, dirs_of: Callable[..., list[Path]]) -> list[int]:
+    """Return a cheap freshness signature of the active and archived directories.
+
+    *dirs_of* is :func:`task_snapshot_dirs` or :func:`task_event_dirs`.
+    Creating, replacing, moving or deleting a file bumps its directory's
+    mtime.  In the sharded layout that is only the shard's mtime, so the
+    signature also carries the sum of shard mtimes (which only grows as
+    shards are written to).
+    """
+    roots = [dirs_of(lattice_dir), dirs_of(lattice_dir, archived=True)]
+    sig = [_dir_mtime(dirs[0]) for dirs in roots]
+    if project_layout(lattice_dir) == "sharded":
+        sig.extend(sum(_dir_mtime(d) for d in dirs[1:]) for dirs in roots)
+    return sig
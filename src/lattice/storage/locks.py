@@ -5,8 +5,13 @@ from __future__ import annotations
 import contextlib
 from collections.abc import Generator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from filelock import FileLock, Timeout
+if TYPE_CHECKING:
+    from filelock import FileLock
+
+# filelock is imported inside the lock helpers: it costs tens of milliseconds
+# to import, and read-only commands usually never take a lock.
 
 
 class LockTimeout(Exception):
@@ -29,6 +34,8 @@ def lattice_lock(
     Raises:
         LockTimeout: If the lock cannot be acquired within *timeout* seconds.
     """
+    from filelock import FileLock, Timeout
+
     lock_path = locks_dir / f"{key}.lock"
     lock = FileLock(lock_path, timeout=timeout)
     try:
@@ -61,6 +68,8 @@ def multi_lock(
     Raises:
         LockTimeout: If any lock cannot be acquired within *timeout* seconds.
     """
+    from filelock import FileLock, Timeout
+
     sorted_keys = sorted(keys)
     acquired: list[FileLock] = []
     try:
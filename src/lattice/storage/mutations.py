@@ -0,0 +1,490 @@
+"""Validation and side effects shared by the task write commands and batches.
+
+``lattice create``/``update``/``status``/``assign``/``comment``/``link``/
+``unlink`` and :func:`lattice.storage.batch.run_batch` apply the same rules
+through these functions, so a batch accepts exactly what the individual
+commands accept and rejects it with the same error code.  Failures raise
+:class:`MutationError`; the CLI turns it into ``output_error`` and a batch
+into a failed operation.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from lattice.core.comments import validate_comment_body, validate_comment_for_reply
+from lattice.core.config import (
+    VALID_COMPLEXITIES,
+    VALID_PRIORITIES,
+    VALID_URGENCIES,
+    get_configured_roles,
+    get_review_cycle_limit,
+    get_valid_transitions,
+    validate_completion_policy,
+    validate_status,
+    validate_task_type,
+    validate_transition,
+)
+from lattice.core.events import count_review_rework_cycles
+from lattice.core.ids import validate_actor
+from lattice.core.relationships import RELATIONSHIP_TYPES, validate_relationship_type
+from lattice.core.tasks import is_backward_status_transition, is_scaffold_plan
+from lattice.storage.layout import task_snapshot_path
+from lattice.storage.readers import read_task_events
+
+# Fields `create` compares when a caller-supplied ID already exists.
+CREATE_COMPARE_FIELDS = (
+    "title",
+    "type",
+    "priority",
+    "urgency",
+    "complexity",
+    "status",
+    "description",
+    "tags",
+    "assigned_to",
+)
+
+UPDATABLE_FIELDS = frozenset(
+    {"title", "description", "priority", "urgency", "complexity", "type", "tags"}
+)
+
+_REDIRECT_FIELDS = {
+    "status": "Use 'lattice status' to change status.",
+    "assigned_to": "Use 'lattice assign' to change assignment.",
+}
+
+UNASSIGN_SENTINELS = frozenset({"none", "unassigned", "-"})
+
+_REASON_REQUIRED = "--reason is required with --force."
+
+
+class MutationError(Exception):
+    """A task write was rejected.
+
+    *details* carries extra machine-readable fields for the JSON error
+    object (e.g. the valid transitions of an ``INVALID_TRANSITION``).
+    """
+
+    def __init__(self, code: str, message: str, **details: object) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details
+
+
+def _parse_tags(tags: str | list[str] | None) -> list[str]:
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        return [t.strip() for t in tags.split(",") if t.strip()]
+    return list(tags)
+
+
+# ---------------------------------------------------------------------------
+# create / update
+# ---------------------------------------------------------------------------
+
+
+def new_task_data(
+    config: dict,
+    title: str,
+    *,
+    task_type: str | None = None,
+    priority: str | None = None,
+    urgency: str | None = None,
+    complexity: str | None = None,
+    status: str | None = None,
+    description: str | None = None,
+    tags: str | list[str] | None = None,
+    assigned_to: str | None = None,
+) -> dict:
+    """Apply defaults to and validate the fields of a new task.
+
+    Returns a dict keyed by :data:`CREATE_COMPARE_FIELDS`.
+    """
+    if status is None:
+        status = config.get("default_status", "backlog")
+    if priority is None:
+        priority = config.get("default_priority", "medium")
+    if task_type is None:
+        task_type = "task"
+
+    if not validate_status(config, status):
+        valid = ", ".join(config.get("workflow", {}).get("statuses", []))
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid status: '{status}'. Valid statuses: {valid}."
+        )
+    if not validate_task_type(config, task_type):
+        valid = ", ".join(config.get("task_types", []))
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid task type: '{task_type}'. Valid types: {valid}."
+        )
+    if priority not in VALID_PRIORITIES:
+        valid = ", ".join(VALID_PRIORITIES)
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid priority: '{priority}'. Valid priorities: {valid}."
+        )
+    if urgency is not None and urgency not in VALID_URGENCIES:
+        valid = ", ".join(VALID_URGENCIES)
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid urgency: '{urgency}'. Valid urgencies: {valid}."
+        )
+    if complexity is not None and complexity not in VALID_COMPLEXITIES:
+        valid = ", ".join(VALID_COMPLEXITIES)
+        raise MutationError(
+            "VALIDATION_ERROR",
+            f"Invalid complexity: '{complexity}'. Valid complexities: {valid}.",
+        )
+    if assigned_to is not None and not validate_actor(assigned_to):
+        raise MutationError("INVALID_ACTOR", f"Invalid assigned-to format: '{assigned_to}'.")
+
+    return {
+        "title": title,
+        "type": task_type,
+        "priority": priority,
+        "urgency": urgency,
+        "complexity": complexity,
+        "status": status,
+        "description": description,
+        "tags": _parse_tags(tags),
+        "assigned_to": assigned_to,
+    }
+
+
+def check_existing_task(task_id: str, existing: dict, data: dict) -> None:
+    """Check a create of an existing *task_id* is an idempotent retry.
+
+    Raises ``CONFLICT`` when *existing* differs from the new task *data*.
+    """
+    existing_data = {field: existing.get(field) for field in CREATE_COMPARE_FIELDS}
+    # Normalize: snapshot stores tags as list, default is None
+    if existing_data.get("tags") is None:
+        existing_data["tags"] = []
+    if existing_data != data:
+        raise MutationError("CONFLICT", f"Conflict: task {task_id} exists with different data.")
+
+
+def task_created_data(data: dict) -> dict:
+    """Return the ``task_created`` event data for the new task *data*."""
+    return {k: v for k, v in data.items() if v is not None and v != []}
+
+
+def field_change(config: dict, snapshot: dict, field: str, value: object) -> tuple[object, object]:
+    """Validate setting *field* to *value*; return its ``(old, new)`` values.
+
+    *field* is one of :data:`UPDATABLE_FIELDS` or ``custom_fields.<key>``.
+    The caller skips the update when old and new are equal.
+    """
+    if field in _REDIRECT_FIELDS:
+        raise MutationError("VALIDATION_ERROR", _REDIRECT_FIELDS[field])
+
+    if field.startswith("custom_fields."):
+        key = field[len("custom_fields.") :]
+        if not key:
+            raise MutationError(
+                "VALIDATION_ERROR", "Invalid custom field: 'custom_fields.' requires a key name."
+            )
+        return (snapshot.get("custom_fields") or {}).get(key), value
+
+    if field not in UPDATABLE_FIELDS:
+        valid = ", ".join(sorted(UPDATABLE_FIELDS))
+        raise MutationError(
+            "VALIDATION_ERROR",
+            f"Unknown or non-updatable field: '{field}'. "
+            f"Updatable fields: {valid}. Use custom_fields.<key> for custom data.",
+        )
+
+    if field == "priority" and value not in VALID_PRIORITIES:
+        valid = ", ".join(VALID_PRIORITIES)
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid priority: '{value}'. Valid priorities: {valid}."
+        )
+    if field == "urgency" and value not in VALID_URGENCIES:
+        valid = ", ".join(VALID_URGENCIES)
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid urgency: '{value}'. Valid urgencies: {valid}."
+        )
+    if field == "complexity" and value not in VALID_COMPLEXITIES:
+        valid = ", ".join(VALID_COMPLEXITIES)
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid complexity: '{value}'. Valid complexities: {valid}."
+        )
+    if field == "type" and not validate_task_type(config, value):
+        valid = ", ".join(config.get("task_types", []))
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid task type: '{value}'. Valid types: {valid}."
+        )
+
+    if field == "tags":
+        return snapshot.get("tags") or [], _parse_tags(value)
+    return snapshot.get(field), value
+
+
+# ---------------------------------------------------------------------------
+# status
+# ---------------------------------------------------------------------------
+
+
+def plan_gate_error(
+    lattice_dir: Path, task_id: str, *, snapshot: dict | None = None
+) -> str | None:
+    """Return why *task_id* may not move to in_progress, or None if its plan is written.
+
+    *snapshot* supplies the task description a scaffold plan is compared
+    against; it is read from disk when not given.
+    """
+    plan_path = lattice_dir / "plans" / f"{task_id}.md"
+    if not plan_path.exists():
+        return (
+            f"Plan file missing for {task_id}. "
+            "Write a plan before moving to in_progress. "
+            "Override with --force --reason."
+        )
+
+    try:
+        content = plan_path.read_text()
+    except OSError:
+        return None  # Can't read → don't block (filesystem issue, not a planning issue)
+
+    # Load the task description so we can distinguish "plan is just the
+    # auto-generated description" from "plan has real content".
+    if snapshot is None:
+        try:
+            snapshot = json.loads(task_snapshot_path(lattice_dir, task_id).read_text())
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            snapshot = {}
+
+    if is_scaffold_plan(content, description=snapshot.get("description")):
+        return (
+            f"Plan for {task_id} is still scaffold. "
+            "Write the plan (even one line) before moving to in_progress. "
+            "Override with --force --reason."
+        )
+    return None
+
+
+def check_status_change(
+    lattice_dir: Path,
+    config: dict,
+    snapshot: dict,
+    new_status: str,
+    *,
+    force: bool = False,
+    reason: str | None = None,
+    read_events: Callable[[], list[dict]] | None = None,
+) -> None:
+    """Validate moving *snapshot* to *new_status* (already resolved to a slug).
+
+    Checks the transition, the review cycle limit, the completion policy and
+    the planning gate.  *force* overrides them, but then needs a *reason*.
+    *read_events* returns the task's events for the review cycle count; the
+    log on disk is read when not given.  A no-op move is not an error; the
+    caller reports it.
+    """
+    task_id = snapshot["id"]
+    current_status = snapshot["status"]
+
+    if not validate_status(config, new_status):
+        valid = ", ".join(config.get("workflow", {}).get("statuses", []))
+        raise MutationError(
+            "VALIDATION_ERROR", f"Invalid status: '{new_status}'. Valid statuses: {valid}."
+        )
+    if current_status == new_status:
+        return
+
+    if not validate_transition(config, current_status, new_status):
+        if not force:
+            valid_targets = get_valid_transitions(config, current_status)
+            valid_list = ", ".join(valid_targets) if valid_targets else "(none)"
+            raise MutationError(
+                "INVALID_TRANSITION",
+                f"Invalid transition from {current_status} to {new_status}. "
+                f"Valid transitions from {current_status}: {valid_list}. "
+                "Use --force --reason to override.",
+                current_status=current_status,
+                requested_status=new_status,
+                valid_transitions=valid_targets,
+            )
+        if not reason:
+            raise MutationError("VALIDATION_ERROR", _REASON_REQUIRED)
+
+    # Review cycle limit: block rework transitions if cycle limit reached
+    if current_status == "review" and new_status in ("in_progress", "in_planning") and not force:
+        events = read_events() if read_events else read_task_events(lattice_dir, task_id)
+        cycle_count = count_review_rework_cycles(events)
+        cycle_limit = get_review_cycle_limit(config)
+        if cycle_count >= cycle_limit:
+            raise MutationError(
+                "REVIEW_CYCLE_LIMIT",
+                f"Review cycle limit reached ({cycle_count}/{cycle_limit}). "
+                f"This task has been sent back from review {cycle_count} time(s). "
+                "Move to needs_human with a comment explaining the situation "
+                "instead of cycling further. "
+                "Override with --force --reason.",
+            )
+
+    # Completion policies (evidence gating)
+    policy_ok, policy_failures = validate_completion_policy(config, snapshot, new_status)
+    if not policy_ok:
+        if not force:
+            raise MutationError(
+                "COMPLETION_BLOCKED",
+                f"Completion policy not satisfied: {'; '.join(policy_failures)}. "
+                "Override with --force --reason.",
+            )
+        if not reason:
+            raise MutationError("VALIDATION_ERROR", _REASON_REQUIRED)
+
+    # Planning gate: block in_progress if plan is still scaffold
+    if new_status == "in_progress":
+        if force:
+            if not reason:
+                raise MutationError("VALIDATION_ERROR", _REASON_REQUIRED)
+            return
+        message = plan_gate_error(lattice_dir, task_id, snapshot=snapshot)
+        if message is not None:
+            raise MutationError("PLAN_REQUIRED", message)
+
+
+def _status_rank_from_config(config: dict) -> dict[str, int] | None:
+    statuses = config.get("workflow", {}).get("statuses", [])
+    if not isinstance(statuses, list):
+        return None
+    rank = {status: idx for idx, status in enumerate(statuses) if isinstance(status, str)}
+    return rank or None
+
+
+def reset_plan_after_status_change(
+    lattice_dir: Path, config: dict, event: dict, actor: str | dict
+) -> None:
+    """Append a reset heading to the plan when *event* moved its task backward.
+
+    Call after the ``status_changed`` *event* is written.
+    """
+    data = event["data"]
+    rank = _status_rank_from_config(config)
+    if not is_backward_status_transition(data["from"], data["to"], rank):
+        return
+    plan_path = lattice_dir / "plans" / f"{event['task_id']}.md"
+    if not plan_path.exists():
+        return
+
+    date = "unknown-date"
+    event_ts = event.get("ts")
+    if isinstance(event_ts, str) and event_ts:
+        date = event_ts.split("T", 1)[0]
+
+    content = plan_path.read_text(encoding="utf-8")
+    separator = "" if content.endswith("\n") else "\n"
+    reset_heading = f"## Reset {date} by {actor}"
+    plan_path.write_text(f"{content}{separator}\n{reset_heading}\n", encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# assign / comment
+# ---------------------------------------------------------------------------
+
+
+def parse_assignee(value: str) -> str | None:
+    """Return the actor to assign, or None for an unassign sentinel."""
+    if value.lower() in UNASSIGN_SENTINELS:
+        return None
+    if not validate_actor(value):
+        raise MutationError(
+            "INVALID_ACTOR",
+            f"Invalid actor format: '{value}'. "
+            "Expected prefix:identifier (e.g., human:atin, agent:claude). "
+            "Use 'none', 'unassigned', or '-' to unassign.",
+        )
+    return value
+
+
+def comment_data(
+    config: dict,
+    text: object,
+    *,
+    role: str | None = None,
+    reply_to: str | None = None,
+    read_events: Callable[[], list[dict]],
+) -> dict:
+    """Validate a new comment and return its ``comment_added`` event data.
+
+    *read_events* returns the task's events; it is only called for a reply.
+    """
+    try:
+        if reply_to is not None:
+            validate_comment_for_reply(read_events(), reply_to)
+        body = validate_comment_body(text)
+    except ValueError as exc:
+        raise MutationError("VALIDATION_ERROR", str(exc)) from None
+
+    # Validate role against configured completion policy roles
+    if role is not None:
+        configured_roles = get_configured_roles(config)
+        if configured_roles and role not in configured_roles:
+            raise MutationError(
+                "INVALID_ROLE",
+                f"Unknown role: '{role}'. Valid roles: {', '.join(sorted(configured_roles))}.",
+            )
+
+    event_data: dict = {"body": body}
+    if reply_to is not None:
+        event_data["parent_id"] = reply_to
+    if role is not None:
+        event_data["role"] = role
+    return event_data
+
+
+# ---------------------------------------------------------------------------
+# link / unlink
+# ---------------------------------------------------------------------------
+
+
+def check_relationship_type(rel_type: str) -> None:
+    if not validate_relationship_type(rel_type):
+        sorted_types = ", ".join(sorted(RELATIONSHIP_TYPES))
+        raise MutationError(
+            "VALIDATION_ERROR",
+            f"Invalid relationship type: '{rel_type}'. Valid types: {sorted_types}.",
+        )
+
+
+def check_not_self_link(source_id: str, target_id: str) -> None:
+    if source_id == target_id:
+        raise MutationError(
+            "VALIDATION_ERROR", "Cannot create a relationship from a task to itself."
+        )
+
+
+def link_data(snapshot: dict, rel_type: str, target_id: str, note: str | None = None) -> dict:
+    """Validate a new relationship from *snapshot*; return its event data.
+
+    The caller has already run :func:`check_relationship_type` and
+    :func:`check_not_self_link` and checked that the target task exists.
+    """
+    # Reject duplicates: same type + same target already in relationships_out
+    for rel in snapshot.get("relationships_out", []):
+        if rel["type"] == rel_type and rel["target_task_id"] == target_id:
+            raise MutationError(
+                "CONFLICT", f"Duplicate: {rel_type} relationship to {target_id} already exists."
+            )
+    event_data: dict = {"type": rel_type, "target_task_id": target_id}
+    if note is not None:
+        event_data["note"] = note
+    return event_data
+
+
+def unlink_data(snapshot: dict, rel_type: str, target_id: str) -> dict:
+    """Validate removing a relationship from *snapshot*; return its event data.
+
+    The caller has already run :func:`check_relationship_type`.
+    """
+    if not any(
+        rel["type"] == rel_type and rel["target_task_id"] == target_id
+        for rel in snapshot.get("relationships_out", [])
+    ):
+        raise MutationError("NOT_FOUND", f"No {rel_type} relationship to {target_id}.")
+    return {"type": rel_type, "target_task_id": target_id}
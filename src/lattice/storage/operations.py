@@ -3,14 +3,54 @@
 from __future__ import annotations
 
 import contextlib
-from collections.abc import Generator
+import json
+import shutil
+import sys
+from collections.abc import Callable, Generator
 from pathlib import Path
 
-from lattice.core.events import LIFECYCLE_EVENT_TYPES, serialize_event
-from lattice.core.tasks import serialize_snapshot
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.core.config import get_durability
+from lattice.core.events import (
+    LIFECYCLE_EVENT_TYPES,
+    create_event,
+    get_actor_display,
+    serialize_event,
+)
+from lattice.core.next import actors_match, compute_claim_transitions
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage.archive_packs import unpack_task
+from lattice.storage.blocking_index import (
+    BLOCKING_EVENT_TYPES,
+    BLOCKING_INDEX_FILENAME,
+    blocking_index_record,
+)
+from lattice.storage.catalog import CATALOG_FILENAME, catalog_record
+from lattice.storage.event_index import (
+    EVENT_INDEX_FILENAME,
+    event_index_move,
+    event_index_record,
+)
+from lattice.storage.fs import atomic_write, cache_path, jsonl_append, jsonl_append_many
 from lattice.storage.hooks import execute_hooks
+from lattice.storage.layout import (
+    ensure_parent,
+    lifecycle_log_path,
+    resource_event_path,
+    task_event_path,
+    task_snapshot_path,
+)
 from lattice.storage.locks import lattice_lock, multi_lock
+from lattice.storage.project_config import read_project_config
+from lattice.storage.ready_queue import (
+    READY_QUEUE_FILENAME,
+    affects_ready_queue,
+    ready_queue_record,
+)
+from lattice.storage.relationship_index import (
+    RELATIONSHIP_EVENT_TYPES,
+    RELATIONSHIP_INDEX_FILENAME,
+    relationship_index_record,
+)
 
 
 def scaffold_plan(
@@ -76,52 +116,173 @@ def scaffold_notes(
     notes_path.write_text("\n".join(lines), encoding="utf-8")
 
 
+def durability_policy(lattice_dir: Path, config: dict | None = None) -> str:
+    """Return the project's event-append durability policy.
+
+    Uses *config* when the caller already loaded it; otherwise the cached
+    ``config.json`` (see :mod:`lattice.storage.project_config`).  An
+    unreadable config means ``strict``.
+    """
+    if config is None:
+        config = read_project_config(lattice_dir)
+        if config is None:
+            return "strict"
+    return get_durability(config)
+
+
+def append_lines(path: Path, lines: list[str], durability: str) -> None:
+    """Append JSONL lines to *path* under the given durability policy.
+
+    ``strict`` fsyncs after every line; ``batched`` and ``relaxed`` write the
+    whole batch with a single write and fsync (``relaxed`` also skips the
+    directory fsync).  The caller must hold the file's lock.
+    """
+    if durability == "strict":
+        for line in lines:
+            jsonl_append(path, line)
+    else:
+        jsonl_append_many(path, lines, fsync_dir=durability != "relaxed")
+
+
+def record_derived(
+    lattice_dir: Path, filename: str, record: Callable[..., object], *args: object
+) -> None:
+    """Call ``record(lattice_dir, *args)``, deleting the cache file if it fails.
+
+    By the time a cache is updated the events and snapshot are already on
+    disk, so a failure here must not fail the write or skip its hooks.  A
+    missing cache file is rebuilt by its next reader, whereas one that
+    silently missed a record could later be restamped as fresh.
+    """
+    try:
+        record(lattice_dir, *args)
+    except Exception as exc:  # noqa: BLE001 — the cache is rebuildable; the write already landed
+        print(f"lattice: {filename} marked stale: {exc}", file=sys.stderr)
+        with contextlib.suppress(OSError):
+            cache_path(lattice_dir, filename).unlink(missing_ok=True)
+
+
+def append_events(
+    lattice_dir: Path,
+    log_id: str,
+    event_path: Path,
+    events: list[dict],
+    *,
+    durability: str | None = None,
+) -> None:
+    """Append events to a per-task/per-resource log and record them in the event index.
+
+    The caller must hold the log's ``events_<id>`` lock.  *durability*
+    defaults to the project's configured policy.
+    """
+    if not events:
+        return
+    if durability is None:
+        durability = durability_policy(lattice_dir)
+    append_lines(event_path, [serialize_event(e) for e in events], durability)
+    end_offset = event_path.stat().st_size
+    record_derived(
+        lattice_dir, EVENT_INDEX_FILENAME, event_index_record, log_id, end_offset, events
+    )
+
+
 def write_task_event(
     lattice_dir: Path,
     task_id: str,
     events: list[dict],
     snapshot: dict,
     config: dict | None = None,
+    *,
+    _caller_holds_lock: bool = False,
+    _caller_holds_lifecycle_lock: bool = False,
 ) -> None:
     """Write event(s) and snapshot atomically with proper locking.
 
     This is the canonical write path for all task mutations. Both the CLI
     and dashboard route through this function.
 
+    Args:
+        _caller_holds_lock: If True, skip acquiring the task locks (caller
+            already holds ``events_<id>``/``tasks_<id>`` for a read-check-write
+            sequence).  Such callers normally pass ``config=None`` and fire
+            hooks themselves once their locks are released.
+        _caller_holds_lifecycle_lock: With ``_caller_holds_lock``, the caller
+            also holds ``events__lifecycle`` (taken in sorted order with the
+            task locks), so lifecycle events are appended without it.
+
     Steps:
     1. Acquire locks in sorted order
-    2. Append events to per-task JSONL
+    2. Append events to per-task JSONL (fsync policy per ``durability``)
     3. Append lifecycle events to _lifecycle.jsonl
     4. Atomic-write snapshot
-    5. Release locks
-    6. Fire hooks (after locks released, data is durable)
+    5. Update the derived task catalog, indexes and ready queue (a failure
+       deletes that cache so its next reader rebuilds it)
+    6. Release locks
+    7. Fire hooks (after locks released, data is durable)
     """
     locks_dir = lattice_dir / "locks"
+    durability = durability_policy(lattice_dir, config)
 
     # Determine which events go to lifecycle log
     lifecycle_events = [e for e in events if e["type"] in LIFECYCLE_EVENT_TYPES]
+    edges_changed = any(e["type"] in RELATIONSHIP_EVENT_TYPES for e in events)
+    blocking_changed = any(e["type"] in BLOCKING_EVENT_TYPES for e in events)
+    queue_changed = affects_ready_queue(events)
 
-    # Build lock keys
-    lock_keys = [f"events_{task_id}", f"tasks_{task_id}"]
-    if lifecycle_events:
-        lock_keys.append("events__lifecycle")
-    lock_keys.sort()
-
-    with multi_lock(locks_dir, lock_keys):
+    def _do_writes() -> None:
         # Event-first: append to per-task log
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        for event in events:
-            jsonl_append(event_path, serialize_event(event))
+        event_path = ensure_parent(task_event_path(lattice_dir, task_id))
+        append_events(lattice_dir, task_id, event_path, events, durability=durability)
 
         # Lifecycle events go to lifecycle log
         if lifecycle_events:
-            lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-            for event in lifecycle_events:
-                jsonl_append(lifecycle_path, serialize_event(event))
+            lifecycle_path = lifecycle_log_path(lattice_dir)
+            append_lines(
+                lifecycle_path, [serialize_event(e) for e in lifecycle_events], durability
+            )
 
         # Then materialize snapshot
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(snapshot))
+        snapshot_path = ensure_parent(task_snapshot_path(lattice_dir, task_id))
+        atomic_write(
+            snapshot_path, serialize_snapshot(snapshot), fsync_dir=durability != "relaxed"
+        )
+
+        # Derived caches: a failure marks that cache stale instead of failing the write
+        record_derived(lattice_dir, CATALOG_FILENAME, catalog_record, [snapshot])
+        record_derived(
+            lattice_dir,
+            RELATIONSHIP_INDEX_FILENAME,
+            relationship_index_record,
+            [snapshot] if edges_changed else [],
+        )
+        record_derived(
+            lattice_dir,
+            BLOCKING_INDEX_FILENAME,
+            blocking_index_record,
+            [snapshot] if blocking_changed else [],
+        )
+        record_derived(
+            lattice_dir,
+            READY_QUEUE_FILENAME,
+            ready_queue_record,
+            [snapshot] if queue_changed else [],
+        )
+
+    if _caller_holds_lock:
+        if lifecycle_events and not _caller_holds_lifecycle_lock:
+            with lattice_lock(locks_dir, "events__lifecycle"):
+                _do_writes()
+        else:
+            _do_writes()
+    else:
+        # Build lock keys
+        lock_keys = [f"events_{task_id}", f"tasks_{task_id}"]
+        if lifecycle_events:
+            lock_keys.append("events__lifecycle")
+        lock_keys.sort()
+
+        with multi_lock(locks_dir, lock_keys):
+            _do_writes()
 
     # Fire hooks after locks are released (data is durable)
     if config:
@@ -129,6 +290,230 @@ def write_task_event(
             execute_hooks(config, lattice_dir, task_id, event)
 
 
+def claim_tasks(
+    lattice_dir: Path,
+    claims: list[tuple[str, str | dict]],
+    actor: str | dict,
+    config: dict,
+) -> tuple[list[dict], list[dict]]:
+    """Assign each task to its claimant and move it to ``in_progress``.
+
+    *claims* is a list of ``(task_id, claimant)`` pairs, usually from
+    :func:`~lattice.storage.ready_queue.queue_select_batch`.  All task locks
+    are taken in one pass in sorted order, so concurrent batch claims never
+    deadlock.  Each snapshot is re-read under the lock.  A task that is
+    already claimed by someone else, or that has no workflow path to
+    ``in_progress``, is skipped rather than failing the whole batch.
+
+    Returns ``(claimed, skipped)``: the updated snapshots and
+    ``{"task_id", "code", "message"}`` entries.  Hooks fire after the locks
+    are released.
+    """
+    locks_dir = lattice_dir / "locks"
+    transitions = config.get("workflow", {}).get("transitions", {})
+    lock_keys = sorted(
+        key for task_id, _claimant in claims for key in (f"events_{task_id}", f"tasks_{task_id}")
+    )
+
+    claimed: list[dict] = []
+    skipped: list[dict] = []
+    written: list[tuple[str, list[dict]]] = []
+    with multi_lock(locks_dir, lock_keys):
+        for task_id, claimant in claims:
+            try:
+                snapshot = json.loads(task_snapshot_path(lattice_dir, task_id).read_text())
+            except (json.JSONDecodeError, OSError):
+                skipped.append(
+                    {"task_id": task_id, "code": "NOT_FOUND", "message": "Task not found."}
+                )
+                continue
+
+            current_assigned = snapshot.get("assigned_to")
+            current_status = snapshot.get("status", "")
+            if current_assigned is not None and not actors_match(current_assigned, claimant):
+                owner = get_actor_display(current_assigned)
+                skipped.append(
+                    {
+                        "task_id": task_id,
+                        "code": "ALREADY_CLAIMED",
+                        "message": f"Task already claimed by {owner}.",
+                    }
+                )
+                continue
+            if current_status in (
+                "in_progress",
+                "review",
+                "done",
+                "cancelled",
+            ) and not actors_match(current_assigned, claimant):
+                skipped.append(
+                    {
+                        "task_id": task_id,
+                        "code": "ALREADY_CLAIMED",
+                        "message": f"Task already in {current_status}.",
+                    }
+                )
+                continue
+
+            path = compute_claim_transitions(current_status, "in_progress", transitions)
+            if path is None:
+                skipped.append(
+                    {
+                        "task_id": task_id,
+                        "code": "INVALID_TRANSITION",
+                        "message": f"No valid transition path from {current_status} "
+                        "to in_progress.",
+                    }
+                )
+                continue
+
+            events: list[dict] = []
+            if not actors_match(current_assigned, claimant):
+                event = create_event(
+                    type="assignment_changed",
+                    task_id=task_id,
+                    actor=actor,
+                    data={"from": current_assigned, "to": claimant},
+                )
+                events.append(event)
+                snapshot = apply_event_to_snapshot(snapshot, event)
+            prev_status = current_status
+            for next_status in path:
+                event = create_event(
+                    type="status_changed",
+                    task_id=task_id,
+                    actor=actor,
+                    data={"from": prev_status, "to": next_status},
+                )
+                events.append(event)
+                snapshot = apply_event_to_snapshot(snapshot, event)
+                prev_status = next_status
+
+            if events:
+                write_task_event(lattice_dir, task_id, events, snapshot, _caller_holds_lock=True)
+                written.append((task_id, events))
+            claimed.append(snapshot)
+
+    for task_id, events in written:
+        for event in events:
+            execute_hooks(config, lattice_dir, task_id, event)
+
+    return claimed, skipped
+
+
+def archive_task_files(
+    lattice_dir: Path,
+    task_id: str,
+    event: dict,
+    snapshot: dict,
+) -> None:
+    """Append the ``task_archived`` event and move the task into ``archive/``.
+
+    The caller must hold ``events_<id>``, ``tasks_<id>`` and
+    ``events__lifecycle``.  *snapshot* is the snapshot with *event* already
+    applied.  Hooks are left to the caller.
+    """
+    durability = durability_policy(lattice_dir)
+    event_path = task_event_path(lattice_dir, task_id)
+    append_events(lattice_dir, task_id, event_path, [event], durability=durability)
+
+    lifecycle_path = lifecycle_log_path(lattice_dir)
+    append_lines(lifecycle_path, [serialize_event(event)], durability)
+
+    atomic_write(
+        ensure_parent(task_snapshot_path(lattice_dir, task_id, archived=True)),
+        serialize_snapshot(snapshot),
+    )
+
+    snapshot_path = task_snapshot_path(lattice_dir, task_id)
+    if snapshot_path.exists():
+        snapshot_path.unlink()
+
+    if event_path.exists():
+        shutil.move(
+            str(event_path),
+            str(ensure_parent(task_event_path(lattice_dir, task_id, archived=True))),
+        )
+        event_index_move(lattice_dir, task_id, archived=True)
+
+    notes_path = lattice_dir / "notes" / f"{task_id}.md"
+    if notes_path.exists():
+        shutil.move(
+            str(notes_path),
+            str(lattice_dir / "archive" / "notes" / f"{task_id}.md"),
+        )
+
+    plans_path = lattice_dir / "plans" / f"{task_id}.md"
+    if plans_path.exists():
+        archive_plans_dir = lattice_dir / "archive" / "plans"
+        archive_plans_dir.mkdir(parents=True, exist_ok=True)
+        shutil.move(
+            str(plans_path),
+            str(archive_plans_dir / f"{task_id}.md"),
+        )
+
+    catalog_record(lattice_dir, [snapshot], archived=True)
+    relationship_index_record(lattice_dir, [snapshot], archived=True)
+    blocking_index_record(lattice_dir, [snapshot], archived=True)
+    ready_queue_record(lattice_dir, [snapshot], archived=True)
+
+
+def unarchive_task_files(
+    lattice_dir: Path,
+    task_id: str,
+    event: dict,
+    snapshot: dict,
+) -> None:
+    """Append the ``task_unarchived`` event and move the task back out of ``archive/``.
+
+    Same locking contract as :func:`archive_task_files`.  A packed task is
+    unpacked first (see :mod:`lattice.storage.archive_packs`).
+    """
+    unpack_task(lattice_dir, task_id)
+    durability = durability_policy(lattice_dir)
+    archive_event_path = task_event_path(lattice_dir, task_id, archived=True)
+    append_events(lattice_dir, task_id, archive_event_path, [event], durability=durability)
+
+    lifecycle_path = lifecycle_log_path(lattice_dir)
+    append_lines(lifecycle_path, [serialize_event(event)], durability)
+
+    shutil.move(
+        str(archive_event_path),
+        str(ensure_parent(task_event_path(lattice_dir, task_id))),
+    )
+    event_index_move(lattice_dir, task_id, archived=False)
+
+    atomic_write(
+        ensure_parent(task_snapshot_path(lattice_dir, task_id)),
+        serialize_snapshot(snapshot),
+    )
+
+    archive_snapshot_path = task_snapshot_path(lattice_dir, task_id, archived=True)
+    if archive_snapshot_path.exists():
+        archive_snapshot_path.unlink()
+
+    archive_notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
+    if archive_notes_path.exists():
+        shutil.move(
+            str(archive_notes_path),
+            str(lattice_dir / "notes" / f"{task_id}.md"),
+        )
+
+    archive_plans_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
+    if archive_plans_path.exists():
+        plans_dir = lattice_dir / "plans"
+        plans_dir.mkdir(parents=True, exist_ok=True)
+        shutil.move(
+            str(archive_plans_path),
+            str(plans_dir / f"{task_id}.md"),
+        )
+
+    catalog_record(lattice_dir, [snapshot])
+    relationship_index_record(lattice_dir, [snapshot])
+    blocking_index_record(lattice_dir, [snapshot])
+    ready_queue_record(lattice_dir, [snapshot])
+
+
 @contextlib.contextmanager
 def resource_write_context(
     lattice_dir: Path,
@@ -184,9 +569,14 @@ def write_resource_event(
 
     def _do_writes() -> None:
         # Event-first: append to per-resource event log
-        event_path = lattice_dir / "events" / f"{resource_id}.jsonl"
-        for event in events:
-            jsonl_append(event_path, serialize_event(event))
+        event_path = resource_event_path(lattice_dir, resource_id)
+        append_events(
+            lattice_dir,
+            resource_id,
+            event_path,
+            events,
+            durability=durability_policy(lattice_dir, config),
+        )
 
         # Then materialize snapshot
         snapshot_path = resource_dir / "resource.json"
@@ -0,0 +1,48 @@
+"""Process-level cache of ``.lattice/config.json`` for the storage layer.
+
+Storage code needs a couple of settings (durability policy, on-disk layout) on
+every write and path lookup.  Re-reading and re-parsing ``config.json`` each
+time is wasteful, so the parsed file is cached keyed on its (inode, size,
+mtime) and re-read only when it changes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+# config.json path -> ((inode, size, mtime_ns), parsed config or None)
+_cache: dict[Path, tuple[tuple[int, int, int], dict | None]] = {}
+_cache_lock = threading.Lock()
+
+
+def read_project_config(lattice_dir: Path) -> dict | None:
+    """Return the parsed project config.
+
+    Returns ``{}`` when ``config.json`` does not exist and ``None`` when it
+    exists but cannot be read or parsed.  The returned dict is shared between
+    callers and must not be mutated.
+    """
+    path = lattice_dir / "config.json"
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    except OSError:
+        return None
+    key = (st.st_ino, st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    try:
+        config = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        config = None
+    if not isinstance(config, dict):
+        config = None
+    with _cache_lock:
+        _cache[path] = (key, config)
+    return config
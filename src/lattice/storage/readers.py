@@ -3,20 +3,33 @@
 from __future__ import annotations
 
 import json
+import os
+from collections.abc import Iterator
+from itertools import islice
 from pathlib import Path
 
+from lattice.storage.archive_packs import read_packed_part, read_packed_snapshot
+from lattice.storage.layout import task_event_path, task_snapshot_path
+
+# Block size for reverse (tail) reads.  Most events are a few hundred bytes,
+# so one block usually covers the last couple of dozen records.
+_TAIL_BLOCK_SIZE = 16 * 1024
+
+
+def _event_path(lattice_dir: Path, task_id: str, is_archived: bool) -> Path:
+    return task_event_path(lattice_dir, task_id, archived=is_archived)
+
 
 def read_task_events(lattice_dir: Path, task_id: str, *, is_archived: bool = False) -> list[dict]:
     """Read all events for a task from its JSONL log.
 
     Returns an empty list if the event file does not exist.
     """
-    if is_archived:
-        event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
-    else:
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
+    event_path = _event_path(lattice_dir, task_id, is_archived)
 
     events: list[dict] = []
+    if is_archived and not event_path.exists():
+        return _parse_lines(read_packed_part(lattice_dir, task_id, "events") or b"")
     if event_path.exists():
         try:
             for line in event_path.read_text().splitlines():
@@ -29,3 +42,104 @@ def read_task_events(lattice_dir: Path, task_id: str, *, is_archived: bool = Fal
         except OSError:
             pass
     return events
+
+
+def _parse_lines(data: bytes) -> list[dict]:
+    return [r for r in (_parse_line(raw) for raw in data.split(b"\n")) if r is not None]
+
+
+def read_archived_snapshot(lattice_dir: Path, task_id: str) -> dict | None:
+    """Read an archived task's snapshot, loose or packed. Returns None if not archived."""
+    path = task_snapshot_path(lattice_dir, task_id, archived=True)
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return read_packed_snapshot(lattice_dir, task_id)
+
+
+def read_archived_doc(lattice_dir: Path, task_id: str, part: str) -> str | None:
+    """Read an archived task's ``"notes"`` or ``"plan"`` file, loose or packed."""
+    subdir = "notes" if part == "notes" else "plans"
+    path = lattice_dir / "archive" / subdir / f"{task_id}.md"
+    try:
+        return path.read_text()
+    except FileNotFoundError:
+        blob = read_packed_part(lattice_dir, task_id, part)
+        return blob.decode("utf-8") if blob is not None else None
+
+
+def iter_task_events_reverse(
+    lattice_dir: Path, task_id: str, *, is_archived: bool = False
+) -> Iterator[dict]:
+    """Yield a task's events newest-first (see :func:`iter_jsonl_reverse`)."""
+    event_path = _event_path(lattice_dir, task_id, is_archived)
+    if is_archived and not event_path.exists():
+        yield from reversed(read_task_events(lattice_dir, task_id, is_archived=True))
+        return
+    yield from iter_jsonl_reverse(event_path)
+
+
+def iter_jsonl_reverse(path: Path, *, block_size: int = _TAIL_BLOCK_SIZE) -> Iterator[dict]:
+    """Yield records from a JSONL file newest-first.
+
+    Reads fixed-size blocks backward from EOF, so consuming only the first
+    few records touches only the end of the file.  Blank and malformed
+    lines are skipped, matching ``read_task_events``.  A missing or
+    unreadable file yields nothing.
+    """
+    try:
+        fh = open(path, "rb")
+    except OSError:
+        return
+    with fh:
+        try:
+            pos = os.fstat(fh.fileno()).st_size
+        except OSError:
+            return
+        remainder = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            fh.seek(pos)
+            chunk = fh.read(step) + remainder
+            lines = chunk.split(b"\n")
+            # The first piece may be the tail of a line that starts in an
+            # earlier block; carry it over unless we are at the file start.
+            remainder = lines.pop(0) if pos > 0 else b""
+            for raw in reversed(lines):
+                record = _parse_line(raw)
+                if record is not None:
+                    yield record
+
+
+def _parse_line(raw: bytes) -> dict | None:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def read_jsonl_tail(path: Path, n: int) -> list[dict]:
+    """Return the last *n* records of a JSONL file in file (chronological) order."""
+    if n <= 0:
+        return []
+    records = list(islice(iter_jsonl_reverse(path), n))
+    records.reverse()
+    return records
+
+
+def read_task_events_tail(
+    lattice_dir: Path, task_id: str, n: int, *, is_archived: bool = False
+) -> list[dict]:
+    """Read the latest *n* events for a task, oldest first.
+
+    Equivalent to ``read_task_events(...)[-n:]`` but only reads the end of
+    the log.
+    """
+    event_path = _event_path(lattice_dir, task_id, is_archived)
+    if is_archived and not event_path.exists():
+        return read_task_events(lattice_dir, task_id, is_archived=True)[-n:] if n > 0 else []
+    return read_jsonl_tail(event_path, n)
@@ -0,0 +1,300 @@
+"""Derived ready queue: open tasks ordered the way ``lattice next`` picks them.
+
+``lattice next`` used to parse every active snapshot and sort the candidates
+on each call.  The ready queue (``.lattice/cache/ready_queue.jsonl``) keeps the
+selection-relevant fields of every task ``next`` could ever return — active
+tasks not in :data:`~lattice.core.next.EXCLUDED_STATUSES` — and the process
+cache holds them in a list kept sorted by :func:`~lattice.core.next.sort_key`.
+:func:`queue_select_next` walks that list and reads only the snapshot of the
+task it picks (:func:`queue_select_batch` likewise for batch claims).
+
+Like the task catalog it is **non-authoritative** — snapshots stay the source
+of truth and :func:`rebuild_ready_queue` regenerates it at any time.  A
+selection that finds the recorded signature out of date (a snapshot write
+bypassed the queue, e.g. a ``git pull``) regenerates the queue first; if the
+picked snapshot still disagrees with its entry the selection falls back to
+the full scan.
+
+It is an :class:`~lattice.storage.append_log.AppendLog` with two item
+record kinds:
+
+- ``{"kind": "entry", "id", "status", "priority", "urgency", "assigned_to"}``
+  — task ``id`` is (still) a candidate; replaces any earlier record for it.
+- ``{"kind": "drop", "id"}`` — task ``id`` left the pool (archived, or moved
+  to an excluded status).
+
+Writers append after a write that can change those fields (see
+:func:`affects_ready_queue`) and on archive and unarchive, and an empty commit
+after any other snapshot write, and only when the queue already exists; the
+first selection builds it.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+from pathlib import Path
+
+from lattice.core.next import (
+    DEFAULT_READY_STATUSES,
+    EXCLUDED_STATUSES,
+    RESUME_STATUSES,
+    actors_match,
+    select_batch,
+    select_next,
+    sort_key,
+)
+from lattice.storage.append_log import AppendLog, LogState
+from lattice.storage.catalog import catalog_signature, load_snapshots
+from lattice.storage.layout import task_snapshot_path
+from lattice.storage.locks import LockTimeout
+
+READY_QUEUE_FILENAME = "ready_queue.jsonl"
+READY_QUEUE_SCHEMA_VERSION = 2
+
+# Event types that can move a task in or out of the queue or reorder it.
+READY_QUEUE_EVENT_TYPES = frozenset({"task_created", "status_changed", "assignment_changed"})
+# ...plus field_updated events on these fields.
+READY_QUEUE_FIELDS = frozenset({"priority", "urgency"})
+
+# The snapshot fields an entry mirrors.
+_ENTRY_FIELDS = ("status", "priority", "urgency", "assigned_to")
+
+
+def affects_ready_queue(events: list[dict]) -> bool:
+    """True if any of *events* can change a task's place in the ready queue."""
+    return any(
+        e["type"] in READY_QUEUE_EVENT_TYPES
+        or (e["type"] == "field_updated" and e["data"].get("field") in READY_QUEUE_FIELDS)
+        for e in events
+    )
+
+
+def _queue_record(snapshot: dict, archived: bool) -> dict:
+    if archived or snapshot.get("status") in EXCLUDED_STATUSES:
+        return {"kind": "drop", "id": snapshot["id"]}
+    record = {"kind": "entry", "id": snapshot["id"]}
+    for field in _ENTRY_FIELDS:
+        record[field] = snapshot.get(field)
+    return record
+
+
+def _matches(entry: dict, snapshot: dict) -> bool:
+    return all(entry.get(field) == snapshot.get(field) for field in _ENTRY_FIELDS)
+
+
+# ---------------------------------------------------------------------------
+# In-memory view
+# ---------------------------------------------------------------------------
+
+
+class _State(LogState):
+    """Replayed queue: entries by ID plus their (sort_key, id) order."""
+
+    __slots__ = ("entries", "order")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entries: dict[str, dict] = {}
+        # sorted list of sort_key(entry); the key ends with the task ID
+        self.order: list[tuple[int, int, str]] = []
+
+    def apply(self, record: dict) -> None:
+        task_id = record.get("id")
+        kind = record.get("kind")
+        if kind not in ("entry", "drop") or not isinstance(task_id, str):
+            return
+        old = self.entries.pop(task_id, None)
+        if old is not None:
+            i = bisect.bisect_left(self.order, sort_key(old))
+            if i < len(self.order) and self.order[i][2] == task_id:
+                del self.order[i]
+        if kind == "entry":
+            self.entries[task_id] = record
+            bisect.insort(self.order, sort_key(record))
+
+    def records(self) -> list[dict]:
+        return [self.entries[t] for t in sorted(self.entries)]
+
+
+_log = AppendLog(
+    READY_QUEUE_FILENAME,
+    lock_name="ready_queue",
+    schema_version=READY_QUEUE_SCHEMA_VERSION,
+    state_class=_State,
+    signature=catalog_signature,
+)
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+
+
+def _pick(
+    state: _State,
+    *,
+    actor: str | dict | None,
+    ready_statuses: frozenset[str],
+    blocked: frozenset[str],
+) -> dict | None:
+    """Apply the ``select_next`` rules to the queue order. Returns an entry."""
+    if actor:
+        for key in state.order:
+            entry = state.entries[key[2]]
+            if entry["status"] in RESUME_STATUSES and actors_match(entry["assigned_to"], actor):
+                return entry
+    for key in state.order:
+        entry = state.entries[key[2]]
+        if entry["status"] not in ready_statuses or key[2] in blocked:
+            continue
+        assigned = entry["assigned_to"]
+        if assigned is not None and (actor is None or not actors_match(assigned, actor)):
+            continue
+        return entry
+    return None
+
+
+def _read_active_snapshot(lattice_dir: Path, task_id: str) -> dict | None:
+    try:
+        return json.loads(task_snapshot_path(lattice_dir, task_id).read_text())
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def queue_select_next(
+    lattice_dir: Path,
+    *,
+    actor: str | dict | None = None,
+    ready_statuses: frozenset[str] | None = None,
+    blocked: frozenset[str] = frozenset(),
+) -> dict | None:
+    """Return the snapshot :func:`~lattice.core.next.select_next` would pick.
+
+    Served from the ready queue, reading only the chosen snapshot.  Builds the
+    queue on first use and regenerates it when stale; falls back to loading
+    every active snapshot when the queue is unavailable or the chosen entry
+    still disagrees with its snapshot.
+    """
+    if ready_statuses is None:
+        ready_statuses = DEFAULT_READY_STATUSES
+    state = _log.fresh_state(lattice_dir, rebuild_ready_queue)
+
+    if state is not None:
+        entry = _pick(state, actor=actor, ready_statuses=ready_statuses, blocked=blocked)
+        if entry is None:
+            return None
+        snapshot = _read_active_snapshot(lattice_dir, entry["id"])
+        if snapshot is not None and _matches(entry, snapshot):
+            return snapshot
+        # A write bypassed the queue: answer from the scan and regenerate
+        try:
+            rebuild_ready_queue(lattice_dir, timeout=0)
+        except (LockTimeout, OSError):
+            pass
+
+    active, _archived = load_snapshots(lattice_dir, include_archived=False)
+    return select_next(active, actor=actor, ready_statuses=ready_statuses, blocked=blocked)
+
+
+def queue_select_batch(
+    lattice_dir: Path,
+    actors: list[str | dict],
+    *,
+    ready_statuses: frozenset[str] | None = None,
+    blocked: frozenset[str] = frozenset(),
+) -> list[tuple[str | dict, dict]]:
+    """Return the ``(actor, snapshot)`` pairs :func:`~lattice.core.next.select_batch` would pick.
+
+    Pairs are chosen from the queue entries (regenerated first when stale) and
+    only the chosen snapshots are read; if any of them disagrees with its entry
+    the selection is redone from the full scan.
+    """
+    state = _log.fresh_state(lattice_dir, rebuild_ready_queue)
+
+    if state is not None:
+        entries = [state.entries[key[2]] for key in state.order]
+        picked = select_batch(entries, actors, ready_statuses=ready_statuses, blocked=blocked)
+        pairs: list[tuple[str | dict, dict]] = []
+        for actor, entry in picked:
+            snapshot = _read_active_snapshot(lattice_dir, entry["id"])
+            if snapshot is None or not _matches(entry, snapshot):
+                break
+            pairs.append((actor, snapshot))
+        else:
+            return pairs
+        try:
+            rebuild_ready_queue(lattice_dir, timeout=0)
+        except (LockTimeout, OSError):
+            pass
+
+    active, _archived = load_snapshots(lattice_dir, include_archived=False)
+    return select_batch(active, actors, ready_statuses=ready_statuses, blocked=blocked)
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def rebuild_ready_queue(lattice_dir: Path, *, timeout: float = 10) -> int:
+    """Regenerate the queue from the active snapshots. Returns the number of entries."""
+    with _log.lock(lattice_dir, timeout=timeout):
+        sig = catalog_signature(lattice_dir)
+        active, _archived = load_snapshots(lattice_dir, include_archived=False)
+        records = [_queue_record(s, False) for s in active if "id" in s]
+        records = sorted((r for r in records if r["kind"] == "entry"), key=lambda r: r["id"])
+        _log.write_full(lattice_dir, records, sig=sig)
+    return len(records)
+
+
+def ready_queue_record(
+    lattice_dir: Path,
+    snapshots: list[dict],
+    *,
+    archived: bool = False,
+) -> None:
+    """Record the queue position of freshly written snapshot(s).
+
+    Call after the snapshot files are on disk, while still holding the task
+    locks; pass no snapshots after a write that cannot move a task in the
+    queue.  A no-op when the project has no queue yet.
+    """
+    _log.append(lattice_dir, [_queue_record(s, archived) for s in snapshots])
+
+
+# ---------------------------------------------------------------------------
+# Verification (doctor)
+# ---------------------------------------------------------------------------
+
+
+def verify_ready_queue(lattice_dir: Path, active: dict[str, dict]) -> list[str]:
+    """Compare the queue against parsed active snapshots. Returns problem descriptions.
+
+    An absent queue is not a problem (it is built on first use).
+    """
+    path = _log.path(lattice_dir)
+    if not path.exists():
+        return []
+    try:
+        state = _log.parse(path.read_bytes())
+    except OSError:
+        return ["Ready queue is unreadable"]
+    if state is None:
+        return ["Ready queue has an unsupported schema version"]
+
+    expected: dict[str, dict] = {}
+    for task_id, snap in active.items():
+        record = _queue_record(dict(snap, id=task_id), False)
+        if record["kind"] == "entry":
+            expected[task_id] = record
+
+    problems: list[str] = []
+    for task_id in sorted(set(expected) - set(state.entries)):
+        problems.append(f"Ready queue is missing {task_id}")
+    for task_id in sorted(set(state.entries) - set(expected)):
+        problems.append(f"Ready queue lists {task_id}, which is not an open active task")
+    for task_id in sorted(set(state.entries) & set(expected)):
+        if state.entries[task_id] != expected[task_id]:
+            problems.append(f"Ready queue entry for {task_id} differs from its snapshot")
+    return problems
@@ -0,0 +1,241 @@
+"""Derived reverse relationship index: incoming edges per task.
+
+Relationships are stored only on their source task (``relationships_out``),
+so answering "what points at this task?" used to mean opening every active
+and archived snapshot.  The index (``.lattice/cache/relationship_index.jsonl``)
+keeps each source task's outgoing edges in one file, so a lookup is a read of
+that file (usually served from the process cache) plus one snapshot read per
+incoming edge for its title.
+
+Like the task catalog it is **non-authoritative** — snapshots stay the source
+of truth and :func:`rebuild_relationship_index` regenerates it at any time.
+
+It is an :class:`~lattice.storage.append_log.AppendLog` whose item records
+are ``{"kind": "source", "id", "archived", "edges": [...]}`` — the complete
+outgoing edge list of task ``id`` (``{"type", "target_task_id", "note"}``
+each); a later record for the same source replaces the earlier one.
+
+Tasks without outgoing edges have no record.  Writers append a record after
+a ``relationship_added``/``relationship_removed`` write and on archive and
+unarchive, and an empty commit after any other snapshot write, and only when
+the index already exists; the first lookup builds it.  A lookup that finds the
+recorded signature out of date (a snapshot write bypassed the index, e.g. a
+``git pull``) regenerates it first.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.storage.append_log import AppendLog, LogState
+from lattice.storage.catalog import catalog_signature, load_snapshots
+from lattice.storage.layout import task_snapshot_path
+from lattice.storage.readers import read_archived_snapshot
+
+RELATIONSHIP_INDEX_FILENAME = "relationship_index.jsonl"
+RELATIONSHIP_INDEX_SCHEMA_VERSION = 2
+
+# Event types that change a task's outgoing edges.
+RELATIONSHIP_EVENT_TYPES = frozenset({"relationship_added", "relationship_removed"})
+
+
+def _edges(snapshot: dict) -> list[dict]:
+    return [
+        {
+            "type": rel.get("type"),
+            "target_task_id": rel.get("target_task_id"),
+            "note": rel.get("note"),
+        }
+        for rel in snapshot.get("relationships_out", [])
+    ]
+
+
+def _source_record(snapshot: dict, archived: bool) -> dict:
+    return {
+        "kind": "source",
+        "id": snapshot["id"],
+        "archived": archived,
+        "edges": _edges(snapshot),
+    }
+
+
+# ---------------------------------------------------------------------------
+# In-memory view
+# ---------------------------------------------------------------------------
+
+
+class _State(LogState):
+    """Replayed index: outgoing edges per source and their inversion."""
+
+    __slots__ = ("incoming", "sources")
+
+    def __init__(self) -> None:
+        super().__init__()
+        # source id -> (archived, edges)
+        self.sources: dict[str, tuple[bool, list[dict]]] = {}
+        # target id -> {source id: [edge, ...]}
+        self.incoming: dict[str, dict[str, list[dict]]] = {}
+
+    def apply(self, record: dict) -> None:
+        source = record.get("id")
+        if record.get("kind") != "source" or not isinstance(source, str):
+            return
+        old = self.sources.get(source)
+        if old is not None:
+            for edge in old[1]:
+                by_source = self.incoming.get(edge["target_task_id"])
+                if by_source is not None:
+                    by_source.pop(source, None)
+                    if not by_source:
+                        del self.incoming[edge["target_task_id"]]
+        edges = [e for e in record.get("edges", []) if isinstance(e, dict)]
+        if not edges:
+            self.sources.pop(source, None)
+            return
+        self.sources[source] = (bool(record.get("archived")), edges)
+        for edge in edges:
+            by_source = self.incoming.setdefault(edge.get("target_task_id"), {})
+            by_source.setdefault(source, []).append(edge)
+
+    def records(self) -> list[dict]:
+        return [
+            {"kind": "source", "id": source, "archived": is_archived, "edges": edges}
+            for source, (is_archived, edges) in sorted(self.sources.items())
+        ]
+
+
+_log = AppendLog(
+    RELATIONSHIP_INDEX_FILENAME,
+    lock_name="relationship_index",
+    schema_version=RELATIONSHIP_INDEX_SCHEMA_VERSION,
+    state_class=_State,
+    signature=catalog_signature,
+)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def _read_source_snapshot(lattice_dir: Path, task_id: str, archived: bool) -> dict | None:
+    try:
+        if archived:
+            return read_archived_snapshot(lattice_dir, task_id)
+        return json.loads(task_snapshot_path(lattice_dir, task_id).read_text())
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def incoming_relationships(lattice_dir: Path, task_id: str) -> list[dict]:
+    """Return the relationships pointing at *task_id*, from active and archived tasks.
+
+    Each entry has ``source_task_id``, ``source_title``, ``type`` and
+    ``note``, ordered by source task ID.  Builds the index on first use and
+    regenerates it when stale.
+    """
+    state = _log.fresh_state(lattice_dir, rebuild_relationship_index)
+    if state is None:
+        # Could not write the index (e.g. read-only project): scan instead
+        state = _State()
+        active, archived = load_snapshots(lattice_dir)
+        for is_archived, snaps in ((False, active), (True, archived)):
+            for snap in snaps:
+                if "id" in snap and snap.get("relationships_out"):
+                    state.apply(_source_record(snap, is_archived))
+
+    incoming: list[dict] = []
+    for source in sorted(state.incoming.get(task_id, {})):
+        if source == task_id:
+            continue  # self-links are reported by doctor, not shown as incoming
+        source_archived = state.sources[source][0]
+        snap = _read_source_snapshot(lattice_dir, source, source_archived)
+        if snap is None:
+            # Moved between active and archive without a record: try the other side
+            snap = _read_source_snapshot(lattice_dir, source, not source_archived)
+        for edge in state.incoming[task_id][source]:
+            incoming.append(
+                {
+                    "source_task_id": source,
+                    "source_title": snap.get("title") if snap is not None else None,
+                    "type": edge.get("type"),
+                    "note": edge.get("note"),
+                }
+            )
+    return incoming
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def rebuild_relationship_index(lattice_dir: Path) -> int:
+    """Regenerate the index from all snapshots. Returns the number of edges."""
+    with _log.lock(lattice_dir):
+        sig = catalog_signature(lattice_dir)
+        active, archived = load_snapshots(lattice_dir)
+        records: list[dict] = []
+        for is_archived, snaps in ((False, active), (True, archived)):
+            for snap in snaps:
+                if "id" in snap and snap.get("relationships_out"):
+                    records.append(_source_record(snap, is_archived))
+        records.sort(key=lambda r: r["id"])
+        _log.write_full(lattice_dir, records, sig=sig)
+    return sum(len(r["edges"]) for r in records)
+
+
+def relationship_index_record(
+    lattice_dir: Path,
+    snapshots: list[dict],
+    *,
+    archived: bool = False,
+) -> None:
+    """Record the current outgoing edges of freshly written snapshot(s).
+
+    Call after the snapshot files are on disk, while still holding the task
+    locks; pass no snapshots after a write that left every edge alone.  A
+    no-op when the project has no index yet.
+    """
+    _log.append(lattice_dir, [_source_record(s, archived) for s in snapshots])
+
+
+# ---------------------------------------------------------------------------
+# Verification (doctor)
+# ---------------------------------------------------------------------------
+
+
+def verify_relationship_index(
+    lattice_dir: Path, active: dict[str, dict], archived: dict[str, dict]
+) -> list[str]:
+    """Compare the index against parsed snapshots. Returns problem descriptions.
+
+    An absent index is not a problem (it is built on first use).
+    """
+    path = _log.path(lattice_dir)
+    if not path.exists():
+        return []
+    try:
+        state = _log.parse(path.read_bytes())
+    except OSError:
+        return ["Relationship index is unreadable"]
+    if state is None:
+        return ["Relationship index has an unsupported schema version"]
+
+    expected: dict[str, tuple[bool, list[dict]]] = {}
+    for is_archived, snaps in ((False, active), (True, archived)):
+        for task_id, snap in snaps.items():
+            edges = _edges(snap)
+            if edges:
+                expected[task_id] = (is_archived, edges)
+
+    problems: list[str] = []
+    for task_id in sorted(set(expected) - set(state.sources)):
+        problems.append(f"Relationship index is missing the edges of {task_id}")
+    for task_id in sorted(set(state.sources) - set(expected)):
+        problems.append(f"Relationship index lists stale edges from {task_id}")
+    for task_id in sorted(set(state.sources) & set(expected)):
+        if state.sources[task_id] != expected[task_id]:
+            problems.append(f"Relationship index entry for {task_id} differs from its snapshot")
+    return problems
@@ -1,13 +1,35 @@
-"""Short ID index management: load, save, allocate, resolve, register."""
+"""Short ID index management: load, save, allocate, resolve, register.
+
+The index lives in two files:
+
+- ``ids.json`` — the compacted base (``schema_version``, ``next_seqs``, ``map``)
+- ``ids_log.jsonl`` — allocations appended since the base was last written,
+  one ``{"prefix", "seq", "short_id", "id"}`` record per line
+
+``allocate_short_id`` appends one line instead of rewriting the whole map, and
+folds the log back into ``ids.json`` every :data:`_COMPACT_EVERY` allocations.
+Replaying a record is idempotent, so a crash between rewriting the base and
+removing the log is harmless.
+
+Reads go through a process-level cache validated against the (inode, size,
+mtime) of both files; when only the log has grown, just the new tail is read.
+"""
 
 from __future__ import annotations
 
 import json
+import os
+import threading
 from pathlib import Path
 
-from lattice.storage.fs import atomic_write
+from lattice.storage.fs import atomic_write, jsonl_append
 from lattice.storage.locks import lattice_lock
 
+IDS_LOG_FILENAME = "ids_log.jsonl"
+
+# Fold the allocation log back into ids.json after this many records.
+_COMPACT_EVERY = 1000
+
 
 def _default_index() -> dict:
     """Return a fresh empty v2 index structure."""
@@ -60,28 +82,135 @@ def _migrate_v1_to_v2(index: dict, project_code: str | None = None) -> dict:
     }
 
 
-def load_id_index(lattice_dir: Path) -> dict:
-    """Load and parse ``.lattice/ids.json``, transparently migrating v1 to v2."""
-    ids_path = lattice_dir / "ids.json"
-    if not ids_path.exists():
-        return _default_index()
+def _read_base(ids_path: Path) -> dict:
     try:
         index = json.loads(ids_path.read_text())
     except (json.JSONDecodeError, OSError):
         return _default_index()
+    if not isinstance(index, dict):
+        return _default_index()
 
     # Lazy migration: convert v1 -> v2 in memory (persisted on next save)
     if index.get("schema_version", 1) < 2:
         index = _migrate_v1_to_v2(index)
-
+    index.setdefault("next_seqs", {})
+    index.setdefault("map", {})
     return index
 
 
+def _file_sig(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _apply_log_record(index: dict, record: dict) -> None:
+    prefix = record.get("prefix")
+    seq = record.get("seq")
+    if not isinstance(prefix, str) or not isinstance(seq, int):
+        return
+    next_seqs = index["next_seqs"]
+    if next_seqs.get(prefix, 1) <= seq:
+        next_seqs[prefix] = seq + 1
+    if record.get("id"):
+        index["map"][f"{prefix}-{seq}"] = record["id"]
+
+
+class _CachedIndex:
+    __slots__ = ("base_sig", "index", "log_ino", "log_pos", "log_records")
+
+    def __init__(self, base_sig: tuple[int, int, int] | None, index: dict) -> None:
+        self.base_sig = base_sig
+        self.log_ino: int | None = None
+        self.log_pos = 0
+        self.log_records = 0
+        self.index = index
+
+
+_cache: dict[Path, _CachedIndex] = {}
+_cache_lock = threading.Lock()
+
+
+def _current_index(lattice_dir: Path) -> _CachedIndex:
+    """Return the cached index for *lattice_dir*, brought up to date with disk.
+
+    The returned object is shared; callers must not mutate ``.index``.
+    """
+    ids_path = lattice_dir / "ids.json"
+    log_path = lattice_dir / IDS_LOG_FILENAME
+    with _cache_lock:
+        base_sig = _file_sig(ids_path)
+        entry = _cache.get(lattice_dir)
+        if entry is None or entry.base_sig != base_sig:
+            entry = _CachedIndex(base_sig, _read_base(ids_path))
+            _cache[lattice_dir] = entry
+
+        try:
+            st = os.stat(log_path)
+        except OSError:
+            st = None
+        if st is None:
+            if entry.log_pos:
+                # Log removed without the base changing: start over from the base
+                entry = _CachedIndex(base_sig, _read_base(ids_path))
+                _cache[lattice_dir] = entry
+            return entry
+        if entry.log_ino is not None and (
+            st.st_ino != entry.log_ino or st.st_size < entry.log_pos
+        ):
+            entry = _CachedIndex(base_sig, _read_base(ids_path))
+            _cache[lattice_dir] = entry
+        entry.log_ino = st.st_ino
+        if st.st_size == entry.log_pos:
+            return entry
+
+        try:
+            with open(log_path, "rb") as fh:
+                fh.seek(entry.log_pos)
+                data = fh.read(st.st_size - entry.log_pos)
+        except OSError:
+            return entry
+        # Only consume complete lines; a torn tail is picked up next time
+        end = data.rfind(b"\n") + 1
+        entry.log_pos += end
+        for raw in data[:end].splitlines():
+            try:
+                record = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(record, dict):
+                _apply_log_record(entry.index, record)
+                entry.log_records += 1
+        return entry
+
+
+def load_id_index(lattice_dir: Path) -> dict:
+    """Load ``.lattice/ids.json`` plus its allocation log, migrating v1 to v2.
+
+    Returns a fresh dict the caller may mutate and pass to :func:`save_id_index`.
+    """
+    index = _current_index(lattice_dir).index
+    return {
+        **index,
+        "next_seqs": dict(index["next_seqs"]),
+        "map": dict(index["map"]),
+    }
+
+
 def save_id_index(lattice_dir: Path, index: dict) -> None:
-    """Atomic write of the ID index to ``.lattice/ids.json``."""
+    """Atomic write of the full ID index to ``.lattice/ids.json``.
+
+    *index* is the complete state, so the allocation log is removed afterwards.
+    """
     ids_path = lattice_dir / "ids.json"
     content = json.dumps(index, sort_keys=True, indent=2) + "\n"
     atomic_write(ids_path, content)
+    try:
+        os.unlink(lattice_dir / IDS_LOG_FILENAME)
+    except FileNotFoundError:
+        pass
 
 
 def register_short_id(index: dict, short_id: str, task_ulid: str) -> dict:
@@ -99,24 +228,36 @@ def allocate_short_id(
     registered atomically under the same lock, preventing race conditions
     between allocation and registration.
 
-    Returns (short_id, updated_index). The index is saved to disk
-    and the lock is released before returning.
+    The allocation is a single line appended to the ids log; ``ids.json`` is
+    only rewritten when the log is compacted (or does not exist yet).
+
+    Returns (short_id, updated_index). The allocation is durable and the
+    lock is released before returning.
     """
     locks_dir = lattice_dir / "locks"
     with lattice_lock(locks_dir, "ids_json"):
-        index = load_id_index(lattice_dir)
-        next_seqs = index.get("next_seqs", {})
-        seq = next_seqs.get(prefix, 1)
+        entry = _current_index(lattice_dir)
+        seq = entry.index["next_seqs"].get(prefix, 1)
         short_id = f"{prefix}-{seq}"
-        next_seqs[prefix] = seq + 1
-        index["next_seqs"] = next_seqs
-        if task_ulid is not None:
-            index["map"][short_id] = task_ulid
-        save_id_index(lattice_dir, index)
-    return short_id, index
+        record = {"prefix": prefix, "seq": seq, "short_id": short_id, "id": task_ulid}
+
+        if entry.base_sig is None or entry.log_records + 1 >= _COMPACT_EVERY:
+            index = load_id_index(lattice_dir)
+            _apply_log_record(index, record)
+            save_id_index(lattice_dir, index)
+            return short_id, index
+
+        jsonl_append(
+            lattice_dir / IDS_LOG_FILENAME,
+            json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n",
+        )
+    return short_id, load_id_index(lattice_dir)
 
 
 def resolve_short_id(lattice_dir: Path, short_id: str) -> str | None:
-    """Look up a short ID and return the corresponding ULID, or None."""
-    index = load_id_index(lattice_dir)
-    return index.get("map", {}).get(short_id.upper())
+    """Look up a short ID and return the corresponding ULID, or None.
+
+    Served from the process-level cache; only re-reads the index files when
+    they changed on disk.
+    """
+    return _current_index(lattice_dir).index["map"].get(short_id.upper())
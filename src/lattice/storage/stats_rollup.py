@@ -0,0 +1,185 @@
+"""Derived stats rollup: per-log event aggregates behind ``lattice stats``.
+
+The rollup (``.lattice/cache/stats_rollup.json``) holds, for every event log, the
+numbers the stats and weather reports are built from — event count, per-actor
+counts, done transitions bucketed by ISO week, per-status dwell totals and
+blocked episodes — plus the timestamps of the last couple of days' events.
+It is folded forward from the event index (:mod:`lattice.storage.event_index`):
+the file records the index's inode and the byte position consumed so far, and
+an update reads only the index rows appended past that watermark.  Only
+``task_created`` and ``status_changed`` rows need their event body, which is
+read by seeking into the log at the row's offset.
+
+Like the other derived files it is **non-authoritative**: a replaced index
+(``rebuild --all``), a schema change or an unreadable file simply refolds
+everything, and deleting it is always safe.  Building the rollup builds the
+event index if the project does not have one yet.
+
+Updated rollups are cached per process, so a long-lived reader (the
+dashboard) only ``stat``\\ s the index between writes.  The returned state is
+shared between callers and must not be mutated.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from lattice.core.stats import STATUS_EVENT_TYPES, fold_event, new_log_rollup, parse_ts
+from lattice.storage.event_index import (
+    EVENT_INDEX_FILENAME,
+    read_log_events,
+    rebuild_event_index,
+)
+from lattice.storage.fs import atomic_write, cache_path, ensure_cache_dir
+from lattice.storage.layout import RESOURCE_PREFIX
+
+STATS_ROLLUP_FILENAME = "stats_rollup.json"
+STATS_ROLLUP_SCHEMA_VERSION = 1
+
+# Timestamps kept for "events in the last N hours" queries (weather uses 24).
+RECENT_RETENTION_HOURS = 48
+
+
+def _empty_state() -> dict:
+    return {
+        "schema_version": STATS_ROLLUP_SCHEMA_VERSION,
+        "inode": None,
+        "pos": 0,
+        "logs": {},
+        "recent": [],
+    }
+
+
+def _read_state(path: Path) -> dict:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return _empty_state()
+    if not isinstance(state, dict) or state.get("schema_version") != STATS_ROLLUP_SCHEMA_VERSION:
+        return _empty_state()
+    return state
+
+
+def _fold(lattice_dir: Path, state: dict, data: bytes, now: datetime) -> dict:
+    """Return a new state with the complete index lines *data* folded in.
+
+    Copy-on-write: *state* may still be read by other threads, so only the
+    aggregates of the logs the new rows touch are copied and changed.
+    """
+    logs: dict[str, dict] = dict(state["logs"])
+    touched: set[str] = set()
+
+    def log_rollup(log_id: str) -> dict:
+        if log_id not in touched:
+            touched.add(log_id)
+            agg = logs.get(log_id)
+            logs[log_id] = (
+                copy.deepcopy(agg)
+                if agg is not None
+                else new_log_rollup(resource=log_id.startswith(RESOURCE_PREFIX))
+            )
+        return logs[log_id]
+
+    records: list[dict] = []
+    wanted: defaultdict[str, list[int]] = defaultdict(list)
+    for raw in data.splitlines():
+        try:
+            record = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if not isinstance(record, dict) or "log" not in record:
+            continue
+        records.append(record)
+        if record.get("type") in STATUS_EVENT_TYPES:
+            wanted[record["log"]].append(record.get("offset", -1))
+
+    # One open per log for the few rows whose event body is needed
+    bodies = {
+        log_id: read_log_events(
+            lattice_dir, log_id, offsets, archived=logs.get(log_id, {}).get("archived", False)
+        )
+        for log_id, offsets in wanted.items()
+    }
+
+    recent_cutoff = now - timedelta(hours=RECENT_RETENTION_HOURS)
+    recent: list[list[str]] = list(state["recent"])
+    # A write racing with an index rebuild can be recorded twice; such events
+    # are new, so checking the recent ids is enough to drop the duplicate.
+    recent_ids = {entry[2] for entry in recent}
+    for record in records:
+        agg = log_rollup(record["log"])
+        if record.get("kind") == "move":
+            agg["archived"] = bool(record.get("archived"))
+            continue
+        event_id = record.get("id", "")
+        if event_id in recent_ids:
+            continue
+        offset = record.get("offset", -1)
+        event_type = record.get("type", "")
+        ts = record.get("ts", "")
+        event_data = None
+        if event_type in STATUS_EVENT_TYPES:
+            event = bodies.get(record["log"], {}).get(offset)
+            if event is not None and event.get("id") == event_id:
+                event_data = event.get("data") or {}
+        fold_event(agg, event_type, ts, record.get("actor", ""), event_data)
+        dt = parse_ts(ts)
+        if dt is not None and dt >= recent_cutoff:
+            recent.append([ts, record["log"], event_id])
+            recent_ids.add(event_id)
+
+    recent = [
+        entry for entry in recent if (dt := parse_ts(entry[0])) is not None and dt >= recent_cutoff
+    ]
+    return {**state, "logs": logs, "recent": recent}
+
+
+_cache: dict[Path, dict] = {}
+_cache_lock = threading.Lock()
+
+
+def update_stats_rollup(lattice_dir: Path) -> dict:
+    """Bring the rollup up to date with the event index and return it.
+
+    Reads only the index rows appended since the last update and persists
+    the result when anything changed.  The returned dict (``logs`` keyed by
+    log stem, ``recent`` as ``[ts, log, event_id]`` rows) must not be mutated.
+    """
+    index_path = cache_path(lattice_dir, EVENT_INDEX_FILENAME)
+    rollup_path = cache_path(lattice_dir, STATS_ROLLUP_FILENAME)
+    with _cache_lock:
+        state = _cache.get(lattice_dir)
+        if state is None:
+            state = _read_state(rollup_path)
+        data = b""
+        try:
+            if not index_path.exists():
+                rebuild_event_index(lattice_dir)
+            st = os.stat(index_path)
+            if st.st_ino != state["inode"] or st.st_size < state["pos"]:
+                state = {**_empty_state(), "inode": st.st_ino}
+            if st.st_size > state["pos"]:
+                with open(index_path, "rb") as fh:
+                    fh.seek(state["pos"])
+                    data = fh.read(st.st_size - state["pos"])
+        except OSError:
+            pass  # serve what is cached; the logs stay the source of truth
+        if data:
+            # Only consume complete lines; a torn tail is picked up next time
+            end = data.rfind(b"\n") + 1
+            if end:
+                state = _fold(lattice_dir, state, data[:end], datetime.now(timezone.utc))
+                state["pos"] += end
+                try:
+                    ensure_cache_dir(lattice_dir)
+                    atomic_write(rollup_path, json.dumps(state, separators=(",", ":")))
+                except OSError:
+                    pass  # still correct in memory; the next process refolds
+        _cache[lattice_dir] = state
+        return state
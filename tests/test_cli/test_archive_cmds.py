@@ -632,3 +632,87 @@ class TestBulkUnarchive:
         assert parsed["ok"] is True
         assert len(parsed["data"]["unarchived"]) == 2
         assert len(parsed["data"]["failed"]) == 0
+
+
+class TestArchivePack:
+    """Tests for `lattice archive-pack`."""
+
+    def _pack_two(self, create_task, invoke, initialized_root):
+        t1 = create_task("Pack one")
+        t2 = create_task("Pack two")
+        lattice = initialized_root / ".lattice"
+        (lattice / "notes" / f"{t1['id']}.md").write_text("# Packed notes\n")
+        invoke("archive", t1["id"], t2["id"], "--actor", "human:test")
+        result = invoke("archive-pack", "--json")
+        assert result.exit_code == 0
+        return t1, t2, json.loads(result.output)
+
+    def test_pack_folds_loose_files(self, create_task, invoke, initialized_root):
+        _t1, _t2, parsed = self._pack_two(create_task, invoke, initialized_root)
+        assert parsed["ok"] is True
+        assert parsed["data"]["tasks"] == 2
+
+        lattice = initialized_root / ".lattice"
+        assert list((lattice / "archive" / "tasks").glob("*.json")) == []
+        assert list((lattice / "archive" / "events").glob("*.jsonl")) == []
+        assert (lattice / "archive" / "packs" / f"{parsed['data']['segment']}.dat").exists()
+
+    def test_pack_nothing_to_do(self, invoke):
+        result = invoke("archive-pack")
+        assert result.exit_code == 0
+        assert "No loose archived tasks" in result.output
+
+    def test_archive_pack_argument_is_a_task_id(self, invoke, initialized_root):
+        result = invoke("archive", "pack", "--actor", "human:test")
+        assert result.exit_code != 0
+        assert not (initialized_root / ".lattice" / "archive" / "packs").exists()
+
+    def test_show_packed_task(self, create_task, invoke, invoke_json, initialized_root):
+        t1, _t2, _ = self._pack_two(create_task, invoke, initialized_root)
+
+        parsed, code = invoke_json("show", t1["id"])
+        assert code == 0
+        assert parsed["data"]["archived"] is True
+        assert parsed["data"]["title"] == "Pack one"
+        assert parsed["data"]["events"][-1]["type"] == "task_archived"
+
+    def test_doctor_and_archive_see_packed(
+        self, create_task, invoke, invoke_json, initialized_root
+    ):
+        t1, _t2, _ = self._pack_two(create_task, invoke, initialized_root)
+
+        result = invoke("archive", t1["id"], "--actor", "human:test")
+        assert "already archived" in result.output
+
+        parsed, code = invoke_json("doctor")
+        assert code == 0
+        assert parsed["data"]["summary"]["tasks"] == 2
+        assert parsed["data"]["findings"] == []
+
+    def test_unarchive_packed_task(self, create_task, invoke, initialized_root):
+        t1, t2, _ = self._pack_two(create_task, invoke, initialized_root)
+
+        result = invoke("unarchive", t1["id"], "--actor", "human:test")
+        assert result.exit_code == 0
+
+        lattice = initialized_root / ".lattice"
+        assert (lattice / "tasks" / f"{t1['id']}.json").exists()
+        assert (lattice / "notes" / f"{t1['id']}.md").read_text() == "# Packed notes\n"
+        events = (lattice / "events" / f"{t1['id']}.jsonl").read_text().splitlines()
+        assert json.loads(events[-1])["type"] == "task_unarchived"
+
+        # The other task is still packed and still readable
+        result = invoke("show", t2["id"], "--json")
+        assert json.loads(result.output)["data"]["archived"] is True
+
+    def test_rebuild_all_with_packed_tasks(self, create_task, invoke, initialized_root):
+        t1, t2, _ = self._pack_two(create_task, invoke, initialized_root)
+        lattice = initialized_root / ".lattice"
+        lifecycle_before = (lattice / "events" / "_lifecycle.jsonl").read_text()
+
+        result = invoke("rebuild", "--all", "--json")
+        assert result.exit_code == 0
+        assert set(json.loads(result.output)["data"]["rebuilt_tasks"]) >= {t1["id"], t2["id"]}
+        assert (lattice / "events" / "_lifecycle.jsonl").read_text() == lifecycle_before
+        # Packed snapshots already match their logs, so nothing is unpacked
+        assert list((lattice / "archive" / "tasks").glob("*.json")) == []
@@ -0,0 +1,53 @@
+"""CLI integration tests for `lattice batch`."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+
+def _results(output: str) -> list[dict]:
+    return [json.loads(line) for line in output.splitlines() if line.strip()]
+
+
+class TestBatch:
+    def test_reads_stdin(self, invoke, create_task) -> None:
+        existing = create_task("Existing")
+        ops = "\n".join(
+            json.dumps(op)
+            for op in [
+                {"op": "create", "title": "New", "ref": "new"},
+                {"op": "link", "source": "@new", "type": "blocks", "target": existing["id"]},
+                {"op": "assign", "task": existing["id"], "to": "agent:worker"},
+            ]
+        )
+        result = invoke("batch", "--actor", "human:test", input=ops)
+        assert result.exit_code == 0, result.output
+        results = _results(result.output)
+        assert [r["ok"] for r in results] == [True, True, True]
+
+        shown = json.loads(invoke("show", existing["id"], "--json").output)["data"]
+        assert shown["assigned_to"] == "agent:worker"
+
+    def test_reads_file(self, invoke, tmp_path: Path) -> None:
+        source = tmp_path / "ops.jsonl"
+        source.write_text('{"op": "create", "title": "From file"}\n')
+        result = invoke("batch", str(source), "--actor", "human:test")
+        assert result.exit_code == 0, result.output
+        assert _results(result.output)[0]["task_id"].startswith("task_")
+
+    def test_failed_batch_exits_nonzero(self, invoke) -> None:
+        ops = '{"op": "create", "title": "A"}\n{"op": "bogus"}\n'
+        result = invoke("batch", "--actor", "human:test", input=ops)
+        assert result.exit_code == 1
+        assert [r["error"]["code"] for r in _results(result.output)] == [
+            "ABORTED",
+            "VALIDATION_ERROR",
+        ]
+        listed = json.loads(invoke("list", "--json").output)["data"]
+        assert listed == []
+
+    def test_invalid_json(self, invoke) -> None:
+        result = invoke("batch", "--actor", "human:test", input="not json\n")
+        assert result.exit_code != 0
+        assert "Line 1" in result.output
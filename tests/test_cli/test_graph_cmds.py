@@ -0,0 +1,34 @@
+"""CLI integration tests for `lattice graph`."""
+
+from __future__ import annotations
+
+
+class TestGraphCheck:
+    """`lattice graph check` reports blocked tasks and cycles."""
+
+    def test_empty_project(self, invoke) -> None:
+        result = invoke("graph", "check")
+        assert result.exit_code == 0
+        assert "0 blocking edges, 0 blocked tasks" in result.output
+        assert "No dependency cycles" in result.output
+
+    def test_reports_blocked_task(self, create_task, invoke_json) -> None:
+        task_a = create_task("Prerequisite")
+        task_b = create_task("Follow-up")
+        invoke_json("link", task_a["id"], "blocks", task_b["id"], "--actor", "human:test")
+
+        parsed, code = invoke_json("graph", "check")
+        assert code == 0
+        assert parsed["data"]["edges"] == 1
+        assert parsed["data"]["blocked"] == [{"task_id": task_b["id"], "blockers": [task_a["id"]]}]
+        assert parsed["data"]["cycles"] == []
+
+    def test_cycle_exits_nonzero(self, create_task, invoke) -> None:
+        task_a = create_task("Chicken")
+        task_b = create_task("Egg")
+        invoke("link", task_a["id"], "blocks", task_b["id"], "--actor", "human:test")
+        invoke("link", task_b["id"], "blocks", task_a["id"], "--actor", "human:test")
+
+        result = invoke("graph", "check")
+        assert result.exit_code == 1
+        assert "Cycle among" in result.output
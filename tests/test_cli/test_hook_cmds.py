@@ -0,0 +1,63 @@
+"""CLI integration tests for `lattice hooks` (queued hook outbox)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from lattice.storage import hook_queue
+
+
+@pytest.fixture()
+def queued_hooks(initialized_root: Path, monkeypatch) -> Path:
+    """Configure a failing queued post_event hook; return its log file."""
+    monkeypatch.setattr(hook_queue, "spawn_worker", lambda _ld: None)
+    monkeypatch.setattr(hook_queue, "RETRY_BACKOFF_SECONDS", 0)
+    log = initialized_root / "hook.log"
+    config_path = initialized_root / ".lattice" / "config.json"
+    config = json.loads(config_path.read_text())
+    config["hooks"] = {
+        "queued": True,
+        "max_attempts": 2,
+        "post_event": f'echo "$LATTICE_EVENT_TYPE" >> "{log}"; exit 1',
+    }
+    config_path.write_text(json.dumps(config))
+    return log
+
+
+class TestHooksCommands:
+    def test_status_drain_retry(self, queued_hooks: Path, create_task, invoke) -> None:
+        create_task("Queued")
+        assert not queued_hooks.exists()
+
+        status = json.loads(invoke("hooks", "status", "--json").output)["data"]
+        assert len(status["pending"]) == 1
+        assert status["dead"] == []
+
+        result = invoke("hooks", "drain", "--json")
+        assert result.exit_code == 0, result.output
+        stats = json.loads(result.output)["data"]
+        assert stats == {"jobs": 1, "commands": 1, "retries": 1, "dead": 1}
+        assert queued_hooks.read_text().splitlines() == ["task_created", "task_created"]
+
+        status = json.loads(invoke("hooks", "status", "--json").output)["data"]
+        assert status["pending"] == []
+        (letter,) = status["dead"]
+        assert letter["error"] == "exit status 1"
+
+        doctor = json.loads(invoke("doctor", "--json").output)["data"]
+        assert [f["check"] for f in doctor["findings"]] == ["hook_dead_letter"]
+
+        result = invoke("hooks", "retry", letter["id"])
+        assert result.exit_code == 0
+        assert "Re-queued 1 hook command." in result.output
+        status = json.loads(invoke("hooks", "status", "--json").output)["data"]
+        assert len(status["pending"]) == 1
+        assert status["dead"] == []
+
+    def test_retry_unknown_id(self, queued_hooks: Path, invoke) -> None:
+        result = invoke("hooks", "retry", "nope", "--json")
+        assert result.exit_code == 1
+        assert json.loads(result.output)["error"]["code"] == "NOT_FOUND"
@@ -227,6 +227,60 @@ class TestDoctor:
         assert result.exit_code == 0
         assert "lifecycle" in result.output.lower() or "Lifecycle" in result.output
 
+    def test_doctor_fix_relationship_index(self, create_task, invoke, initialized_root):
+        """A stale relationship index is reported and regenerated by --fix."""
+        task_a = create_task("Source")
+        task_b = create_task("Target")
+        invoke("link", task_a["id"], "blocks", task_b["id"], "--actor", "human:test")
+        invoke("show", task_b["id"])  # builds the index
+
+        index_path = initialized_root / ".lattice" / "cache" / "relationship_index.jsonl"
+        header = index_path.read_text().splitlines()[0]
+        index_path.write_text(header + "\n")
+
+        result = invoke("doctor")
+        assert f"Relationship index is missing the edges of {task_a['id']}" in result.output
+
+        result = invoke("doctor", "--fix")
+        assert "fixed by regenerating relationship index" in result.output
+        result = invoke("doctor")
+        assert "Relationship index consistent" in result.output
+
+    def test_doctor_fix_blocking_index(self, create_task, invoke, initialized_root):
+        """A stale blocking index is reported and regenerated by --fix."""
+        task_a = create_task("Source")
+        task_b = create_task("Target")
+        invoke("next")  # builds the index
+        index_path = initialized_root / ".lattice" / "cache" / "blocking_index.jsonl"
+        stale = index_path.read_text()
+        invoke("link", task_a["id"], "blocks", task_b["id"], "--actor", "human:test")
+        index_path.write_text(stale)
+
+        result = invoke("doctor")
+        assert f"Blocking index entry for {task_a['id']} differs" in result.output
+
+        result = invoke("doctor", "--fix")
+        assert "fixed by regenerating blocking index" in result.output
+        result = invoke("doctor")
+        assert "Blocking index consistent" in result.output
+
+    def test_doctor_fix_ready_queue(self, create_task, invoke, initialized_root):
+        """A ready queue missing a task is reported and regenerated by --fix."""
+        create_task("First")
+        invoke("next")  # builds the queue
+        index_path = initialized_root / ".lattice" / "cache" / "ready_queue.jsonl"
+        stale = index_path.read_text()
+        task_b = create_task("Second")
+        index_path.write_text(stale)
+
+        result = invoke("doctor")
+        assert f"Ready queue is missing {task_b['id']}" in result.output
+
+        result = invoke("doctor", "--fix")
+        assert "fixed by regenerating ready queue" in result.output
+        result = invoke("doctor")
+        assert "Ready queue consistent" in result.output
+
 
 # ---------------------------------------------------------------------------
 # Rebuild tests
@@ -391,3 +445,20 @@ class TestRebuild:
         assert parsed["ok"] is True
         assert len(parsed["data"]["rebuilt_tasks"]) == 2
         assert parsed["data"]["global_log_rebuilt"] is True
+
+    def test_rebuild_all_regenerates_relationship_index(
+        self, create_task, invoke, invoke_json, initialized_root
+    ):
+        task_a = create_task("Source")
+        task_b = create_task("Target")
+        invoke("link", task_a["id"], "blocks", task_b["id"], "--actor", "human:test")
+        index_path = initialized_root / ".lattice" / "cache" / "relationship_index.jsonl"
+        index_path.unlink(missing_ok=True)
+
+        result = invoke("rebuild", "--all")
+        assert result.exit_code == 0
+        assert index_path.exists()
+
+        parsed, code = invoke_json("show", task_b["id"])
+        assert code == 0
+        assert parsed["data"]["relationships_in"][0]["source_task_id"] == task_a["id"]
@@ -0,0 +1,74 @@
+"""Tests for `lattice migrate-layout`."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.storage.layout import shard_of
+
+
+def _files(lattice_dir: Path) -> list[str]:
+    return sorted(
+        str(p.relative_to(lattice_dir))
+        for sub in ("tasks", "events", "archive/tasks", "archive/events")
+        for p in (lattice_dir / sub).rglob("*")
+        if p.is_file()
+    )
+
+
+class TestMigrateLayout:
+    def test_round_trip(self, invoke, invoke_json, create_task, initialized_root: Path) -> None:
+        lattice_dir = initialized_root / ".lattice"
+        kept = create_task("Kept")
+        gone = create_task("Archived")
+        invoke("comment", kept["id"], "hello", "--actor", "human:test")
+        invoke("archive", gone["id"], "--actor", "human:test")
+        flat_files = _files(lattice_dir)
+
+        parsed, code = invoke_json("migrate-layout", "--to", "sharded")
+        assert code == 0
+        assert parsed["data"] == {"layout": "sharded", "previous_layout": "flat", "moved": 4}
+        config = json.loads((lattice_dir / "config.json").read_text())
+        assert config["layout"] == "sharded"
+        shard = shard_of(kept["id"])
+        assert (lattice_dir / "tasks" / shard / f"{kept['id']}.json").exists()
+        assert (lattice_dir / "archive" / "events" / shard_of(gone["id"])).is_dir()
+        assert (lattice_dir / "events" / "_lifecycle.jsonl").exists()
+
+        # Everything still reads and checks out under the new layout
+        listed, _ = invoke_json("list")
+        assert [t["id"] for t in listed["data"]] == [kept["id"]]
+        shown, _ = invoke_json("show", kept["id"])
+        assert len(shown["data"]["events"]) == 2
+        doctor, code = invoke_json("doctor")
+        assert code == 0 and doctor["data"]["summary"]["errors"] == 0
+        assert invoke("rebuild", "--all").exit_code == 0
+        assert _files(lattice_dir) != flat_files
+
+        parsed, code = invoke_json("migrate-layout", "--to", "flat")
+        assert code == 0
+        assert parsed["data"]["moved"] == 4
+        assert _files(lattice_dir) == flat_files
+        assert [p.name for p in (lattice_dir / "tasks").iterdir()] == [f"{kept['id']}.json"]
+
+    def test_noop_when_already_in_layout(self, invoke, create_task) -> None:
+        create_task("Task")
+        result = invoke("migrate-layout", "--to", "flat")
+        assert result.exit_code == 0
+        assert "Already using the flat layout" in result.output
+
+    def test_conflicting_destination_aborts(
+        self, invoke, invoke_json, create_task, initialized_root: Path
+    ) -> None:
+        lattice_dir = initialized_root / ".lattice"
+        task = create_task("Task")
+        shard_dir = lattice_dir / "tasks" / shard_of(task["id"])
+        shard_dir.mkdir()
+        (shard_dir / f"{task['id']}.json").write_text("{}")
+
+        parsed, code = invoke_json("migrate-layout", "--to", "sharded")
+        assert code != 0
+        assert parsed["error"]["code"] == "CONFLICT"
+        assert (lattice_dir / "tasks" / f"{task['id']}.json").exists()
+        assert "layout" not in json.loads((lattice_dir / "config.json").read_text())
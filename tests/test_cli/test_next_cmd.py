@@ -96,6 +96,29 @@ class TestNextExclusions:
         assert parsed["data"] is None
 
 
+class TestNextBlocked:
+    """Tasks waiting on open prerequisites are skipped."""
+
+    def test_skips_task_with_open_blocker(self, create_task, invoke) -> None:
+        blocker = create_task("Low prerequisite", "--priority", "low")
+        blocked = create_task("Critical follow-up", "--priority", "critical")
+        invoke("link", blocker["id"], "blocks", blocked["id"], "--actor", "human:test")
+
+        result = invoke("next", "--json")
+        parsed = json.loads(result.output)
+        assert parsed["data"]["title"] == "Low prerequisite"
+
+    def test_cancelled_blocker_releases_task(self, create_task, invoke) -> None:
+        blocker = create_task("Low prerequisite", "--priority", "low")
+        blocked = create_task("Critical follow-up", "--priority", "critical")
+        invoke("link", blocked["id"], "depends_on", blocker["id"], "--actor", "human:test")
+        invoke("status", blocker["id"], "cancelled", "--actor", "human:test")
+
+        result = invoke("next", "--json")
+        parsed = json.loads(result.output)
+        assert parsed["data"]["title"] == "Critical follow-up"
+
+
 class TestNextAssignment:
     """Assignment-based filtering."""
 
@@ -399,48 +422,29 @@ class TestNextClaimConcurrency:
     """Concurrent claim guard — reject when another agent already claimed.
 
     The guard fires inside the file lock, after re-reading the snapshot.
-    In a real race, both agents call select_next() and pick the same task
-    (both see it unassigned), then serialize through the lock.  The first
-    writes assignment + status; the second re-reads and should see the
-    first's claim.
-
-    To simulate this without threads, we:
-    1. Let agent:alpha claim the task normally (select → lock → write).
-    2. Manually mutate the snapshot back to 'backlog' + unassigned so
-       select_next() picks it again for agent:bravo.
-    3. agent:bravo calls next --claim, select_next sees the faked
-       snapshot (unassigned/backlog), but the lock path re-reads the
-       REAL snapshot (assigned to alpha, in_progress) and rejects.
+    In a real race, both agents select the same task (both see it
+    unassigned), then serialize through the lock.  The first writes
+    assignment + status; the second re-reads and should see the first's
+    claim.
+
+    To simulate this without threads, the first agent claims the task
+    normally and selection is then patched to hand the second agent the
+    stale, unclaimed snapshot.
     """
 
+    @staticmethod
+    def _select_stale(monkeypatch, stale: dict) -> None:
+        import lattice.cli.query_cmds as qmod
+
+        monkeypatch.setattr(qmod, "queue_select_next", lambda *_args, **_kwargs: stale)
+
     def test_guard_rejects_when_snapshot_shows_other_owner(
         self, create_task, invoke, fill_plan, cli_env, monkeypatch
     ) -> None:
-        """Patch read_snapshot to return a claimed snapshot inside the lock.
-
-        select_next uses load_all_snapshots (not read_snapshot), so the only
-        read_snapshot call for our task_id is the re-read inside the lock.
-        We patch that single call to simulate another agent having claimed
-        the task between selection and lock acquisition.
-        """
         task = create_task("Race task")
-        task_id = task["id"]
-        fill_plan(task_id, "Race task")
-
-        import lattice.cli.query_cmds as qmod
-
-        original_read = qmod.read_snapshot
-
-        def patched_read(lattice_dir, tid):
-            snap = original_read(lattice_dir, tid)
-            if tid == task_id and snap is not None:
-                # Simulate: alpha claimed between select and lock
-                snap = dict(snap)
-                snap["assigned_to"] = "agent:alpha"
-                snap["status"] = "in_progress"
-            return snap
-
-        monkeypatch.setattr(qmod, "read_snapshot", patched_read)
+        fill_plan(task["id"], "Race task")
+        assert invoke("next", "--actor", "agent:alpha", "--claim").exit_code == 0
+        self._select_stale(monkeypatch, task)
 
         result = invoke("next", "--actor", "agent:bravo", "--claim", "--json")
         assert result.exit_code != 0
@@ -454,27 +458,15 @@ class TestNextClaimConcurrency:
     ) -> None:
         """If the snapshot shows the SAME actor, claim should proceed (no false reject)."""
         task = create_task("Own task")
-        task_id = task["id"]
-        fill_plan(task_id, "Own task")
-
-        import lattice.cli.query_cmds as qmod
-
-        original_read = qmod.read_snapshot
-
-        def patched_read(lattice_dir, tid):
-            snap = original_read(lattice_dir, tid)
-            if tid == task_id and snap is not None:
-                snap = dict(snap)
-                snap["assigned_to"] = "agent:claude"
-                snap["status"] = "in_progress"
-            return snap
-
-        monkeypatch.setattr(qmod, "read_snapshot", patched_read)
+        fill_plan(task["id"], "Own task")
+        assert invoke("next", "--actor", "agent:claude", "--claim").exit_code == 0
+        self._select_stale(monkeypatch, task)
 
         result = invoke("next", "--actor", "agent:claude", "--claim", "--json")
         assert result.exit_code == 0
         parsed = json.loads(result.output)
-        assert parsed["data"]["id"] == task_id
+        assert parsed["data"]["id"] == task["id"]
+        assert parsed["data"]["status"] == "in_progress"
 
     def test_claim_rejects_when_in_progress_by_other(self, create_task, invoke, fill_plan) -> None:
         """If task is already in_progress by another agent, bravo picks the next task."""
@@ -520,23 +512,98 @@ class TestNextClaimConcurrency:
     def test_guard_human_readable_error(self, create_task, invoke, fill_plan, monkeypatch) -> None:
         """Non-JSON mode should also show the ALREADY_CLAIMED error."""
         task = create_task("Contested HR task")
-        task_id = task["id"]
-        fill_plan(task_id, "Contested HR task")
+        fill_plan(task["id"], "Contested HR task")
+        assert invoke("next", "--actor", "agent:alpha", "--claim").exit_code == 0
+        self._select_stale(monkeypatch, task)
 
-        import lattice.cli.query_cmds as qmod
+        result = invoke("next", "--actor", "agent:bravo", "--claim")
+        assert result.exit_code != 0
+        assert "already claimed" in result.output.lower()
 
-        original_read = qmod.read_snapshot
 
-        def patched_read(lattice_dir, tid):
-            snap = original_read(lattice_dir, tid)
-            if tid == task_id and snap is not None:
-                snap = dict(snap)
-                snap["assigned_to"] = "agent:alpha"
-                snap["status"] = "in_progress"
-            return snap
+class TestNextBatchClaim:
+    """--claim --count/--worker claims several tasks in one pass."""
 
-        monkeypatch.setattr(qmod, "read_snapshot", patched_read)
+    def test_count_claims_top_tasks_for_actor(self, create_task, invoke, fill_plan) -> None:
+        tasks = [
+            create_task("Low", "--priority", "low"),
+            create_task("Critical", "--priority", "critical"),
+            create_task("High", "--priority", "high"),
+        ]
+        for task in tasks:
+            fill_plan(task["id"], task["title"])
 
-        result = invoke("next", "--actor", "agent:bravo", "--claim")
+        result = invoke("next", "--actor", "agent:claude", "--claim", "--count", "2", "--json")
+        assert result.exit_code == 0
+        parsed = json.loads(result.output)
+        claimed = parsed["data"]["claimed"]
+        assert [s["title"] for s in claimed] == ["Critical", "High"]
+        assert all(s["assigned_to"] == "agent:claude" for s in claimed)
+        assert all(s["status"] == "in_progress" for s in claimed)
+        assert parsed["data"]["skipped"] == []
+
+    def test_workers_each_get_one_task(self, create_task, invoke, fill_plan) -> None:
+        for title in ("First", "Second", "Third"):
+            task = create_task(title)
+            fill_plan(task["id"], title)
+
+        result = invoke(
+            "next",
+            "--actor",
+            "agent:orchestrator",
+            "--claim",
+            "--worker",
+            "agent:w1",
+            "--worker",
+            "agent:w2",
+            "--json",
+        )
+        assert result.exit_code == 0
+        claimed = json.loads(result.output)["data"]["claimed"]
+        assert [s["assigned_to"] for s in claimed] == ["agent:w1", "agent:w2"]
+
+        # The third task is still available
+        result = invoke("next", "--json")
+        assert json.loads(result.output)["data"]["title"] == "Third"
+
+    def test_unplanned_task_is_skipped(self, create_task, invoke, fill_plan) -> None:
+        planned = create_task("Planned", "--priority", "high")
+        fill_plan(planned["id"], "Planned")
+        unplanned = create_task("Unplanned", "--priority", "critical")
+
+        result = invoke("next", "--actor", "agent:claude", "--claim", "--count", "2", "--json")
+        assert result.exit_code == 0
+        data = json.loads(result.output)["data"]
+        assert [s["id"] for s in data["claimed"]] == [planned["id"]]
+        assert [(s["task_id"], s["code"]) for s in data["skipped"]] == [
+            (unplanned["id"], "PLAN_REQUIRED")
+        ]
+
+    def test_count_larger_than_pool(self, create_task, invoke, fill_plan) -> None:
+        task = create_task("Only")
+        fill_plan(task["id"], "Only")
+        result = invoke("next", "--actor", "agent:claude", "--claim", "--count", "3", "--json")
+        assert result.exit_code == 0
+        assert len(json.loads(result.output)["data"]["claimed"]) == 1
+
+    def test_count_requires_claim(self, invoke) -> None:
+        result = invoke("next", "--count", "2", "--json")
         assert result.exit_code != 0
-        assert "already claimed" in result.output.lower()
+        assert json.loads(result.output)["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_mismatched_worker_count_rejected(self, invoke) -> None:
+        result = invoke(
+            "next",
+            "--actor",
+            "agent:o",
+            "--claim",
+            "--count",
+            "3",
+            "--worker",
+            "agent:w1",
+            "--worker",
+            "agent:w2",
+            "--json",
+        )
+        assert result.exit_code != 0
+        assert json.loads(result.output)["error"]["code"] == "VALIDATION_ERROR"
@@ -68,6 +68,27 @@ class TestPluginsCommand:
         assert result.exit_code == 0
         assert "Lattice -- Stage 11" in result.output
 
+    @patch("lattice.plugins.entry_points")
+    def test_shows_hook_handlers(self, mock_ep: MagicMock) -> None:
+        def side_effect(group=None):
+            if group == "lattice.hooks":
+                ep = MagicMock()
+                ep.name = "notify"
+                ep.value = "my_pkg.hooks:notify"
+                return [ep]
+            return []
+
+        mock_ep.side_effect = side_effect
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["plugins", "--json"])
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["data"]["hooks"] == [{"name": "notify", "value": "my_pkg.hooks:notify"}]
+
+        result = runner.invoke(cli, ["plugins"])
+        assert "notify -> my_pkg.hooks:notify" in result.output
+
 
 class TestPluginRegisteredCommand:
     """Plugin-registered Click commands are invocable through the CLI."""
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import subprocess
 from pathlib import Path
 from subprocess import CompletedProcess
 
@@ -645,33 +646,32 @@ class TestShow:
         commits = query_cmds._auto_detect_commits("LAT-144", lattice_dir)
         assert commits == []
 
-    def test_auto_detect_commits_parses_git_log_output(self, monkeypatch, cli_env):
-        """Commit auto-detection parses git log output into structured commits."""
+    def test_auto_detect_commits_reads_the_commit_index(self, cli_env):
+        """Commit auto-detection matches references and picks up new commits."""
         from lattice.cli import query_cmds
 
-        lattice_dir = Path(cli_env["LATTICE_ROOT"]) / ".lattice"
-        calls: list[list[str]] = []
-
-        def fake_run(args, **kwargs):
-            calls.append(args)
-            return CompletedProcess(
-                args,
-                0,
-                "abc1234\x1f2026-02-18\x1fLAT-144 add parser\n"
-                "def5678\x1f2026-02-17\x1fLAT-144 add tests",
-                "",
+        root = Path(cli_env["LATTICE_ROOT"])
+        lattice_dir = root / ".lattice"
+
+        def git(*args: str) -> None:
+            subprocess.run(
+                ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", *args],
+                cwd=root,
+                check=True,
+                capture_output=True,
             )
 
-        monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/git")
-        monkeypatch.setattr("subprocess.run", fake_run)
+        git("init", "--initial-branch=main")
+        git("commit", "--allow-empty", "-m", "LAT-144 add parser")
+        git("commit", "--allow-empty", "-m", "LAT-1440 unrelated")
+        assert [c["subject"] for c in query_cmds._auto_detect_commits("LAT-144", lattice_dir)] == [
+            "LAT-144 add parser"
+        ]
 
+        git("commit", "--allow-empty", "-m", "Add tests", "-m", "Refs lat-144")
         commits = query_cmds._auto_detect_commits("LAT-144", lattice_dir)
-        assert commits == [
-            {"sha": "abc1234", "date": "2026-02-18", "subject": "LAT-144 add parser"},
-            {"sha": "def5678", "date": "2026-02-17", "subject": "LAT-144 add tests"},
-        ]
-        assert calls, "Expected git log to run"
-        assert any(part.startswith("--grep=LAT-144") for part in calls[0])
+        assert [c["subject"] for c in commits] == ["Add tests", "LAT-144 add parser"]
+        assert len(commits[0]["date"]) == 10
 
     def test_compact_output(self, invoke, create_task):
         """--compact shows only compact fields."""
@@ -979,6 +979,28 @@ class TestShow:
         assert "Warning: Previously completed, reset on " in result.output
         assert "by human:test" in result.output
 
+    def test_show_lists_only_recent_events_without_full(self, invoke, create_task):
+        """Human show lists the latest events; --full lists the whole history."""
+        task = create_task("Long history")
+        task_id = task["id"]
+        invoke("status", task_id, "done", "--force", "--reason", "test", "--actor", "human:test")
+        invoke(
+            "status", task_id, "planned", "--force", "--reason", "test", "--actor", "human:test"
+        )
+        for i in range(25):
+            invoke("comment", task_id, f"note {i}", "--actor", "human:test")
+
+        result = invoke("show", task_id)
+        assert result.exit_code == 0
+        assert "use --full for all" in result.output
+        assert result.output.count("comment_added") == 20
+        # The reopen warning still comes from the older part of the log
+        assert "Warning: Previously completed, reset on " in result.output
+
+        result = invoke("show", task_id, "--full")
+        assert "use --full for all" not in result.output
+        assert result.output.count("comment_added") == 25
+
     def test_show_json_includes_reopen_warning_metadata(self, invoke, create_task):
         """JSON show output includes warning metadata for latest backward transition."""
         task = create_task("Reset metadata")
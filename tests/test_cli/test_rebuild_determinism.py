@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import json
 
+import pytest
+
 
 class TestRebuildDeterminism:
     """Verify that rebuild from events produces byte-identical snapshots."""
@@ -268,3 +270,240 @@ class TestRebuildDeterminism:
         data2, exit2 = invoke_json("rebuild", task_id)
         assert exit2 == 0
         assert data2 == data1
+
+
+def _rich_task_events(task_id: str, rounds: int) -> list[dict]:
+    """Build an event history that exercises every snapshot mutation type."""
+    from lattice.core.events import create_event
+
+    target = "task_01BBBBBBBBBBBBBBBBBBBBBBBB"
+
+    def ev(etype: str, data: dict) -> dict:
+        return create_event(type=etype, task_id=task_id, actor="human:test", data=data)
+
+    events = [
+        ev(
+            "task_created",
+            {
+                "title": "Rich history",
+                "status": "backlog",
+                "type": "task",
+                "tags": ["a", "b"],
+                "custom_fields": {"team": "core"},
+            },
+        )
+    ]
+    for i in range(rounds):
+        comment = ev("comment_added", {"body": f"c{i}", "role": "review" if i % 2 else None})
+        events += [
+            ev("status_changed", {"from": "backlog", "to": "done"}),
+            ev("status_changed", {"from": "done", "to": "backlog"}),
+            ev("assignment_changed", {"from": None, "to": f"agent:a{i}"}),
+            ev("field_updated", {"field": "tags", "from": None, "to": ["x", f"t{i}"]}),
+            ev("field_updated", {"field": "custom_fields.team", "from": None, "to": {"n": i}}),
+            ev("relationship_added", {"type": "blocks", "target_task_id": target}),
+            ev("artifact_attached", {"artifact_id": f"art_{i}", "role": "log"}),
+            ev("branch_linked", {"branch": f"feat/{i}", "repo": None}),
+            comment,
+            ev("comment_edited", {"comment_id": comment["id"], "body": "e", "role": "final"}),
+            ev("reaction_added", {"comment_id": comment["id"], "emoji": "+1"}),
+            ev("x_custom", {"payload": [1, 2, 3]}),
+        ]
+        if i % 3 == 0:
+            events += [
+                ev("relationship_removed", {"type": "blocks", "target_task_id": target}),
+                ev("branch_unlinked", {"branch": f"feat/{i}", "repo": None}),
+                ev("comment_deleted", {"comment_id": comment["id"]}),
+            ]
+    events.append(ev("task_short_id_assigned", {"short_id": "LAT-1"}))
+    return events
+
+
+class TestInPlaceReplayEquivalence:
+    """replay_events must be byte-identical to chained apply_event_to_snapshot."""
+
+    def test_replay_matches_chained_apply(self):
+        import copy
+
+        from lattice.core.tasks import apply_event_to_snapshot, replay_events, serialize_snapshot
+
+        events = _rich_task_events("task_01AAAAAAAAAAAAAAAAAAAAAAAA", rounds=25)
+        original = copy.deepcopy(events)
+
+        chained = None
+        for event in events:
+            chained = apply_event_to_snapshot(chained, event)
+        replayed = replay_events(events)
+
+        assert serialize_snapshot(replayed) == serialize_snapshot(chained)
+        # In-place replay must not mutate (or alias into) the caller's events
+        assert events == original
+        replayed["tags"].append("mutated")
+        replayed["custom_fields"]["team"]["n"] = -1
+        assert events == original
+
+    def test_replay_from_existing_snapshot(self):
+        from lattice.core.tasks import apply_event_to_snapshot, replay_events, serialize_snapshot
+
+        events = _rich_task_events("task_01AAAAAAAAAAAAAAAAAAAAAAAA", rounds=6)
+        head, tail = events[:20], events[20:]
+        base = replay_events(head)
+        before = serialize_snapshot(base)
+
+        chained = base
+        for event in tail:
+            chained = apply_event_to_snapshot(chained, event)
+
+        assert serialize_snapshot(replay_events(tail, base)) == serialize_snapshot(chained)
+        assert serialize_snapshot(base) == before
+
+    def test_replay_empty(self):
+        from lattice.core.tasks import replay_events
+
+        assert replay_events([]) is None
+
+    def test_resource_replay_matches_chained_apply(self):
+        from lattice.core.events import create_resource_event
+        from lattice.core.resources import (
+            apply_resource_event_to_snapshot,
+            replay_resource_events,
+            serialize_resource_snapshot,
+        )
+
+        rid = "res_01AAAAAAAAAAAAAAAAAAAAAAAA"
+
+        def ev(etype: str, data: dict) -> dict:
+            return create_resource_event(
+                type=etype, resource_id=rid, actor="human:test", data=data
+            )
+
+        events = [ev("resource_created", {"name": "db", "max_holders": 2})]
+        for i in range(20):
+            events += [
+                ev("resource_acquired", {"holder": f"agent:{i}", "expires_at": "x"}),
+                ev("resource_heartbeat", {"holder": f"agent:{i}", "expires_at": "y"}),
+                ev("resource_updated", {"field": "description", "new_value": f"d{i}"}),
+                ev("resource_released", {"holder": f"agent:{i}"}),
+            ]
+
+        chained = None
+        for event in events:
+            chained = apply_resource_event_to_snapshot(chained, event)
+        assert serialize_resource_snapshot(
+            replay_resource_events(events)
+        ) == serialize_resource_snapshot(chained)
+
+    def test_cli_rebuild_of_rich_history_is_byte_identical(self, initialized_root, invoke):
+        """A snapshot materialized incrementally survives `rebuild` byte-for-byte."""
+        from lattice.core.events import serialize_event
+        from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+
+        task_id = "task_01AAAAAAAAAAAAAAAAAAAAAAAA"
+        events = _rich_task_events(task_id, rounds=10)
+        snapshot = None
+        for event in events:
+            snapshot = apply_event_to_snapshot(snapshot, event)
+
+        lattice_dir = initialized_root / ".lattice"
+        snap_path = lattice_dir / "tasks" / f"{task_id}.json"
+        snap_path.write_text(serialize_snapshot(snapshot))
+        (lattice_dir / "events" / f"{task_id}.jsonl").write_text(
+            "".join(serialize_event(e) for e in events)
+        )
+        before = snap_path.read_bytes()
+
+        result = invoke("rebuild", task_id)
+        assert result.exit_code == 0
+        assert snap_path.read_bytes() == before
+
+
+class TestSinglePassRebuild:
+    """`rebuild --all` reads each log once, optionally across worker processes."""
+
+    def _derived_files(self, lattice_dir) -> dict[str, bytes]:
+        from lattice.storage.short_ids import load_id_index
+
+        paths = [
+            lattice_dir / "events" / "_lifecycle.jsonl",
+            lattice_dir / "cache" / "event_index.jsonl",
+            *sorted((lattice_dir / "tasks").glob("*.json")),
+            *sorted((lattice_dir / "archive" / "tasks").glob("*.json")),
+        ]
+        files = {str(p.relative_to(lattice_dir)): p.read_bytes() for p in paths}
+        # The event index ends with the log directories' mtimes, which every rewrite bumps
+        index_lines = files["cache/event_index.jsonl"].splitlines(keepends=True)
+        files["cache/event_index.jsonl"] = b"".join(
+            line for line in index_lines if not line.startswith(b'{"kind":"sig"')
+        )
+        # Short IDs may live partly in the allocation log until rebuilt
+        files["ids"] = json.dumps(load_id_index(lattice_dir), sort_keys=True).encode()
+        return files
+
+    def _enable_short_ids(self, lattice_dir) -> None:
+        config_path = lattice_dir / "config.json"
+        config = json.loads(config_path.read_text())
+        config["project_code"] = "TST"
+        config_path.write_text(json.dumps(config, sort_keys=True, indent=2) + "\n")
+
+    def _populate(self, invoke, create_task, lattice_dir) -> list[dict]:
+        self._enable_short_ids(lattice_dir)
+        tasks = [create_task(f"Parallel rebuild {i}") for i in range(6)]
+        for task in tasks[1:]:
+            invoke("status", task["id"], "in_planning", "--actor", "human:test")
+            invoke("link", task["id"], "depends_on", tasks[0]["id"], "--actor", "human:test")
+        invoke("comment", tasks[2]["id"], "Some context", "--actor", "human:test")
+        invoke("archive", tasks[5]["id"], "--actor", "human:test")
+        return tasks
+
+    @pytest.mark.timeout(60)
+    def test_jobs_matches_sequential(self, invoke, create_task, initialized_root):
+        from lattice.storage.event_index import rebuild_event_index
+
+        lattice_dir = initialized_root / ".lattice"
+        self._populate(invoke, create_task, lattice_dir)
+        rebuild_event_index(lattice_dir)
+
+        result = invoke("rebuild", "--all")
+        assert result.exit_code == 0
+        sequential = self._derived_files(lattice_dir)
+
+        result = invoke("rebuild", "--all", "--jobs", "3")
+        assert result.exit_code == 0, result.output
+        assert self._derived_files(lattice_dir) == sequential
+
+    def test_single_pass_matches_incremental_state(self, invoke, create_task, initialized_root):
+        from lattice.storage.event_index import rebuild_event_index
+
+        lattice_dir = initialized_root / ".lattice"
+        self._populate(invoke, create_task, lattice_dir)
+        rebuild_event_index(lattice_dir)
+        before = self._derived_files(lattice_dir)
+        before_index = sorted(before["cache/event_index.jsonl"].splitlines())
+
+        result = invoke("rebuild", "--all")
+        assert result.exit_code == 0
+
+        after = self._derived_files(lattice_dir)
+        after_index = sorted(after["cache/event_index.jsonl"].splitlines())
+        before.pop("cache/event_index.jsonl")
+        after.pop("cache/event_index.jsonl")
+        assert after == before
+        assert after_index == before_index
+
+    def test_broken_log_does_not_stop_the_pass(self, invoke, create_task, initialized_root):
+        lattice_dir = initialized_root / ".lattice"
+        self._enable_short_ids(lattice_dir)
+        tasks = [create_task(f"Broken log {i}") for i in range(3)]
+        broken = lattice_dir / "events" / f"{tasks[1]['id']}.jsonl"
+        broken.write_text(broken.read_text() + "{not json\n")
+
+        result = invoke("rebuild", "--all")
+
+        assert result.exit_code == 0
+        assert f"Error rebuilding {tasks[1]['id']}" in result.output
+        assert "Rebuilt 2 tasks" in result.output
+        # The broken task keeps its short ID and its lifecycle events
+        ids = json.loads((lattice_dir / "ids.json").read_text())
+        assert sorted(ids["map"].values()) == sorted(t["id"] for t in tasks)
+        lifecycle = (lattice_dir / "events" / "_lifecycle.jsonl").read_text()
+        assert all(t["id"] in lifecycle for t in tasks)
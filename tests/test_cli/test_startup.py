@@ -0,0 +1,84 @@
+"""CLI cold-start tests: lazy command loading and an import-time benchmark."""
+
+from __future__ import annotations
+
+import importlib
+import os
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from lattice.cli.main import _LAZY_COMMANDS, cli
+
+# Modules that `lattice list` must not import before it runs.
+_HEAVY_MODULES = (
+    "lattice.cli.demo_cmd",
+    "lattice.cli.resource_cmds",
+    "lattice.cli.dashboard_cmd",
+    "lattice.dashboard.server",
+    "lattice.plugins",
+    "filelock",
+)
+
+
+def _importtime(*argv: str) -> dict[str, int]:
+    """Run ``lattice <argv>`` under ``python -X importtime``.
+
+    Returns ``{module: cumulative microseconds}`` for every module imported.
+    """
+    code = f"import sys; sys.argv = ['lattice', *{list(argv)!r}]; from lattice.daemon import main; main()"
+    env = dict(os.environ, LATTICE_NO_DAEMON="1", LATTICE_NO_UPDATE_CHECK="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        if cumulative.isdigit():
+            modules[name] = int(cumulative)
+    return modules
+
+
+class TestLazyCommands:
+    def test_map_matches_registering_modules(self) -> None:
+        for name, module in _LAZY_COMMANDS.items():
+            importlib.import_module(module)
+            assert name in cli.commands, f"{module} does not register {name!r}"
+
+    def test_help_lists_every_command(self) -> None:
+        result = CliRunner().invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        for name in ("create", "list", "next", "dashboard", "demo", "resource", "daemon"):
+            assert f"  {name} " in result.output
+
+    def test_unknown_command_is_still_an_error(self) -> None:
+        result = CliRunner().invoke(cli, ["no-such-command"])
+        assert result.exit_code == 2
+        assert "No such command" in result.output
+
+
+class TestStartupImports:
+    def test_subcommand_imports_only_its_module(self) -> None:
+        modules = _importtime("list", "--help")
+        assert "lattice.cli.query_cmds" in modules
+        loaded_cmds = sorted(
+            m for m in modules if m.startswith("lattice.cli.") and m.endswith(("_cmds", "_cmd"))
+        )
+        assert loaded_cmds == ["lattice.cli.query_cmds"]
+        for heavy in _HEAVY_MODULES:
+            assert heavy not in modules, (
+                f"{heavy} imported on `lattice list` "
+                f"(lattice.cli.main cumulative {modules.get('lattice.cli.main')}us)"
+            )
+
+    def test_top_level_help_loads_plugins(self) -> None:
+        modules = _importtime("--help")
+        assert "lattice.plugins" in modules
@@ -7,11 +7,13 @@ import json
 import pytest
 
 from lattice.core.config import (
+    DEFAULT_DURABILITY,
     STATUS_DESCRIPTIONS,
     VALID_PRIORITIES,
     VALID_URGENCIES,
     default_config,
     get_configured_roles,
+    get_durability,
     get_review_cycle_limit,
     get_status_description,
     get_wip_limit,
@@ -356,6 +358,20 @@ class TestGetWipLimit:
         assert get_wip_limit(config, "in_progress") is None
 
 
+class TestGetDurability:
+    """get_durability() returns the configured event-append policy."""
+
+    def test_default_when_missing(self) -> None:
+        assert get_durability(default_config()) == DEFAULT_DURABILITY == "strict"
+
+    @pytest.mark.parametrize("mode", ["strict", "batched", "relaxed"])
+    def test_configured_mode(self, mode: str) -> None:
+        assert get_durability({"durability": mode}) == mode
+
+    def test_unknown_value_falls_back_to_strict(self) -> None:
+        assert get_durability({"durability": "yolo"}) == "strict"
+
+
 # ---------------------------------------------------------------------------
 # get_status_description
 # ---------------------------------------------------------------------------
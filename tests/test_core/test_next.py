@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from lattice.core.next import (
-    _actors_match,
+    actors_match,
     compute_claim_transitions,
     select_all_ready,
+    select_batch,
     select_next,
 )
 
@@ -417,34 +418,34 @@ class TestComputeClaimTransitions:
 
 
 class TestActorsMatch:
-    """_actors_match handles both legacy strings and structured dicts."""
+    """actors_match handles both legacy strings and structured dicts."""
 
     def test_both_none(self) -> None:
-        assert _actors_match(None, None)
+        assert actors_match(None, None)
 
     def test_one_none(self) -> None:
-        assert not _actors_match("agent:claude", None)
-        assert not _actors_match(None, "agent:claude")
+        assert not actors_match("agent:claude", None)
+        assert not actors_match(None, "agent:claude")
 
     def test_legacy_strings_match(self) -> None:
-        assert _actors_match("agent:claude", "agent:claude")
+        assert actors_match("agent:claude", "agent:claude")
 
     def test_legacy_strings_no_match(self) -> None:
-        assert not _actors_match("agent:claude", "agent:codex")
+        assert not actors_match("agent:claude", "agent:codex")
 
     def test_structured_dicts_match(self) -> None:
         a = {"name": "Argus-3", "base_name": "Argus", "serial": 3}
         b = {"name": "Argus-3", "base_name": "Argus", "serial": 3}
-        assert _actors_match(a, b)
+        assert actors_match(a, b)
 
     def test_structured_dicts_no_match(self) -> None:
         a = {"name": "Argus-3", "base_name": "Argus", "serial": 3}
         b = {"name": "Beacon-1", "base_name": "Beacon", "serial": 1}
-        assert not _actors_match(a, b)
+        assert not actors_match(a, b)
 
     def test_mixed_no_match(self) -> None:
         """Legacy string vs structured dict with different names."""
-        assert not _actors_match("agent:claude", {"name": "Argus-3"})
+        assert not actors_match("agent:claude", {"name": "Argus-3"})
 
 
 class TestSelectNextStructuredActor:
@@ -476,3 +477,64 @@ class TestSelectNextStructuredActor:
         me = {"name": "Argus-3", "base_name": "Argus", "serial": 3}
         snaps = [_snap("task_other", assigned_to=other)]
         assert select_next(snaps, actor=me) is None
+
+
+class TestSelectBlocked:
+    """Tasks with open prerequisites (the *blocked* set) are skipped."""
+
+    def test_skips_blocked_task(self) -> None:
+        snaps = [
+            _snap("task_crit", priority="critical"),
+            _snap("task_low", priority="low"),
+        ]
+        result = select_next(snaps, blocked=frozenset({"task_crit"}))
+        assert result is not None
+        assert result["id"] == "task_low"
+
+    def test_resume_ignores_blocked(self) -> None:
+        snaps = [_snap("task_ip", status="in_progress", assigned_to="agent:claude")]
+        result = select_next(snaps, actor="agent:claude", blocked=frozenset({"task_ip"}))
+        assert result is not None
+        assert result["id"] == "task_ip"
+
+    def test_all_ready_skips_blocked(self) -> None:
+        snaps = [_snap("task_a"), _snap("task_b")]
+        result = select_all_ready(snaps, blocked=frozenset({"task_a"}))
+        assert [s["id"] for s in result] == ["task_b"]
+
+
+class TestSelectBatch:
+    """select_batch pairs each actor with a distinct ready task."""
+
+    def test_pairs_in_priority_order(self) -> None:
+        snaps = [
+            _snap("task_low", priority="low"),
+            _snap("task_crit", priority="critical"),
+            _snap("task_med"),
+        ]
+        result = select_batch(snaps, ["agent:a", "agent:b"])
+        assert [(actor, snap["id"]) for actor, snap in result] == [
+            ("agent:a", "task_crit"),
+            ("agent:b", "task_med"),
+        ]
+
+    def test_assigned_task_goes_to_its_assignee(self) -> None:
+        snaps = [
+            _snap("task_crit", priority="critical", assigned_to="agent:b"),
+            _snap("task_med"),
+        ]
+        result = select_batch(snaps, ["agent:a", "agent:b"])
+        assert [(actor, snap["id"]) for actor, snap in result] == [
+            ("agent:a", "task_med"),
+            ("agent:b", "task_crit"),
+        ]
+
+    def test_stops_when_pool_runs_out(self) -> None:
+        snaps = [_snap("task_a"), _snap("task_b", status="in_progress")]
+        result = select_batch(snaps, ["agent:a"] * 3, blocked=frozenset())
+        assert [snap["id"] for _actor, snap in result] == ["task_a"]
+
+    def test_skips_blocked(self) -> None:
+        snaps = [_snap("task_a", priority="high"), _snap("task_b")]
+        result = select_batch(snaps, ["agent:a"], blocked=frozenset({"task_a"}))
+        assert result[0][1]["id"] == "task_b"
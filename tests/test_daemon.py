@@ -0,0 +1,112 @@
+"""Tests for lattice.daemon — forwarding CLI commands to a warm process."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from lattice.daemon import (
+    DaemonError,
+    forward,
+    request,
+    serve,
+    socket_path,
+)
+
+
+@pytest.fixture()
+def lattice_dir(initialized_root: Path, monkeypatch) -> Path:
+    monkeypatch.setenv("LATTICE_ROOT", str(initialized_root))
+    monkeypatch.delenv("LATTICE_NO_DAEMON", raising=False)
+    return initialized_root / ".lattice"
+
+
+@pytest.fixture()
+def running(lattice_dir: Path):
+    """Serve *lattice_dir* from a background thread for the test's duration."""
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=serve, args=(lattice_dir,), kwargs={"on_ready": lambda _p: ready.set()}
+    )
+    thread.start()
+    assert ready.wait(10)
+    yield lattice_dir
+    if thread.is_alive():
+        request(lattice_dir, {"op": "stop"})
+    thread.join(10)
+
+
+class TestForward:
+    def test_commands_run_in_daemon(self, running: Path, capsys) -> None:
+        assert forward(["create", "Warm task", "--actor", "human:test"]) == 0
+        assert "Created task" in capsys.readouterr().out
+
+        assert forward(["list", "--json"]) == 0
+        data = json.loads(capsys.readouterr().out)["data"]
+        assert [t["title"] for t in data] == ["Warm task"]
+
+        # The write went through the normal storage path
+        assert len(list((running / "tasks").glob("*.json"))) == 1
+        assert request(running, {"op": "status"})["served"] == 2
+
+    def test_exit_code_and_stderr_are_relayed(self, running: Path, capsys) -> None:
+        assert forward(["show", "task_01AAAAAAAAAAAAAAAAAAAAAAAAAA"]) == 1
+        assert "Error" in capsys.readouterr().err
+
+    def test_environment_is_restored(self, running: Path) -> None:
+        before = dict(os.environ)
+        forward(["list"])
+        assert dict(os.environ) == before
+
+    def test_no_socket_runs_locally(self, lattice_dir: Path) -> None:
+        assert forward(["list"]) is None
+
+    def test_stale_socket_runs_locally(self, lattice_dir: Path) -> None:
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(socket_path(lattice_dir)))
+        stale.close()
+        assert forward(["list"]) is None
+
+    def test_local_commands_and_bypass(self, running: Path, monkeypatch) -> None:
+        assert forward(["dashboard", "--port", "1"]) is None
+        monkeypatch.setenv("LATTICE_NO_DAEMON", "1")
+        assert forward(["list"]) is None
+        assert request(running, {"op": "status"})["served"] == 0
+
+    def test_plugin_and_unknown_commands_are_declined(self, running: Path, monkeypatch) -> None:
+        from lattice.cli.main import cli
+
+        # A plugin command may read stdin or prompt, so it runs in the client
+        monkeypatch.setattr(cli, "plugin_commands", frozenset({"list"}))
+        assert forward(["list"]) is None
+        assert forward(["no-such-command"]) is None
+        assert request(running, {"op": "status"})["served"] == 0
+
+    def test_version_mismatch_is_declined(self, running: Path) -> None:
+        reply = request(
+            running,
+            {"op": "run", "version": "0.0.0-other", "argv": ["list"], "cwd": "/", "env": {}},
+        )
+        assert reply == {"ok": False, "error": "version mismatch"}
+        assert request(running, {"op": "status"})["served"] == 0
+
+
+class TestServe:
+    def test_stop_removes_socket(self, running: Path) -> None:
+        assert request(running, {"op": "stop"}) == {"ok": True}
+        for _ in range(100):
+            if not socket_path(running).exists():
+                break
+            threading.Event().wait(0.05)
+        assert not socket_path(running).exists()
+        with pytest.raises(DaemonError):
+            request(running, {"op": "status"})
+
+    def test_second_daemon_is_refused(self, running: Path) -> None:
+        with pytest.raises(DaemonError, match="already listening"):
+            serve(running)
@@ -0,0 +1,117 @@
+"""Tests for dashboard gzip negotiation and the in-memory static asset cache."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from lattice.dashboard.assets import GZIP_MIN_BYTES, accepts_gzip, load_static
+
+
+def _get(base_url: str, path: str, **headers: str):
+    req = Request(f"{base_url}{path}", headers=headers)
+    try:
+        with urlopen(req, timeout=10) as resp:
+            return resp.status, resp.headers, resp.read()
+    except HTTPError as exc:
+        return exc.code, exc.headers, exc.read()
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ("identity", False),
+        ("gzip", True),
+        ("br, gzip, deflate", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0.5", True),
+        ("*", True),
+    ],
+)
+def test_accepts_gzip(header: str | None, expected: bool) -> None:
+    assert accepts_gzip(header) is expected
+
+
+class TestLoadStatic:
+    def test_cached_until_the_file_changes(self, tmp_path: Path) -> None:
+        path = tmp_path / "app.js"
+        path.write_text("x" * GZIP_MIN_BYTES)
+        first = load_static(path)
+        assert first is not None
+        assert load_static(path) is first
+        assert gzip.decompress(first.gzipped) == first.data
+
+        path.write_text("y" * GZIP_MIN_BYTES)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        second = load_static(path)
+        assert second is not first
+        assert second.etag != first.etag
+
+    def test_uses_matching_precompressed_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "app.css"
+        data = b"body { color: red; }\n" * 200
+        path.write_bytes(data)
+        shipped = gzip.compress(data, compresslevel=1, mtime=0)
+        path.with_name("app.css.gz").write_bytes(shipped)
+        assert load_static(path).gzipped == shipped
+
+    def test_ignores_stale_precompressed_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "app.css"
+        data = b"body { color: red; }\n" * 200
+        path.write_bytes(data)
+        path.with_name("app.css.gz").write_bytes(gzip.compress(b"old contents"))
+        assert gzip.decompress(load_static(path).gzipped) == data
+
+    def test_small_and_binary_files_are_not_compressed(self, tmp_path: Path) -> None:
+        (tmp_path / "tiny.js").write_text("1;")
+        (tmp_path / "big.png").write_bytes(b"\x89PNG" * GZIP_MIN_BYTES)
+        assert load_static(tmp_path / "tiny.js").gzipped is None
+        assert load_static(tmp_path / "big.png").gzipped is None
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        assert load_static(tmp_path / "nope.js") is None
+
+
+class TestServer:
+    def test_index_is_gzipped_and_revalidated(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        status, plain_headers, plain = _get(base_url, "/")
+        assert status == 200
+        assert plain_headers.get("Content-Encoding") is None
+
+        status, headers, body = _get(base_url, "/", **{"Accept-Encoding": "gzip"})
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(body) == plain
+        assert headers["ETag"] == plain_headers["ETag"]
+
+        status, _headers, body = _get(base_url, "/", **{"If-None-Match": headers["ETag"]})
+        assert status == 304
+        assert body == b""
+
+    def test_large_api_responses_are_gzipped(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        _status, _headers, plain = _get(base_url, "/api/tasks")
+        assert len(plain) >= GZIP_MIN_BYTES
+
+        _status, headers, body = _get(base_url, "/api/tasks", **{"Accept-Encoding": "gzip"})
+        assert headers["Content-Encoding"] == "gzip"
+        assert int(headers["Content-Length"]) == len(body)
+        assert json.loads(gzip.decompress(body)) == json.loads(plain)
+
+    def test_small_api_responses_are_sent_as_is(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        status, headers, body = _get(
+            base_url, "/api/tasks/not-an-id", **{"Accept-Encoding": "gzip"}
+        )
+        assert status == 400
+        assert headers.get("Content-Encoding") is None
+        assert json.loads(body)["ok"] is False
@@ -0,0 +1,152 @@
+"""Tests for the derived git commit → task reference index."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lattice.core.config import default_config, serialize_config
+from lattice.dashboard import commit_index as commit_index_mod
+from lattice.dashboard.commit_index import (
+    COMMIT_INDEX_FILENAME,
+    branch_commits,
+    index_keys,
+    refresh_commit_index,
+    task_commit_activity,
+    task_commits,
+)
+from lattice.storage.fs import atomic_write, cache_path, ensure_lattice_dirs
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def _commit(repo: Path, message: str) -> str:
+    _git(repo, "commit", "--allow-empty", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture()
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "--initial-branch=main")
+    ensure_lattice_dirs(tmp_path)
+    atomic_write(tmp_path / ".lattice" / "config.json", serialize_config(default_config()))
+    _commit(tmp_path, "Initial commit")
+    _commit(tmp_path, "Add parser (LAT-1)")
+    return tmp_path
+
+
+@pytest.fixture()
+def walks(monkeypatch) -> list[list[str]]:
+    """Record the revision arguments of every ``git log`` walk the index runs."""
+    seen: list[list[str]] = []
+    real = commit_index_mod.read_log
+
+    def recording(repo_root, revisions):
+        seen.append(revisions)
+        return real(repo_root, revisions)
+
+    monkeypatch.setattr(commit_index_mod, "read_log", recording)
+    return seen
+
+
+def test_index_keys() -> None:
+    commit = {"subject": "Fix lat-7 and LAT-8", "body": "See task_01HQAAAAAAAAAAAAAAAAAAAAAA"}
+    assert index_keys(commit) == ["LAT-7", "LAT-8", "task_01HQAAAAAAAAAAAAAAAAAAAAAA"]
+
+
+class TestRefresh:
+    def test_walks_only_new_commits(self, repo: Path, walks: list[list[str]]) -> None:
+        ld = repo / ".lattice"
+        first_tip = _git(repo, "rev-parse", "HEAD")
+        state = refresh_commit_index(ld, repo)
+        assert walks == [[first_tip]]
+        assert list(state["refs"]) == ["LAT-1"]
+
+        refresh_commit_index(ld, repo)
+        assert len(walks) == 1  # nothing moved, no walk
+
+        new_tip = _commit(repo, "Follow-up for LAT-1")
+        state = refresh_commit_index(ld, repo)
+        assert walks[-1] == [new_tip, "--not", first_tip]
+        assert len(state["refs"]["LAT-1"]) == 2
+
+    def test_new_branch_walks_only_its_own_commits(
+        self, repo: Path, walks: list[list[str]]
+    ) -> None:
+        ld = repo / ".lattice"
+        main_tip = _git(repo, "rev-parse", "HEAD")
+        refresh_commit_index(ld, repo)
+
+        _git(repo, "checkout", "-b", "feat/LAT-2")
+        tip = _commit(repo, "Start LAT-2")
+        state = refresh_commit_index(ld, repo)
+        assert walks[-1] == [tip, "--not", main_tip]
+        assert state["tips"] == {"main": main_tip, "feat/LAT-2": tip}
+        assert task_commit_activity(state)["LAT-2"]["count"] == 1
+
+    def test_persisted_index_is_reused(self, repo: Path, walks: list[list[str]]) -> None:
+        ld = repo / ".lattice"
+        refresh_commit_index(ld, repo)
+        commit_index_mod._cache.clear()
+
+        saved = json.loads((cache_path(ld, COMMIT_INDEX_FILENAME)).read_text())
+        assert saved["refs"]["LAT-1"]
+        refresh_commit_index(ld, repo)
+        assert len(walks) == 1
+
+    def test_rewritten_branch_falls_back_to_a_valid_walk(self, repo: Path) -> None:
+        ld = repo / ".lattice"
+        refresh_commit_index(ld, repo)
+        commit_index_mod._cache.clear()
+        # Point the stored tip at a commit that does not exist
+        path = cache_path(ld, COMMIT_INDEX_FILENAME)
+        saved = json.loads(path.read_text())
+        saved["tips"]["main"] = "0" * 40
+        path.write_text(json.dumps(saved))
+
+        _commit(repo, "More LAT-1 work")
+        state = refresh_commit_index(ld, repo)
+        assert len(state["refs"]["LAT-1"]) == 2
+
+
+class TestQueries:
+    def test_task_commits_newest_first(self, repo: Path) -> None:
+        ld = repo / ".lattice"
+        _commit(repo, "lat-1: tests")
+        commits = task_commits(ld, repo, ["LAT-1"])
+        assert [c["subject"] for c in commits] == ["lat-1: tests", "Add parser (LAT-1)"]
+        assert task_commits(ld, repo, ["LAT-99"]) == []
+
+    def test_branch_commits_cached_until_tip_moves(self, repo: Path, monkeypatch) -> None:
+        ld = repo / ".lattice"
+        calls: list[str] = []
+        real = commit_index_mod.get_recent_commits
+
+        def counting(repo_root, branch, **kwargs):
+            calls.append(branch)
+            return real(repo_root, branch, **kwargs)
+
+        monkeypatch.setattr(commit_index_mod, "get_recent_commits", counting)
+        assert len(branch_commits(ld, repo, "main")) == 2
+        assert len(branch_commits(ld, repo, "main")) == 2
+        assert len(calls) == 1
+
+        _commit(repo, "Third")
+        assert branch_commits(ld, repo, "main")[0]["subject"] == "Third"
+        assert len(calls) == 2
+
+        # Revisions that are not local branches are read directly
+        assert len(branch_commits(ld, repo, "HEAD~1")) == 2
+        assert calls[-1] == "HEAD~1"
@@ -0,0 +1,129 @@
+"""Load tests for the threaded dashboard server and its shared cache."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import Request, urlopen
+
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.dashboard.cache import DashboardCache, RWLock
+from lattice.storage.operations import write_task_event
+
+CLIENTS = 8
+REQUESTS_PER_CLIENT = 15
+
+
+def _get(base_url: str, path: str) -> tuple[int, dict]:
+    with urlopen(f"{base_url}{path}", timeout=10) as resp:
+        return resp.status, json.loads(resp.read())
+
+
+def _post(base_url: str, path: str, data: dict) -> tuple[int, dict]:
+    req = Request(
+        f"{base_url}{path}",
+        data=json.dumps(data).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urlopen(req, timeout=10) as resp:
+        return resp.status, json.loads(resp.read())
+
+
+class TestThreadedServer:
+    def test_stalled_client_does_not_block_others(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        host, port = base_url.removeprefix("http://").split(":")
+        # A client that sends half a request line and then goes quiet used to
+        # hold the single server thread hostage.
+        with socket.create_connection((host, int(port))) as stalled:
+            stalled.sendall(b"GET /api/tasks HTTP/1.1\r\n")
+            status, body = _get(base_url, "/api/tasks")
+        assert status == 200
+        assert body["ok"]
+
+    def test_concurrent_readers_and_writers(self, dashboard_server) -> None:
+        base_url, _ld, task_ids = dashboard_server
+        task_id = task_ids["backlog"]
+
+        def client(n: int) -> list[int]:
+            statuses: list[int] = []
+            for i in range(REQUESTS_PER_CLIENT):
+                if i % 3 == 0:
+                    status, _ = _post(
+                        base_url,
+                        f"/api/tasks/{task_id}/comment",
+                        {"body": f"client {n} comment {i}", "actor": f"human:c{n}"},
+                    )
+                else:
+                    path = ("/api/tasks", "/api/graph", f"/api/tasks/{task_id}/full")[i % 3]
+                    status, body = _get(base_url, path)
+                    assert body["ok"]
+                statuses.append(status)
+            return statuses
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(CLIENTS) as pool:
+            results = list(pool.map(client, range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+        assert all(s == 200 for statuses in results for s in statuses)
+        # Writes to the same task are serialized: no comment is lost
+        posted = CLIENTS * len(range(0, REQUESTS_PER_CLIENT, 3))
+        _, body = _get(base_url, f"/api/tasks/{task_id}")
+        assert body["data"]["comment_count"] == posted
+        assert elapsed < 30
+
+    def test_sees_writes_made_outside_the_dashboard(self, dashboard_server) -> None:
+        base_url, ld, task_ids = dashboard_server
+        task_id = task_ids["backlog"]
+        _get(base_url, "/api/tasks")  # warm the cache
+
+        snapshot = json.loads((ld / "tasks" / f"{task_id}.json").read_text())
+        event = create_event(
+            type="field_updated",
+            task_id=task_id,
+            actor="human:cli",
+            data={"field": "title", "from": snapshot["title"], "to": "Renamed by CLI"},
+        )
+        write_task_event(ld, task_id, [event], apply_event_to_snapshot(snapshot, event))
+
+        _, body = _get(base_url, "/api/tasks")
+        titles = {t["id"]: t["title"] for t in body["data"]}
+        assert titles[task_id] == "Renamed by CLI"
+
+
+class TestDashboardCache:
+    def test_reuses_snapshots_until_revision_changes(
+        self, populated_lattice_dir: tuple[Path, dict[str, str]]
+    ) -> None:
+        ld, _ids = populated_lattice_dir
+        cache = DashboardCache(ld)
+        cache.snapshots()  # the first load also writes the catalog
+        first = cache.snapshots()
+        assert cache.snapshots() is first
+
+        with cache.writing():
+            pass
+        assert cache.snapshots() is not first
+
+    def test_writer_excludes_readers(self) -> None:
+        lock = RWLock()
+        order: list[str] = []
+
+        def read() -> None:
+            with lock.read():
+                order.append("r")
+
+        with lock.write():
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            order.append("w")
+        reader.join(5)
+        assert order == ["w", "r"]
@@ -0,0 +1,136 @@
+"""Tests for ETag / If-None-Match handling across dashboard GET endpoints."""
+
+from __future__ import annotations
+
+import json
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.dashboard.cache import shared_cache
+from lattice.dashboard.server import _etag_matches
+from lattice.storage.operations import write_task_event
+
+
+def _get(base_url: str, path: str, etag: str | None = None) -> tuple[int, str | None]:
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        with urlopen(Request(f"{base_url}{path}", headers=headers), timeout=10) as resp:
+            resp.read()
+            return resp.status, resp.headers.get("ETag")
+    except HTTPError as exc:
+        return exc.code, exc.headers.get("ETag")
+
+
+def _endpoints(task_ids: dict[str, str]) -> list[str]:
+    task_id = task_ids["backlog"]
+    return [
+        "/api/config",
+        "/api/tasks",
+        "/api/archived",
+        "/api/stats",
+        "/api/graph",
+        "/api/activity?limit=5",
+        f"/api/tasks/{task_id}",
+        f"/api/tasks/{task_id}/events",
+        f"/api/tasks/{task_id}/comments",
+        f"/api/tasks/{task_id}/full",
+    ]
+
+
+class TestConditionalGet:
+    def test_every_endpoint_revalidates(self, dashboard_server) -> None:
+        base_url, _ld, task_ids = dashboard_server
+        # The first full load writes the catalog (and the activity feed the
+        # event index), which moves every ETag once
+        for path in _endpoints(task_ids):
+            _get(base_url, path)
+        for path in _endpoints(task_ids):
+            status, etag = _get(base_url, path)
+            assert status == 200, path
+            assert etag and etag.startswith('"'), path
+            assert _get(base_url, path, etag) == (304, etag), path
+
+    def test_not_modified_skips_snapshot_loading(self, dashboard_server, monkeypatch) -> None:
+        base_url, ld, _ids = dashboard_server
+        _status, etag = _get(base_url, "/api/tasks")
+
+        def fail(*_args, **_kwargs):
+            raise AssertionError("snapshots loaded for a 304")
+
+        monkeypatch.setattr(shared_cache(ld), "snapshots", fail)
+        assert _get(base_url, "/api/tasks", etag)[0] == 304
+
+    def test_dashboard_write_changes_etag(self, dashboard_server) -> None:
+        base_url, _ld, task_ids = dashboard_server
+        task_id = task_ids["backlog"]
+        _status, etag = _get(base_url, "/api/tasks")
+        req = Request(
+            f"{base_url}/api/tasks/{task_id}/comment",
+            data=json.dumps({"body": "hi", "actor": "human:test"}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urlopen(req, timeout=10):
+            pass
+        status, new_etag = _get(base_url, "/api/tasks", etag)
+        assert status == 200
+        assert new_etag != etag
+
+    def test_external_write_changes_etag(self, dashboard_server) -> None:
+        base_url, ld, task_ids = dashboard_server
+        task_id = task_ids["backlog"]
+        _status, etag = _get(base_url, f"/api/tasks/{task_id}/full")
+
+        snapshot = json.loads((ld / "tasks" / f"{task_id}.json").read_text())
+        event = create_event(
+            type="field_updated",
+            task_id=task_id,
+            actor="human:cli",
+            data={"field": "title", "from": snapshot["title"], "to": "Renamed"},
+        )
+        write_task_event(ld, task_id, [event], apply_event_to_snapshot(snapshot, event))
+
+        assert _get(base_url, f"/api/tasks/{task_id}/full", etag)[0] == 200
+
+    def test_plan_edited_in_place_changes_etag(self, dashboard_server) -> None:
+        base_url, ld, task_ids = dashboard_server
+        task_id = task_ids["backlog"]
+        plan = ld / "plans" / f"{task_id}.md"
+        plan.write_text("# Plan\n")
+        _status, etag = _get(base_url, f"/api/tasks/{task_id}/full")
+        plans_dir_mtime = plan.parent.stat().st_mtime_ns
+
+        # Rewriting an existing file leaves the directory's mtime alone
+        with open(plan, "r+") as fh:
+            fh.write("# Plan\n\n1. Ship it\n")
+        assert plan.parent.stat().st_mtime_ns == plans_dir_mtime
+        assert _get(base_url, f"/api/tasks/{task_id}/full", etag)[0] == 200
+
+    def test_query_string_is_part_of_the_etag(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        _status, first = _get(base_url, "/api/activity?limit=1")
+        _status, second = _get(base_url, "/api/activity?limit=2")
+        assert first != second
+
+    def test_errors_carry_no_etag(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        assert _get(base_url, "/api/tasks/not-an-id") == (400, None)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+    ],
+)
+def test_etag_matches(header: str | None, expected: bool) -> None:
+    assert _etag_matches(header, '"abc"') is expected
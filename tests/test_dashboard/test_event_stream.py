@@ -0,0 +1,108 @@
+"""Tests for the /api/events/stream Server-Sent Events change feed."""
+
+from __future__ import annotations
+
+import json
+import os
+from urllib.request import Request, urlopen
+
+import pytest
+
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.operations import write_task_event
+
+
+def _next_message(resp) -> tuple[str, dict]:
+    """Read one SSE message, skipping keepalives and the retry hint."""
+    fields: dict[str, str] = {}
+    while True:
+        line = resp.readline().decode("utf-8")
+        if not line:
+            raise AssertionError("stream closed")
+        line = line.rstrip("\n")
+        if not line:
+            if "event" in fields:
+                return fields["event"], json.loads(fields["data"])
+            fields = {}
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(": ")
+        fields[name] = value
+
+
+@pytest.fixture()
+def stream(dashboard_server):
+    base_url, ld, task_ids = dashboard_server
+    resp = urlopen(f"{base_url}/api/events/stream", timeout=10)
+    yield resp, base_url, ld, task_ids
+    resp.close()
+
+
+class TestEventStream:
+    def test_headers(self, stream) -> None:
+        resp, *_ = stream
+        assert resp.status == 200
+        assert resp.headers["Content-Type"] == "text/event-stream"
+
+    def test_pushes_dashboard_writes(self, stream) -> None:
+        resp, base_url, _ld, task_ids = stream
+        task_id = task_ids["backlog"]
+        req = Request(
+            f"{base_url}/api/tasks/{task_id}/comment",
+            data=json.dumps({"body": "hello", "actor": "human:test"}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urlopen(req, timeout=10) as post:
+            assert post.status == 200
+
+        kind, data = _next_message(resp)
+        assert kind == "task"
+        assert data["id"] == task_id
+        assert data["archived"] is False
+        assert data["event"]["type"] == "comment_added"
+        assert data["task"]["comment_count"] == 1
+
+    def test_pushes_writes_made_outside_the_dashboard(self, stream) -> None:
+        resp, _base_url, ld, task_ids = stream
+        task_id = task_ids["in_progress"]
+        snapshot = json.loads((ld / "tasks" / f"{task_id}.json").read_text())
+        event = create_event(
+            type="field_updated",
+            task_id=task_id,
+            actor="human:cli",
+            data={"field": "title", "from": snapshot["title"], "to": "Renamed by CLI"},
+        )
+        write_task_event(ld, task_id, [event], apply_event_to_snapshot(snapshot, event))
+
+        kind, data = _next_message(resp)
+        assert kind == "task"
+        assert data["event"]["id"] == event["id"]
+        assert data["task"]["title"] == "Renamed by CLI"
+
+    def test_config_change(self, stream) -> None:
+        resp, _base_url, ld, _ids = stream
+        config = json.loads((ld / "config.json").read_text())
+        config["dashboard"] = {"theme": "dark"}
+        (ld / "config.json").write_text(json.dumps(config, indent=2) + "\n")
+
+        assert _next_message(resp)[0] == "config"
+
+    def test_pulled_log_triggers_resync(self, stream) -> None:
+        resp, _base_url, ld, task_ids = stream
+        task_id = task_ids["backlog"]
+        log = ld / "events" / f"{task_id}.jsonl"
+        event = create_event(
+            type="comment_added",
+            task_id=task_id,
+            actor="human:remote",
+            data={"body": "from a teammate"},
+        )
+        # git pull replaces the file rather than appending to it
+        tmp = log.with_suffix(".pulled")
+        tmp.write_bytes(log.read_bytes() + (json.dumps(event) + "\n").encode("utf-8"))
+        os.replace(tmp, log)
+
+        assert _next_message(resp)[0] == "resync"
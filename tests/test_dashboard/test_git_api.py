@@ -21,10 +21,8 @@ from urllib.request import Request, urlopen
 import pytest
 
 from lattice.core.config import default_config, serialize_config
+from lattice.dashboard import git_reader
 from lattice.dashboard.git_reader import (
-    CACHE_TTL_SECONDS,
-    _prune_expired_cache,
-    _summary_cache,
     _validate_branch_name,
     extract_task_refs,
     find_git_root,
@@ -666,41 +664,92 @@ class TestBranchNameInjection:
             server.server_close()
 
 
-class TestCacheEviction:
-    """Expired entries must be pruned from the cache to prevent unbounded growth."""
+class TestBackgroundRefresh:
+    """The summary is served from cache and rebuilt by a background thread
+    when HEAD, a branch ref or the config changes."""
 
-    def test_prune_removes_expired_entries(self):
-        """Manually insert an expired cache entry and verify it gets pruned."""
-        invalidate_cache()
-
-        # Insert a cache entry with a timestamp well in the past
-        old_time = time.monotonic() - CACHE_TTL_SECONDS - 100
-        _summary_cache["/fake/repo1"] = (old_time, "etag1", {"available": True})
-        _summary_cache["/fake/repo2"] = (old_time, "etag2", {"available": True})
+    def _wait_for(self, lattice_dir: Path, predicate) -> dict:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            summary, _ = get_git_summary(lattice_dir)
+            if predicate(summary):
+                return summary
+            time.sleep(0.02)
+        raise AssertionError("git summary was not refreshed")
 
-        # Insert a fresh entry
-        fresh_time = time.monotonic()
-        _summary_cache["/fake/repo3"] = (fresh_time, "etag3", {"available": True})
+    def test_cached_request_runs_no_git(self, lattice_in_git_repo: Path):
+        get_git_summary(lattice_in_git_repo)
+        with patch("lattice.dashboard.git_reader._run_git") as run_git:
+            summary, etag = get_git_summary(lattice_in_git_repo)
+        run_git.assert_not_called()
+        assert summary["available"] is True
+        assert etag != ""
 
-        assert len(_summary_cache) == 3
+    def test_refresher_picks_up_new_commit(
+        self, lattice_in_git_repo: Path, git_repo: Path, monkeypatch
+    ):
+        monkeypatch.setattr(git_reader, "REFRESH_POLL_SECONDS", 0.02)
+        summary, etag = get_git_summary(lattice_in_git_repo)
+        assert summary["commit_count"] == 2
 
-        _prune_expired_cache()
+        subprocess.run(
+            ["git", "commit", "--allow-empty", "-m", "Third (LAT-42)"],
+            cwd=str(git_repo),
+            check=True,
+            capture_output=True,
+        )
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=str(git_repo),
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
 
-        # Expired entries removed, fresh entry kept
-        assert "/fake/repo1" not in _summary_cache
-        assert "/fake/repo2" not in _summary_cache
-        assert "/fake/repo3" in _summary_cache
-        assert len(_summary_cache) == 1
+        summary = self._wait_for(lattice_in_git_repo, lambda s: s["head_commit"] == head)
+        assert summary["commit_count"] == 3
+        assert get_git_summary(lattice_in_git_repo)[1] != etag
 
-    def test_get_git_summary_prunes_on_access(self, lattice_in_git_repo: Path):
-        """get_git_summary should prune stale entries from other repos."""
-        invalidate_cache()
+    def test_incremental_count_matches_full_count(self, git_repo: Path):
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=str(git_repo),
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        subprocess.run(
+            ["git", "checkout", "-q", "feat/LAT-42-login"],
+            cwd=str(git_repo),
+            check=True,
+            capture_output=True,
+        )
+        feature = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=str(git_repo),
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        assert git_reader._count_commits(git_repo, feature, (head, 2)) == get_commit_count(
+            git_repo
+        )
+        assert git_reader._count_commits(git_repo, head, (head, 2)) == 2
 
-        # Plant a stale entry for a different repo
-        old_time = time.monotonic() - CACHE_TTL_SECONDS - 100
-        _summary_cache["/stale/repo"] = (old_time, "old_etag", {"available": True})
+    def test_signature_tracks_head_and_refs(self, git_repo: Path):
+        git_dir = git_repo / ".git"
+        before = git_reader.refs_signature(git_dir, git_dir)
+        assert git_reader.refs_signature(git_dir, git_dir) == before
+        subprocess.run(
+            ["git", "branch", "feat/LAT-7"], cwd=str(git_repo), check=True, capture_output=True
+        )
+        assert git_reader.refs_signature(git_dir, git_dir) != before
 
-        # Call get_git_summary, which should prune the stale entry
+    def test_invalidate_stops_refresher(self, lattice_in_git_repo: Path, monkeypatch):
+        monkeypatch.setattr(git_reader, "REFRESH_POLL_SECONDS", 0.02)
         get_git_summary(lattice_in_git_repo)
-
-        assert "/stale/repo" not in _summary_cache
+        thread = git_reader._entries[lattice_in_git_repo].thread
+        assert thread is not None
+        invalidate_cache()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
@@ -279,6 +279,31 @@ class TestActivityEndpoint:
         if total > 2:
             assert data["events"][0]["id"] != all_events[0]["id"]
 
+    def test_activity_cursor_pagination(self, dashboard_server):
+        """next_cursor pages through the same events as offset paging."""
+        base_url, _ld, _ids = dashboard_server
+        _status, body = _get(base_url, "/api/activity?limit=200")
+        all_ids = [e["id"] for e in body["data"]["events"]]
+        assert body["data"]["next_cursor"] is None
+
+        seen: list[str] = []
+        url = "/api/activity?limit=2"
+        while True:
+            status, body = _get(base_url, url)
+            assert status == 200
+            data = body["data"]
+            seen.extend(e["id"] for e in data["events"])
+            if not data["has_more"]:
+                break
+            url = f"/api/activity?limit=2&cursor={data['next_cursor']}"
+        assert seen == all_ids
+
+    def test_activity_invalid_cursor(self, dashboard_server):
+        base_url, _ld, _ids = dashboard_server
+        status, body = _get(base_url, "/api/activity?cursor=%21%21bad")
+        assert status == 400
+        assert body["error"]["code"] == "VALIDATION_ERROR"
+
     def test_activity_type_filter(self, dashboard_server):
         """Filtering by event type should return only matching events."""
         base_url, _ld, _ids = dashboard_server
@@ -11,6 +11,8 @@ from lattice.mcp.tools import (
     lattice_archive,
     lattice_assign,
     lattice_attach,
+    lattice_batch,
+    lattice_claim_next,
     lattice_comment,
     lattice_config,
     lattice_create,
@@ -18,6 +20,7 @@ from lattice.mcp.tools import (
     lattice_event,
     lattice_link,
     lattice_list,
+    lattice_next,
     lattice_show,
     lattice_status,
     lattice_unarchive,
@@ -350,6 +353,71 @@ class TestList:
         assert result[0]["title"] == "High"
 
 
+class TestNext:
+    """Tests for lattice_next tool."""
+
+    def test_next_none_when_empty(self, lattice_env: Path):
+        assert lattice_next() is None
+
+    def test_next_skips_blocked(self, lattice_env: Path):
+        blocker = lattice_create(title="Blocker", actor="human:test", priority="low")
+        blocked = lattice_create(title="Blocked", actor="human:test", priority="critical")
+        lattice_link(
+            source_id=blocker["id"],
+            relationship_type="blocks",
+            target_id=blocked["id"],
+            actor="human:test",
+        )
+        assert lattice_next()["title"] == "Blocker"
+
+
+class TestClaimNext:
+    """Tests for lattice_claim_next tool."""
+
+    def test_claim_for_workers(self, lattice_env: Path):
+        lattice_create(title="First", actor="human:test", priority="high")
+        lattice_create(title="Second", actor="human:test")
+
+        result = lattice_claim_next(actor="agent:orch", workers=["agent:w1", "agent:w2"])
+        assert [(s["title"], s["assigned_to"]) for s in result["claimed"]] == [
+            ("First", "agent:w1"),
+            ("Second", "agent:w2"),
+        ]
+        assert all(s["status"] == "in_progress" for s in result["claimed"])
+        assert lattice_next() is None
+
+    def test_invalid_worker_rejected(self, lattice_env: Path):
+        with pytest.raises(ValueError, match="Invalid actor"):
+            lattice_claim_next(actor="agent:orch", workers=["bad"])
+
+
+class TestBatch:
+    """Tests for lattice_batch tool."""
+
+    def test_batch_with_refs(self, lattice_env: Path):
+        result = lattice_batch(
+            operations=[
+                {"op": "create", "title": "Parent", "type": "chore", "ref": "p"},
+                {"op": "create", "title": "Child", "ref": "c"},
+                {"op": "link", "source": "@c", "type": "subtask_of", "target": "@p"},
+            ],
+            actor="agent:claude",
+        )
+        assert result["committed"] is True
+        assert [r["short_id"] for r in result["results"][:2]] == ["TST-1", "TST-2"]
+        child = lattice_show(task_id="TST-2", include_events=False)
+        assert child["relationships_out"][0]["type"] == "subtask_of"
+
+    def test_batch_failure_is_reported(self, lattice_env: Path):
+        result = lattice_batch(
+            operations=[{"op": "create", "title": "A"}, {"op": "assign", "task": "TST-9"}],
+            actor="agent:claude",
+        )
+        assert result["committed"] is False
+        assert result["results"][1]["error"]["code"] == "NOT_FOUND"
+        assert lattice_list() == []
+
+
 class TestShow:
     """Tests for lattice_show tool."""
 
@@ -0,0 +1,195 @@
+"""Tests for lattice.storage.archive_packs — packed archive segments."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.archive_packs import (
+    find_packed,
+    pack_archive,
+    packed_event_logs,
+    packed_snapshots,
+    packs_dir,
+    segments,
+    unpack_task,
+    verify_packs,
+)
+from lattice.storage.catalog import load_snapshots
+from lattice.storage.event_index import ROW_ID, EventIndex, rebuild_event_index
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+from lattice.storage.layout import task_event_path, task_snapshot_path
+from lattice.storage.operations import archive_task_files, write_task_event
+from lattice.storage.readers import (
+    read_archived_doc,
+    read_archived_snapshot,
+    read_task_events,
+    read_task_events_tail,
+)
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _make_archived(ld: Path, n: int, *, notes: str | None = None) -> dict:
+    task_id = f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}"
+    created = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": f"Task {n}", "status": "done", "type": "task"},
+    )
+    snapshot = apply_event_to_snapshot(None, created)
+    write_task_event(ld, task_id, [created], snapshot)
+    if notes is not None:
+        (ld / "notes" / f"{task_id}.md").write_text(notes)
+    archived = create_event(type="task_archived", task_id=task_id, actor="human:test", data={})
+    snapshot = apply_event_to_snapshot(snapshot, archived)
+    archive_task_files(ld, task_id, archived, snapshot)
+    return snapshot
+
+
+class TestPackArchive:
+    def test_nothing_to_pack(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert pack_archive(ld)["segment"] is None
+        assert segments(ld) == []
+
+    def test_pack_removes_loose_files(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snaps = [_make_archived(ld, i, notes="# notes\n" if i == 0 else None) for i in range(3)]
+
+        result = pack_archive(ld)
+        assert result["segment"] == "seg-000001"
+        assert result["tasks"] == 3
+        assert result["files_removed"] == 7  # 3 snapshots, 3 logs, 1 notes file
+
+        for snap in snaps:
+            assert not task_snapshot_path(ld, snap["id"], archived=True).exists()
+            assert not task_event_path(ld, snap["id"], archived=True).exists()
+        assert not (ld / "archive" / "notes" / f"{snaps[0]['id']}.md").exists()
+        assert sorted(p.name for p in packs_dir(ld).iterdir()) == [
+            "seg-000001.dat",
+            "seg-000001.idx.json",
+        ]
+        assert verify_packs(ld) == []
+
+    def test_readers_are_transparent(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_archived(ld, 0, notes="# notes\n")
+        task_id = snap["id"]
+        events_before = read_task_events(ld, task_id, is_archived=True)
+
+        pack_archive(ld)
+
+        assert read_archived_snapshot(ld, task_id) == snap
+        assert read_archived_doc(ld, task_id, "notes") == "# notes\n"
+        assert read_archived_doc(ld, task_id, "plan") is None
+        assert read_task_events(ld, task_id, is_archived=True) == events_before
+        assert read_task_events_tail(ld, task_id, 1, is_archived=True) == events_before[-1:]
+
+    def test_bulk_scans(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snaps = [_make_archived(ld, i) for i in range(3)]
+        pack_archive(ld)
+
+        assert sorted(s["id"] for s in packed_snapshots(ld)) == [s["id"] for s in snaps]
+        assert [s["id"] for s in packed_snapshots(ld, skip={snaps[0]["id"]})] == [
+            s["id"] for s in snaps[1:]
+        ]
+        logs = dict(packed_event_logs(ld))
+        assert set(logs) == {s["id"] for s in snaps}
+        assert all(len(data.splitlines()) == 2 for data in logs.values())
+
+        _active, archived = load_snapshots(ld)
+        assert [s["id"] for s in archived] == [s["id"] for s in snaps]
+
+    def test_second_pack_makes_new_segment(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        first = _make_archived(ld, 0)
+        pack_archive(ld)
+        second = _make_archived(ld, 1)
+
+        assert pack_archive(ld)["segment"] == "seg-000002"
+        assert find_packed(ld, first["id"]).name == "seg-000001"
+        assert find_packed(ld, second["id"]).name == "seg-000002"
+
+    def test_loose_copy_wins_over_packed(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_archived(ld, 0)
+        task_id = snap["id"]
+        pack_archive(ld)
+        path = task_snapshot_path(ld, task_id, archived=True)
+        path.write_text(json.dumps(dict(snap, title="Changed")))
+
+        assert read_archived_snapshot(ld, task_id)["title"] == "Changed"
+        assert packed_snapshots(ld, skip={task_id}) == []
+
+
+class TestUnpackTask:
+    def test_restores_loose_files_and_drops_entry(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snaps = [_make_archived(ld, i, notes="# n\n") for i in range(2)]
+        log_before = task_event_path(ld, snaps[0]["id"], archived=True).read_bytes()
+        pack_archive(ld)
+
+        assert unpack_task(ld, snaps[0]["id"]) is True
+        assert unpack_task(ld, snaps[0]["id"]) is False
+
+        assert task_event_path(ld, snaps[0]["id"], archived=True).read_bytes() == log_before
+        assert (
+            json.loads(task_snapshot_path(ld, snaps[0]["id"], archived=True).read_text())
+            == (snaps[0])
+        )
+        assert (ld / "archive" / "notes" / f"{snaps[0]['id']}.md").read_text() == "# n\n"
+        assert find_packed(ld, snaps[0]["id"]) is None
+        assert find_packed(ld, snaps[1]["id"]) is not None
+
+    def test_last_task_removes_segment(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_archived(ld, 0)
+        pack_archive(ld)
+
+        unpack_task(ld, snap["id"])
+        assert list(packs_dir(ld).iterdir()) == []
+
+
+class TestPackedEventIndex:
+    def test_index_reads_events_from_pack(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_archived(ld, 0)
+        rebuild_event_index(ld)
+        pack_archive(ld)
+
+        index = EventIndex(ld)
+        index.refresh()
+        events = [index.read_event(row) for row in index.rows]
+        assert [e["type"] for e in events if e is not None] == ["task_created", "task_archived"]
+
+        # A rebuild after packing indexes the same events
+        rebuild_event_index(ld)
+        index = EventIndex(ld)
+        index.refresh()
+        assert {row[ROW_ID] for row in index.rows} == {
+            e["id"] for e in read_task_events(ld, snap["id"], is_archived=True)
+        }
+
+
+class TestVerifyPacks:
+    def test_truncated_data_file(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_archived(ld, 0)
+        pack_archive(ld)
+        data = packs_dir(ld) / "seg-000001.dat"
+        data.write_bytes(data.read_bytes()[:10])
+
+        problems = verify_packs(ld)
+        assert problems
+        assert all("outside the data file" in p for p in problems)
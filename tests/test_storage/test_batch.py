@@ -0,0 +1,251 @@
+"""Tests for lattice.storage.batch — all-or-nothing multi-operation writes."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage import batch as batch_mod
+from lattice.storage.batch import BatchError, parse_operations, run_batch
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+from lattice.storage.locks import lattice_lock, multi_lock
+from lattice.storage.operations import archive_task_files
+
+ACTOR = "human:test"
+
+
+def _setup_lattice(tmp_path: Path, **overrides) -> tuple[Path, dict]:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    config = {**default_config(), **overrides}
+    atomic_write(ld / "config.json", serialize_config(config))
+    return ld, config
+
+
+def _events(ld: Path, task_id: str) -> list[dict]:
+    path = ld / "events" / f"{task_id}.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestRunBatch:
+    def test_refs_link_new_tasks(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path, project_code="TST")
+        committed, results = run_batch(
+            ld,
+            [
+                {"op": "create", "title": "Schema", "ref": "schema"},
+                {"op": "create", "title": "API", "ref": "api"},
+                {"op": "link", "source": "@schema", "type": "blocks", "target": "@api"},
+                {"op": "comment", "task": "@api", "text": "Waiting on schema"},
+                {"op": "status", "task": "@schema", "status": "planned"},
+            ],
+            ACTOR,
+            config,
+        )
+        assert committed
+        assert all(r["ok"] for r in results)
+        schema_id, api_id = results[0]["task_id"], results[1]["task_id"]
+        assert [r["short_id"] for r in results[:2]] == ["TST-1", "TST-2"]
+
+        schema = json.loads((ld / "tasks" / f"{schema_id}.json").read_text())
+        assert schema["status"] == "planned"
+        assert schema["relationships_out"][0]["target_task_id"] == api_id
+        assert [e["type"] for e in _events(ld, api_id)] == ["task_created", "comment_added"]
+        assert (ld / "plans" / f"{schema_id}.md").exists()
+
+    def test_one_write_per_task(self, tmp_path: Path, monkeypatch) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        calls: list[tuple[str, int]] = []
+        real_write = batch_mod.write_task_event
+
+        def counting_write(lattice_dir, task_id, events, snapshot, *args, **kwargs):
+            calls.append((task_id, len(events)))
+            return real_write(lattice_dir, task_id, events, snapshot, *args, **kwargs)
+
+        monkeypatch.setattr(batch_mod, "write_task_event", counting_write)
+        committed, results = run_batch(
+            ld,
+            [
+                {"op": "create", "title": "Task", "ref": "t"},
+                {"op": "update", "task": "@t", "fields": {"priority": "high"}},
+                {"op": "assign", "task": "@t", "to": "agent:a"},
+            ],
+            ACTOR,
+            config,
+        )
+        assert committed
+        assert calls == [(results[0]["task_id"], 3)]
+
+    def test_failure_writes_nothing(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        committed, results = run_batch(
+            ld,
+            [
+                {"op": "create", "title": "Task", "ref": "t"},
+                {"op": "status", "task": "@t", "status": "not-a-status"},
+            ],
+            ACTOR,
+            config,
+        )
+        assert not committed
+        assert results[0]["error"]["code"] == "ABORTED"
+        assert results[1]["error"]["code"] == "VALIDATION_ERROR"
+        assert list((ld / "tasks").iterdir()) == []
+        assert list((ld / "events").glob("task_*.jsonl")) == []
+
+    def test_transition_rules_apply(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        committed, results = run_batch(
+            ld,
+            [
+                {"op": "create", "title": "Task", "ref": "t"},
+                {"op": "status", "task": "@t", "status": "done"},
+            ],
+            ACTOR,
+            config,
+        )
+        assert not committed
+        assert results[1]["error"]["code"] == "INVALID_TRANSITION"
+
+    def test_backward_move_resets_plan(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        _committed, results = run_batch(
+            ld, [{"op": "create", "title": "Task", "status": "review"}], ACTOR, config
+        )
+        task_id = results[0]["task_id"]
+        plan_path = ld / "plans" / f"{task_id}.md"
+        plan_path.write_text("# Task\n\nShip it.\n")
+
+        committed, _results = run_batch(
+            ld, [{"op": "status", "task": task_id, "status": "in_progress"}], ACTOR, config
+        )
+        assert committed
+        assert (
+            f"## Reset {_events(ld, task_id)[-1]['ts'][:10]} by {ACTOR}" in plan_path.read_text()
+        )
+
+    def test_status_rules_match_the_status_command(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        _committed, results = run_batch(ld, [{"op": "create", "title": "Task"}], ACTOR, config)
+        task_id = results[0]["task_id"]
+
+        # force only needs a reason when it overrides something
+        committed, _results = run_batch(
+            ld,
+            [{"op": "status", "task": task_id, "status": "planned", "force": True}],
+            ACTOR,
+            config,
+        )
+        assert committed
+
+        committed, results = run_batch(
+            ld, [{"op": "status", "task": task_id, "status": "in_progress"}], ACTOR, config
+        )
+        assert not committed
+        assert results[0]["error"]["code"] == "PLAN_REQUIRED"
+
+    def test_unknown_comment_role(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        config["workflow"]["roles"] = ["review"]
+        committed, results = run_batch(
+            ld,
+            [
+                {"op": "create", "title": "Task", "ref": "t"},
+                {"op": "comment", "task": "@t", "text": "hi", "role": "reveiw"},
+            ],
+            ACTOR,
+            config,
+        )
+        assert not committed
+        assert results[1]["error"]["code"] == "INVALID_ROLE"
+
+    def test_unknown_reference(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        committed, results = run_batch(
+            ld, [{"op": "comment", "task": "@missing", "text": "hi"}], ACTOR, config
+        )
+        assert not committed
+        assert results[0]["error"]["code"] == "NOT_FOUND"
+
+    def test_create_with_id_is_idempotent(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        op = {"op": "create", "title": "Task", "id": "task_01AAAAAAAAAAAAAAAAAAAAAAAA"}
+        assert run_batch(ld, [op], ACTOR, config)[0]
+
+        committed, results = run_batch(ld, [op], ACTOR, config)
+        assert committed
+        assert "idempotent" in results[0]["message"]
+        assert len(_events(ld, op["id"])) == 1
+
+        committed, results = run_batch(ld, [{**op, "title": "Other"}], ACTOR, config)
+        assert not committed
+        assert results[0]["error"]["code"] == "CONFLICT"
+
+    def test_hooks_fire_after_commit(self, tmp_path: Path, monkeypatch) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        fired: list[str] = []
+        monkeypatch.setattr(
+            batch_mod, "execute_hooks", lambda _c, _ld, _tid, event: fired.append(event["type"])
+        )
+        run_batch(
+            ld,
+            [
+                {"op": "create", "title": "Task", "ref": "t"},
+                {"op": "comment", "task": "@t", "text": "hi"},
+            ],
+            ACTOR,
+            config,
+        )
+        assert fired == ["task_created", "comment_added"]
+
+    def test_create_batch_orders_lifecycle_lock_with_archive(self, tmp_path: Path) -> None:
+        ld, config = _setup_lattice(tmp_path)
+        _committed, results = run_batch(ld, [{"op": "create", "title": "Old"}], ACTOR, config)
+        old_id = results[0]["task_id"]
+        locks_dir = ld / "locks"
+
+        outcome: list[tuple[bool, list[dict]]] = []
+        batch = threading.Thread(
+            target=lambda: outcome.append(
+                run_batch(
+                    ld,
+                    [
+                        {"op": "create", "title": "New"},
+                        {"op": "comment", "task": old_id, "text": "hi"},
+                    ],
+                    ACTOR,
+                    config,
+                )
+            )
+        )
+        # Archive takes events__lifecycle first, then the task locks
+        with lattice_lock(locks_dir, "events__lifecycle"):
+            batch.start()
+            time.sleep(0.2)  # the batch is now waiting, holding none of the task locks
+            with multi_lock(locks_dir, [f"events_{old_id}", f"tasks_{old_id}"], timeout=2):
+                snapshot = json.loads((ld / "tasks" / f"{old_id}.json").read_text())
+                event = create_event(type="task_archived", task_id=old_id, actor=ACTOR, data={})
+                archive_task_files(ld, old_id, event, apply_event_to_snapshot(snapshot, event))
+        batch.join(timeout=10)
+
+        committed, results = outcome[0]
+        assert not committed
+        assert results[1]["error"]["code"] == "NOT_FOUND"
+        assert [p.stem for p in (ld / "events").glob("task_*.jsonl")] == []
+
+
+class TestParseOperations:
+    def test_skips_blank_lines(self) -> None:
+        ops = parse_operations(['{"op": "create", "title": "A"}\n', "\n", '{"op": "link"}\n'])
+        assert [op["op"] for op in ops] == ["create", "link"]
+
+    def test_reports_bad_line(self) -> None:
+        with pytest.raises(BatchError, match="Line 2"):
+            parse_operations(['{"op": "create"}', "[1, 2]"])
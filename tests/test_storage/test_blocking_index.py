@@ -0,0 +1,236 @@
+"""Tests for lattice.storage.blocking_index — the blocking-graph index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage import blocking_index as blocking_index_mod
+from lattice.storage.blocking_index import (
+    BLOCKING_INDEX_FILENAME,
+    blocked_task_ids,
+    blocking_report,
+    rebuild_blocking_index,
+    unresolved_blockers,
+    verify_blocking_index,
+)
+from lattice.storage.fs import atomic_write, cache_path, ensure_lattice_dirs
+from lattice.storage.operations import archive_task_files, write_task_event
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _make_task(ld: Path, n: int) -> dict:
+    task_id = f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}"
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": f"Task {n}", "status": "backlog", "type": "task"},
+    )
+    snapshot = apply_event_to_snapshot(None, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+def _relate(ld: Path, source: dict, target: dict, rel_type: str, *, remove: bool = False) -> dict:
+    event = create_event(
+        type="relationship_removed" if remove else "relationship_added",
+        task_id=source["id"],
+        actor="human:test",
+        data={"type": rel_type, "target_task_id": target["id"]},
+    )
+    snapshot = apply_event_to_snapshot(source, event)
+    write_task_event(ld, source["id"], [event], snapshot)
+    return snapshot
+
+
+def _set_status(ld: Path, snapshot: dict, status: str) -> dict:
+    event = create_event(
+        type="status_changed",
+        task_id=snapshot["id"],
+        actor="human:test",
+        data={"from": snapshot["status"], "to": status},
+    )
+    updated = apply_event_to_snapshot(snapshot, event)
+    write_task_event(ld, snapshot["id"], [event], updated)
+    return updated
+
+
+def _all_snapshots(ld: Path) -> tuple[dict[str, dict], dict[str, dict]]:
+    active = {p.stem: json.loads(p.read_text()) for p in (ld / "tasks").glob("*.json")}
+    archived = {
+        p.stem: json.loads(p.read_text()) for p in (ld / "archive" / "tasks").glob("*.json")
+    }
+    return active, archived
+
+
+class TestBlockedSet:
+    def test_first_lookup_builds_index(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        _relate(ld, a, b, "blocks")
+        assert not (cache_path(ld, BLOCKING_INDEX_FILENAME)).exists()
+
+        assert blocked_task_ids(ld) == {b["id"]}
+        assert (cache_path(ld, BLOCKING_INDEX_FILENAME)).exists()
+        assert unresolved_blockers(ld, b["id"]) == [a["id"]]
+
+    def test_blocks_and_depends_on_both_count(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b, c = _make_task(ld, 1), _make_task(ld, 2), _make_task(ld, 3)
+        blocked_task_ids(ld)  # build the index
+
+        _relate(ld, a, b, "blocks")
+        c = _relate(ld, c, a, "depends_on")
+        assert blocked_task_ids(ld) == {b["id"], c["id"]}
+
+        _relate(ld, c, a, "depends_on", remove=True)
+        assert blocked_task_ids(ld) == {b["id"]}
+        assert verify_blocking_index(ld, *_all_snapshots(ld)) == []
+
+    def test_other_relationship_types_do_not_block(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        _relate(ld, a, b, "related_to")
+        assert blocked_task_ids(ld) == frozenset()
+
+    def test_finishing_blocker_unblocks(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        a = _relate(ld, a, b, "blocks")
+        assert blocked_task_ids(ld) == {b["id"]}
+
+        a = _set_status(ld, a, "cancelled")
+        assert blocked_task_ids(ld) == frozenset()
+
+        _set_status(ld, a, "backlog")
+        assert blocked_task_ids(ld) == {b["id"]}
+        assert verify_blocking_index(ld, *_all_snapshots(ld)) == []
+
+    def test_archived_blocker_is_resolved(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        a = _relate(ld, a, b, "blocks")
+        assert blocked_task_ids(ld) == {b["id"]}
+
+        event = create_event(type="task_archived", task_id=a["id"], actor="human:test", data={})
+        archive_task_files(ld, a["id"], event, apply_event_to_snapshot(a, event))
+        assert blocked_task_ids(ld) == frozenset()
+        assert verify_blocking_index(ld, *_all_snapshots(ld)) == []
+
+    def test_unknown_blocker_is_not_resolved(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        b = _make_task(ld, 2)
+        ghost = {"id": "task_01AAAAAAAAAAAAAAAAAAAAAA0009"}
+        _relate(ld, b, ghost, "depends_on")
+
+        assert blocked_task_ids(ld) == {b["id"]}
+        assert unresolved_blockers(ld, b["id"]) == [ghost["id"]]
+        assert blocking_report(ld)["cycles"] == []
+
+    def test_write_behind_the_index_is_picked_up(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        a = _relate(ld, a, b, "blocks")
+        assert blocked_task_ids(ld) == {b["id"]}
+
+        # e.g. a git pull bringing in the blocker's completion
+        atomic_write(ld / "tasks" / f"{a['id']}.json", serialize_snapshot({**a, "status": "done"}))
+
+        assert blocked_task_ids(ld) == frozenset()
+
+    def test_unrelated_write_keeps_index_fresh(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        _relate(ld, a, b, "blocks")
+        blocked_task_ids(ld)
+        inode = cache_path(ld, BLOCKING_INDEX_FILENAME).stat().st_ino
+
+        event = create_event(
+            type="field_updated",
+            task_id=a["id"],
+            actor="human:test",
+            data={"field": "title", "from": a["title"], "to": "Renamed"},
+        )
+        write_task_event(ld, a["id"], [event], apply_event_to_snapshot(a, event))
+
+        assert blocked_task_ids(ld) == {b["id"]}
+        assert cache_path(ld, BLOCKING_INDEX_FILENAME).stat().st_ino == inode
+
+
+class TestCycles:
+    def test_cycle_is_reported(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b, c = _make_task(ld, 1), _make_task(ld, 2), _make_task(ld, 3)
+        a = _relate(ld, a, b, "blocks")
+        b = _relate(ld, b, c, "blocks")
+        c = _relate(ld, c, b, "blocks")
+
+        report = blocking_report(ld)
+        assert report["edges"] == 3
+        assert report["cycles"] == [[b["id"], c["id"]]]
+        assert report["blocked"][b["id"]] == [a["id"], c["id"]]
+
+    def test_resolved_member_breaks_cycle(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        a = _relate(ld, a, b, "blocks")
+        _relate(ld, a, b, "depends_on")
+        assert len(blocking_report(ld)["cycles"]) == 1
+
+        _set_status(ld, b, "cancelled")
+        assert blocking_report(ld)["cycles"] == []
+
+
+class TestCompaction:
+    def test_superseded_records_are_dropped(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(blocking_index_mod._log, "compact_min_bytes", 0)
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        blocked_task_ids(ld)
+
+        for _ in range(3):
+            a = _relate(ld, a, b, "blocks")
+            a = _relate(ld, a, b, "blocks", remove=True)
+        _relate(ld, a, b, "blocks")
+
+        lines = (cache_path(ld, BLOCKING_INDEX_FILENAME)).read_text().splitlines()
+        assert len(lines) < 8
+        assert blocked_task_ids(ld) == {b["id"]}
+
+
+class TestVerify:
+    def test_absent_index_is_fine(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert verify_blocking_index(ld, {}, {}) == []
+
+    def test_bypassing_write_is_detected_and_rebuilt(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        rebuild_blocking_index(ld)
+
+        # Write an edge behind the index's back
+        event = create_event(
+            type="relationship_added",
+            task_id=a["id"],
+            actor="human:test",
+            data={"type": "blocks", "target_task_id": b["id"]},
+        )
+        a = apply_event_to_snapshot(a, event)
+        atomic_write(ld / "tasks" / f"{a['id']}.json", serialize_snapshot(a))
+
+        problems = verify_blocking_index(ld, *_all_snapshots(ld))
+        assert problems == [f"Blocking index entry for {a['id']} differs from its snapshot"]
+
+        assert rebuild_blocking_index(ld) == 1
+        assert verify_blocking_index(ld, *_all_snapshots(ld)) == []
+        assert blocked_task_ids(ld) == {b["id"]}
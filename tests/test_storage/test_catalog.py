@@ -0,0 +1,173 @@
+"""Tests for lattice.storage.catalog — the derived task catalog."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage import catalog as catalog_mod
+from lattice.storage.catalog import (
+    CATALOG_FILENAME,
+    catalog_generation,
+    load_snapshots,
+    read_catalog,
+    rebuild_catalog,
+    verify_catalog,
+)
+from lattice.storage.fs import atomic_write, cache_path, ensure_lattice_dirs
+from lattice.storage.operations import archive_task_files, write_task_event
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _make_task(ld: Path, n: int, *, title: str | None = None) -> dict:
+    task_id = f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}"
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": title or f"Task {n}", "status": "backlog", "type": "task"},
+    )
+    snapshot = apply_event_to_snapshot(None, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+def _status_change(ld: Path, snapshot: dict, status: str) -> dict:
+    event = create_event(
+        type="status_changed",
+        task_id=snapshot["id"],
+        actor="human:test",
+        data={"from": snapshot["status"], "to": status},
+    )
+    updated = apply_event_to_snapshot(snapshot, event)
+    write_task_event(ld, snapshot["id"], [event], updated)
+    return updated
+
+
+class TestLoadSnapshots:
+    def test_first_load_creates_catalog(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_task(ld, 1)
+        _make_task(ld, 2)
+        assert not (cache_path(ld, CATALOG_FILENAME)).exists()
+
+        active, archived = load_snapshots(ld)
+
+        assert [s["title"] for s in active] == ["Task 1", "Task 2"]
+        assert archived == []
+        assert (cache_path(ld, CATALOG_FILENAME)).exists()
+        assert read_catalog(ld) is not None
+
+    def test_catalog_matches_scan(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        for n in range(5):
+            _make_task(ld, n)
+        scanned = load_snapshots(ld)
+        cached = load_snapshots(ld)
+        assert cached == scanned
+
+    def test_writes_are_recorded(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        load_snapshots(ld)
+        gen = catalog_generation(ld)
+
+        _make_task(ld, 2)
+        _status_change(ld, snap, "planned")
+
+        catalog = read_catalog(ld)
+        assert catalog is not None
+        assert catalog.generation == gen + 2
+        assert [s["status"] for s in catalog.active] == ["planned", "backlog"]
+
+    def test_bypassing_write_falls_back_to_scan(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_task(ld, 1)
+        load_snapshots(ld)
+
+        # Write a snapshot without going through write_task_event
+        rogue = {"id": "task_01AAAAAAAAAAAAAAAAAAAAAA9999", "title": "Rogue"}
+        atomic_write(ld / "tasks" / f"{rogue['id']}.json", serialize_snapshot(rogue))
+
+        assert read_catalog(ld) is None
+        active, _ = load_snapshots(ld)
+        assert [s["title"] for s in active] == ["Task 1", "Rogue"]
+
+    def test_active_only_does_not_read_archive(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_task(ld, 1)
+        active, archived = load_snapshots(ld, include_archived=False)
+        assert len(active) == 1
+        assert archived == []
+
+
+class TestArchive:
+    def test_archive_moves_row(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        _make_task(ld, 2)
+        load_snapshots(ld)
+
+        event = create_event(type="task_archived", task_id=snap["id"], actor="human:test", data={})
+        archive_task_files(ld, snap["id"], event, apply_event_to_snapshot(snap, event))
+
+        catalog = read_catalog(ld)
+        assert catalog is not None
+        assert [s["title"] for s in catalog.active] == ["Task 2"]
+        assert [s["title"] for s in catalog.archived] == ["Task 1"]
+
+
+class TestCompaction:
+    def test_tail_is_folded_back(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(catalog_mod._log, "compact_min_bytes", 0)
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        load_snapshots(ld)
+
+        for status in ["planned", "backlog", "planned", "backlog", "planned"]:
+            snap = _status_change(ld, snap, status)
+
+        lines = (cache_path(ld, CATALOG_FILENAME)).read_text().splitlines()
+        kinds = [json.loads(line)["kind"] for line in lines]
+        assert kinds.count("commit") < 5
+        catalog = read_catalog(ld)
+        assert catalog is not None
+        assert catalog.active[0]["status"] == "planned"
+
+
+class TestVerify:
+    def test_absent_catalog_is_fine(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert verify_catalog(ld, {}, {}) == []
+
+    def test_detects_missing_and_divergent_rows(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        rebuild_catalog(ld)
+
+        other = {"id": "task_01AAAAAAAAAAAAAAAAAAAAAA0002", "title": "Other"}
+        changed = {**snap, "title": "Changed"}
+        problems = verify_catalog(ld, {snap["id"]: changed, other["id"]: other}, {})
+
+        assert any("missing task_01AAAAAAAAAAAAAAAAAAAAAA0002" in p for p in problems)
+        assert any("differs" in p for p in problems)
+
+    def test_rebuild_fixes_stale_catalog(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        rebuild_catalog(ld)
+        other = {"id": "task_01AAAAAAAAAAAAAAAAAAAAAA0002", "title": "Other"}
+        atomic_write(ld / "tasks" / f"{other['id']}.json", serialize_snapshot(other))
+
+        assert verify_catalog(ld, {snap["id"]: snap, other["id"]: other}, {})
+        assert rebuild_catalog(ld) == 2
+        assert verify_catalog(ld, {snap["id"]: snap, other["id"]: other}, {}) == []
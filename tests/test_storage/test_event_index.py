@@ -0,0 +1,290 @@
+"""Tests for lattice.storage.event_index — the derived global event index."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event, serialize_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage import event_index as event_index_mod
+from lattice.storage.event_index import (
+    EVENT_INDEX_FILENAME,
+    ROW_ID,
+    ROW_TYPE,
+    EventIndex,
+    decode_cursor,
+    encode_cursor,
+    page_rows,
+    rebuild_event_index,
+    verify_event_index,
+)
+from lattice.storage.fs import atomic_write, cache_path, ensure_lattice_dirs
+from lattice.storage.operations import archive_task_files, write_task_event
+from lattice.storage.readers import read_task_events
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _make_task(ld: Path, n: int) -> dict:
+    task_id = f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}"
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": f"Task {n}", "status": "backlog", "type": "task"},
+    )
+    snapshot = apply_event_to_snapshot(None, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+def _comment(ld: Path, snapshot: dict, body: str, actor: str = "human:test") -> dict:
+    event = create_event(
+        type="comment_added",
+        task_id=snapshot["id"],
+        actor=actor,
+        data={"body": body},
+    )
+    updated = apply_event_to_snapshot(snapshot, event)
+    write_task_event(ld, snapshot["id"], [event], updated)
+    return updated
+
+
+def _all_events(ld: Path, task_ids: list[str]) -> list[dict]:
+    events = [e for tid in task_ids for e in read_task_events(ld, tid)]
+    return sorted(events, key=lambda e: (e["ts"], e["id"]), reverse=True)
+
+
+class TestRebuildAndRead:
+    def test_refresh_builds_missing_index(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_task(ld, 1)
+        assert not (cache_path(ld, EVENT_INDEX_FILENAME)).exists()
+
+        index = EventIndex(ld)
+        assert index.refresh()
+        assert (cache_path(ld, EVENT_INDEX_FILENAME)).exists()
+        assert len(index.rows) == 1
+
+    def test_rows_seek_to_their_events(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        _comment(ld, snap, "hello")
+        index = EventIndex(ld)
+        index.refresh()
+
+        for row in index.rows:
+            event = index.read_event(row)
+            assert event is not None
+            assert event["id"] == row[ROW_ID]
+
+    def test_writes_are_appended_incrementally(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        index = EventIndex(ld)
+        index.refresh()
+
+        snap = _comment(ld, snap, "one")
+        _comment(ld, snap, "two")
+        _make_task(ld, 2)
+        index.refresh()
+
+        assert len(index.rows) == 4
+        events = [index.read_event(r) for r in index.rows]
+        assert [e["id"] for e in events] == [
+            e["id"]
+            for e in reversed(_all_events(ld, [snap["id"], "task_01AAAAAAAAAAAAAAAAAAAAAA0002"]))
+        ]
+
+    def test_torn_separator_keeps_offsets_valid(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        rebuild_event_index(ld)
+        # Simulate a torn write: log no longer ends with a newline
+        log = ld / "events" / f"{snap['id']}.jsonl"
+        log.write_text(log.read_text() + '{"partial"')
+
+        _comment(ld, snap, "after tear")
+        index = EventIndex(ld)
+        index.refresh()
+        last = index.rows[-1]
+        event = index.read_event(last)
+        assert event is not None
+        assert event["data"]["body"] == "after tear"
+
+    def test_mismatch_flags_stale_and_rebuilds(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        index = EventIndex(ld)
+        index.refresh()
+        # Rewrite the log behind the index's back
+        log = ld / "events" / f"{snap['id']}.jsonl"
+        log.write_text("\n" + log.read_text())
+
+        assert index.read_event(index.rows[0]) is None
+        assert index.stale
+        index.refresh()
+        assert index.read_event(index.rows[0]) is not None
+
+    def test_listeners_see_new_rows_then_replacement(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        index = EventIndex(ld)
+        seen: list = []
+        index.add_listener(seen.append)
+        index.refresh()
+        index.refresh()
+        _comment(ld, snap, "one")
+        index.refresh()
+        assert [[r[ROW_TYPE] for r in rows] for rows in seen] == [
+            ["task_created"],
+            ["comment_added"],
+        ]
+
+        rebuild_event_index(ld)
+        index.refresh()
+        assert seen[-1] is None
+
+    def test_logs_written_behind_the_index_trigger_rebuild(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_task(ld, 1)
+        index = EventIndex(ld)
+        seen: list = []
+        index.add_listener(seen.append)
+        index.refresh()
+
+        # e.g. a git pull bringing in another task's log
+        task_id = "task_01AAAAAAAAAAAAAAAAAAAAAA0002"
+        event = create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:test",
+            data={"title": "Pulled", "status": "backlog", "type": "task"},
+        )
+        atomic_write(ld / "events" / f"{task_id}.jsonl", serialize_event(event))
+
+        assert index.refresh()
+        assert seen[-1] is None
+        assert [row[ROW_ID] for row in index.select(task_id=task_id)] == [event["id"]]
+        assert index.refresh()
+        assert len(seen) == 2  # no further rebuild once the signature matches again
+
+    def test_append_during_first_rebuild_is_kept(self, tmp_path: Path, monkeypatch) -> None:
+        ld = _setup_lattice(tmp_path)
+        snapshot = _make_task(ld, 1)
+        writers: list[threading.Thread] = []
+        real_scan = event_index_mod._scan_log
+
+        def scan_then_write(path: Path, log_id: str) -> list[dict]:
+            rows = real_scan(path, log_id)
+            if not writers:
+                # The log has been scanned; append to it before the index is written
+                writers.append(threading.Thread(target=_comment, args=(ld, snapshot, "late")))
+                writers[0].start()
+                time.sleep(0.3)
+            return rows
+
+        monkeypatch.setattr(event_index_mod, "_scan_log", scan_then_write)
+        rebuild_event_index(ld)
+        writers[0].join(10)
+
+        index = EventIndex(ld)
+        index.refresh()
+        types = [row[ROW_TYPE] for row in index.select()]
+        assert types == ["task_created", "comment_added"]
+
+
+class TestSelectAndPage:
+    def _populate(self, ld: Path) -> EventIndex:
+        a = _make_task(ld, 1)
+        b = _make_task(ld, 2)
+        for i in range(5):
+            a = _comment(ld, a, f"a{i}", actor="agent:claude")
+            b = _comment(ld, b, f"b{i}")
+        index = EventIndex(ld)
+        index.refresh()
+        return index
+
+    def test_filters_use_columns(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        index = self._populate(ld)
+
+        assert len(index.select(types={"comment_added"})) == 10
+        assert len(index.select(actor="agent:claude")) == 5
+        assert len(index.select(task_id="task_01AAAAAAAAAAAAAAAAAAAAAA0002")) == 6
+
+    def test_cursor_pages_cover_everything_once(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        index = self._populate(ld)
+        rows = index.select()
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page, has_more = page_rows(rows, limit=3, cursor=cursor)
+            seen.extend(r[ROW_ID] for r in page)
+            if not has_more:
+                break
+            cursor = decode_cursor(encode_cursor(page[-1]))
+
+        assert seen == [r[ROW_ID] for r in reversed(rows)]
+
+    def test_offset_matches_cursor(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        index = self._populate(ld)
+        rows = index.select()
+        first, _ = page_rows(rows, limit=4)
+        by_offset, _ = page_rows(rows, limit=4, offset=4)
+        by_cursor, _ = page_rows(rows, limit=4, cursor=decode_cursor(encode_cursor(first[-1])))
+        assert by_offset == by_cursor
+
+    def test_archived_logs_excluded_on_request(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        _make_task(ld, 2)
+        index = EventIndex(ld)
+        index.refresh()
+
+        event = create_event(type="task_archived", task_id=snap["id"], actor="human:test", data={})
+        archive_task_files(ld, snap["id"], event, apply_event_to_snapshot(snap, event))
+        index.refresh()
+
+        assert len(index.select()) == 3
+        active_only = index.select(include_archived=False)
+        assert [r[ROW_ID] for r in active_only] == [
+            e["id"] for e in read_task_events(ld, "task_01AAAAAAAAAAAAAAAAAAAAAA0002")
+        ]
+        # Archived rows still resolve to the moved log
+        archived_row = next(r for r in index.rows if r[ROW_ID] == event["id"])
+        assert index.read_event(archived_row) == json.loads(serialize_event(event))
+
+
+class TestCursor:
+    def test_invalid_cursor_raises(self) -> None:
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor!!")
+
+
+class TestVerify:
+    def test_absent_index_is_fine(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert verify_event_index(ld, {}) == []
+
+    def test_detects_missing_events(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        rebuild_event_index(ld)
+        logs = {snap["id"]: read_task_events(ld, snap["id"]) + [{"id": "ev_extra"}]}
+
+        assert verify_event_index(ld, logs) == ["Event index is missing 1 event(s)"]
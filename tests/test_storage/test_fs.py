@@ -8,7 +8,15 @@ from unittest.mock import patch
 
 import pytest
 
-from lattice.storage.fs import _fsync_directory, atomic_write, jsonl_append
+from lattice.storage.fs import (
+    CACHE_DIR,
+    _fsync_directory,
+    atomic_write,
+    ensure_cache_dir,
+    ensure_lattice_dirs,
+    jsonl_append,
+    jsonl_append_many,
+)
 
 
 class TestAtomicWrite:
@@ -127,6 +135,47 @@ class TestJsonlAppend:
         assert written == line
 
 
+class TestJsonlAppendMany:
+    """jsonl_append_many() appends a batch with one write and one fsync."""
+
+    def test_appends_all_lines_in_order(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        jsonl_append(target, '{"n":0}\n')
+        jsonl_append_many(target, ['{"n":1}\n', '{"n":2}\n'])
+        assert target.read_text() == '{"n":0}\n{"n":1}\n{"n":2}\n'
+
+    def test_single_write_and_fsync(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        lines = [f'{{"n":{i}}}\n' for i in range(5)]
+        with (
+            patch("lattice.storage.fs.os.write", wraps=os.write) as mock_write,
+            patch("lattice.storage.fs.os.fsync", wraps=os.fsync) as mock_fsync,
+            patch("lattice.storage.fs._fsync_directory") as mock_dir,
+        ):
+            jsonl_append_many(target, lines)
+        assert mock_write.call_count == 1
+        assert mock_fsync.call_count == 1
+        mock_dir.assert_called_once_with(tmp_path)
+
+    def test_repairs_missing_trailing_newline(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        target.write_text('{"torn":true}')
+        jsonl_append_many(target, ['{"n":1}\n', '{"n":2}\n'])
+        assert target.read_text().splitlines() == ['{"torn":true}', '{"n":1}', '{"n":2}']
+
+    def test_skip_directory_fsync(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        with patch("lattice.storage.fs._fsync_directory") as mock_dir:
+            jsonl_append_many(target, ['{"n":1}\n'], fsync_dir=False)
+        mock_dir.assert_not_called()
+        assert target.exists()
+
+    def test_empty_batch_is_noop(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        jsonl_append_many(target, [])
+        assert not target.exists()
+
+
 class TestFsyncDirectory:
     """_fsync_directory() syncs directory metadata for durability."""
 
@@ -148,3 +197,21 @@ class TestFsyncDirectory:
         """_fsync_directory should silently ignore OSError (e.g. macOS)."""
         with patch("lattice.storage.fs.os.open", side_effect=OSError("not supported")):
             _fsync_directory(tmp_path)  # Should not raise
+
+
+class TestCacheDir:
+    """Derived files live in a self-ignoring .lattice/cache/ directory."""
+
+    def test_init_creates_ignored_cache_dir(self, tmp_path: Path) -> None:
+        ensure_lattice_dirs(tmp_path)
+        cache = tmp_path / ".lattice" / CACHE_DIR
+        assert cache.is_dir()
+        assert "*" in (cache / ".gitignore").read_text().splitlines()
+
+    def test_leaves_top_level_files_untouched(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        (ld / "ids.json").write_text("{}\n")
+
+        assert ensure_cache_dir(ld) == ld / CACHE_DIR
+        assert (ld / "ids.json").read_text() == "{}\n"
@@ -0,0 +1,231 @@
+"""Tests for lattice.storage.hook_queue — the durable hook outbox."""
+
+from __future__ import annotations
+
+import json
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+from lattice.core.events import create_event
+from lattice.storage import hook_queue
+from lattice.storage.hook_queue import (
+    OUTBOX_DIR,
+    WORKER_LOCK_KEY,
+    dead_letters,
+    drain,
+    pending_jobs,
+    retry_dead_letters,
+    start_worker,
+)
+from lattice.storage.hooks import execute_hooks
+from lattice.storage.locks import lattice_lock
+
+TASK_ID = "task_01AAAAAAAAAAAAAAAAAAAAAAAAAA"
+
+
+@pytest.fixture()
+def lattice_dir(tmp_path: Path) -> Path:
+    ld = tmp_path / ".lattice"
+    (ld / "locks").mkdir(parents=True)
+    return ld
+
+
+@pytest.fixture()
+def spawned(monkeypatch) -> list[Path]:
+    """Record detached-worker spawns instead of starting processes."""
+    calls: list[Path] = []
+    monkeypatch.setattr(hook_queue, "spawn_worker", calls.append)
+    monkeypatch.setattr(hook_queue, "RETRY_BACKOFF_SECONDS", 0)
+    return calls
+
+
+def _event(event_type: str = "status_changed") -> dict:
+    return create_event(
+        type=event_type,
+        task_id=TASK_ID,
+        actor="human:test",
+        data={"from": "backlog", "to": "in_planning"},
+    )
+
+
+def _recorder(tmp_path: Path, name: str, log: Path, *, exit_code: int = 0) -> str:
+    script = tmp_path / name
+    script.write_text(
+        f'#!/bin/sh\necho "{name} $LATTICE_EVENT_TYPE" >> "{log}"\nexit {exit_code}\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+def _queued_config(tmp_path: Path, log: Path, **extra) -> dict:
+    return {
+        "hooks": {
+            "queued": True,
+            "post_event": _recorder(tmp_path, "post", log),
+            "transitions": {"* -> in_planning": _recorder(tmp_path, "planning", log)},
+            **extra,
+        }
+    }
+
+
+class TestEnqueue:
+    def test_execute_hooks_queues_instead_of_running(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path]
+    ) -> None:
+        log = tmp_path / "log.txt"
+        execute_hooks(_queued_config(tmp_path, log), lattice_dir, TASK_ID, _event())
+
+        assert not log.exists()
+        assert spawned == [lattice_dir]
+        (job,) = pending_jobs(lattice_dir)
+        assert job["key"] == TASK_ID
+        assert [Path(c["cmd"]).name for c in job["commands"]] == ["post", "planning"]
+        assert json.loads(job["stdin"])["type"] == "status_changed"
+
+    def test_job_stores_only_lattice_variables(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path], monkeypatch
+    ) -> None:
+        monkeypatch.setenv("SOME_SECRET_TOKEN", "hunter2")
+        execute_hooks(_queued_config(tmp_path, tmp_path / "log"), lattice_dir, TASK_ID, _event())
+        raw = next((lattice_dir / OUTBOX_DIR).glob("*.json")).read_text()
+        assert "hunter2" not in raw
+        env = json.loads(raw)["commands"][1]["env"]
+        assert env["LATTICE_TO_STATUS"] == "in_planning"
+        assert all(name.startswith("LATTICE_") for name in env)
+
+    def test_no_spawn_while_a_worker_holds_the_lock(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path]
+    ) -> None:
+        with lattice_lock(lattice_dir / "locks", WORKER_LOCK_KEY):
+            execute_hooks(
+                _queued_config(tmp_path, tmp_path / "log"), lattice_dir, TASK_ID, _event()
+            )
+        assert spawned == []
+        assert len(pending_jobs(lattice_dir)) == 1
+
+
+class TestDrain:
+    def test_runs_jobs_in_order(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path]
+    ) -> None:
+        log = tmp_path / "log.txt"
+        config = _queued_config(tmp_path, log)
+        execute_hooks(config, lattice_dir, TASK_ID, _event())
+        execute_hooks(config, lattice_dir, TASK_ID, _event("comment_added"))
+
+        stats = drain(lattice_dir, config)
+        assert stats == {"jobs": 2, "commands": 3, "retries": 0, "dead": 0}
+        assert log.read_text().splitlines() == [
+            "post status_changed",
+            "planning status_changed",
+            "post comment_added",
+        ]
+        assert pending_jobs(lattice_dir) == []
+
+    def test_failing_command_is_retried_then_dead_lettered(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path]
+    ) -> None:
+        log = tmp_path / "log.txt"
+        config = _queued_config(tmp_path, log, max_attempts=2)
+        config["hooks"]["post_event"] = _recorder(tmp_path, "broken", log, exit_code=3)
+        execute_hooks(config, lattice_dir, TASK_ID, _event())
+
+        stats = drain(lattice_dir, config)
+        assert stats == {"jobs": 1, "commands": 2, "retries": 1, "dead": 1}
+        # The next command in the job still ran
+        assert log.read_text().splitlines() == [
+            "broken status_changed",
+            "broken status_changed",
+            "planning status_changed",
+        ]
+        (letter,) = dead_letters(lattice_dir)
+        assert letter["error"].startswith("exit status 3")
+        assert letter["attempts"] == 2
+
+        assert retry_dead_letters(lattice_dir) == [letter["id"]]
+        assert dead_letters(lattice_dir) == []
+        (job,) = pending_jobs(lattice_dir)
+        assert job["commands"] == [{"cmd": letter["cmd"], "env": letter["env"]}]
+
+    def test_resumes_a_partly_run_job(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path]
+    ) -> None:
+        log = tmp_path / "log.txt"
+        config = _queued_config(tmp_path, log)
+        execute_hooks(config, lattice_dir, TASK_ID, _event())
+        path = next((lattice_dir / OUTBOX_DIR).glob("*.json"))
+        job = json.loads(path.read_text())
+        path.write_text(json.dumps({**job, "next": 1}))
+
+        drain(lattice_dir, config)
+        assert log.read_text().splitlines() == ["planning status_changed"]
+
+    def test_returns_none_while_another_worker_drains(self, lattice_dir: Path) -> None:
+        with lattice_lock(lattice_dir / "locks", WORKER_LOCK_KEY):
+            assert drain(lattice_dir, {}) is None
+
+
+class TestWorkers:
+    def test_in_process_worker_is_woken(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path]
+    ) -> None:
+        log = tmp_path / "log.txt"
+        config = _queued_config(tmp_path, log)
+        (lattice_dir / "config.json").write_text(json.dumps(config))
+        worker = start_worker(lattice_dir)
+        try:
+            execute_hooks(config, lattice_dir, TASK_ID, _event())
+            for _ in range(200):
+                if log.exists() and len(log.read_text().splitlines()) == 2:
+                    break
+                time.sleep(0.02)
+        finally:
+            worker.stop()
+            worker.join(10)
+        assert spawned == []
+        assert len(log.read_text().splitlines()) == 2
+
+    def test_worker_keeps_its_startup_environment(
+        self, tmp_path: Path, lattice_dir: Path, spawned: list[Path], monkeypatch
+    ) -> None:
+        log = tmp_path / "log.txt"
+        script = tmp_path / "where"
+        script.write_text(f'#!/bin/sh\necho "$HOOK_MARK $(pwd)" >> "{log}"\n')
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        config = {"hooks": {"queued": True, "post_event": str(script)}}
+        (lattice_dir / "config.json").write_text(json.dumps(config))
+        home, client = tmp_path / "home", tmp_path / "client"
+        home.mkdir()
+        client.mkdir()
+
+        monkeypatch.setenv("HOOK_MARK", "daemon")
+        monkeypatch.chdir(home)
+        worker = start_worker(lattice_dir)
+        try:
+            # What the CLI daemon does while it serves a client's command
+            monkeypatch.setenv("HOOK_MARK", "client")
+            monkeypatch.chdir(client)
+            execute_hooks(config, lattice_dir, TASK_ID, _event())
+            for _ in range(200):
+                if log.exists():
+                    break
+                time.sleep(0.02)
+        finally:
+            worker.stop()
+            worker.join(10)
+        assert log.read_text().split() == ["daemon", str(home.resolve())]
+
+    def test_detached_worker_drains_outbox(self, tmp_path: Path, lattice_dir: Path) -> None:
+        log = tmp_path / "log.txt"
+        config = _queued_config(tmp_path, log)
+        (lattice_dir / "config.json").write_text(json.dumps(config))
+        execute_hooks(config, lattice_dir, TASK_ID, _event())
+        for _ in range(500):
+            if not pending_jobs(lattice_dir):
+                break
+            time.sleep(0.02)
+        assert pending_jobs(lattice_dir) == []
+        assert log.read_text().splitlines() == ["post status_changed", "planning status_changed"]
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import json
 import stat
+import threading
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -890,3 +892,149 @@ def test_transition_with_missing_event_data(lattice_dir: Path) -> None:
     config = {"hooks": {"transitions": {"* -> *": "echo noop"}}}
     # from_status and to_status will be empty strings, guard should skip
     execute_hooks(config, lattice_dir, event["task_id"], event)
+
+
+# ---------------------------------------------------------------------------
+# 14. In-process Python hooks (lattice.hooks entry points)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def python_hooks(monkeypatch) -> dict:
+    """Register fake ``lattice.hooks`` entry points; return name -> handler."""
+    from lattice import plugins
+
+    handlers: dict = {}
+
+    def fake_entry_points(group=None):
+        if group != plugins.HOOK_PLUGIN_GROUP:
+            return []
+        eps = []
+        for name, handler in handlers.items():
+            ep = MagicMock()
+            ep.name = name
+            ep.load.return_value = handler
+            eps.append(ep)
+        return eps
+
+    monkeypatch.setattr(plugins, "entry_points", fake_entry_points)
+    monkeypatch.setattr(plugins, "_hook_entry_points", None)
+    monkeypatch.setattr(plugins, "_loaded_hooks", {})
+    return handlers
+
+
+def test_python_hooks_follow_transition_order(
+    tmp_path: Path, lattice_dir: Path, sample_event: dict, python_hooks: dict
+) -> None:
+    """py: handlers interleave with shell hooks in the usual firing order."""
+    calls: list[tuple[str, str | None]] = []
+    for name in ("catch_all", "exact", "wildcard"):
+        python_hooks[name] = lambda event, env, name=name: calls.append(
+            (name, env.get("LATTICE_TO_STATUS"))
+        )
+    output_file = tmp_path / "shell.txt"
+
+    config = {
+        "hooks": {
+            "post_event": "py:catch_all",
+            "transitions": {
+                "* -> *": "py:wildcard",
+                "backlog -> in_planning": ["py:exact", f"echo fired > {output_file}"],
+            },
+        }
+    }
+    execute_hooks(config, lattice_dir, sample_event["task_id"], sample_event)
+
+    assert calls == [("catch_all", None), ("exact", "in_planning"), ("wildcard", "in_planning")]
+    assert output_file.read_text().strip() == "fired"
+
+
+def test_python_hook_receives_event_and_env(
+    lattice_dir: Path, sample_event: dict, python_hooks: dict
+) -> None:
+    received: list = []
+    python_hooks["record"] = lambda event, env: received.append((event, env))
+
+    config = {"hooks": {"on": {"status_changed": "py:record"}}}
+    execute_hooks(config, lattice_dir, sample_event["task_id"], sample_event)
+
+    ((event, env),) = received
+    assert event is sample_event
+    assert env["LATTICE_TASK_ID"] == sample_event["task_id"]
+    assert env["LATTICE_ROOT"] == str(lattice_dir)
+    assert "PATH" not in env
+
+
+def test_python_hook_failures_do_not_raise(
+    lattice_dir: Path, sample_event: dict, python_hooks: dict, capsys
+) -> None:
+    """A raising handler or an unknown name is logged; later hooks still run."""
+    ran: list[str] = []
+
+    def broken(event, env):
+        raise RuntimeError("boom")
+
+    python_hooks["broken"] = broken
+    python_hooks["after"] = lambda event, env: ran.append("after")
+
+    config = {
+        "hooks": {
+            "post_event": "py:broken",
+            "on": {"status_changed": "py:missing"},
+            "transitions": {"* -> in_planning": "py:after"},
+        }
+    }
+    execute_hooks(config, lattice_dir, sample_event["task_id"], sample_event)
+
+    assert ran == ["after"]
+    err = capsys.readouterr().err
+    assert "boom" in err
+    assert "no 'lattice.hooks' entry point named 'missing'" in err
+
+
+def test_queued_python_hook_failure_is_retried(
+    lattice_dir: Path, sample_event: dict, python_hooks: dict, monkeypatch
+) -> None:
+    from lattice.storage import hook_queue
+
+    monkeypatch.setattr(hook_queue, "spawn_worker", lambda _ld: None)
+    monkeypatch.setattr(hook_queue, "RETRY_BACKOFF_SECONDS", 0)
+    (lattice_dir / "locks").mkdir()
+    attempts: list[dict] = []
+
+    def flaky(event, env):
+        attempts.append(event)
+        if len(attempts) == 1:
+            raise ConnectionError("try again")
+
+    python_hooks["flaky"] = flaky
+    config = {"hooks": {"queued": True, "post_event": "py:flaky"}}
+    execute_hooks(config, lattice_dir, sample_event["task_id"], sample_event)
+    assert attempts == []
+
+    stats = hook_queue.drain(lattice_dir, config)
+    assert stats == {"jobs": 1, "commands": 1, "retries": 1, "dead": 0}
+    assert attempts[-1]["id"] == sample_event["id"]
+
+
+def test_python_hook_runs_in_process(
+    lattice_dir: Path, sample_event: dict, python_hooks: dict, monkeypatch
+) -> None:
+    """A py: hook is called directly, in the calling thread, without a subprocess."""
+    from lattice.storage import hooks
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("py: hooks must not spawn a process")
+
+    monkeypatch.setattr(hooks.subprocess, "run", no_subprocess)
+    calls: list[tuple[dict, dict, int]] = []
+    python_hooks["record"] = lambda event, env: calls.append((event, env, threading.get_ident()))
+
+    config = {"hooks": {"on": {"status_changed": "py:record"}}}
+    execute_hooks(config, lattice_dir, sample_event["task_id"], sample_event)
+
+    ((event, env, thread_id),) = calls
+    assert event is sample_event
+    assert env["LATTICE_TASK_ID"] == sample_event["task_id"]
+    assert env["LATTICE_EVENT_TYPE"] == "status_changed"
+    assert thread_id == threading.get_ident()
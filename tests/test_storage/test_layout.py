@@ -0,0 +1,139 @@
+"""Tests for lattice.storage.layout — task path resolution for flat and sharded layouts."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.catalog import load_snapshots, read_catalog
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+from lattice.storage.layout import (
+    lifecycle_log_path,
+    project_layout,
+    resource_event_files,
+    shard_of,
+    task_event_files,
+    task_event_path,
+    task_snapshot_files,
+    task_snapshot_path,
+)
+from lattice.storage.operations import archive_task_files, write_task_event
+from lattice.storage.readers import read_task_events
+
+TASK_A = "task_01AAAAAAAAAAAAAAAAAAAAAA00A1"
+TASK_B = "task_01AAAAAAAAAAAAAAAAAAAAAA00B2"
+
+
+def _setup_lattice(tmp_path: Path, layout: str | None = None) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    config = dict(default_config())
+    if layout is not None:
+        config["layout"] = layout
+    atomic_write(ld / "config.json", serialize_config(config))
+    return ld
+
+
+def _make_task(ld: Path, task_id: str) -> dict:
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": task_id[-4:], "status": "backlog", "type": "task"},
+    )
+    snapshot = apply_event_to_snapshot(None, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+class TestPathResolution:
+    def test_flat_is_the_default(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert project_layout(ld) == "flat"
+        assert task_snapshot_path(ld, TASK_A) == ld / "tasks" / f"{TASK_A}.json"
+        assert task_event_path(ld, TASK_A, archived=True) == (
+            ld / "archive" / "events" / f"{TASK_A}.jsonl"
+        )
+
+    def test_sharded_paths_use_id_suffix(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "sharded")
+        assert shard_of(TASK_A) == "A1"
+        assert task_snapshot_path(ld, TASK_A) == ld / "tasks" / "A1" / f"{TASK_A}.json"
+        assert task_event_path(ld, TASK_A, archived=True) == (
+            ld / "archive" / "events" / "A1" / f"{TASK_A}.jsonl"
+        )
+
+    def test_explicit_layout_overrides_config(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "sharded")
+        assert task_snapshot_path(ld, TASK_A, layout="flat") == ld / "tasks" / f"{TASK_A}.json"
+
+    def test_resources_and_lifecycle_stay_flat(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "sharded")
+        assert task_event_path(ld, "res_01AAAAAAAAAAAAAAAAAAAAAA0001") == (
+            ld / "events" / "res_01AAAAAAAAAAAAAAAAAAAAAA0001.jsonl"
+        )
+        assert lifecycle_log_path(ld) == ld / "events" / "_lifecycle.jsonl"
+
+    def test_unknown_layout_means_flat(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "hashed")
+        assert project_layout(ld) == "flat"
+
+    def test_config_change_is_picked_up(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert project_layout(ld) == "flat"
+        config = json.loads((ld / "config.json").read_text())
+        config["layout"] = "sharded"
+        atomic_write(ld / "config.json", serialize_config(config))
+        assert project_layout(ld) == "sharded"
+
+
+class TestShardedStorage:
+    def test_writes_and_reads_go_through_shards(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "sharded")
+        _make_task(ld, TASK_A)
+        _make_task(ld, TASK_B)
+
+        assert (ld / "tasks" / "A1" / f"{TASK_A}.json").exists()
+        assert (ld / "events" / "B2" / f"{TASK_B}.jsonl").exists()
+        assert not list((ld / "tasks").glob("*.json"))
+        assert len(read_task_events(ld, TASK_A)) == 1
+        assert [f.stem for f in task_snapshot_files(ld)] == [TASK_A, TASK_B]
+        assert [f.stem for f in task_event_files(ld)] == [TASK_A, TASK_B]
+
+    def test_listing_skips_lifecycle_and_resources(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "sharded")
+        _make_task(ld, TASK_A)
+        (ld / "events" / "res_01AAAAAAAAAAAAAAAAAAAAAA0001.jsonl").write_text("")
+
+        assert [f.stem for f in task_event_files(ld)] == [TASK_A]
+        assert [f.stem for f in resource_event_files(ld)] == ["res_01AAAAAAAAAAAAAAAAAAAAAA0001"]
+
+    def test_archive_moves_between_shards(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "sharded")
+        snap = _make_task(ld, TASK_A)
+        event = create_event(type="task_archived", task_id=TASK_A, actor="human:test", data={})
+        archive_task_files(ld, TASK_A, event, apply_event_to_snapshot(snap, event))
+
+        assert not task_snapshot_path(ld, TASK_A).exists()
+        assert (ld / "archive" / "tasks" / "A1" / f"{TASK_A}.json").exists()
+        assert [f.stem for f in task_event_files(ld, archived=True)] == [TASK_A]
+
+    def test_catalog_notices_shard_writes(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path, "sharded")
+        _make_task(ld, TASK_A)
+        load_snapshots(ld)
+        assert read_catalog(ld) is not None
+
+        # A snapshot written behind the catalog's back into an existing shard
+        # leaves tasks/ itself untouched
+        rogue_id = "task_01AAAAAAAAAAAAAAAAAAAAAA01A1"
+        atomic_write(
+            task_snapshot_path(ld, rogue_id), json.dumps({"id": rogue_id, "title": "Rogue"})
+        )
+
+        assert read_catalog(ld) is None
+        active, _ = load_snapshots(ld)
+        assert [s["title"] for s in active] == ["00A1", "Rogue"]
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 from lattice.core.config import default_config, serialize_config
 from lattice.core.events import create_event
 from lattice.core.tasks import apply_event_to_snapshot
 from lattice.storage.fs import atomic_write, ensure_lattice_dirs
-from lattice.storage.operations import write_task_event
+from lattice.storage.operations import claim_tasks, durability_policy, write_task_event
 
 
 def _setup_lattice(tmp_path: Path) -> Path:
@@ -150,3 +154,166 @@ class TestWriteTaskEvent:
         event_path = ld / "events" / f"{task_id}.jsonl"
         lines = event_path.read_text().strip().split("\n")
         assert len(lines) == 3  # create + 2 field updates
+
+    def test_cache_failure_marks_it_stale_and_hooks_still_fire(
+        self, tmp_path: Path, capsys
+    ) -> None:
+        from lattice.storage.catalog import CATALOG_FILENAME, load_snapshots, rebuild_catalog
+        from lattice.storage.fs import cache_path
+        from lattice.storage.locks import LockTimeout
+
+        ld = _setup_lattice(tmp_path)
+        rebuild_catalog(ld)
+        task_id = "task_01EEEEEEEEEEEEEEEEEEEEEEEEEE"
+        event = create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:test",
+            data={"title": "Stale cache", "status": "backlog", "type": "task"},
+        )
+        snapshot = apply_event_to_snapshot(None, event)
+
+        with (
+            patch(
+                "lattice.storage.operations.catalog_record",
+                side_effect=LockTimeout("catalog busy"),
+            ),
+            patch("lattice.storage.operations.execute_hooks") as hooks,
+        ):
+            write_task_event(ld, task_id, [event], snapshot, default_config())
+
+        hooks.assert_called_once_with(default_config(), ld, task_id, event)
+        assert not cache_path(ld, CATALOG_FILENAME).exists()
+        assert "catalog busy" in capsys.readouterr().err
+        active, _ = load_snapshots(ld)
+        assert [s["id"] for s in active] == [task_id]
+
+
+def _claim_like_events(task_id: str) -> tuple[list[dict], dict]:
+    """A task_created plus two status steps, written in one call."""
+    created = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": "Batch", "status": "backlog", "type": "task"},
+    )
+    events = [created]
+    snap = apply_event_to_snapshot(None, created)
+    for from_status, to_status in [("backlog", "in_planning"), ("in_planning", "planned")]:
+        ev = create_event(
+            type="status_changed",
+            task_id=task_id,
+            actor="human:test",
+            data={"from": from_status, "to": to_status},
+        )
+        snap = apply_event_to_snapshot(snap, ev)
+        events.append(ev)
+    return events, snap
+
+
+class TestDurabilityPolicy:
+    """The configured durability policy controls fsyncs on the write path."""
+
+    def _set_policy(self, ld: Path, mode: str) -> None:
+        config = default_config()
+        config["durability"] = mode
+        atomic_write(ld / "config.json", serialize_config(config))
+
+    @pytest.mark.parametrize(
+        ("mode", "file_fsyncs", "dir_fsyncs"),
+        [
+            # 3 events + 1 lifecycle line + snapshot
+            ("strict", 5, 5),
+            # one fsync per file: event log, lifecycle log, snapshot
+            ("batched", 3, 3),
+            ("relaxed", 3, 0),
+        ],
+    )
+    def test_fsync_counts(
+        self, tmp_path: Path, mode: str, file_fsyncs: int, dir_fsyncs: int
+    ) -> None:
+        ld = _setup_lattice(tmp_path)
+        self._set_policy(ld, mode)
+        task_id = "task_01EEEEEEEEEEEEEEEEEEEEEEEEEE"
+        events, snap = _claim_like_events(task_id)
+
+        with (
+            patch("lattice.storage.fs.os.fsync", wraps=os.fsync) as mock_fsync,
+            patch("lattice.storage.fs._fsync_directory") as mock_dir,
+        ):
+            write_task_event(ld, task_id, events, snap)
+
+        assert mock_fsync.call_count == file_fsyncs
+        assert mock_dir.call_count == dir_fsyncs
+        lines = (ld / "events" / f"{task_id}.jsonl").read_text().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [e["id"] for e in events]
+
+    def test_policy_follows_config_changes(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert durability_policy(ld) == "strict"
+        self._set_policy(ld, "relaxed")
+        assert durability_policy(ld) == "relaxed"
+        self._set_policy(ld, "batched")
+        assert durability_policy(ld) == "batched"
+
+    def test_explicit_config_wins(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert durability_policy(ld, {"durability": "relaxed"}) == "relaxed"
+
+
+class TestClaimTasks:
+    """claim_tasks assigns and starts several tasks under one lock pass."""
+
+    def _make(self, ld: Path, n: int, **data: object) -> dict:
+        task_id = f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}"
+        event = create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:test",
+            data={"title": f"Task {n}", "status": "backlog", "type": "task", **data},
+        )
+        snapshot = apply_event_to_snapshot(None, event)
+        write_task_event(ld, task_id, [event], snapshot)
+        return snapshot
+
+    def test_claims_each_for_its_claimant(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        first, second = self._make(ld, 1), self._make(ld, 2)
+
+        claimed, skipped = claim_tasks(
+            ld,
+            [(first["id"], "agent:a"), (second["id"], "agent:b")],
+            "agent:orchestrator",
+            default_config(),
+        )
+
+        assert skipped == []
+        assert [(s["assigned_to"], s["status"]) for s in claimed] == [
+            ("agent:a", "in_progress"),
+            ("agent:b", "in_progress"),
+        ]
+        on_disk = json.loads((ld / "tasks" / f"{second['id']}.json").read_text())
+        assert on_disk["status"] == "in_progress"
+        events = (ld / "events" / f"{second['id']}.jsonl").read_text().splitlines()
+        assert json.loads(events[1])["actor"] == "agent:orchestrator"
+
+    def test_task_claimed_by_someone_else_is_skipped(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        taken = self._make(ld, 1, assigned_to="agent:other")
+        free = self._make(ld, 2)
+
+        claimed, skipped = claim_tasks(
+            ld,
+            [(taken["id"], "agent:a"), (free["id"], "agent:a")],
+            "agent:a",
+            default_config(),
+        )
+
+        assert [s["id"] for s in claimed] == [free["id"]]
+        assert skipped == [
+            {
+                "task_id": taken["id"],
+                "code": "ALREADY_CLAIMED",
+                "message": "Task already claimed by agent:other.",
+            }
+        ]
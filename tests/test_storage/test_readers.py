@@ -5,7 +5,12 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from lattice.storage.readers import read_task_events
+from lattice.storage.readers import (
+    iter_jsonl_reverse,
+    read_jsonl_tail,
+    read_task_events,
+    read_task_events_tail,
+)
 
 
 class TestReadTaskEvents:
@@ -73,3 +78,60 @@ class TestReadTaskEvents:
         result = read_task_events(tmp_path, "task_X")
         assert len(result) == 5
         assert [e["id"] for e in result] == [f"ev_{i}" for i in range(5)]
+
+
+def _write_events(path: Path, count: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps({"id": f"ev_{i}", "n": i}) + "\n" for i in range(count)))
+
+
+class TestIterJsonlReverse:
+    def test_yields_newest_first(self, tmp_path: Path) -> None:
+        path = tmp_path / "log.jsonl"
+        _write_events(path, 5)
+        assert [e["n"] for e in iter_jsonl_reverse(path)] == [4, 3, 2, 1, 0]
+
+    def test_small_blocks_split_lines(self, tmp_path: Path) -> None:
+        path = tmp_path / "log.jsonl"
+        _write_events(path, 50)
+        result = [e["n"] for e in iter_jsonl_reverse(path, block_size=7)]
+        assert result == list(range(49, -1, -1))
+
+    def test_line_longer_than_block(self, tmp_path: Path) -> None:
+        path = tmp_path / "log.jsonl"
+        big = json.dumps({"id": "ev_big", "body": "x" * 500})
+        path.write_text(big + "\n" + json.dumps({"id": "ev_last"}) + "\n")
+        result = [e["id"] for e in iter_jsonl_reverse(path, block_size=32)]
+        assert result == ["ev_last", "ev_big"]
+
+    def test_missing_trailing_newline(self, tmp_path: Path) -> None:
+        path = tmp_path / "log.jsonl"
+        path.write_text(json.dumps({"id": "ev_0"}) + "\n" + json.dumps({"id": "ev_1"}))
+        assert [e["id"] for e in iter_jsonl_reverse(path)] == ["ev_1", "ev_0"]
+
+    def test_skips_blank_and_malformed(self, tmp_path: Path) -> None:
+        path = tmp_path / "log.jsonl"
+        valid = json.dumps({"id": "ev_1"})
+        path.write_text(f"\n{valid}\n{{CORRUPT\n\n")
+        assert [e["id"] for e in iter_jsonl_reverse(path)] == ["ev_1"]
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        assert list(iter_jsonl_reverse(tmp_path / "nope.jsonl")) == []
+
+
+class TestReadTail:
+    def test_tail_matches_full_read(self, tmp_path: Path) -> None:
+        _write_events(tmp_path / "events" / "task_X.jsonl", 40)
+        full = read_task_events(tmp_path, "task_X")
+        assert read_task_events_tail(tmp_path, "task_X", 10) == full[-10:]
+        assert read_task_events_tail(tmp_path, "task_X", 100) == full
+
+    def test_zero_returns_empty(self, tmp_path: Path) -> None:
+        path = tmp_path / "log.jsonl"
+        _write_events(path, 3)
+        assert read_jsonl_tail(path, 0) == []
+
+    def test_archived(self, tmp_path: Path) -> None:
+        _write_events(tmp_path / "archive" / "events" / "task_X.jsonl", 3)
+        result = read_task_events_tail(tmp_path, "task_X", 2, is_archived=True)
+        assert [e["n"] for e in result] == [1, 2]
@@ -0,0 +1,177 @@
+"""Tests for lattice.storage.ready_queue — the persisted ready queue."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage import ready_queue as ready_queue_mod
+from lattice.storage.fs import atomic_write, cache_path, ensure_lattice_dirs
+from lattice.storage.operations import archive_task_files, write_task_event
+from lattice.storage.ready_queue import (
+    READY_QUEUE_FILENAME,
+    affects_ready_queue,
+    queue_select_next,
+    rebuild_ready_queue,
+    verify_ready_queue,
+)
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _make_task(ld: Path, n: int, *, priority: str = "medium") -> dict:
+    task_id = f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}"
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": f"Task {n}", "status": "backlog", "type": "task", "priority": priority},
+    )
+    snapshot = apply_event_to_snapshot(None, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+def _write(ld: Path, snapshot: dict, event_type: str, data: dict) -> dict:
+    event = create_event(type=event_type, task_id=snapshot["id"], actor="human:test", data=data)
+    updated = apply_event_to_snapshot(snapshot, event)
+    write_task_event(ld, snapshot["id"], [event], updated)
+    return updated
+
+
+def _active(ld: Path) -> dict[str, dict]:
+    return {p.stem: json.loads(p.read_text()) for p in (ld / "tasks").glob("*.json")}
+
+
+class TestQueueSelectNext:
+    def test_first_selection_builds_queue(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_task(ld, 1, priority="low")
+        high = _make_task(ld, 2, priority="high")
+        assert not (cache_path(ld, READY_QUEUE_FILENAME)).exists()
+
+        assert queue_select_next(ld) == high
+        assert (cache_path(ld, READY_QUEUE_FILENAME)).exists()
+        assert verify_ready_queue(ld, _active(ld)) == []
+
+    def test_priority_change_reorders(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        low = _make_task(ld, 1, priority="low")
+        _make_task(ld, 2, priority="medium")
+        queue_select_next(ld)
+
+        low = _write(
+            ld, low, "field_updated", {"field": "priority", "from": "low", "to": "critical"}
+        )
+        assert queue_select_next(ld) == low
+        assert verify_ready_queue(ld, _active(ld)) == []
+
+    def test_assignment_and_status_follow_select_next_rules(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        first = _make_task(ld, 1)
+        second = _make_task(ld, 2)
+        queue_select_next(ld)
+
+        first = _write(ld, first, "assignment_changed", {"from": None, "to": "agent:a"})
+        assert queue_select_next(ld)["id"] == second["id"]
+        assert queue_select_next(ld, actor="agent:a")["id"] == first["id"]
+
+        first = _write(ld, first, "status_changed", {"from": "backlog", "to": "in_progress"})
+        assert queue_select_next(ld, actor="agent:a")["id"] == first["id"]
+
+        _write(ld, second, "status_changed", {"from": "backlog", "to": "cancelled"})
+        assert queue_select_next(ld) is None
+        assert verify_ready_queue(ld, _active(ld)) == []
+
+    def test_blocked_and_archived_tasks_are_skipped(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        first = _make_task(ld, 1, priority="high")
+        second = _make_task(ld, 2)
+        queue_select_next(ld)
+
+        assert queue_select_next(ld, blocked=frozenset({first["id"]}))["id"] == second["id"]
+
+        event = create_event(
+            type="task_archived", task_id=first["id"], actor="human:test", data={}
+        )
+        archive_task_files(ld, first["id"], event, apply_event_to_snapshot(first, event))
+        assert queue_select_next(ld)["id"] == second["id"]
+        assert verify_ready_queue(ld, _active(ld)) == []
+
+    def test_stale_entry_falls_back_and_regenerates(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        first = _make_task(ld, 1, priority="high")
+        second = _make_task(ld, 2)
+        queue_select_next(ld)
+
+        # Finish the top task behind the queue's back
+        atomic_write(
+            ld / "tasks" / f"{first['id']}.json",
+            serialize_snapshot(dict(first, status="done")),
+        )
+        assert verify_ready_queue(ld, _active(ld)) == [
+            f"Ready queue lists {first['id']}, which is not an open active task"
+        ]
+
+        assert queue_select_next(ld)["id"] == second["id"]
+        assert verify_ready_queue(ld, _active(ld)) == []
+
+    def test_unpicked_task_changed_behind_queue_is_seen(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _make_task(ld, 1, priority="high")
+        low = _make_task(ld, 2, priority="low")
+        queue_select_next(ld)
+
+        # e.g. a git pull raising a task the queue would never pick
+        atomic_write(
+            ld / "tasks" / f"{low['id']}.json",
+            serialize_snapshot(dict(low, priority="critical")),
+        )
+
+        assert queue_select_next(ld)["id"] == low["id"]
+        assert verify_ready_queue(ld, _active(ld)) == []
+
+    def test_unrelated_write_keeps_queue_fresh(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        first = _make_task(ld, 1)
+        queue_select_next(ld)
+        inode = cache_path(ld, READY_QUEUE_FILENAME).stat().st_ino
+
+        _write(ld, first, "field_updated", {"field": "title", "from": "Task 1", "to": "Renamed"})
+
+        assert queue_select_next(ld)["title"] == "Renamed"
+        assert cache_path(ld, READY_QUEUE_FILENAME).stat().st_ino == inode
+
+
+class TestAffectsReadyQueue:
+    def test_only_ordering_fields_count(self) -> None:
+        def field(name: str) -> dict:
+            return {"type": "field_updated", "data": {"field": name}}
+
+        assert affects_ready_queue([field("urgency")])
+        assert not affects_ready_queue([field("title")])
+        assert not affects_ready_queue([{"type": "comment_added", "data": {}}])
+
+
+class TestCompaction:
+    def test_superseded_records_are_dropped(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(ready_queue_mod._log, "compact_min_bytes", 0)
+        ld = _setup_lattice(tmp_path)
+        task = _make_task(ld, 1)
+        rebuild_ready_queue(ld)
+
+        for _ in range(3):
+            task = _write(ld, task, "assignment_changed", {"from": None, "to": "agent:a"})
+            task = _write(ld, task, "assignment_changed", {"from": "agent:a", "to": None})
+
+        lines = (cache_path(ld, READY_QUEUE_FILENAME)).read_text().splitlines()
+        assert len(lines) < 5
+        assert queue_select_next(ld) == task
@@ -0,0 +1,193 @@
+"""Tests for lattice.storage.relationship_index — the reverse relationship index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage import relationship_index as relationship_index_mod
+from lattice.storage.fs import atomic_write, cache_path, ensure_lattice_dirs
+from lattice.storage.operations import (
+    archive_task_files,
+    unarchive_task_files,
+    write_task_event,
+)
+from lattice.storage.relationship_index import (
+    RELATIONSHIP_INDEX_FILENAME,
+    incoming_relationships,
+    rebuild_relationship_index,
+    verify_relationship_index,
+)
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _make_task(ld: Path, n: int) -> dict:
+    task_id = f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}"
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": f"Task {n}", "status": "backlog", "type": "task"},
+    )
+    snapshot = apply_event_to_snapshot(None, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+def _relate(ld: Path, source: dict, target: dict, rel_type: str, *, remove: bool = False) -> dict:
+    event = create_event(
+        type="relationship_removed" if remove else "relationship_added",
+        task_id=source["id"],
+        actor="human:test",
+        data={"type": rel_type, "target_task_id": target["id"]},
+    )
+    snapshot = apply_event_to_snapshot(source, event)
+    write_task_event(ld, source["id"], [event], snapshot)
+    return snapshot
+
+
+def _lifecycle(ld: Path, snapshot: dict, event_type: str) -> dict:
+    event = create_event(type=event_type, task_id=snapshot["id"], actor="human:test", data={})
+    updated = apply_event_to_snapshot(snapshot, event)
+    if event_type == "task_archived":
+        archive_task_files(ld, snapshot["id"], event, updated)
+    else:
+        unarchive_task_files(ld, snapshot["id"], event, updated)
+    return updated
+
+
+def _all_snapshots(ld: Path) -> tuple[dict[str, dict], dict[str, dict]]:
+    active = {p.stem: json.loads(p.read_text()) for p in (ld / "tasks").glob("*.json")}
+    archived = {
+        p.stem: json.loads(p.read_text()) for p in (ld / "archive" / "tasks").glob("*.json")
+    }
+    return active, archived
+
+
+class TestIncomingRelationships:
+    def test_first_lookup_builds_index(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        _relate(ld, a, b, "blocks")
+        assert not (cache_path(ld, RELATIONSHIP_INDEX_FILENAME)).exists()
+
+        incoming = incoming_relationships(ld, b["id"])
+
+        assert (cache_path(ld, RELATIONSHIP_INDEX_FILENAME)).exists()
+        assert incoming == [
+            {"source_task_id": a["id"], "source_title": "Task 1", "type": "blocks", "note": None}
+        ]
+        assert incoming_relationships(ld, a["id"]) == []
+
+    def test_add_and_remove_are_recorded(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b, c = _make_task(ld, 1), _make_task(ld, 2), _make_task(ld, 3)
+        incoming_relationships(ld, b["id"])  # build the (empty) index
+
+        a = _relate(ld, a, b, "blocks")
+        c = _relate(ld, c, b, "related_to")
+        assert [r["source_task_id"] for r in incoming_relationships(ld, b["id"])] == [
+            a["id"],
+            c["id"],
+        ]
+
+        _relate(ld, a, b, "blocks", remove=True)
+        assert [r["source_task_id"] for r in incoming_relationships(ld, b["id"])] == [c["id"]]
+        assert verify_relationship_index(ld, *_all_snapshots(ld)) == []
+
+    def test_archived_source_still_listed(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        a = _relate(ld, a, b, "blocks")
+        incoming_relationships(ld, b["id"])
+
+        a = _lifecycle(ld, a, "task_archived")
+        assert incoming_relationships(ld, b["id"])[0]["source_title"] == "Task 1"
+        assert verify_relationship_index(ld, *_all_snapshots(ld)) == []
+
+        _lifecycle(ld, a, "task_unarchived")
+        assert incoming_relationships(ld, b["id"])[0]["source_title"] == "Task 1"
+        assert verify_relationship_index(ld, *_all_snapshots(ld)) == []
+
+    def test_unrelated_write_keeps_index_fresh(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        _relate(ld, a, b, "blocks")
+        incoming_relationships(ld, b["id"])
+        inode = cache_path(ld, RELATIONSHIP_INDEX_FILENAME).stat().st_ino
+
+        _make_task(ld, 3)
+        assert len(incoming_relationships(ld, b["id"])) == 1
+        assert cache_path(ld, RELATIONSHIP_INDEX_FILENAME).stat().st_ino == inode
+
+    def test_write_behind_the_index_is_picked_up(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        assert incoming_relationships(ld, b["id"]) == []
+
+        # e.g. a git pull bringing in an edge written elsewhere
+        event = create_event(
+            type="relationship_added",
+            task_id=a["id"],
+            actor="human:test",
+            data={"type": "blocks", "target_task_id": b["id"]},
+        )
+        a = apply_event_to_snapshot(a, event)
+        atomic_write(ld / "tasks" / f"{a['id']}.json", serialize_snapshot(a))
+
+        assert [r["source_task_id"] for r in incoming_relationships(ld, b["id"])] == [a["id"]]
+        assert verify_relationship_index(ld, *_all_snapshots(ld)) == []
+
+
+class TestCompaction:
+    def test_superseded_records_are_dropped(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(relationship_index_mod._log, "compact_min_bytes", 0)
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        incoming_relationships(ld, b["id"])
+
+        for _ in range(3):
+            a = _relate(ld, a, b, "blocks")
+            a = _relate(ld, a, b, "blocks", remove=True)
+        a = _relate(ld, a, b, "blocks")
+
+        lines = (cache_path(ld, RELATIONSHIP_INDEX_FILENAME)).read_text().splitlines()
+        assert len(lines) < 8
+        assert [r["source_task_id"] for r in incoming_relationships(ld, b["id"])] == [a["id"]]
+
+
+class TestVerify:
+    def test_absent_index_is_fine(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert verify_relationship_index(ld, {}, {}) == []
+
+    def test_bypassing_write_is_detected_and_rebuilt(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a, b = _make_task(ld, 1), _make_task(ld, 2)
+        rebuild_relationship_index(ld)
+
+        # Write an edge behind the index's back
+        event = create_event(
+            type="relationship_added",
+            task_id=a["id"],
+            actor="human:test",
+            data={"type": "blocks", "target_task_id": b["id"]},
+        )
+        a = apply_event_to_snapshot(a, event)
+        atomic_write(ld / "tasks" / f"{a['id']}.json", serialize_snapshot(a))
+
+        problems = verify_relationship_index(ld, *_all_snapshots(ld))
+        assert any(f"missing the edges of {a['id']}" in p for p in problems)
+
+        assert rebuild_relationship_index(ld) == 1
+        assert verify_relationship_index(ld, *_all_snapshots(ld)) == []
+        assert incoming_relationships(ld, b["id"])[0]["source_task_id"] == a["id"]
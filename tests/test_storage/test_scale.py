@@ -8,6 +8,7 @@ set up data quickly, then time CLI operations.
 from __future__ import annotations
 
 import json
+import os
 import time
 
 import pytest
@@ -16,6 +17,11 @@ from ulid import ULID
 from lattice.core.events import create_event, serialize_event
 from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
 
+# Benchmarks that only measure and record timings are opt-in.
+bench = pytest.mark.skipif(
+    not os.environ.get("LATTICE_BENCH"),
+    reason="set LATTICE_BENCH=1 to run the storage benchmarks",
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -188,3 +194,169 @@ def test_rebuild_all_100_tasks_under_10s(invoke, initialized_root):
     assert len(data["data"]["rebuilt_tasks"]) == 100
     assert data["data"]["global_log_rebuilt"] is True
     assert duration < 10, f"rebuild --all took {duration:.2f}s (limit: 10s)"
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(60)
+def test_in_place_replay_faster_than_chained_apply():
+    """Replaying thousands of events in place beats per-event deep copies.
+
+    Comments carrying a role append to ``evidence_refs`` and relationships
+    accumulate, so the snapshot grows with history -- the case where the
+    copying path degrades to O(events x snapshot size).
+    """
+    from lattice.core.tasks import replay_events
+
+    task_id = f"task_{ULID()}"
+    events = [
+        create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:test",
+            data={"title": "Long-lived task", "status": "backlog", "type": "task"},
+        )
+    ]
+    for i in range(1, 1500):
+        if i % 2:
+            ev = create_event(
+                type="comment_added",
+                task_id=task_id,
+                actor="human:test",
+                data={"body": f"Comment {i}", "role": "review"},
+            )
+        else:
+            ev = create_event(
+                type="relationship_added",
+                task_id=task_id,
+                actor="human:test",
+                data={"type": "related_to", "target_task_id": f"task_{ULID()}"},
+            )
+        events.append(ev)
+
+    start = time.monotonic()
+    chained = None
+    for ev in events:
+        chained = apply_event_to_snapshot(chained, ev)
+    chained_duration = time.monotonic() - start
+
+    start = time.monotonic()
+    replayed = replay_events(events)
+    replay_duration = time.monotonic() - start
+
+    assert serialize_snapshot(replayed) == serialize_snapshot(chained)
+    assert replay_duration * 10 < chained_duration, (
+        f"in-place replay {replay_duration:.3f}s vs chained {chained_duration:.3f}s"
+    )
+
+
+@pytest.mark.slow
+@bench
+@pytest.mark.timeout(60)
+def test_write_latency_per_durability_policy(initialized_root, record_property):
+    """Record multi-event write latency under each durability policy.
+
+    Each write mirrors ``next --claim``: several status steps appended to one
+    task log in a single ``write_task_event`` call.  The per-call latency of
+    each policy is recorded as a test property (see ``--junitxml``).
+    """
+    from lattice.core.config import DURABILITY_MODES
+    from lattice.storage.operations import write_task_event
+
+    lattice_dir = initialized_root / ".lattice"
+    config = json.loads((lattice_dir / "config.json").read_text())
+    steps = ["in_planning", "planned", "in_progress", "review"]
+    writes = 30
+
+    for mode in DURABILITY_MODES:
+        mode_config = {**config, "durability": mode}
+        task_id = f"task_{ULID()}"
+        created = create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:test",
+            data={"title": f"Durability {mode}", "status": "backlog", "type": "task"},
+        )
+        snapshot = apply_event_to_snapshot(None, created)
+        write_task_event(lattice_dir, task_id, [created], snapshot, mode_config)
+
+        elapsed = 0.0
+        for _ in range(writes):
+            batch = []
+            current = "backlog"
+            for step in steps:
+                ev = create_event(
+                    type="status_changed",
+                    task_id=task_id,
+                    actor="human:test",
+                    data={"from": current, "to": step},
+                )
+                snapshot = apply_event_to_snapshot(snapshot, ev)
+                batch.append(ev)
+                current = step
+            # Reset so the next batch starts from backlog again
+            reset = create_event(
+                type="status_changed",
+                task_id=task_id,
+                actor="human:test",
+                data={"from": current, "to": "backlog"},
+            )
+            snapshot = apply_event_to_snapshot(snapshot, reset)
+            batch.append(reset)
+
+            start = time.perf_counter()
+            write_task_event(lattice_dir, task_id, batch, snapshot, mode_config)
+            elapsed += time.perf_counter() - start
+
+        log_lines = (lattice_dir / "events" / f"{task_id}.jsonl").read_text().splitlines()
+        assert len(log_lines) == 1 + writes * (len(steps) + 1)
+        record_property(f"{mode}_ms_per_call", round(elapsed / writes * 1000, 3))
+
+
+@pytest.mark.slow
+@bench
+@pytest.mark.timeout(600)
+@pytest.mark.parametrize(
+    "count",
+    [
+        10_000,
+        pytest.param(
+            100_000,
+            marks=pytest.mark.skipif(
+                not os.environ.get("LATTICE_BENCH_100K"),
+                reason="set LATTICE_BENCH_100K=1 to run the 100k layout benchmark",
+            ),
+        ),
+    ],
+)
+def test_layout_listing_and_lookup(tmp_path, record_property, count):
+    """Measure snapshot listing and by-ID lookup in the flat and sharded layouts.
+
+    Files are written directly with placeholder content; only directory
+    behaviour is measured.  The timings are recorded as test properties.
+    """
+    import random
+
+    from lattice.storage.layout import ensure_parent, task_snapshot_files, task_snapshot_path
+
+    task_ids = [f"task_{ULID()}" for _ in range(count)]
+    lookups = random.Random(0).sample(task_ids, 1000)
+
+    for layout in ("flat", "sharded"):
+        lattice_dir = tmp_path / layout
+        (lattice_dir / "tasks").mkdir(parents=True)
+        for task_id in task_ids:
+            path = task_snapshot_path(lattice_dir, task_id, layout=layout)
+            ensure_parent(path).write_bytes(b"{}")
+
+        start = time.perf_counter()
+        listed = task_snapshot_files(lattice_dir, layout=layout)
+        list_ms = (time.perf_counter() - start) * 1000
+        assert len(listed) == count
+
+        start = time.perf_counter()
+        for task_id in lookups:
+            task_snapshot_path(lattice_dir, task_id, layout=layout).read_bytes()
+        lookup_us = (time.perf_counter() - start) / len(lookups) * 1_000_000
+
+        record_property(f"{layout}_list_ms", round(list_ms, 1))
+        record_property(f"{layout}_lookup_us", round(lookup_us, 1))
@@ -5,7 +5,11 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
+from lattice.storage import short_ids as short_ids_mod
 from lattice.storage.short_ids import (
+    IDS_LOG_FILENAME,
     _default_index,
     _migrate_v1_to_v2,
     allocate_short_id,
@@ -187,3 +191,106 @@ class TestResolveShortId:
             },
         )
         assert resolve_short_id(lattice_dir, "AUT-F-1") == "task_01SUB"
+
+
+class TestAllocationLog:
+    def test_allocate_appends_instead_of_rewriting(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(lattice_dir, _default_index())
+        base_before = (lattice_dir / "ids.json").read_bytes()
+
+        allocate_short_id(lattice_dir, "LAT", task_ulid="task_a")
+        allocate_short_id(lattice_dir, "LAT", task_ulid="task_b")
+
+        assert (lattice_dir / "ids.json").read_bytes() == base_before
+        lines = (lattice_dir / IDS_LOG_FILENAME).read_text().splitlines()
+        assert [json.loads(line)["short_id"] for line in lines] == ["LAT-1", "LAT-2"]
+        index = load_id_index(lattice_dir)
+        assert index["map"] == {"LAT-1": "task_a", "LAT-2": "task_b"}
+        assert index["next_seqs"]["LAT"] == 3
+
+    def test_missing_base_is_written_in_full(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        allocate_short_id(lattice_dir, "LAT", task_ulid="task_a")
+
+        loaded = json.loads((lattice_dir / "ids.json").read_text())
+        assert loaded["map"] == {"LAT-1": "task_a"}
+        assert not (lattice_dir / IDS_LOG_FILENAME).exists()
+
+    def test_log_is_compacted(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(short_ids_mod, "_COMPACT_EVERY", 3)
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(lattice_dir, _default_index())
+
+        for n in range(3):
+            allocate_short_id(lattice_dir, "LAT", task_ulid=f"task_{n}")
+
+        assert not (lattice_dir / IDS_LOG_FILENAME).exists()
+        loaded = json.loads((lattice_dir / "ids.json").read_text())
+        assert loaded["map"] == {"LAT-1": "task_0", "LAT-2": "task_1", "LAT-3": "task_2"}
+        assert loaded["next_seqs"] == {"LAT": 4}
+
+    def test_save_discards_log(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(lattice_dir, _default_index())
+        allocate_short_id(lattice_dir, "LAT", task_ulid="task_a")
+
+        save_id_index(lattice_dir, _default_index())
+
+        assert not (lattice_dir / IDS_LOG_FILENAME).exists()
+        assert resolve_short_id(lattice_dir, "LAT-1") is None
+
+    def test_replayed_records_are_idempotent(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(
+            lattice_dir, {"schema_version": 2, "next_seqs": {"LAT": 2}, "map": {"LAT-1": "a"}}
+        )
+        # A record already folded into the base (crash during compaction) plus a torn tail
+        (lattice_dir / IDS_LOG_FILENAME).write_text(
+            '{"id":"a","prefix":"LAT","seq":1,"short_id":"LAT-1"}\n{"id":"b","prefix"'
+        )
+
+        index = load_id_index(lattice_dir)
+        assert index["map"] == {"LAT-1": "a"}
+        assert index["next_seqs"] == {"LAT": 2}
+        assert allocate_short_id(lattice_dir, "LAT", task_ulid="c")[0] == "LAT-2"
+
+
+class TestResolverCache:
+    def test_unchanged_files_are_not_reparsed(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(
+            lattice_dir, {"schema_version": 2, "next_seqs": {"LAT": 2}, "map": {"LAT-1": "a"}}
+        )
+        calls: list[Path] = []
+        real_read_base = short_ids_mod._read_base
+        monkeypatch.setattr(
+            short_ids_mod, "_read_base", lambda path: calls.append(path) or real_read_base(path)
+        )
+
+        for _ in range(5):
+            assert resolve_short_id(lattice_dir, "LAT-1") == "a"
+        allocate_short_id(lattice_dir, "LAT", task_ulid="b")
+        assert resolve_short_id(lattice_dir, "LAT-2") == "b"
+
+        assert len(calls) == 1
+
+    def test_external_rewrite_is_picked_up(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(
+            lattice_dir, {"schema_version": 2, "next_seqs": {"LAT": 2}, "map": {"LAT-1": "a"}}
+        )
+        assert resolve_short_id(lattice_dir, "LAT-1") == "a"
+
+        (lattice_dir / "ids.json").write_text(
+            json.dumps({"schema_version": 2, "next_seqs": {"LAT": 2}, "map": {"LAT-1": "zz"}})
+        )
+        assert resolve_short_id(lattice_dir, "LAT-1") == "zz"
+
+    def test_loaded_index_is_a_private_copy(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(lattice_dir, _default_index())
+        register_short_id(load_id_index(lattice_dir), "LAT-1", "task_x")
+        assert resolve_short_id(lattice_dir, "LAT-1") is None
@@ -0,0 +1,162 @@
+"""Tests for lattice.storage.stats_rollup — the incremental stats rollup."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.stats import build_stats, count_recent_events
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage import stats_rollup as rollup_mod
+from lattice.storage.event_index import rebuild_event_index
+from lattice.storage.fs import atomic_write, cache_path, ensure_lattice_dirs
+from lattice.storage.operations import archive_task_files, write_task_event
+from lattice.storage.stats_rollup import STATS_ROLLUP_FILENAME, update_stats_rollup
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _ts(hours_ago: float) -> str:
+    dt = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _write(ld: Path, snapshot: dict | None, type: str, data: dict, **kwargs) -> dict:
+    task_id = snapshot["id"] if snapshot else kwargs.pop("task_id")
+    event = create_event(type=type, task_id=task_id, data=data, **kwargs)
+    updated = apply_event_to_snapshot(snapshot, event)
+    write_task_event(ld, task_id, [event], updated)
+    return updated
+
+
+def _make_task(ld: Path, n: int, hours_ago: float = 100) -> dict:
+    return _write(
+        ld,
+        None,
+        "task_created",
+        {"title": f"Task {n}", "status": "backlog", "type": "task"},
+        task_id=f"task_01AAAAAAAAAAAAAAAAAAAAAA{n:04d}",
+        actor="human:test",
+        ts=_ts(hours_ago),
+    )
+
+
+def _move(ld: Path, snap: dict, to: str, hours_ago: float, actor: str = "agent:a") -> dict:
+    return _write(
+        ld,
+        snap,
+        "status_changed",
+        {"from": snap["status"], "to": to},
+        actor=actor,
+        ts=_ts(hours_ago),
+    )
+
+
+def _refold(ld: Path) -> dict:
+    """Fold the whole index from scratch, as a fresh process without a rollup would."""
+    rollup_mod._cache.pop(ld, None)
+    (cache_path(ld, STATS_ROLLUP_FILENAME)).unlink(missing_ok=True)
+    return update_stats_rollup(ld)
+
+
+class TestIncrementalUpdate:
+    def test_matches_a_full_refold(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a = _make_task(ld, 1)
+        a = _move(ld, a, "in_progress", 90)
+        update_stats_rollup(ld)
+
+        a = _move(ld, a, "blocked", 80)
+        a = _move(ld, a, "in_progress", 70, actor="human:b")
+        _move(ld, a, "done", 60)
+        b = _make_task(ld, 2, hours_ago=50)
+        _write(ld, b, "comment_added", {"body": "hi"}, actor="human:b")
+        incremental = update_stats_rollup(ld)
+
+        assert incremental["logs"] == _refold(ld)["logs"]
+        agg = incremental["logs"][a["id"]]
+        assert agg["events"] == 5
+        assert agg["actors"] == {"human:test": 1, "agent:a": 3, "human:b": 1}
+        assert agg["dwell"]["blocked"][1] == 1
+        assert agg["blocked"] == [10.0, 1]
+        assert agg["current"][0] == "done"
+
+    def test_only_new_rows_are_read(self, tmp_path: Path, monkeypatch) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        update_stats_rollup(ld)
+
+        reads: list[str] = []
+        real = rollup_mod.read_log_events
+
+        def counting(lattice_dir, log_id, offsets, **kwargs):
+            reads.append(log_id)
+            return real(lattice_dir, log_id, offsets, **kwargs)
+
+        monkeypatch.setattr(rollup_mod, "read_log_events", counting)
+        snap = _write(ld, snap, "comment_added", {"body": "hi"}, actor="human:test")
+        update_stats_rollup(ld)
+        assert reads == []  # comments need only their index row
+
+        _move(ld, snap, "in_progress", 1)
+        state = update_stats_rollup(ld)
+        assert reads == [snap["id"]]
+        assert state["logs"][snap["id"]]["events"] == 3
+
+    def test_persisted_watermark_is_picked_up(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        update_stats_rollup(ld)
+        rollup_mod._cache.pop(ld, None)
+
+        _write(ld, snap, "comment_added", {"body": "hi"}, actor="human:test")
+        saved = json.loads((cache_path(ld, STATS_ROLLUP_FILENAME)).read_text())
+        assert update_stats_rollup(ld)["pos"] > saved["pos"]
+        assert update_stats_rollup(ld)["logs"][snap["id"]]["events"] == 2
+
+    def test_replaced_index_refolds(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        _move(ld, snap, "in_progress", 10)
+        before = update_stats_rollup(ld)
+
+        rebuild_event_index(ld)
+        after = update_stats_rollup(ld)
+        assert after["inode"] != before["inode"]
+        assert after["logs"] == before["logs"]
+
+    def test_archive_moves_are_tracked(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1)
+        _make_task(ld, 2)
+        update_stats_rollup(ld)
+
+        event = create_event(type="task_archived", task_id=snap["id"], actor="human:test", data={})
+        archive_task_files(ld, snap["id"], event, apply_event_to_snapshot(snap, event))
+        state = update_stats_rollup(ld)
+        assert state["logs"][snap["id"]]["archived"] is True
+
+        summary = build_stats(ld, default_config())["summary"]
+        assert summary["active_events"] == 1
+        assert summary["total_events"] == 3
+
+
+class TestRecentEvents:
+    def test_counts_active_events_in_window(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _make_task(ld, 1, hours_ago=30)
+        _move(ld, snap, "in_progress", 2)
+        state = update_stats_rollup(ld)
+
+        now = datetime.now(timezone.utc)
+        assert count_recent_events(state, now, hours=24) == 1
+        assert count_recent_events(state, now, hours=36) == 2
+        assert len(state["recent"]) == 2